@@ -73,6 +73,13 @@ if __name__ == "__main__":
     parser.add_argument(
         "--expr", type=str, default=None, help="A description to this experiment."
     )
+    parser.add_argument(
+        "--resume",
+        type=str,
+        default=None,
+        help="resume global placement from a checkpoint, "
+        "or from the latest checkpoint in a directory",
+    )
 
     args, unknown_args = parser.parse_known_args()
     extra_arguments = dict(
@@ -104,6 +111,8 @@ if __name__ == "__main__":
     # update parameters
     for k, v in extra_arguments.items():
         params.update(k, v)
+    if args.resume is not None:
+        params.gp_resume_file = args.resume
     params.printWelcome()
 
     logging.info("parameters = %s" % params)
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Place multiple designs in a pool of worker processes.
+
+Designs are directories in enhanced bookshelf format, like the MLCAD 2023
+benchmarks placed one by one by scripts/mlcad2023_place.sh.
+Every worker imports torch and the OpenPARF extensions once and then places
+designs one after another, so only its first design pays the startup cost.
+The threads of the machine are partitioned among the workers. Parsed
+benchmarks are reused across runs through the database cache, see
+params.db_cache_dir. Each design gets <result_dir>/<design>/<design>.pl and a
+log file, and one CSV file summarizes the runtime, HPWL and overflow of all
+designs.
+"""
+
+import os
+import re
+import csv
+import sys
+import copy
+import json
+import time
+import ctypes
+import logging
+import contextlib
+import multiprocessing
+import os.path as osp
+
+logger = logging.getLogger(__name__)
+
+CSV_FIELDS = ("design", "status", "runtime", "hpwl", "overflow", "pl_file", "log_file")
+
+# state of a worker process, set by _init_worker
+_worker = None
+
+
+def _natural_key(s):
+    """Sort key such that Design_2 comes before Design_10"""
+    return [int(x) if x.isdigit() else x for x in re.split(r"(\d+)", s)]
+
+
+def collect_designs(paths):
+    """Design directories from a list of design directories and directories of designs.
+    A directory with sub-directories is taken as a directory of designs.
+    """
+    designs = []
+    for path in paths:
+        subdirs = sorted(
+            (d for d in os.listdir(path) if osp.isdir(osp.join(path, d))),
+            key=_natural_key,
+        )
+        if subdirs:
+            designs.extend(osp.join(path, d) for d in subdirs)
+        else:
+            designs.append(path)
+    return designs
+
+
+def _design_size(design_dir):
+    return sum(
+        osp.getsize(osp.join(design_dir, name))
+        for name in os.listdir(design_dir)
+        if osp.isfile(osp.join(design_dir, name))
+    )
+
+
+def available_threads():
+    """Number of CPUs this process may run on"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+@contextlib.contextmanager
+def _redirect_output(filename):
+    """Redirect stdout and stderr at the file descriptor level,
+    so that messages printed by the C++ extensions are captured as well.
+    """
+    libc = ctypes.CDLL(None)
+
+    def flush():
+        sys.stdout.flush()
+        sys.stderr.flush()
+        libc.fflush(None)
+
+    flush()
+    saved_fds = [os.dup(1), os.dup(2)]
+    with open(filename, "w") as f:
+        os.dup2(f.fileno(), 1)
+        os.dup2(f.fileno(), 2)
+        try:
+            yield
+        finally:
+            flush()
+            os.dup2(saved_fds[0], 1)
+            os.dup2(saved_fds[1], 2)
+            for fd in saved_fds:
+                os.close(fd)
+
+
+def _init_worker(config, overrides, result_dir, num_threads):
+    global _worker
+
+    import torch
+
+    # load the extensions once for all designs of this worker
+    from openparf import flow  # noqa: F401
+
+    # operators take their thread count from torch, or from params.num_threads of each design
+    torch.set_num_threads(num_threads)
+    logging.basicConfig(
+        level=logging.INFO,
+        stream=sys.stderr,
+        format="[%(levelname)-7s] %(name)s - %(message)s",
+    )
+    _worker = {
+        "config": config,
+        "overrides": overrides,
+        "result_dir": result_dir,
+        "num_threads": num_threads,
+    }
+
+
+def _final_metrics(place_engine):
+    """Weighted HPWL and the maximum overflow over area types of the final solution"""
+    import torch
+
+    data_cls = place_engine.data_cls
+    op_cls = place_engine.op_cls
+    with torch.no_grad():
+        pos = data_cls.pos[0]
+        hpwl = op_cls.hpwl_op(pos)
+        overflow = op_cls.normalized_overflow_op(pos)
+    weights = place_engine.params.wirelength_weights
+    return (
+        float(hpwl[0] * weights[0] + hpwl[1] * weights[1]),
+        float(overflow.max()),
+    )
+
+
+def _place_design(design_dir):
+    from openparf import flow
+    from openparf.params import Params
+
+    design_name = osp.basename(osp.normpath(design_dir))
+    design_result_dir = osp.join(_worker["result_dir"], design_name)
+    os.makedirs(design_result_dir, exist_ok=True)
+    log_file = osp.join(design_result_dir, "%s.log" % design_name)
+    row = {
+        "design": design_name,
+        "status": "failed",
+        "runtime": None,
+        "hpwl": None,
+        "overflow": None,
+        "pl_file": None,
+        "log_file": log_file,
+    }
+
+    tt = time.time()
+    with _redirect_output(log_file):
+        try:
+            params = Params()
+            params.fromJson(copy.deepcopy(_worker["config"]))
+            for k, v in _worker["overrides"].items():
+                params.update(k, v)
+            params.benchmark_name = design_name
+            params.input_dir = design_dir
+            params.result_dir = design_result_dir
+            params.plot_dir = osp.join(design_result_dir, "plot")
+            params.num_threads = _worker["num_threads"]
+            if params.macro_place_flag:
+                pl_file = osp.join(design_result_dir, "macroplacement.pl")
+            else:
+                pl_file = osp.join(design_result_dir, "%s.pl" % design_name)
+            place_engine = flow.place(params, pl_file)
+            row["hpwl"], row["overflow"] = _final_metrics(place_engine)
+            row["pl_file"] = pl_file
+            row["status"] = "ok"
+        except Exception:
+            logger.exception("Error occurs when placing %s" % design_name)
+    row["runtime"] = time.time() - tt
+    return row
+
+
+def place_designs(
+    config_file,
+    designs,
+    result_dir,
+    num_workers,
+    num_threads,
+    csv_file=None,
+    overrides=None,
+):
+    """Place designs in a process pool and summarize them in a CSV file.
+
+    :param config_file: parameter json file shared by all designs
+    :param designs: design directories
+    :param result_dir: each design writes to <result_dir>/<design>
+    :param num_workers: number of worker processes
+    :param num_threads: total number of threads, partitioned among the workers
+    :param csv_file: summary file, <result_dir>/summary.csv by default
+    :param overrides: dict of parameters overriding the json file
+    :return: CSV rows of the designs in completion order
+    """
+    with open(config_file, "r") as f:
+        config = json.load(f)
+    num_workers = max(1, min(num_workers, len(designs)))
+    threads_per_worker = max(1, num_threads // num_workers)
+    if csv_file is None:
+        csv_file = osp.join(result_dir, "summary.csv")
+    os.makedirs(result_dir, exist_ok=True)
+    # start the largest designs first, so that none of them is left for the end
+    designs = sorted(designs, key=_design_size, reverse=True)
+    logger.info(
+        "place %d designs with %d workers x %d threads"
+        % (len(designs), num_workers, threads_per_worker)
+    )
+
+    context = multiprocessing.get_context("spawn")
+    rows = []
+    with open(csv_file, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        with context.Pool(
+            num_workers,
+            initializer=_init_worker,
+            initargs=(config, overrides or {}, result_dir, threads_per_worker),
+        ) as pool:
+            for row in pool.imap_unordered(_place_design, designs):
+                writer.writerow(row)
+                f.flush()
+                rows.append(row)
+                logger.info(
+                    "[%d/%d] %s %s in %.3f seconds, log %s"
+                    % (
+                        len(rows),
+                        len(designs),
+                        row["design"],
+                        row["status"],
+                        row["runtime"],
+                        row["log_file"],
+                    )
+                )
+    logger.info("write summary to %s" % csv_file)
+    return rows
@@ -128,6 +128,7 @@ class InstAttr : public BaseAttr {
   void                 copy(InstAttr const &rhs);
   /// @brief move object
   void                 move(InstAttr &&rhs);
+  friend class Snapshot;
   /// @brief overload output stream
   friend std::ostream &operator<<(std::ostream &os, InstAttr const &rhs);
 
@@ -192,6 +193,7 @@ class NetAttr : public BaseAttr {
   void                 copy(NetAttr const &rhs);
   /// @brief move object
   void                 move(NetAttr &&rhs);
+  friend class Snapshot;
   /// @brief overload output stream
   friend std::ostream &operator<<(std::ostream &os, NetAttr const &rhs);
 
@@ -246,6 +248,7 @@ class PinAttr : public BaseAttr {
   void                 copy(PinAttr const &rhs);
   /// @brief move object
   void                 move(PinAttr &&rhs);
+  friend class Snapshot;
   /// @brief overload output stream
   friend std::ostream &operator<<(std::ostream &os, PinAttr const &rhs);
 
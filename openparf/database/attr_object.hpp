@@ -69,6 +69,7 @@ protected:
     this->BaseType::move(std::move(rhs));
     std::swap(attr_, rhs.attr_);
   }
+  friend class Snapshot;
   /// @brief overload output stream
   friend std::ostream &operator<<(std::ostream &os, AttrObject const &rhs) {
     os << className<decltype(rhs)>() << "("
@@ -113,6 +113,7 @@ protected:
     void copy(ClockRegion const &rhs);
     /// @brief move object
     void move(ClockRegion &&rhs);
+    friend class Snapshot;
     /// @brief overload output stream
     friend std::ostream &operator<<(std::ostream &os, ClockRegion const &rhs);
 
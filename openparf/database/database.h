@@ -136,6 +136,12 @@ class Database : public Object {
   /// @brief write bookshelf .nets file
   bool                    writeBookshelfNets(std::string const &nets_file);
 
+  /// @brief write a binary snapshot of the entire database
+  bool                    writeSnapshot(std::string const &filename) const;
+
+  /// @brief read a binary snapshot written by writeSnapshot, bypassing the benchmark parsers
+  bool                    readSnapshot(std::string const &filename);
+
   /// @brief read from flexshelf files
   void readFlexshelf(std::string const &layout_file, std::string const &netlist_file, std::string const &place_file);
 
@@ -153,6 +159,7 @@ class Database : public Object {
   void                   copy(Database const &rhs);
   /// @brief move object
   void                   move(Database &&rhs);
+  friend class Snapshot;
   /// @brief overload output stream
   friend std::ostream   &operator<<(std::ostream &os, Database const &rhs);
 
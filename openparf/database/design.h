@@ -145,6 +145,7 @@ class Design : public Object {
   void                                       copy(Design const &rhs);
   /// @brief move object
   void                                       move(Design &&rhs);
+  friend class Snapshot;
   /// @brief overload output stream
   friend std::ostream                       &operator<<(std::ostream &os, Design const &rhs);
 
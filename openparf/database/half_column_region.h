@@ -68,6 +68,7 @@ protected:
   void copy(HalfColumnRegion const &rhs);
   /// @brief move object
   void move(HalfColumnRegion &&rhs);
+  friend class Snapshot;
   /// @brief overload output stream
   friend std::ostream &operator<<(std::ostream &os,
                                   HalfColumnRegion const &rhs);
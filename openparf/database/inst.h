@@ -76,6 +76,7 @@ protected:
   void copy(Inst const &rhs);
   /// @brief move object
   void move(Inst &&rhs);
+  friend class Snapshot;
   /// @brief overload output stream
   friend std::ostream &operator<<(std::ostream &os, Inst const &rhs);
 
@@ -134,6 +134,7 @@ protected:
   void copy(Layout const &rhs);
   /// @brief move object
   void move(Layout &&rhs);
+  friend class Snapshot;
   /// @brief overload output stream
   friend std::ostream &operator<<(std::ostream &os, Layout const &rhs);
 
@@ -104,6 +104,7 @@ protected:
   void copy(LayoutMap2D const &rhs);
   /// @brief move object
   void move(LayoutMap2D &&rhs);
+  friend class Snapshot;
   /// @brief overload output stream
   /// The function cannot be linked if put outside
   friend std::ostream &operator<<(std::ostream &os, LayoutMap2D const &rhs) {
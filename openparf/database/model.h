@@ -213,6 +213,7 @@ class Model : public Object {
   void                                       copy(Model const &rhs);
   /// @brief move object
   void                                       move(Model &&rhs);
+  friend class Snapshot;
   /// @brief overload output stream
   friend std::ostream                       &operator<<(std::ostream &os, Model const &rhs);
 
@@ -139,6 +139,7 @@ class ModuleInstNetlist {
   void copy(ModuleInstNetlist const &rhs);
   /// @brief move object
   void move(ModuleInstNetlist &&rhs);
+  friend class Snapshot;
   friend std::ostream &operator<<(std::ostream &os,
                                   ModuleInstNetlist const &rhs);
 
@@ -205,6 +206,7 @@ class ModuleInst : public Inst {
   void copy(ModuleInst const &rhs);
   /// @brief move object
   void move(ModuleInst &&rhs);
+  friend class Snapshot;
   /// @brief overload output stream
   friend std::ostream &operator<<(std::ostream &os, ModuleInst const &rhs);
 
@@ -74,6 +74,7 @@ protected:
   void copy(Net const &rhs);
   /// @brief move object
   void move(Net &&rhs);
+  friend class Snapshot;
   /// @brief overload output stream
   friend std::ostream &operator<<(std::ostream &os, Net const &rhs);
 
@@ -147,6 +147,7 @@ protected:
   void copy(Netlist const &rhs);
   /// @brief move object
   void move(Netlist &&rhs);
+  friend class Snapshot;
   /// @brief overload output stream
   friend std::ostream &operator<<(std::ostream &os, Netlist const &rhs) {
     os << className<decltype(rhs)>() << "("
@@ -20,6 +20,9 @@ OPENPARF_BEGIN_NAMESPACE
 
 namespace database {
 
+/// @brief binary snapshot of the database, see snapshot.cpp
+class Snapshot;
+
 class Object {
  public:
   using CoordinateType                    = CoordinateTraits<int32_t>::CoordinateType;
@@ -69,6 +72,7 @@ class Object {
   /// @brief summarize memory usage of the object in bytes
   virtual IndexType    memory() const { return sizeof(*this); }
 
+  friend class Snapshot;
   /// @brief overload output stream
   friend std::ostream &operator<<(std::ostream &os, Object const &rhs) {
     os << className<decltype(rhs)>() << "("
@@ -281,6 +285,7 @@ class ObjectMap {
     map_ = std::move(rhs.map_);
   }
 
+  friend class Snapshot;
   friend std::ostream &operator<<(std::ostream &os, ObjectMap const &rhs) {
     os << className<decltype(rhs)>();
     os << ", vec_: (";
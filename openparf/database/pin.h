@@ -85,6 +85,7 @@ protected:
   void copy(ModelPin const &rhs);
   /// @brief move object
   void move(ModelPin &&rhs);
+  friend class Snapshot;
   /// @brief overload output stream
   friend std::ostream &operator<<(std::ostream &os, ModelPin const &rhs);
 
@@ -160,6 +161,7 @@ protected:
   void copy(Pin const &rhs);
   /// @brief move object
   void move(Pin &&rhs);
+  friend class Snapshot;
   /// @brief overload output stream
   friend std::ostream &operator<<(std::ostream &os, Pin const &rhs);
 
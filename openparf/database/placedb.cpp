@@ -7,6 +7,9 @@
 
 // C++ standard library headers
 #include <algorithm>
+#include <cctype>
+#include <cstdio>
+#include <cstdlib>
 #include <fstream>
 #include <limits>
 #include <queue>
@@ -254,6 +257,127 @@ bool PlaceDB::writeBookshelfPl(std::string const &pl_file) const {
   return db_->writeBookshelfPl(pl_file);
 }
 
+namespace {
+
+/// @brief size of the buffer for streaming instance locations
+constexpr std::size_t kInstLocsBufferSize = 1 << 20;
+
+/// @brief print the shortest representation of a value that reads back to the same value
+int printCoordinate(char *buf, std::size_t n, double v) {
+  int len = 0;
+  for (int precision = 15; precision <= 17; ++precision) {
+    len = std::snprintf(buf, n, "%.*g", precision, v);
+    if (std::strtod(buf, nullptr) == v) {
+      break;
+    }
+  }
+  return len;
+}
+
+}   // namespace
+
+bool PlaceDB::writeInstLocs(std::string const &pl_file, double const *xy, IndexType bgn, IndexType end) const {
+  std::ofstream ofs(pl_file.c_str(), std::ios::binary);
+  if (!ofs.good()) {
+    openparfPrint(kError, "failed to open file %s for write\n", pl_file.c_str());
+    return false;
+  }
+  auto top_module_inst = db_->design().topModuleInst();
+  openparfAssert(top_module_inst);
+  // assume flat netlist for now
+  auto const &netlist = top_module_inst->netlist();
+
+  std::string buf;
+  buf.reserve(kInstLocsBufferSize);
+  char num[32];
+  for (IndexType i = bgn; i < end; ++i) {
+    buf += netlist.inst(oldInstId(i)).attr().name();
+    for (IndexType k = 0; k < 2; ++k) {
+      buf += ' ';
+      buf.append(num, printCoordinate(num, sizeof(num), xy[(i - bgn) * 2 + k]));
+    }
+    buf += '\n';
+    if (buf.size() >= kInstLocsBufferSize) {
+      ofs.write(buf.data(), buf.size());
+      buf.clear();
+    }
+  }
+  ofs.write(buf.data(), buf.size());
+  ofs.close();
+  return !ofs.fail();
+}
+
+bool PlaceDB::readInstLocs(std::string const &pl_file, double *xy) const {
+  std::ifstream ifs(pl_file.c_str(), std::ios::binary);
+  if (!ifs.good()) {
+    openparfPrint(kError, "failed to open file %s for read\n", pl_file.c_str());
+    return false;
+  }
+
+  // parse one line terminated by '\0', return false on failure
+  auto parse_line = [&](char *line) {
+    char *name = line;
+    while (std::isspace(static_cast<unsigned char>(*name))) {
+      ++name;
+    }
+    if (*name == '\0') {
+      return true;
+    }
+    char *name_end = name;
+    while (*name_end != '\0' && !std::isspace(static_cast<unsigned char>(*name_end))) {
+      ++name_end;
+    }
+    auto found = name_to_inst.find(std::string(name, name_end));
+    if (found == name_to_inst.end()) {
+      openparfPrint(kError, "unknown instance %s in %s\n", std::string(name, name_end).c_str(), pl_file.c_str());
+      return false;
+    }
+    char  *x_end, *y_end;
+    double x = std::strtod(name_end, &x_end);
+    double y = std::strtod(x_end, &y_end);
+    if (x_end == name_end || y_end == x_end) {
+      openparfPrint(kError, "invalid location of instance %s in %s\n", std::string(name, name_end).c_str(),
+              pl_file.c_str());
+      return false;
+    }
+    xy[found->second * 2]     = x;
+    xy[found->second * 2 + 1] = y;
+    return true;
+  };
+
+  // complete lines are parsed chunk by chunk, an incomplete line is kept for the next chunk
+  std::string buf;
+  std::size_t size = 0;
+  while (true) {
+    buf.resize(size + kInstLocsBufferSize);
+    ifs.read(&buf[size], kInstLocsBufferSize);
+    size += ifs.gcount();
+    bool eof = (ifs.gcount() == 0);
+    if (eof) {
+      // the last line may not end with a newline
+      buf.resize(size);
+      buf += '\n';
+      size = buf.size();
+    }
+    std::size_t line_bgn = 0;
+    for (std::size_t i = 0; i < size; ++i) {
+      if (buf[i] == '\n') {
+        buf[i] = '\0';
+        if (!parse_line(&buf[line_bgn])) {
+          return false;
+        }
+        line_bgn = i + 1;
+      }
+    }
+    if (eof) {
+      break;
+    }
+    buf.erase(0, line_bgn);
+    size -= line_bgn;
+  }
+  return true;
+}
+
 bool PlaceDB::writeMacroBookshelfPl(std::string const &pl_file) const {
   return db_->writeMacroBookshelfPl(pl_file);
 }
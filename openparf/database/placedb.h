@@ -722,6 +722,16 @@ class PlaceDB {
   /// @brief write bookshelf .pl file
   bool                                                     writeBookshelfPl(std::string const &pl_file) const;
 
+  /// @brief write "name x y" lines of instances [bgn, end) with floating point locations,
+  /// streamed through a bounded buffer
+  /// @param xy (x, y) of instances [bgn, end), 2 values per instance
+  bool writeInstLocs(std::string const &pl_file, double const *xy, IndexType bgn, IndexType end) const;
+
+  /// @brief read "name x y" lines written by writeInstLocs, streamed through a bounded buffer
+  /// @param xy (x, y) of all instances in new instance ids, 2 values per instance;
+  /// only the instances listed in the file are updated
+  bool readInstLocs(std::string const &pl_file, double *xy) const;
+
   /// brief wirte bookshelf .pl file for macros, specialized for MLCAD 2023 FPGA macro placement contest
   bool                                                     writeMacroBookshelfPl(std::string const &pl_file) const;
 
@@ -115,6 +115,7 @@ class Region : public Object {
   /// @brief move object
   void                   move(Region &&rhs) noexcept;
 
+  friend class Snapshot;
   /// @brief overload output stream
   friend std::ostream   &operator<<(std::ostream &os, Region const &rhs);
 
@@ -222,6 +223,7 @@ class RegionConstraint : public Object {
   /// @brief move object
   void                 move(RegionConstraint &&rhs) noexcept;
 
+  friend class Snapshot;
   /// @brief overload output stream
   friend std::ostream &operator<<(std::ostream &os, RegionConstraint const &rhs);
 
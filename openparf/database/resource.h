@@ -72,6 +72,7 @@ class Resource : public Object {
   void copy(Resource const &rhs);
   /// @brief move object
   void move(Resource &&rhs);
+  friend class Snapshot;
   /// @brief overload output stream
   friend std::ostream &operator<<(std::ostream &os, Resource const &rhs);
 
@@ -176,6 +177,7 @@ class ResourceMap : public Object {
   void copy(ResourceMap const &rhs);
   /// @brief move object
   void move(ResourceMap &&rhs);
+  friend class Snapshot;
   /// @brief overload output stream
   friend std::ostream &operator<<(std::ostream &os, ResourceMap const &rhs);
 
@@ -50,6 +50,7 @@ class ShapeElement : public Object {
   void             setOffset(PointType const &o) { offset_ = o; }
 
  protected:
+  friend class Snapshot;
   /// @brief overload output stream
   friend std::ostream &operator<<(std::ostream &os, ShapeElement const &rhs);
 
@@ -130,6 +131,7 @@ class ShapeModel : public Object {
   void                      copy(ShapeModel const &rhs);
   /// @brief move object
   void                      move(ShapeModel &&rhs);
+  friend class Snapshot;
   /// @brief overload output stream
   friend std::ostream      &operator<<(std::ostream &os, ShapeModel const &rhs);
 
@@ -206,6 +208,7 @@ class Shape : public Object {
   void                   copy(Shape const &rhs);
   /// @brief move object
   void                   move(Shape &&rhs);
+  friend class Snapshot;
   /// @brief overload output stream
   friend std::ostream   &operator<<(std::ostream &os, Shape const &rhs);
 
@@ -311,6 +314,7 @@ class ShapeConstraint : public Object {
   /// @brief move object
   void                          move(ShapeConstraint &&rhs);
 
+  friend class Snapshot;
   /// @brief overload output stream
   friend std::ostream          &operator<<(std::ostream &os, ShapeConstraint const &rhs);
 
@@ -124,6 +124,7 @@ class Site : public Object {
   void                 copy(Site const &rhs);
   /// @brief move object
   void                 move(Site &&rhs);
+  friend class Snapshot;
   /// @brief overload output stream
   friend std::ostream &operator<<(std::ostream &os, Site const &rhs);
 
@@ -327,6 +328,7 @@ class SiteMap : public Object {
   void                   copy(SiteMap const &rhs);
   /// @brief move object
   void                   move(SiteMap &&rhs);
+  friend class Snapshot;
   /// @brief overload output stream
   friend std::ostream &  operator<<(std::ostream &os, SiteMap const &rhs);
 
@@ -97,6 +97,7 @@ class SiteType : public Object {
   void copy(SiteType const &rhs);
   /// @brief move object
   void move(SiteType &&rhs);
+  friend class Snapshot;
   /// @brief overload output stream
   friend std::ostream &operator<<(std::ostream &os, SiteType const &rhs);
 
@@ -187,6 +188,7 @@ class SiteTypeMap : public Object {
   void copy(SiteTypeMap const &rhs);
   /// @brief move object
   void move(SiteTypeMap &&rhs);
+  friend class Snapshot;
   /// @brief overload output stream
   friend std::ostream &operator<<(std::ostream &os, SiteTypeMap const &rhs);
 
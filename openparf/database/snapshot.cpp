@@ -0,0 +1,578 @@
+/**
+ * @file   snapshot.cpp
+ * @brief  Binary snapshot of the database.
+ *
+ * A snapshot is a flat little-endian dump of all members of the database,
+ * written in declaration order. Containers are written as a 64-bit size
+ * followed by the elements; vectors of arithmetic or enum types are copied
+ * in bulk. Reading maps the file into memory and copies the members out of
+ * the mapping, which is much faster than running the benchmark parsers.
+ */
+
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+
+#include <array>
+#include <cstdint>
+#include <cstring>
+#include <fstream>
+#include <stdexcept>
+#include <string>
+#include <type_traits>
+#include <unordered_map>
+#include <unordered_set>
+#include <vector>
+
+#include "database/database.h"
+
+OPENPARF_BEGIN_NAMESPACE
+
+namespace database {
+
+namespace {
+
+constexpr char     kSnapshotMagic[8] = {'O', 'P', 'F', 'D', 'B', 'S', 'N', 'P'};
+/// bump the version whenever a member is added to or removed from the database
+constexpr uint32_t kSnapshotVersion  = 1;
+
+/// @brief Archive writing to an output stream
+class SnapshotWriter {
+ public:
+  static constexpr bool kLoading = false;
+
+  explicit SnapshotWriter(std::ostream &os) : os_(os) {}
+
+  void bytes(void *data, std::size_t n) { os_.write(static_cast<char const *>(data), n); }
+
+ private:
+  std::ostream &os_;
+};
+
+/// @brief Archive reading from a memory buffer
+class SnapshotReader {
+ public:
+  static constexpr bool kLoading = true;
+
+  SnapshotReader(char const *begin, char const *end) : cur_(begin), end_(end) {}
+
+  void bytes(void *data, std::size_t n) {
+    if (n > static_cast<std::size_t>(end_ - cur_)) {
+      throw std::runtime_error("unexpected end of snapshot");
+    }
+    std::memcpy(data, cur_, n);
+    cur_ += n;
+  }
+
+  bool eof() const { return cur_ == end_; }
+
+ private:
+  char const *cur_;
+  char const *end_;
+};
+
+/// @brief Read-only memory mapping of a file
+class MappedFile {
+ public:
+  explicit MappedFile(std::string const &filename) {
+    fd_ = open(filename.c_str(), O_RDONLY);
+    if (fd_ < 0) {
+      return;
+    }
+    struct stat st;
+    if (fstat(fd_, &st) == 0 && st.st_size > 0) {
+      size_ = st.st_size;
+      data_ = mmap(nullptr, size_, PROT_READ, MAP_PRIVATE, fd_, 0);
+      if (data_ == MAP_FAILED) {
+        data_ = nullptr;
+      } else {
+        madvise(data_, size_, MADV_SEQUENTIAL);
+      }
+    }
+  }
+
+  ~MappedFile() {
+    if (data_) {
+      munmap(data_, size_);
+    }
+    if (fd_ >= 0) {
+      close(fd_);
+    }
+  }
+
+  bool        good() const { return data_ != nullptr; }
+  char const *begin() const { return static_cast<char const *>(data_); }
+  char const *end() const { return begin() + size_; }
+
+ private:
+  int         fd_   = -1;
+  void       *data_ = nullptr;
+  std::size_t size_ = 0;
+};
+
+}   // namespace
+
+/// @brief Visit all members of the database with an archive.
+/// The same functions serve for both writing and reading,
+/// so the two can never go out of sync.
+class Snapshot {
+ public:
+  using IndexType = Object::IndexType;
+
+  template<class Archive, class T>
+  static typename std::enable_if<std::is_arithmetic<T>::value || std::is_enum<T>::value>::type io(Archive &ar, T &v) {
+    ar.bytes(&v, sizeof(T));
+  }
+
+  /// @brief also covers geometry::Point, Size and Box
+  template<class Archive, class T, std::size_t N>
+  static void io(Archive &ar, std::array<T, N> &v) {
+    ar.bytes(v.data(), sizeof(T) * N);
+  }
+
+  template<class Archive>
+  static std::size_t size(Archive &ar, std::size_t n) {
+    uint64_t v = n;
+    io(ar, v);
+    return v;
+  }
+
+  template<class Archive>
+  static void io(Archive &ar, std::string &v) {
+    auto n = size(ar, v.size());
+    if (Archive::kLoading) {
+      v.resize(n);
+    }
+    ar.bytes(&v[0], n);
+  }
+
+  template<class Archive, class T>
+  static void io(Archive &ar, std::vector<T> &v) {
+    auto n = size(ar, v.size());
+    if (Archive::kLoading) {
+      v.resize(n);
+    }
+    ioElements(ar, v.data(), n, std::integral_constant<bool, std::is_arithmetic<T>::value || std::is_enum<T>::value>());
+  }
+
+  template<class Archive, class T>
+  static void ioElements(Archive &ar, T *data, std::size_t n, std::true_type) {
+    ar.bytes(data, sizeof(T) * n);
+  }
+
+  template<class Archive, class T>
+  static void ioElements(Archive &ar, T *data, std::size_t n, std::false_type) {
+    for (std::size_t i = 0; i < n; ++i) {
+      io(ar, data[i]);
+    }
+  }
+
+  template<class Archive, class K, class V>
+  static void io(Archive &ar, std::unordered_map<K, V> &m) {
+    auto n = size(ar, m.size());
+    if (Archive::kLoading) {
+      m.clear();
+      m.reserve(n);
+      for (std::size_t i = 0; i < n; ++i) {
+        std::pair<K, V> kv;
+        io(ar, kv.first);
+        io(ar, kv.second);
+        m.emplace(std::move(kv));
+      }
+    } else {
+      for (auto &kv : m) {
+        // the writer never modifies the key
+        io(ar, const_cast<K &>(kv.first));
+        io(ar, kv.second);
+      }
+    }
+  }
+
+  template<class Archive, class K>
+  static void io(Archive &ar, std::unordered_set<K> &s) {
+    auto n = size(ar, s.size());
+    if (Archive::kLoading) {
+      s.clear();
+      s.reserve(n);
+      for (std::size_t i = 0; i < n; ++i) {
+        K key;
+        io(ar, key);
+        s.insert(std::move(key));
+      }
+    } else {
+      for (auto const &key : s) {
+        io(ar, const_cast<K &>(key));
+      }
+    }
+  }
+
+  template<class Archive, class T>
+  static void io(Archive &ar, boost::optional<T> &v) {
+    bool has_value = static_cast<bool>(v);
+    io(ar, has_value);
+    if (Archive::kLoading) {
+      v.reset();
+      if (has_value) {
+        v.emplace();
+      }
+    }
+    if (has_value) {
+      io(ar, *v);
+    }
+  }
+
+  template<class Archive>
+  static void io(Archive &ar, Object &v) {
+    io(ar, v.id_);
+  }
+
+  template<class Archive, class T>
+  static void io(Archive &ar, ObjectMap<T> &v) {
+    io(ar, v.vec_);
+    io(ar, v.map_);
+  }
+
+  template<class Archive, class T>
+  static void io(Archive &ar, AttrObject<T> &v) {
+    io(ar, static_cast<Object &>(v));
+    io(ar, *v.attr_);
+  }
+
+  template<class Archive, class InstType, class NetType, class PinType>
+  static void io(Archive &ar, Netlist<InstType, NetType, PinType> &v) {
+    io(ar, static_cast<Object &>(v));
+    io(ar, v.insts_);
+    io(ar, v.nets_);
+    io(ar, v.pins_);
+  }
+
+  template<class Archive, class T>
+  static void io(Archive &ar, LayoutMap2D<T> &v) {
+    io(ar, static_cast<Object &>(v));
+    IndexType width  = v.width();
+    IndexType height = v.height();
+    io(ar, width);
+    io(ar, height);
+    if (Archive::kLoading) {
+      v.reshape(width, height);
+    }
+    for (auto &element : v) {
+      io(ar, element);
+    }
+  }
+
+  template<class Archive>
+  static void io(Archive &ar, InstAttr &v) {
+    io(ar, static_cast<Object &>(v));
+    io(ar, v.model_id_);
+    io(ar, v.place_status_);
+    io(ar, v.loc_);
+    io(ar, v.name_);
+  }
+
+  template<class Archive>
+  static void io(Archive &ar, NetAttr &v) {
+    io(ar, static_cast<Object &>(v));
+    io(ar, v.weight_);
+    io(ar, v.name_);
+  }
+
+  template<class Archive>
+  static void io(Archive &ar, PinAttr &v) {
+    io(ar, static_cast<Object &>(v));
+    io(ar, v.signal_direct_);
+  }
+
+  template<class Archive>
+  static void io(Archive &ar, Inst &v) {
+    io(ar, static_cast<Inst::BaseType &>(v));
+    io(ar, v.pin_ids_);
+  }
+
+  template<class Archive>
+  static void io(Archive &ar, Net &v) {
+    io(ar, static_cast<Net::BaseType &>(v));
+    io(ar, v.pin_ids_);
+  }
+
+  template<class Archive>
+  static void io(Archive &ar, Pin &v) {
+    io(ar, static_cast<Pin::BaseType &>(v));
+    io(ar, v.model_pin_id_);
+    io(ar, v.inst_id_);
+    io(ar, v.net_id_);
+  }
+
+  template<class Archive>
+  static void io(Archive &ar, ModelPin &v) {
+    io(ar, static_cast<Object &>(v));
+    io(ar, v.name_);
+    io(ar, v.offset_);
+    io(ar, v.signal_direct_);
+    io(ar, v.signal_type_);
+  }
+
+  template<class Archive>
+  static void io(Archive &ar, Model &v) {
+    io(ar, static_cast<Object &>(v));
+    io(ar, v.model_type_);
+    io(ar, v.size_);
+    io(ar, v.name_);
+    io(ar, v.model_pins_);
+    io(ar, v.model_pin_name2id_map_);
+    io(ar, v.netlist_);
+    io(ar, v.net_to_model_pin_);
+    io(ar, v.model_pin_to_net_);
+    io(ar, v.inst_name2id_map_);
+    io(ar, v.net_name2id_map_);
+  }
+
+  /// @brief the reference to the parent netlist is bound on construction
+  template<class Archive>
+  static void io(Archive &ar, ModuleInstNetlist &v) {
+    io(ar, v.inst_ids_);
+    io(ar, v.net_ids_);
+    io(ar, v.pin_ids_);
+  }
+
+  template<class Archive>
+  static void io(Archive &ar, ModuleInst &v) {
+    io(ar, static_cast<Inst &>(v));
+    io(ar, v.netlist_);
+  }
+
+  template<class Archive>
+  static void io(Archive &ar, Design &v) {
+    io(ar, static_cast<Object &>(v));
+    io(ar, v.models_);
+    io(ar, v.model_name2id_map_);
+    io(ar, v.netlist_);
+    io(ar, v.vddvss_net_id_);
+    // module instances observe the flat netlist and cannot be default constructed
+    bool has_module_insts = static_cast<bool>(v.module_insts_);
+    io(ar, has_module_insts);
+    if (Archive::kLoading) {
+      v.module_insts_.reset();
+    }
+    if (has_module_insts) {
+      if (Archive::kLoading) {
+        openparfAssertMsg(v.netlist_, "module instances require the flat netlist");
+        v.module_insts_.emplace();
+      }
+      auto &module_insts = *v.module_insts_;
+      auto  n            = size(ar, module_insts.size());
+      if (Archive::kLoading) {
+        module_insts.reserve(n);
+        for (std::size_t i = 0; i < n; ++i) {
+          module_insts.emplace_back(*v.netlist_);
+        }
+      }
+      for (auto &module_inst : module_insts) {
+        io(ar, module_inst);
+      }
+    }
+    io(ar, v.top_module_inst_);
+  }
+
+  template<class Archive>
+  static void io(Archive &ar, Site &v) {
+    io(ar, static_cast<Object &>(v));
+    io(ar, v.site_map_id_);
+    io(ar, v.bbox_);
+    io(ar, v.clock_region_id_);
+    io(ar, v.half_column_region_id_);
+    io(ar, v.site_type_id_);
+  }
+
+  template<class Archive>
+  static void io(Archive &ar, SiteMap &v) {
+    io(ar, static_cast<Object &>(v));
+    io(ar, v.dims_);
+    io(ar, v.index_map_);
+    io(ar, v.sites_);
+  }
+
+  template<class Archive>
+  static void io(Archive &ar, ClockRegion &v) {
+    io(ar, static_cast<Object &>(v));
+    io(ar, v.name_);
+    io(ar, v.bbox_);
+    io(ar, v.hc_xmin_);
+    io(ar, v.hc_xmax_);
+    io(ar, v.half_column_region_ids_);
+    io(ar, v.num_sites_);
+  }
+
+  template<class Archive>
+  static void io(Archive &ar, HalfColumnRegion &v) {
+    io(ar, static_cast<Object &>(v));
+    io(ar, v.clock_region_id_);
+    io(ar, v.bbox_);
+  }
+
+  template<class Archive>
+  static void io(Archive &ar, SiteType &v) {
+    io(ar, static_cast<Object &>(v));
+    io(ar, v.name_);
+    io(ar, v.resource_capacity_);
+  }
+
+  template<class Archive>
+  static void io(Archive &ar, SiteTypeMap &v) {
+    io(ar, static_cast<Object &>(v));
+    io(ar, v.site_types_);
+    io(ar, v.site_type_name2id_map_);
+  }
+
+  template<class Archive>
+  static void io(Archive &ar, Resource &v) {
+    io(ar, static_cast<Object &>(v));
+    io(ar, v.name_);
+    io(ar, v.model_ids_);
+  }
+
+  template<class Archive>
+  static void io(Archive &ar, ResourceMap &v) {
+    io(ar, static_cast<Object &>(v));
+    io(ar, v.resources_);
+    io(ar, v.resource_name2id_map_);
+    io(ar, v.model2resource_ids_);
+  }
+
+  template<class Archive>
+  static void io(Archive &ar, Layout &v) {
+    io(ar, static_cast<Object &>(v));
+    io(ar, v.site_map_);
+    io(ar, static_cast<LayoutMap2D<ClockRegion> &>(v.clock_region_map_));
+    io(ar, v.half_column_regions_);
+    io(ar, v.site_type_map_);
+    io(ar, v.resource_map_);
+    io(ar, v.num_sites_);
+  }
+
+  template<class Archive>
+  static void io(Archive &ar, ShapeElement &v) {
+    io(ar, static_cast<Object &>(v));
+    io(ar, v.model_id_);
+    io(ar, v.offset_);
+  }
+
+  template<class Archive>
+  static void io(Archive &ar, ShapeModel &v) {
+    io(ar, static_cast<Object &>(v));
+    io(ar, v.type_);
+    io(ar, v.name_);
+    io(ar, v.elements_);
+  }
+
+  template<class Archive>
+  static void io(Archive &ar, Shape &v) {
+    io(ar, static_cast<Object &>(v));
+    io(ar, v.shape_model_id_);
+    io(ar, v.name_);
+    io(ar, v.inst_ids_);
+  }
+
+  template<class Archive>
+  static void io(Archive &ar, ShapeConstraint &v) {
+    io(ar, static_cast<Object &>(v));
+    io(ar, v.shape_models_);
+    io(ar, v.shapes_);
+    io(ar, v.inst_shape_ids_set_);
+  }
+
+  template<class Archive>
+  static void io(Archive &ar, Region &v) {
+    io(ar, static_cast<Object &>(v));
+    io(ar, v.name_);
+    io(ar, v.bbox_);
+    io(ar, v.inst_ids_);
+  }
+
+  template<class Archive>
+  static void io(Archive &ar, RegionConstraint &v) {
+    io(ar, static_cast<Object &>(v));
+    io(ar, v.region_list_);
+    io(ar, v.inst_id2region_id_);
+  }
+
+  template<class Archive>
+  static void io(Archive &ar, Database &v) {
+    io(ar, static_cast<Object &>(v));
+    io(ar, v.design_);
+    io(ar, v.layout_);
+    io(ar, v.shape_constraint_);
+    io(ar, v.region_constraint_);
+    io(ar, static_cast<Object &>(v.params_));
+    io(ar, v.params_.arch_half_column_region_width_);
+    io(ar, v.inst_macro_ids_);
+  }
+
+  /// @brief header to reject snapshots of another version or build
+  template<class Archive>
+  static bool header(Archive &ar) {
+    std::array<char, sizeof(kSnapshotMagic)> magic;
+    std::memcpy(magic.data(), kSnapshotMagic, magic.size());
+    uint32_t version         = kSnapshotVersion;
+    uint32_t index_bytes     = sizeof(IndexType);
+    uint32_t coordinate_bytes = sizeof(Object::CoordinateType);
+    io(ar, magic);
+    io(ar, version);
+    io(ar, index_bytes);
+    io(ar, coordinate_bytes);
+    return std::memcmp(magic.data(), kSnapshotMagic, magic.size()) == 0 && version == kSnapshotVersion &&
+           index_bytes == sizeof(IndexType) && coordinate_bytes == sizeof(Object::CoordinateType);
+  }
+};
+
+bool Database::writeSnapshot(std::string const &filename) const {
+  openparfPrint(kInfo, "write database snapshot to %s\n", filename.c_str());
+  std::vector<char> buffer(1 << 22);
+  std::ofstream     ofs;
+  ofs.rdbuf()->pubsetbuf(buffer.data(), buffer.size());
+  ofs.open(filename.c_str(), std::ios::out | std::ios::binary | std::ios::trunc);
+  if (!ofs.good()) {
+    openparfPrint(kError, "failed to open file %s for write\n", filename.c_str());
+    return false;
+  }
+  SnapshotWriter ar(ofs);
+  Snapshot::header(ar);
+  // the writer only reads the members
+  Snapshot::io(ar, const_cast<Database &>(*this));
+  ofs.close();
+  if (ofs.fail()) {
+    openparfPrint(kError, "failed to write database snapshot %s\n", filename.c_str());
+    return false;
+  }
+  return true;
+}
+
+bool Database::readSnapshot(std::string const &filename) {
+  MappedFile file(filename);
+  if (!file.good()) {
+    openparfPrint(kWarn, "cannot map database snapshot %s\n", filename.c_str());
+    return false;
+  }
+  openparfPrint(kInfo, "read database snapshot %s\n", filename.c_str());
+  SnapshotReader ar(file.begin(), file.end());
+  try {
+    if (!Snapshot::header(ar)) {
+      openparfPrint(kWarn, "database snapshot %s is written by an incompatible version\n", filename.c_str());
+      return false;
+    }
+    Snapshot::io(ar, *this);
+  } catch (std::exception const &e) {
+    openparfPrint(kWarn, "corrupted database snapshot %s: %s\n", filename.c_str(), e.what());
+    return false;
+  }
+  if (!ar.eof()) {
+    openparfPrint(kWarn, "corrupted database snapshot %s: trailing bytes\n", filename.c_str());
+    return false;
+  }
+  return true;
+}
+
+}   // namespace database
+
+OPENPARF_END_NAMESPACE
@@ -14,6 +14,7 @@ import os
 from . import openparf as of
 from .placement import placer
 from openparf import configure
+from openparf.py_utils import db_cache
 
 if configure.compile_configurations["ENABLE_ROUTER"] == "ON":
     from .routing import router
@@ -23,12 +24,8 @@ import os.path as osp
 logger = logging.getLogger(__name__)
 
 
-def place(params, pl_path):
-    tt = time.time()
-
-    torch.set_num_threads(params.num_threads)
-
-    db = of.database.Database(0)
+def read_benchmark(db, params):
+    """Parse the benchmark described by `params` into an empty database"""
     if params.benchmark_format == "bookshelf":
         db.readBookshelf(params.aux_input)
     elif params.benchmark_format == "xarch":
@@ -49,6 +46,28 @@ def place(params, pl_path):
         raise RuntimeError(
             "Unknown benchmark format: {}".format(params.benchmark_format)
         )
+
+
+def build_placedb(params):
+    """Read the benchmark described by `params` and build the placement database.
+
+    :param params: placement parameters
+    :return: the raw database and the placement database. PlaceDB only observes
+        the raw database, so the caller must keep both alive.
+    """
+    tt = time.time()
+
+    db = None
+    cache_file = db_cache.cache_filename(params) if params.db_cache_dir else None
+    if cache_file and osp.exists(cache_file):
+        db = of.database.Database(0)
+        if not db.readSnapshot(cache_file):
+            db = None
+    if db is None:
+        db = of.database.Database(0)
+        read_benchmark(db, params)
+        if cache_file:
+            db_cache.write(db, cache_file)
     logger.info("read benchmark takes %.3f seconds" % (time.time() - tt))
 
     # extract information from params
@@ -171,16 +190,38 @@ def place(params, pl_path):
         content += "\n"
     logging.info(content[:-1])
 
+    placedb = of.database.PlaceDB(db, place_params)
+    logger.info("build placement database takes %.3f seconds" % (time.time() - tt))
+    return db, placedb
+
+
+def place(params, pl_path):
+    """Place the benchmark described by `params` and write the solution to `pl_path`.
+
+    :return: the placer, which holds the final solution
+    """
+    tt = time.time()
+
+    torch.set_num_threads(params.num_threads)
+
+    db, placedb = build_placedb(params)
+
     os.makedirs(params.plot_dir, exist_ok=True)
 
-    placedb = of.database.PlaceDB(db, place_params)
     place_engine = placer.Placer(params, placedb)
     place_engine()
     if params.macro_place_flag:
         place_engine.writeMacro(pl_path)
     else:
         place_engine.write(pl_path)
+    place_engine.write_trace()
+    if place_engine.op_cls.workspace.enabled:
+        logging.info(
+            "workspace of the placement operators\n%s"
+            % place_engine.op_cls.workspace.summary()
+        )
     logging.info("placement takes %.3f seconds" % (time.time() - tt))
+    return place_engine
 
 
 def route(params, pl_path):
@@ -27,7 +27,8 @@ class Congestion_prediction(nn.Module):
                  pinDirects,
                  initial_horizontal_utilization_map=None,
                  initial_vertical_utilization_map=None,
-                 initial_pin_density_map=None):
+                 initial_pin_density_map=None,
+                 workspace=None):
         super(Congestion_prediction, self).__init__()
 
         self.netpin_start = netpin_start
@@ -47,15 +48,22 @@ class Congestion_prediction(nn.Module):
         self.initial_horizontal_utilization_map = initial_horizontal_utilization_map
         self.initial_vertical_utilization_map = initial_vertical_utilization_map
         self.initial_pin_density_map = initial_pin_density_map
+        self.workspace = workspace
 
 
     def forward(self,pin_pos):
         #computing eigenvalue
-        horizontal_utilization_map = torch.zeros((self.num_bins_x, self.num_bins_y),
-                                                 dtype=pin_pos.dtype,
-                                                 device=pin_pos.device)
-        vertical_utilization_map = torch.zeros_like(horizontal_utilization_map)
-        pin_density_map=torch.zeros_like(horizontal_utilization_map)
+        if self.workspace is not None:
+            horizontal_utilization_map, vertical_utilization_map, pin_density_map = [
+                self.workspace.get("congestion_prediction.%s" % name, (self.num_bins_x, self.num_bins_y),
+                                   pin_pos.dtype, pin_pos.device, zero_flag=True)
+                for name in ["horizontal_utilization_map", "vertical_utilization_map", "pin_density_map"]]
+        else:
+            horizontal_utilization_map = torch.zeros((self.num_bins_x, self.num_bins_y),
+                                                     dtype=pin_pos.dtype,
+                                                     device=pin_pos.device)
+            vertical_utilization_map = torch.zeros_like(horizontal_utilization_map)
+            pin_density_map=torch.zeros_like(horizontal_utilization_map)
 
         function1 = congestion_prediction_cuda.forward if pin_pos.is_cuda else congestion_prediction_cpp.forward
         function1(pin_pos, self.netpin_start, self.flat_netpin,
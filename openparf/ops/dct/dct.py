@@ -2,9 +2,12 @@
 # @file   dct.py (originally dct2_fft2.py)
 # @author Zixuan Jiang, Jiaqi Gu, modified by Yibo Lin
 # @date   Jun 2018
-# @brief  Implement 2d dct, 2d idct, idxst(idct(x)), idct(idxst(x)) based on 2d fft
+# @brief  Implement 2d dct, 2d idct, idxst(idct(x)), idct(idxst(x)) based on 2d fft,
+#         or on matrix products with cached transform bases
 #
 
+from collections import OrderedDict
+
 import numpy as np
 import torch
 from torch.autograd import Function
@@ -18,6 +21,88 @@ if configure.compile_configurations["CUDA_FOUND"] == "TRUE":
     from . import dct2_fft2_cuda
 
 
+# twiddle factors, transform bases and scratch buffers shared by all the transforms,
+# keyed by the transform size, dtype and device, the least recently used evicted first
+_cache = OrderedDict()
+
+# maximum number of cached entries, enough for the maps of all the area types of a design
+CACHE_MAX_ENTRIES = 256
+
+# largest M * N * (M + N) for which the auto backend chooses matrix products
+MATMUL_MAX_COST = 1 << 28
+
+
+def _cached(key, create):
+    value = _cache.get(key)
+    if value is None:
+        value = create()
+        _cache[key] = value
+        if len(_cache) > CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
+    else:
+        _cache.move_to_end(key)
+    return value
+
+
+def clearCache():
+    """Release the cached twiddle factors, bases and buffers"""
+    _cache.clear()
+
+
+def getCachedExpk(N, dtype, device):
+    """exp(-j*pi*u/(2N)) of size N, computed once per (N, dtype, device)"""
+    return _cached(("expk", N, dtype, device),
+                   lambda: precomputeExpk(N, dtype=dtype, device=device))
+
+
+def getCachedBasis(kind, N, dtype, device):
+    """Transform basis B of size N such that a 2d transform of an MxN map x is B_M x B_N^T.
+
+    @param kind "dct" for 2/N cos(pi*(2i+1)*u/(2N)) indexed by [u, i],
+        "idct" for cos(pi*(2i+1)*u/(2N)) indexed by [i, u], doubled except for u = 0,
+        "idxst" for 2 sin(pi*(2i+1)*u/(2N)) indexed by [i, u]
+    """
+    def create():
+        # build in double precision, then cast
+        i = torch.arange(N, dtype=torch.float64, device=device).view([N, 1])
+        u = torch.arange(N, dtype=torch.float64, device=device).view([1, N])
+        angles = (2 * i + 1).mul(u).mul_(np.pi / (2 * N))
+        if kind == "dct":
+            basis = angles.cos_().mul_(2.0 / N).t()
+        elif kind == "idct":
+            basis = angles.cos_().mul_(2)
+            basis[:, 0] = 1
+        elif kind == "idxst":
+            basis = angles.sin_().mul_(2)
+        else:
+            assert 0, "unknown transform basis %s" % (kind)
+        return basis.to(dtype).contiguous()
+
+    return _cached(("basis", kind, N, dtype, device), create)
+
+
+def getCachedBuffer(size, dtype, device):
+    """Scratch buffer shared by all the transforms of the same size.
+    Its content is only valid within a single transform.
+    """
+    return _cached(("buf", tuple(size), dtype, device),
+                   lambda: torch.empty(size, dtype=dtype, device=device))
+
+
+def selectBackend(backend, M, N):
+    """Resolve "auto" to "fft" or "matmul" for MxN maps.
+    FFT is kept for power-of-two sizes and for large maps;
+    the other sizes use matrix products, which run with the multithreaded BLAS
+    and do not depend on the factorization of M and N.
+    """
+    if backend != "auto":
+        return backend
+    power_of_two = (M & (M - 1)) == 0 and (N & (N - 1)) == 0
+    if power_of_two or M * N * (M + N) > MATMUL_MAX_COST:
+        return "fft"
+    return "matmul"
+
+
 class Dct2Function(Function):
     @staticmethod
     def forward(ctx, x, expkM, expkN, out, buf):
@@ -28,36 +113,6 @@ class Dct2Function(Function):
         return out
 
 
-class Dct2(nn.Module):
-    def __init__(self, expkM=None, expkN=None):
-        super(Dct2, self).__init__()
-
-        self.expkM = expkM
-        self.expkN = expkN
-        self.out = None
-        self.buf = None
-
-    def forward(self, x):
-        M = x.size(-2)
-        N = x.size(-1)
-        if self.expkM is None or self.expkM.size(
-                -2) != M or self.expkM.dtype != x.dtype:
-            self.expkM = precomputeExpk(M, dtype=x.dtype, device=x.device)
-        if self.expkN is None or self.expkN.size(
-                -2) != N or self.expkN.dtype != x.dtype:
-            self.expkN = precomputeExpk(N, dtype=x.dtype, device=x.device)
-        if self.out is None:
-            self.out = torch.empty(M, N, dtype=x.dtype, device=x.device)
-            self.buf = torch.empty(M,
-                                   N // 2 + 1,
-                                   2,
-                                   dtype=x.dtype,
-                                   device=x.device)
-
-        return Dct2Function.apply(x, self.expkM, self.expkN, self.out,
-                                  self.buf)
-
-
 class Idct2Function(Function):
     @staticmethod
     def forward(ctx, x, expkM, expkN, out, buf):
@@ -68,36 +123,6 @@ class Idct2Function(Function):
         return out
 
 
-class Idct2(nn.Module):
-    def __init__(self, expkM=None, expkN=None):
-        super(Idct2, self).__init__()
-
-        self.expkM = expkM
-        self.expkN = expkN
-        self.out = None
-        self.buf = None
-
-    def forward(self, x):
-        M = x.size(-2)
-        N = x.size(-1)
-        if self.expkM is None or self.expkM.size(
-                -2) != M or self.expkM.dtype != x.dtype:
-            self.expkM = precomputeExpk(M, dtype=x.dtype, device=x.device)
-        if self.expkN is None or self.expkN.size(
-                -2) != N or self.expkN.dtype != x.dtype:
-            self.expkN = precomputeExpk(N, dtype=x.dtype, device=x.device)
-        if self.out is None:
-            self.out = torch.empty(M, N, dtype=x.dtype, device=x.device)
-            self.buf = torch.empty(M,
-                                   N // 2 + 1,
-                                   2,
-                                   dtype=x.dtype,
-                                   device=x.device)
-
-        return Idct2Function.apply(x, self.expkM, self.expkN, self.out,
-                                   self.buf)
-
-
 class IdctIdxstFunction(Function):
     @staticmethod
     def forward(ctx, x, expkM, expkN, out, buf):
@@ -108,36 +133,6 @@ class IdctIdxstFunction(Function):
         return out
 
 
-class IdctIdxst(nn.Module):
-    def __init__(self, expkM=None, expkN=None):
-        super(IdctIdxst, self).__init__()
-
-        self.expkM = expkM
-        self.expkN = expkN
-        self.out = None
-        self.buf = None
-
-    def forward(self, x):
-        M = x.size(-2)
-        N = x.size(-1)
-        if self.expkM is None or self.expkM.size(
-                -2) != M or self.expkM.dtype != x.dtype:
-            self.expkM = precomputeExpk(M, dtype=x.dtype, device=x.device)
-        if self.expkN is None or self.expkN.size(
-                -2) != N or self.expkN.dtype != x.dtype:
-            self.expkN = precomputeExpk(N, dtype=x.dtype, device=x.device)
-        if self.out is None:
-            self.out = torch.empty(M, N, dtype=x.dtype, device=x.device)
-            self.buf = torch.empty(M,
-                                   N // 2 + 1,
-                                   2,
-                                   dtype=x.dtype,
-                                   device=x.device)
-
-        return IdctIdxstFunction.apply(x, self.expkM, self.expkN, self.out,
-                                       self.buf)
-
-
 class IdxstIdctFunction(Function):
     @staticmethod
     def forward(ctx, x, expkM, expkN, out, buf):
@@ -148,31 +143,78 @@ class IdxstIdctFunction(Function):
         return out
 
 
-class IdxstIdct(nn.Module):
-    def __init__(self, expkM=None, expkN=None):
-        super(IdxstIdct, self).__init__()
+class SpectralTransform(nn.Module):
+    """Common part of the 2d transforms.
+    Each transform keeps its own output, as the outputs of different transforms are used together;
+    twiddle factors, bases and scratch buffers come from the cache.
+    """
+    # FFT based implementation
+    function = None
+    # bases of the matmul backend applied to the rows and the columns
+    row_basis = None
+    col_basis = None
+
+    def __init__(self, expkM=None, expkN=None, backend="fft"):
+        """
+        @param backend "fft", "matmul" or "auto"
+        """
+        super(SpectralTransform, self).__init__()
 
         self.expkM = expkM
         self.expkN = expkN
+        self.backend = backend
         self.out = None
         self.buf = None
 
     def forward(self, x):
         M = x.size(-2)
         N = x.size(-1)
+        # leading dimensions of x are a batch of MxN maps
+        if (self.out is None or self.out.size() != x.size()
+                or self.out.dtype != x.dtype):
+            self.out = torch.empty(x.size(), dtype=x.dtype, device=x.device)
+
+        if selectBackend(self.backend, M, N) == "matmul":
+            self.buf = getCachedBuffer(x.size(), x.dtype, x.device)
+            row_basis = getCachedBasis(self.row_basis, M, x.dtype, x.device)
+            col_basis = getCachedBasis(self.col_basis, N, x.dtype, x.device)
+            with torch.no_grad():
+                torch.matmul(x, col_basis.t(), out=self.buf)
+                torch.matmul(row_basis, self.buf, out=self.out)
+            return self.out
+
         if self.expkM is None or self.expkM.size(
                 -2) != M or self.expkM.dtype != x.dtype:
-            self.expkM = precomputeExpk(M, dtype=x.dtype, device=x.device)
+            self.expkM = getCachedExpk(M, dtype=x.dtype, device=x.device)
         if self.expkN is None or self.expkN.size(
                 -2) != N or self.expkN.dtype != x.dtype:
-            self.expkN = precomputeExpk(N, dtype=x.dtype, device=x.device)
-        if self.out is None:
-            self.out = torch.empty(M, N, dtype=x.dtype, device=x.device)
-            self.buf = torch.empty(M,
-                                   N // 2 + 1,
-                                   2,
-                                   dtype=x.dtype,
-                                   device=x.device)
-
-        return IdxstIdctFunction.apply(x, self.expkM, self.expkN, self.out,
-                                       self.buf)
+            self.expkN = getCachedExpk(N, dtype=x.dtype, device=x.device)
+        self.buf = getCachedBuffer(x.size()[:-1] + (N // 2 + 1, 2), x.dtype,
+                                   x.device)
+
+        return self.function.apply(x, self.expkM, self.expkN, self.out,
+                                   self.buf)
+
+
+class Dct2(SpectralTransform):
+    function = Dct2Function
+    row_basis = "dct"
+    col_basis = "dct"
+
+
+class Idct2(SpectralTransform):
+    function = Idct2Function
+    row_basis = "idct"
+    col_basis = "idct"
+
+
+class IdctIdxst(SpectralTransform):
+    function = IdctIdxstFunction
+    row_basis = "idct"
+    col_basis = "idxst"
+
+
+class IdxstIdct(SpectralTransform):
+    function = IdxstIdctFunction
+    row_basis = "idxst"
+    col_basis = "idct"
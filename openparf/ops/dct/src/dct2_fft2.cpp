@@ -26,20 +26,25 @@ void dct2Forward(at::Tensor x, at::Tensor expkM, at::Tensor expkN,
   CHECK_CONTIGUOUS(buf);
 
   auto N = x.size(-1);
-  auto M = x.numel() / N;
+  auto M = x.dim() > 1 ? x.size(-2) : 1;
+  // leading dimensions are a batch of MxN maps transformed together
+  auto batch = x.numel() / (M * N);
+  AT_ASSERTM(out.numel() == x.numel(), "out must have as many elements as x");
 
   OPENPARF_DISPATCH_FLOATING_TYPES(x, "dct2Forward", [&] {
     dct2dPreprocessCpuLauncher<scalar_t>(
         OPENPARF_TENSOR_DATA_PTR(x, scalar_t),
-        OPENPARF_TENSOR_DATA_PTR(out, scalar_t), M, N, at::get_num_threads());
+        OPENPARF_TENSOR_DATA_PTR(out, scalar_t), M, N, batch,
+        at::get_num_threads());
 
-    buf = at::rfft(out, 2, false, true);
+    buf = at::rfft(out.view({batch, M, N}), 2, false, true);
 
     dct2dPostprocessCpuLauncher<scalar_t>(
         OPENPARF_TENSOR_DATA_PTR(buf, scalar_t),
         OPENPARF_TENSOR_DATA_PTR(out, scalar_t), M, N,
         OPENPARF_TENSOR_DATA_PTR(expkM, scalar_t),
-        OPENPARF_TENSOR_DATA_PTR(expkN, scalar_t), at::get_num_threads());
+        OPENPARF_TENSOR_DATA_PTR(expkN, scalar_t), batch,
+        at::get_num_threads());
   });
 }
 
@@ -58,20 +63,26 @@ void idct2Forward(at::Tensor x, at::Tensor expkM, at::Tensor expkN,
   CHECK_CONTIGUOUS(buf);
 
   auto N = x.size(-1);
-  auto M = x.numel() / N;
+  auto M = x.dim() > 1 ? x.size(-2) : 1;
+  // leading dimensions are a batch of MxN maps transformed together
+  auto batch = x.numel() / (M * N);
+  AT_ASSERTM(out.numel() == x.numel(), "out must have as many elements as x");
 
   OPENPARF_DISPATCH_FLOATING_TYPES(x, "idct2Forward", [&] {
     idct2PreprocessCpuLauncher<scalar_t>(
         OPENPARF_TENSOR_DATA_PTR(x, scalar_t),
         OPENPARF_TENSOR_DATA_PTR(buf, scalar_t), M, N,
         OPENPARF_TENSOR_DATA_PTR(expkM, scalar_t),
-        OPENPARF_TENSOR_DATA_PTR(expkN, scalar_t), at::get_num_threads());
+        OPENPARF_TENSOR_DATA_PTR(expkN, scalar_t), batch,
+        at::get_num_threads());
 
-    auto y = at::irfft(buf, 2, false, true, {M, N});
+    auto y = at::irfft(buf.view({batch, M, N / 2 + 1, 2}), 2, false, true,
+                       {M, N});
 
     idct2PostprocessCpuLauncher<scalar_t>(
         OPENPARF_TENSOR_DATA_PTR(y, scalar_t),
-        OPENPARF_TENSOR_DATA_PTR(out, scalar_t), M, N, at::get_num_threads());
+        OPENPARF_TENSOR_DATA_PTR(out, scalar_t), M, N, batch,
+        at::get_num_threads());
   });
 }
 
@@ -90,20 +101,26 @@ void idctIdxstForward(at::Tensor x, at::Tensor expkM, at::Tensor expkN,
   CHECK_CONTIGUOUS(buf);
 
   auto N = x.size(-1);
-  auto M = x.numel() / N;
+  auto M = x.dim() > 1 ? x.size(-2) : 1;
+  // leading dimensions are a batch of MxN maps transformed together
+  auto batch = x.numel() / (M * N);
+  AT_ASSERTM(out.numel() == x.numel(), "out must have as many elements as x");
 
   OPENPARF_DISPATCH_FLOATING_TYPES(x, "idctIdxstForward", [&] {
     idctIdxstPreprocessCpuLauncher<scalar_t>(
         OPENPARF_TENSOR_DATA_PTR(x, scalar_t),
         OPENPARF_TENSOR_DATA_PTR(buf, scalar_t), M, N,
         OPENPARF_TENSOR_DATA_PTR(expkM, scalar_t),
-        OPENPARF_TENSOR_DATA_PTR(expkN, scalar_t), at::get_num_threads());
+        OPENPARF_TENSOR_DATA_PTR(expkN, scalar_t), batch,
+        at::get_num_threads());
 
-    auto y = at::irfft(buf, 2, false, true, {M, N});
+    auto y = at::irfft(buf.view({batch, M, N / 2 + 1, 2}), 2, false, true,
+                       {M, N});
 
     idctIdxstPostprocessCpuLauncher<scalar_t>(
         OPENPARF_TENSOR_DATA_PTR(y, scalar_t),
-        OPENPARF_TENSOR_DATA_PTR(out, scalar_t), M, N, at::get_num_threads());
+        OPENPARF_TENSOR_DATA_PTR(out, scalar_t), M, N, batch,
+        at::get_num_threads());
   });
 }
 
@@ -122,20 +139,26 @@ void idxstIdctForward(at::Tensor x, at::Tensor expkM, at::Tensor expkN,
   CHECK_CONTIGUOUS(buf);
 
   auto N = x.size(-1);
-  auto M = x.numel() / N;
+  auto M = x.dim() > 1 ? x.size(-2) : 1;
+  // leading dimensions are a batch of MxN maps transformed together
+  auto batch = x.numel() / (M * N);
+  AT_ASSERTM(out.numel() == x.numel(), "out must have as many elements as x");
 
   OPENPARF_DISPATCH_FLOATING_TYPES(x, "idxstIdctForward", [&] {
     idxstIdctPreprocessCpuLauncher<scalar_t>(
         OPENPARF_TENSOR_DATA_PTR(x, scalar_t),
         OPENPARF_TENSOR_DATA_PTR(buf, scalar_t), M, N,
         OPENPARF_TENSOR_DATA_PTR(expkM, scalar_t),
-        OPENPARF_TENSOR_DATA_PTR(expkN, scalar_t), at::get_num_threads());
+        OPENPARF_TENSOR_DATA_PTR(expkN, scalar_t), batch,
+        at::get_num_threads());
 
-    auto y = at::irfft(buf, 2, false, true, {M, N});
+    auto y = at::irfft(buf.view({batch, M, N / 2 + 1, 2}), 2, false, true,
+                       {M, N});
 
     idxstIdctPostprocessCpuLauncher<scalar_t>(
         OPENPARF_TENSOR_DATA_PTR(y, scalar_t),
-        OPENPARF_TENSOR_DATA_PTR(out, scalar_t), M, N, at::get_num_threads());
+        OPENPARF_TENSOR_DATA_PTR(out, scalar_t), M, N, batch,
+        at::get_num_threads());
   });
 }
 
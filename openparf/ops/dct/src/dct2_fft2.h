@@ -63,10 +63,15 @@ void dct2dPreprocessCpu(const T *x, T *y, const int32_t M, const int32_t N,
   }
 }
 
+/// The launchers process a batch of MxN maps stored one after another.
+/// Real maps take M * N elements and complex spectra M * (N / 2 + 1).
 template <typename T>
 void dct2dPreprocessCpuLauncher(const T *x, T *y, const int32_t M,
-                                const int32_t N, int32_t num_threads) {
-  dct2dPreprocessCpu<T>(x, y, M, N, num_threads);
+                                const int32_t N, const int32_t batch,
+                                int32_t num_threads) {
+  for (int32_t b = 0; b < batch; ++b) {
+    dct2dPreprocessCpu<T>(x + b * M * N, y + b * M * N, M, N, num_threads);
+  }
 }
 
 template <typename T, typename TComplex>
@@ -168,10 +173,13 @@ void dct2dPostprocessCpu(const TComplex *V, T *y, const int32_t M,
 template <typename T>
 void dct2dPostprocessCpuLauncher(const T *x, T *y, const int32_t M,
                                  const int32_t N, const T *expkM,
-                                 const T *expkN, int32_t num_threads) {
-  dct2dPostprocessCpu<T, Complex<T>>((Complex<T> *)x, y, M, N,
-                                     (Complex<T> *)expkM, (Complex<T> *)expkN,
-                                     num_threads);
+                                 const T *expkN, const int32_t batch,
+                                 int32_t num_threads) {
+  for (int32_t b = 0; b < batch; ++b) {
+    dct2dPostprocessCpu<T, Complex<T>>(
+        (Complex<T> *)x + b * M * (N / 2 + 1), y + b * M * N, M, N,
+        (Complex<T> *)expkM, (Complex<T> *)expkN, num_threads);
+  }
 }
 
 template <typename T, typename TComplex>
@@ -285,10 +293,12 @@ void idct2PreprocessCpu(const T *input, TComplex *output, const int32_t M,
 template <typename T>
 void idct2PreprocessCpuLauncher(const T *x, T *y, const int32_t M,
                                 const int32_t N, const T *expkM, const T *expkN,
-                                int32_t num_threads) {
-  idct2PreprocessCpu<T, Complex<T>>(x, (Complex<T> *)y, M, N,
-                                    (Complex<T> *)expkM, (Complex<T> *)expkN,
-                                    num_threads);
+                                const int32_t batch, int32_t num_threads) {
+  for (int32_t b = 0; b < batch; ++b) {
+    idct2PreprocessCpu<T, Complex<T>>(
+        x + b * M * N, (Complex<T> *)y + b * M * (N / 2 + 1), M, N,
+        (Complex<T> *)expkM, (Complex<T> *)expkN, num_threads);
+  }
 }
 
 template <typename T>
@@ -324,8 +334,11 @@ void idct2PostprocessCpu(const T *x, T *y, const int32_t M, const int32_t N,
 
 template <typename T>
 void idct2PostprocessCpuLauncher(const T *x, T *y, const int32_t M,
-                                 const int32_t N, int32_t num_threads) {
-  idct2PostprocessCpu<T>(x, y, M, N, num_threads);
+                                 const int32_t N, const int32_t batch,
+                                 int32_t num_threads) {
+  for (int32_t b = 0; b < batch; ++b) {
+    idct2PostprocessCpu<T>(x + b * M * N, y + b * M * N, M, N, num_threads);
+  }
 }
 
 template <typename T, typename TComplex>
@@ -429,10 +442,13 @@ void idctIdxstPreprocessCpu(const T *input, TComplex *output, const int32_t M,
 template <typename T>
 void idctIdxstPreprocessCpuLauncher(const T *x, T *y, const int32_t M,
                                     const int32_t N, const T *expkM,
-                                    const T *expkN, int32_t num_threads) {
-  idctIdxstPreprocessCpu<T, Complex<T>>(x, (Complex<T> *)y, M, N,
-                                        (Complex<T> *)expkM,
-                                        (Complex<T> *)expkN, num_threads);
+                                    const T *expkN, const int32_t batch,
+                                    int32_t num_threads) {
+  for (int32_t b = 0; b < batch; ++b) {
+    idctIdxstPreprocessCpu<T, Complex<T>>(
+        x + b * M * N, (Complex<T> *)y + b * M * (N / 2 + 1), M, N,
+        (Complex<T> *)expkM, (Complex<T> *)expkN, num_threads);
+  }
 }
 
 template <typename T>
@@ -472,8 +488,12 @@ void idctIdxstPostprocessCpu(const T *x, T *y, const int32_t M, const int32_t N,
 
 template <typename T>
 void idctIdxstPostprocessCpuLauncher(const T *x, T *y, const int32_t M,
-                                     const int32_t N, int32_t num_threads) {
-  idctIdxstPostprocessCpu<T>(x, y, M, N, num_threads);
+                                     const int32_t N, const int32_t batch,
+                                     int32_t num_threads) {
+  for (int32_t b = 0; b < batch; ++b) {
+    idctIdxstPostprocessCpu<T>(x + b * M * N, y + b * M * N, M, N,
+                               num_threads);
+  }
 }
 
 template <typename T, typename TComplex>
@@ -584,10 +604,13 @@ void idxstIdctPreprocessCpu(const T *input, TComplex *output, const int32_t M,
 template <typename T>
 void idxstIdctPreprocessCpuLauncher(const T *x, T *y, const int32_t M,
                                     const int32_t N, const T *expkM,
-                                    const T *expkN, int32_t num_threads) {
-  idxstIdctPreprocessCpu<T, Complex<T>>(x, (Complex<T> *)y, M, N,
-                                        (Complex<T> *)expkM,
-                                        (Complex<T> *)expkN, num_threads);
+                                    const T *expkN, const int32_t batch,
+                                    int32_t num_threads) {
+  for (int32_t b = 0; b < batch; ++b) {
+    idxstIdctPreprocessCpu<T, Complex<T>>(
+        x + b * M * N, (Complex<T> *)y + b * M * (N / 2 + 1), M, N,
+        (Complex<T> *)expkM, (Complex<T> *)expkN, num_threads);
+  }
 }
 
 template <typename T>
@@ -627,8 +650,12 @@ void idxstIdctPostprocessCpu(const T *x, T *y, const int32_t M, const int32_t N,
 
 template <typename T>
 void idxstIdctPostprocessCpuLauncher(const T *x, T *y, const int32_t M,
-                                     const int32_t N, int32_t num_threads) {
-  idxstIdctPostprocessCpu<T>(x, y, M, N, num_threads);
+                                     const int32_t N, const int32_t batch,
+                                     int32_t num_threads) {
+  for (int32_t b = 0; b < batch; ++b) {
+    idxstIdctPostprocessCpu<T>(x + b * M * N, y + b * M * N, M, N,
+                               num_threads);
+  }
 }
 
 OPENPARF_END_NAMESPACE
@@ -26,20 +26,23 @@ void dct2Forward(at::Tensor x, at::Tensor expkM, at::Tensor expkN,
   CHECK_CONTIGUOUS(buf);
 
   auto N = x.size(-1);
-  auto M = x.numel() / N;
+  auto M = x.dim() > 1 ? x.size(-2) : 1;
+  // leading dimensions are a batch of MxN maps transformed together
+  auto batch = x.numel() / (M * N);
+  AT_ASSERTM(out.numel() == x.numel(), "out must have as many elements as x");
 
   OPENPARF_DISPATCH_FLOATING_TYPES(x, "dct2Forward", [&] {
     dct2PreprocessCudaLauncher<scalar_t>(
         OPENPARF_TENSOR_DATA_PTR(x, scalar_t),
-        OPENPARF_TENSOR_DATA_PTR(out, scalar_t), M, N);
+        OPENPARF_TENSOR_DATA_PTR(out, scalar_t), M, N, batch);
 
-    buf = at::rfft(out, 2, false, true);
+    buf = at::rfft(out.view({batch, M, N}), 2, false, true);
 
     dct2PostprocessCudaLauncher<scalar_t>(
         OPENPARF_TENSOR_DATA_PTR(buf, scalar_t),
         OPENPARF_TENSOR_DATA_PTR(out, scalar_t), M, N,
         OPENPARF_TENSOR_DATA_PTR(expkM, scalar_t),
-        OPENPARF_TENSOR_DATA_PTR(expkN, scalar_t));
+        OPENPARF_TENSOR_DATA_PTR(expkN, scalar_t), batch);
   });
 }
 
@@ -58,20 +61,24 @@ void idct2Forward(at::Tensor x, at::Tensor expkM, at::Tensor expkN,
   CHECK_CONTIGUOUS(buf);
 
   auto N = x.size(-1);
-  auto M = x.numel() / N;
+  auto M = x.dim() > 1 ? x.size(-2) : 1;
+  // leading dimensions are a batch of MxN maps transformed together
+  auto batch = x.numel() / (M * N);
+  AT_ASSERTM(out.numel() == x.numel(), "out must have as many elements as x");
 
   OPENPARF_DISPATCH_FLOATING_TYPES(x, "idct2Forward", [&] {
     idct2PreprocessCudaLauncher<scalar_t>(
         OPENPARF_TENSOR_DATA_PTR(x, scalar_t),
         OPENPARF_TENSOR_DATA_PTR(buf, scalar_t), M, N,
         OPENPARF_TENSOR_DATA_PTR(expkM, scalar_t),
-        OPENPARF_TENSOR_DATA_PTR(expkN, scalar_t));
+        OPENPARF_TENSOR_DATA_PTR(expkN, scalar_t), batch);
 
-    auto y = at::irfft(buf, 2, false, true, {M, N});
+    auto y = at::irfft(buf.view({batch, M, N / 2 + 1, 2}), 2, false, true,
+                       {M, N});
 
     idct2PostprocessCudaLauncher<scalar_t>(
         OPENPARF_TENSOR_DATA_PTR(y, scalar_t),
-        OPENPARF_TENSOR_DATA_PTR(out, scalar_t), M, N);
+        OPENPARF_TENSOR_DATA_PTR(out, scalar_t), M, N, batch);
   });
 }
 
@@ -90,20 +97,24 @@ void idctIdxstForward(at::Tensor x, at::Tensor expkM, at::Tensor expkN,
   CHECK_CONTIGUOUS(buf);
 
   auto N = x.size(-1);
-  auto M = x.numel() / N;
+  auto M = x.dim() > 1 ? x.size(-2) : 1;
+  // leading dimensions are a batch of MxN maps transformed together
+  auto batch = x.numel() / (M * N);
+  AT_ASSERTM(out.numel() == x.numel(), "out must have as many elements as x");
 
   OPENPARF_DISPATCH_FLOATING_TYPES(x, "idctIdxstForward", [&] {
     idctIdxstPreprocessCudaLauncher<scalar_t>(
         OPENPARF_TENSOR_DATA_PTR(x, scalar_t),
         OPENPARF_TENSOR_DATA_PTR(buf, scalar_t), M, N,
         OPENPARF_TENSOR_DATA_PTR(expkM, scalar_t),
-        OPENPARF_TENSOR_DATA_PTR(expkN, scalar_t));
+        OPENPARF_TENSOR_DATA_PTR(expkN, scalar_t), batch);
 
-    auto y = at::irfft(buf, 2, false, true, {M, N});
+    auto y = at::irfft(buf.view({batch, M, N / 2 + 1, 2}), 2, false, true,
+                       {M, N});
 
     idctIdxstPostprocessCudaLauncher<scalar_t>(
         OPENPARF_TENSOR_DATA_PTR(y, scalar_t),
-        OPENPARF_TENSOR_DATA_PTR(out, scalar_t), M, N);
+        OPENPARF_TENSOR_DATA_PTR(out, scalar_t), M, N, batch);
   });
 }
 
@@ -122,20 +133,24 @@ void idxstIdctForward(at::Tensor x, at::Tensor expkM, at::Tensor expkN,
   CHECK_CONTIGUOUS(buf);
 
   auto N = x.size(-1);
-  auto M = x.numel() / N;
+  auto M = x.dim() > 1 ? x.size(-2) : 1;
+  // leading dimensions are a batch of MxN maps transformed together
+  auto batch = x.numel() / (M * N);
+  AT_ASSERTM(out.numel() == x.numel(), "out must have as many elements as x");
 
   OPENPARF_DISPATCH_FLOATING_TYPES(x, "idxstIdctForward", [&] {
     idxstIdctPreprocessCudaLauncher<scalar_t>(
         OPENPARF_TENSOR_DATA_PTR(x, scalar_t),
         OPENPARF_TENSOR_DATA_PTR(buf, scalar_t), M, N,
         OPENPARF_TENSOR_DATA_PTR(expkM, scalar_t),
-        OPENPARF_TENSOR_DATA_PTR(expkN, scalar_t));
+        OPENPARF_TENSOR_DATA_PTR(expkN, scalar_t), batch);
 
-    auto y = at::irfft(buf, 2, false, true, {M, N});
+    auto y = at::irfft(buf.view({batch, M, N / 2 + 1, 2}), 2, false, true,
+                       {M, N});
 
     idxstIdctPostprocessCudaLauncher<scalar_t>(
         OPENPARF_TENSOR_DATA_PTR(y, scalar_t),
-        OPENPARF_TENSOR_DATA_PTR(out, scalar_t), M, N);
+        OPENPARF_TENSOR_DATA_PTR(out, scalar_t), M, N, batch);
   });
 }
 
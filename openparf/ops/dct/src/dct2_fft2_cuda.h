@@ -23,12 +23,13 @@ void dct2Forward(at::Tensor x, at::Tensor expkM, at::Tensor expkN,
 
 template <typename T>
 void dct2PreprocessCudaLauncher(T const *x, T *y, int32_t const M,
-                                int32_t const N);
+                                int32_t const N, int32_t const batch);
 
 template <typename T>
 void dct2PostprocessCudaLauncher(T const *x, T *y, int32_t const M,
                                  int32_t const N, T const *__restrict__ expkM,
-                                 T const *__restrict__ expkN);
+                                 T const *__restrict__ expkN,
+                                 int32_t const batch);
 
 // idct2 with fft2
 void idct2Forward(at::Tensor x, at::Tensor expkM, at::Tensor expkN,
@@ -37,11 +38,12 @@ void idct2Forward(at::Tensor x, at::Tensor expkM, at::Tensor expkN,
 template <typename T>
 void idct2PreprocessCudaLauncher(T const *x, T *y, int32_t const M,
                                  int32_t const N, T const *__restrict__ expkM,
-                                 T const *__restrict__ expkN);
+                                 T const *__restrict__ expkN,
+                                 int32_t const batch);
 
 template <typename T>
 void idct2PostprocessCudaLauncher(T const *x, T *y, int32_t const M,
-                                  int32_t const N);
+                                  int32_t const N, int32_t const batch);
 
 // idct idxst
 void idctIdxstForward(at::Tensor x, at::Tensor expkM, at::Tensor expkN,
@@ -51,11 +53,12 @@ template <typename T>
 void idctIdxstPreprocessCudaLauncher(T const *x, T *y, int32_t const M,
                                      int32_t const N,
                                      T const *__restrict__ expkM,
-                                     T const *__restrict__ expkN);
+                                     T const *__restrict__ expkN,
+                                     int32_t const batch);
 
 template <typename T>
 void idctIdxstPostprocessCudaLauncher(T const *x, T *y, int32_t const M,
-                                      int32_t const N);
+                                      int32_t const N, int32_t const batch);
 
 // idxst idct
 void idxstIdctForward(at::Tensor x, at::Tensor expkM, at::Tensor expkN,
@@ -65,11 +68,12 @@ template <typename T>
 void idxstIdctPreprocessCudaLauncher(T const *x, T *y, int32_t const M,
                                      int32_t const N,
                                      T const *__restrict__ expkM,
-                                     T const *__restrict__ expkN);
+                                     T const *__restrict__ expkN,
+                                     int32_t const batch);
 
 template <typename T>
 void idxstIdctPostprocessCudaLauncher(T const *x, T *y, int32_t const M,
-                                      int32_t const N);
+                                      int32_t const N, int32_t const batch);
 
 OPENPARF_END_NAMESPACE
 
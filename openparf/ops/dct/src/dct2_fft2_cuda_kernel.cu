@@ -31,6 +31,9 @@ __global__ void dct2Preprocess(T const *x, T *y, int32_t const M,
                                int32_t const N, int32_t const halfN) {
   int32_t const wid = blockDim.x * blockIdx.x + threadIdx.x;
   int32_t const hid = blockDim.y * blockIdx.y + threadIdx.y;
+  // blockIdx.z indexes the map in a batch
+  x += blockIdx.z * M * N;
+  y += blockIdx.z * M * N;
   if (hid < M && wid < N) {
     int32_t index;
     int32_t cond = (((hid & 1) == 0) << 1) | ((wid & 1) == 0);
@@ -56,8 +59,8 @@ __global__ void dct2Preprocess(T const *x, T *y, int32_t const M,
 
 template <typename T>
 void dct2PreprocessCudaLauncher(T const *x, T *y, int32_t const M,
-                                int32_t const N) {
-  dim3 gridSize((N + TPB - 1) / TPB, (M + TPB - 1) / TPB, 1);
+                                int32_t const N, int32_t const batch) {
+  dim3 gridSize((N + TPB - 1) / TPB, (M + TPB - 1) / TPB, batch);
   dim3 blockSize(TPB, TPB, 1);
   dct2Preprocess<T><<<gridSize, blockSize>>>(x, y, M, N, N / 2);
 }
@@ -72,6 +75,9 @@ __global__ void __launch_bounds__(TPB *TPB, 8)
 
   int32_t const wid = blockDim.x * blockIdx.x + threadIdx.x;
   int32_t const hid = blockDim.y * blockIdx.y + threadIdx.y;
+  // blockIdx.z indexes the map in a batch
+  V += blockIdx.z * M * (halfN + 1);
+  y += blockIdx.z * M * N;
   if (hid < halfM && wid < halfN) {
     int32_t cond = ((hid != 0) << 1) | (wid != 0);
     switch (cond) {
@@ -158,8 +164,9 @@ __global__ void __launch_bounds__(TPB *TPB, 8)
 template <typename T>
 void dct2PostprocessCudaLauncher(T const *x, T *y, int32_t const M,
                                  int32_t const N, T const *__restrict__ expkM,
-                                 T const *__restrict__ expkN) {
-  dim3 gridSize((N / 2 + TPB - 1) / TPB, (M / 2 + TPB - 1) / TPB, 1);
+                                 T const *__restrict__ expkN,
+                                 int32_t const batch) {
+  dim3 gridSize((N / 2 + TPB - 1) / TPB, (M / 2 + TPB - 1) / TPB, batch);
   dim3 blockSize(TPB, TPB, 1);
   dct2Postprocess<T, Complex<T>><<<gridSize, blockSize>>>(
       (Complex<T> *)x, y, M, N, M / 2, N / 2, (T)(2. / (M * N)),
@@ -176,6 +183,9 @@ __global__ void __launch_bounds__(TPB *TPB, 8)
                          const TComplex *__restrict__ expkN) {
   int32_t const wid = blockDim.x * blockIdx.x + threadIdx.x;
   int32_t const hid = blockDim.y * blockIdx.y + threadIdx.y;
+  // blockIdx.z indexes the map in a batch
+  input += blockIdx.z * M * N;
+  output += blockIdx.z * M * (halfN + 1);
   if (hid < halfM && wid < halfN) {
     int32_t cond = ((hid != 0) << 1) | (wid != 0);
     switch (cond) {
@@ -279,8 +289,9 @@ template <typename T>
 void idct2PreprocessCudaLauncher(T const *x, T *y, int32_t const M,
                                       int32_t const N,
                                       T const *__restrict__ expkM,
-                                      T const *__restrict__ expkN) {
-  dim3 gridSize((N / 2 + TPB - 1) / TPB, (M / 2 + TPB - 1) / TPB, 1);
+                                      T const *__restrict__ expkN,
+                                      int32_t const batch) {
+  dim3 gridSize((N / 2 + TPB - 1) / TPB, (M / 2 + TPB - 1) / TPB, batch);
   dim3 blockSize(TPB, TPB, 1);
   idct2Preprocess<T, Complex<T>>
       <<<gridSize, blockSize>>>(x, (Complex<T> *)y, M, N, M / 2, N / 2,
@@ -293,6 +304,9 @@ __global__ void idct2Postprocess(T const *x, T *y, int32_t const M,
                                       int32_t const MN) {
   int32_t const wid = blockDim.x * blockIdx.x + threadIdx.x;
   int32_t const hid = blockDim.y * blockIdx.y + threadIdx.y;
+  // blockIdx.z indexes the map in a batch
+  x += blockIdx.z * M * N;
+  y += blockIdx.z * M * N;
   if (hid < M && wid < N) {
     int32_t cond = ((hid < M / 2) << 1) | (wid < N / 2);
     int32_t index;
@@ -319,8 +333,8 @@ __global__ void idct2Postprocess(T const *x, T *y, int32_t const M,
 
 template <typename T>
 void idct2PostprocessCudaLauncher(T const *x, T *y, int32_t const M,
-                                       int32_t const N) {
-  dim3 gridSize((N + TPB - 1) / TPB, (M + TPB - 1) / TPB, 1);
+                                       int32_t const N, int32_t const batch) {
+  dim3 gridSize((N + TPB - 1) / TPB, (M + TPB - 1) / TPB, batch);
   dim3 blockSize(TPB, TPB, 1);
   idct2Postprocess<T><<<gridSize, blockSize>>>(x, y, M, N, N / 2, M * N);
 }
@@ -339,6 +353,9 @@ __global__ void __launch_bounds__(TPB *TPB, 8)
                         const TComplex *__restrict__ expkN) {
   int32_t const wid = blockDim.x * blockIdx.x + threadIdx.x;
   int32_t const hid = blockDim.y * blockIdx.y + threadIdx.y;
+  // blockIdx.z indexes the map in a batch
+  input += blockIdx.z * M * N;
+  output += blockIdx.z * M * (halfN + 1);
   if (hid < halfM && wid < halfN) {
     int32_t cond = ((hid != 0) << 1) | (wid != 0);
     switch (cond) {
@@ -432,8 +449,9 @@ template <typename T>
 void idctIdxstPreprocessCudaLauncher(T const *x, T *y, int32_t const M,
                                      int32_t const N,
                                      T const *__restrict__ expkM,
-                                     T const *__restrict__ expkN) {
-  dim3 gridSize((N / 2 + TPB - 1) / TPB, (M / 2 + TPB - 1) / TPB, 1);
+                                     T const *__restrict__ expkN,
+                                     int32_t const batch) {
+  dim3 gridSize((N / 2 + TPB - 1) / TPB, (M / 2 + TPB - 1) / TPB, batch);
   dim3 blockSize(TPB, TPB, 1);
   idctIdxstPreprocess<T, Complex<T>>
       <<<gridSize, blockSize>>>(x, (Complex<T> *)y, M, N, M / 2, N / 2,
@@ -451,6 +469,9 @@ __global__ void idctIdxstPostprocess(T const *x, T *y, int32_t const M,
                                      int32_t const MN) {
   int32_t const wid = blockDim.x * blockIdx.x + threadIdx.x;
   int32_t const hid = blockDim.y * blockIdx.y + threadIdx.y;
+  // blockIdx.z indexes the map in a batch
+  x += blockIdx.z * M * N;
+  y += blockIdx.z * M * N;
   if (hid < M && wid < N) {
     int32_t cond = ((hid < M / 2) << 1) | (wid < N / 2);
     int32_t index;
@@ -480,8 +501,8 @@ __global__ void idctIdxstPostprocess(T const *x, T *y, int32_t const M,
 
 template <typename T>
 void idctIdxstPostprocessCudaLauncher(T const *x, T *y, int32_t const M,
-                                      int32_t const N) {
-  dim3 gridSize((N + TPB - 1) / TPB, (M + TPB - 1) / TPB, 1);
+                                      int32_t const N, int32_t const batch) {
+  dim3 gridSize((N + TPB - 1) / TPB, (M + TPB - 1) / TPB, batch);
   dim3 blockSize(TPB, TPB, 1);
   idctIdxstPostprocess<T><<<gridSize, blockSize>>>(x, y, M, N, N / 2, M * N);
 }
@@ -500,6 +521,9 @@ __global__ void __launch_bounds__(TPB *TPB, 8)
                         const TComplex *__restrict__ expkN) {
   int32_t const wid = blockDim.x * blockIdx.x + threadIdx.x;
   int32_t const hid = blockDim.y * blockIdx.y + threadIdx.y;
+  // blockIdx.z indexes the map in a batch
+  input += blockIdx.z * M * N;
+  output += blockIdx.z * M * (halfN + 1);
   if (hid < halfM && wid < halfN) {
     int32_t cond = ((hid != 0) << 1) | (wid != 0);
     switch (cond) {
@@ -600,8 +624,9 @@ template <typename T>
 void idxstIdctPreprocessCudaLauncher(T const *x, T *y, int32_t const M,
                                      int32_t const N,
                                      T const *__restrict__ expkM,
-                                     T const *__restrict__ expkN) {
-  dim3 gridSize((N / 2 + TPB - 1) / TPB, (M / 2 + TPB - 1) / TPB, 1);
+                                     T const *__restrict__ expkN,
+                                     int32_t const batch) {
+  dim3 gridSize((N / 2 + TPB - 1) / TPB, (M / 2 + TPB - 1) / TPB, batch);
   dim3 blockSize(TPB, TPB, 1);
   idxstIdctPreprocess<T, Complex<T>>
       <<<gridSize, blockSize>>>(x, (Complex<T> *)y, M, N, M / 2, N / 2,
@@ -619,6 +644,9 @@ __global__ void idxstIdctPostprocess(T const *x, T *y, int32_t const M,
                                      int32_t const MN) {
   int32_t const wid = blockDim.x * blockIdx.x + threadIdx.x;
   int32_t const hid = blockDim.y * blockIdx.y + threadIdx.y;
+  // blockIdx.z indexes the map in a batch
+  x += blockIdx.z * M * N;
+  y += blockIdx.z * M * N;
   if (hid < M && wid < N) {
     int32_t cond = ((hid < M / 2) << 1) | (wid < N / 2);
     int32_t index;
@@ -648,8 +676,8 @@ __global__ void idxstIdctPostprocess(T const *x, T *y, int32_t const M,
 
 template <typename T>
 void idxstIdctPostprocessCudaLauncher(T const *x, T *y, int32_t const M,
-                                      int32_t const N) {
-    dim3 gridSize((N + TPB - 1) / TPB, (M + TPB - 1) / TPB, 1);
+                                      int32_t const N, int32_t const batch) {
+    dim3 gridSize((N + TPB - 1) / TPB, (M + TPB - 1) / TPB, batch);
     dim3 blockSize(TPB, TPB, 1);
     idxstIdctPostprocess<T><<<gridSize, blockSize>>>(x, y, M, N, N / 2, M * N);
 }
@@ -657,7 +685,7 @@ void idxstIdctPostprocessCudaLauncher(T const *x, T *y, int32_t const M,
 // dct2_fft2
 #define REGISTER_DCT2DPREPROCESS_KERNEL_LAUNCHER(type)                                             \
     template void dct2PreprocessCudaLauncher<type>(type const *x, type *y, int32_t const M,        \
-                                                   int32_t const N);
+                                                   int32_t const N, int32_t const batch);
 
 REGISTER_DCT2DPREPROCESS_KERNEL_LAUNCHER(float)
 REGISTER_DCT2DPREPROCESS_KERNEL_LAUNCHER(double)
@@ -667,7 +695,7 @@ REGISTER_DCT2DPREPROCESS_KERNEL_LAUNCHER(double)
 #define REGISTER_DCT2DPOSTPROCESS_KERNEL_LAUNCHER(type)                                            \
     template void dct2PostprocessCudaLauncher<type>(                                               \
             type const *x, type *y, int32_t const M, int32_t const N,                              \
-            type const *__restrict__ expkM, type const *__restrict__ expkN);
+            type const *__restrict__ expkM, type const *__restrict__ expkN, int32_t const batch);
 
 REGISTER_DCT2DPOSTPROCESS_KERNEL_LAUNCHER(float)
 REGISTER_DCT2DPOSTPROCESS_KERNEL_LAUNCHER(double)
@@ -678,7 +706,7 @@ REGISTER_DCT2DPOSTPROCESS_KERNEL_LAUNCHER(double)
 #define REGISTER_IDCT_IDXSTPREPROCESS_KERNEL_LAUNCHER(type)                                        \
     template void idctIdxstPreprocessCudaLauncher<type>(                                           \
             type const *x, type *y, int32_t const M, int32_t const N,                              \
-            type const *__restrict__ expkM, type const *__restrict__ expkN);
+            type const *__restrict__ expkM, type const *__restrict__ expkN, int32_t const batch);
 
 REGISTER_IDCT_IDXSTPREPROCESS_KERNEL_LAUNCHER(float)
 REGISTER_IDCT_IDXSTPREPROCESS_KERNEL_LAUNCHER(double)
@@ -687,7 +715,7 @@ REGISTER_IDCT_IDXSTPREPROCESS_KERNEL_LAUNCHER(double)
 
 #define REGISTER_IDCT_IDXSTPOSTPROCESS_KERNEL_LAUNCHER(type)                                       \
     template void idctIdxstPostprocessCudaLauncher<type>(type const *x, type *y, int32_t const M,  \
-                                                         int32_t const N);
+                                                         int32_t const N, int32_t const batch);
 
 REGISTER_IDCT_IDXSTPOSTPROCESS_KERNEL_LAUNCHER(float)
 REGISTER_IDCT_IDXSTPOSTPROCESS_KERNEL_LAUNCHER(double)
@@ -698,7 +726,7 @@ REGISTER_IDCT_IDXSTPOSTPROCESS_KERNEL_LAUNCHER(double)
 #define REGISTER_IDXST_IDCTPREPROCESS_KERNEL_LAUNCHER(type)                                        \
     template void idxstIdctPreprocessCudaLauncher<type>(                                           \
             type const *x, type *y, int32_t const M, int32_t const N,                              \
-            type const *__restrict__ expkM, type const *__restrict__ expkN);
+            type const *__restrict__ expkM, type const *__restrict__ expkN, int32_t const batch);
 
 REGISTER_IDXST_IDCTPREPROCESS_KERNEL_LAUNCHER(float)
 REGISTER_IDXST_IDCTPREPROCESS_KERNEL_LAUNCHER(double)
@@ -707,7 +735,7 @@ REGISTER_IDXST_IDCTPREPROCESS_KERNEL_LAUNCHER(double)
 
 #define REGISTER_IDXST_IDCTPOSTPROCESS_KERNEL_LAUNCHER(type)                                       \
     template void idxstIdctPostprocessCudaLauncher<type>(type const *x, type *y, int32_t const M,  \
-                                                         int32_t const N);
+                                                         int32_t const N, int32_t const batch);
 
 REGISTER_IDXST_IDCTPOSTPROCESS_KERNEL_LAUNCHER(float)
 REGISTER_IDXST_IDCTPOSTPROCESS_KERNEL_LAUNCHER(double)
@@ -718,7 +746,7 @@ REGISTER_IDXST_IDCTPOSTPROCESS_KERNEL_LAUNCHER(double)
 #define REGISTER_IDCT2_PREPROCESS_KERNEL_LAUNCHER(type)                                            \
     template void idct2PreprocessCudaLauncher<type>(                                               \
             type const *x, type *y, int32_t const M, int32_t const N,                              \
-            type const *__restrict__ expkM, type const *__restrict__ expkN);
+            type const *__restrict__ expkM, type const *__restrict__ expkN, int32_t const batch);
 
 REGISTER_IDCT2_PREPROCESS_KERNEL_LAUNCHER(float)
 REGISTER_IDCT2_PREPROCESS_KERNEL_LAUNCHER(double)
@@ -727,7 +755,7 @@ REGISTER_IDCT2_PREPROCESS_KERNEL_LAUNCHER(double)
 
 #define REGISTER_IDCT2_POSTPROCESS_KERNEL_LAUNCHER(type)                                           \
     template void idct2PostprocessCudaLauncher<type>(type const *x, type *y, int32_t const M,      \
-                                                     int32_t const N);
+                                                     int32_t const N, int32_t const batch);
 
 REGISTER_IDCT2_POSTPROCESS_KERNEL_LAUNCHER(float)
 REGISTER_IDCT2_POSTPROCESS_KERNEL_LAUNCHER(double)
@@ -1,30 +1,164 @@
-from torch import nn
+import numpy as np
 import torch
-from torch._C import device
+from torch import nn
+
 from . import delay_estimation_cpp
-import pdb
-# from hummingbird import ml
-from torch.utils.data import dataloader
+
+
+def expand_delay_features(features, site_map_width):
+    """Recover the dense pin features of `delay_estimation_cpp.forward` from the compact ones.
+
+    The dense features are the column covering of the driver-sink span over `site_map_width` columns, followed by dy,
+    the RAM flag and the DSP flag. They are only needed by delay models trained on them.
+
+    :param features: compact features of `delay_estimation_cpp.compact_forward`, shape (#pins, 6)
+    :param site_map_width: number of columns of the site map
+    :return: dense features, shape (#pins, site_map_width + 3)
+    """
+    min_x = features[:, 0:1]
+    max_x = min_x + features[:, 1:2]
+    lb = torch.ceil(min_x)
+    rb = torch.floor(max_x)
+    cols = torch.arange(site_map_width, dtype=features.dtype, device=features.device).view(1, -1)
+    dense = ((cols >= lb) & (cols < rb)).to(features.dtype)
+    # the partially covered columns at both ends, the right end is written last as in the C++ feature extraction
+    dense = torch.where(cols == lb - 1, lb - min_x, dense)
+    dense = torch.where(cols == rb, max_x - rb, dense)
+    return torch.cat([dense, features[:, 2:5]], dim=1)
+
+
+class TabulatedDelayModel(nn.Module):
+    """Delay lookup table over the compact pin features.
+
+    The delay of a sink pin is bilinearly interpolated from `table[kind]` at (dx / dx_step, dy / dy_step), where kind
+    is 0 for LUT/FF-only connections, 1 if RAM is involved, 2 if DSP is involved and 3 if both are, plus a linear term
+    of the fanout. Evaluating all pins is a single vectorized call on the device of the table.
+    """
+
+    def __init__(self, table, dx_step=1.0, dy_step=1.0, fanout_coef=0.0):
+        """
+        :param table: delays at the grid points, shape (4, #dx, #dy)
+        :param dx_step: x distance between two grid points
+        :param dy_step: y distance between two grid points
+        :param fanout_coef: delay per fanout
+        """
+        super(TabulatedDelayModel, self).__init__()
+        assert table.dim() == 3 and table.size(0) == 4 and table.size(1) > 1 and table.size(2) > 1
+        self.register_buffer("table", table)
+        self.dx_step = dx_step
+        self.dy_step = dy_step
+        self.fanout_coef = fanout_coef
+
+    def forward(self, features):
+        num_dx, num_dy = self.table.size(1), self.table.size(2)
+        table = self.table.to(features.dtype)
+        x = (features[:, 1] / self.dx_step).clamp(0, num_dx - 1)
+        y = (features[:, 2] / self.dy_step).clamp(0, num_dy - 1)
+        ix = x.floor().clamp_(max=num_dx - 2)
+        iy = y.floor().clamp_(max=num_dy - 2)
+        wx = x - ix
+        wy = y - iy
+        kind = (features[:, 3] + 2 * features[:, 4]).long()
+        base = (kind * num_dx + ix.long()) * num_dy + iy.long()
+        flat = table.view(-1)
+        delays = (flat[base] * (1 - wx) + flat[base + num_dy] * wx) * (1 - wy) + (
+            flat[base + 1] * (1 - wx) + flat[base + num_dy + 1] * wx
+        ) * wy
+        if self.fanout_coef:
+            delays = delays + self.fanout_coef * features[:, 5]
+        return delays
+
+    @classmethod
+    def from_model(cls, delay_model, site_map_width, num_dy, dx_step=1.0, dy_step=1.0, num_x_offsets=4):
+        """Tabulate a delay model trained on the dense pin features.
+
+        Every grid point is evaluated with the span starting at `num_x_offsets` evenly spaced columns and averaged, so
+        the column-specific delays of the model are approximated by their mean.
+
+        :param delay_model: model with a `predict` method on dense features
+        :param site_map_width: number of columns of the site map
+        :param num_dy: number of grid points in y
+        """
+        num_dx = max(int(site_map_width / dx_step) + 1, 2)
+        num_dy = max(num_dy, 2)
+        dx = (torch.arange(num_dx, dtype=torch.float32) * dx_step).clamp(max=site_map_width).view(-1, 1, 1)
+        dy = (torch.arange(num_dy, dtype=torch.float32) * dy_step).view(1, -1, 1)
+        offsets = torch.linspace(0, 1, num_x_offsets, dtype=torch.float32).view(1, 1, -1)
+        shape = (num_dx, num_dy, num_x_offsets)
+        table = torch.zeros(4, num_dx, num_dy)
+        # one kind at a time to bound the size of the dense features
+        for kind in range(4):
+            features = torch.stack(
+                [
+                    torch.round(offsets * (site_map_width - dx)).expand(shape),
+                    dx.expand(shape),
+                    dy.expand(shape),
+                    torch.full(shape, float(kind % 2)),
+                    torch.full(shape, float(kind // 2)),
+                    torch.ones(shape),
+                ],
+                dim=-1,
+            ).view(-1, 6)
+            delays = predict_delays(delay_model, expand_delay_features(features, site_map_width))
+            table[kind] = delays.view(shape).mean(dim=-1)
+        return cls(table, dx_step=dx_step, dy_step=dy_step)
+
+
+def predict_delays(delay_model, features):
+    """Predict with a model of `predict` in one call and return a tensor on the device of the features"""
+    delays = delay_model.predict(features)
+    if isinstance(delays, torch.Tensor):
+        return delays.view(-1).to(features)
+    return torch.from_numpy(np.asarray(delays)).view(-1).to(features)
 
 
 class DelayEstimation(nn.Module):
-    def __init__(self, placedb, data_cls, delay_model, batch_size=1000000):
+    def __init__(self, placedb, data_cls, delay_model):
+        """
+        :param delay_model: either a torch module on the compact pin features, e.g., `TabulatedDelayModel`,
+            or a model with a `predict` method on the dense pin features of `expand_delay_features`
+        """
         super(DelayEstimation, self).__init__()
         self.placedb = placedb
         self.data_cls = data_cls
         self.delay_model = delay_model
-        self.batch_size = batch_size
+        self.site_map_width = placedb.siteMapDim().x()
+        self.net_mask_ignore_large = None
 
     def forward(self, pos):
-        pin_features, ignore_pin_masks = delay_estimation_cpp.forward(
-            self.placedb, self.data_cls.net_mask_ignore_large.cpu(), pos.cpu())
+        if self.net_mask_ignore_large is None:
+            self.net_mask_ignore_large = self.data_cls.net_mask_ignore_large.cpu().contiguous()
+        pin_features, ignore_pin_masks = delay_estimation_cpp.compact_forward(
+            self.placedb, self.net_mask_ignore_large, pos.data.cpu().contiguous())
         if pin_features.device != pos.device:
             pin_features = pin_features.to(pos.device)
-        self.delay_model = self.delay_model.to(pos.device)
-        loader = dataloader.DataLoader(
-            pin_features, batch_size=self.batch_size)
-        pin_delays = [torch.tensor(self.delay_model.predict(samples), device=pos.device)
-                      for samples in loader]
-        pin_delays = torch.cat(pin_delays)
-        pin_delays[ignore_pin_masks] = 0
+            ignore_pin_masks = ignore_pin_masks.to(pos.device)
+        pin_delays = torch.zeros_like(pin_features[:, 0])
+        sink_pins = (~ignore_pin_masks).nonzero().view(-1)
+        pin_delays[sink_pins] = self._predict(pin_features[sink_pins], pos.device).to(pin_delays.dtype)
         return pin_delays, ignore_pin_masks
+
+    def update(self, pos, inst_mask):
+        """Re-estimate the delays of the sink pins on the nets of some instances only.
+
+        :param pos: instance positions
+        :param inst_mask: mask of the instances whose nets are re-estimated
+        :return: (sink pin ids, their delays) on the device of pos
+        """
+        if self.net_mask_ignore_large is None:
+            self.net_mask_ignore_large = self.data_cls.net_mask_ignore_large.cpu().contiguous()
+        pin_mask = inst_mask[self.data_cls.inst_pin_map.b2as.long()]
+        net_ids = torch.unique(self.data_cls.net_pin_map.b2as[pin_mask])
+        pin_ids, pin_features = delay_estimation_cpp.compact_net_forward(
+            self.placedb, self.net_mask_ignore_large, pos.data.cpu().contiguous(), net_ids.int().cpu())
+        pin_ids = pin_ids.to(pos.device).long()
+        pin_features = pin_features.to(pos.device)
+        return pin_ids, self._predict(pin_features, pos.device).to(pin_features.dtype)
+
+    def _predict(self, sink_features, device):
+        if isinstance(self.delay_model, nn.Module):
+            self.delay_model = self.delay_model.to(device)
+            return self.delay_model(sink_features)
+        if hasattr(self.delay_model, "to"):
+            self.delay_model = self.delay_model.to(device)
+        return predict_delays(self.delay_model, expand_delay_features(sink_features, self.site_map_width))
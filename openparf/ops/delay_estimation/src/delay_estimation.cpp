@@ -99,6 +99,73 @@ void ExtractDelayFeatures(database::PlaceDB const& placedb,
   }
 }
 
+/**
+ * @brief Compact counterpart of `ExtractDelayFeatures`. Instead of the column covering features of width
+ *  `site_map_width`, each sink pin gets `kNumCompactDelayFeatures` features: the left x of the driver-sink span, the
+ *  span width dx, the displacement dy, whether the driver/sink is RAM, whether the driver/sink is DSP and the fanout
+ *  of the net. The column covering features can be recovered from the first two.
+ *  Nets are independent and write disjoint pins, so they are processed in parallel.
+ */
+template<class T>
+void ExtractCompactDelayFeatures(database::PlaceDB const& placedb,
+                                 T const*                 pos,
+                                 uint8_t const*           net_mask_ignore_large,
+                                 int32_t                  num_threads,
+                                 T*                       pin_feature,
+                                 bool*                    ignored_pin_masks) {
+  auto    db             = placedb.db();
+  auto&   design         = db->design();
+  auto&   netlist        = design.topModuleInst()->netlist();
+  int32_t vdd_vss_net_id = design.VddVssNetId();
+  int32_t num_nets       = netlist.numNets();
+  int32_t chunk_size     = std::max(int32_t(num_nets / num_threads / 16), 1);
+
+#pragma omp parallel for num_threads(num_threads) schedule(dynamic, chunk_size)
+  for (int32_t net_id = 0; net_id < num_nets; ++net_id) {
+    const auto& pin_ids = netlist.net(net_id).pinIds();
+    // ignore clock net & VDD/VSS net & larget net
+    if (placedb.netIdToClockId(net_id) != InvalidIndex<database::PlaceDB::IndexType>::value ||
+        net_id == vdd_vss_net_id || net_mask_ignore_large[net_id] == 0) {
+      for (const auto& pin_id : pin_ids) {
+        ignored_pin_masks[pin_id] = true;
+      }
+      continue;
+    }
+
+    int32_t driver_pin_id = std::numeric_limits<int32_t>::max();
+    for (const auto& pin_id : pin_ids) {
+      if (netlist.pin(pin_id).attr().signalDirect() == SignalDirection::kOutput) {
+        openparfAssert(driver_pin_id == std::numeric_limits<int32_t>::max());
+        driver_pin_id = pin_id;
+      }
+    }
+    openparfAssert(driver_pin_id != std::numeric_limits<int32_t>::max());
+    ignored_pin_masks[driver_pin_id] = true;
+
+    int32_t source_inst_id = netlist.pin(driver_pin_id).instId();
+    T       driver_x       = pos[source_inst_id << 1];
+    T       driver_y       = pos[source_inst_id << 1 | 1];
+    bool    is_source_ram  = placedb.isInstRAM(source_inst_id);
+    bool    is_source_dsp  = placedb.isInstDSP(source_inst_id);
+    T       fanout         = static_cast<T>(pin_ids.size() - 1);
+    for (const auto& pin_id : pin_ids) {
+      if (pin_id == driver_pin_id) {
+        continue;
+      }
+      T*      feature        = pin_feature + kNumCompactDelayFeatures * pin_id;
+      int32_t target_inst_id = netlist.pin(pin_id).instId();
+      T       sink_x         = pos[target_inst_id << 1];
+      T       sink_y         = pos[target_inst_id << 1 | 1];
+      feature[0]             = std::min(driver_x, sink_x);
+      feature[1]             = std::fabs(driver_x - sink_x);
+      feature[2]             = std::fabs(driver_y - sink_y);
+      feature[3]             = is_source_ram || placedb.isInstRAM(target_inst_id);
+      feature[4]             = is_source_dsp || placedb.isInstDSP(target_inst_id);
+      feature[5]             = fanout;
+    }
+  }
+}
+
 /**
  * @brief Construct the output pin featues. The feature size is `the layout width` + 1 (displacement in the y direction
  * + 1 (whether the driver/sink is BRAM) + 1 (whether the driver/sink is DSP).
@@ -142,12 +209,116 @@ std::tuple<at::Tensor, at::Tensor> DelayEstimationForward(database::PlaceDB cons
   return {pin_features, ignore_pin_masks};
 }
 
+std::tuple<at::Tensor, at::Tensor> DelayEstimationCompactForward(database::PlaceDB const& placedb,
+                                                                 at::Tensor               net_mask_ignore_large,
+                                                                 at::Tensor               pos) {
+  CHECK_FLAT_CPU(pos);
+  CHECK_EVEN(pos);
+  CHECK_CONTIGUOUS(pos);
+  CHECK_FLAT_CPU(net_mask_ignore_large);
+  CHECK_CONTIGUOUS(net_mask_ignore_large);
+
+  int32_t    num_pins         = placedb.db()->design().topModuleInst()->netlist().numPins();
+  at::Tensor pin_features     = at::zeros({num_pins, kNumCompactDelayFeatures}, pos.options());
+  at::Tensor ignore_pin_masks = at::zeros({num_pins}, pos.options().dtype(torch::kBool));
+  OPENPARF_DISPATCH_FLOATING_TYPES(pos, "ExtractCompactDelayFeatures", [&] {
+    ExtractCompactDelayFeatures<scalar_t>(placedb,
+                                          OPENPARF_TENSOR_DATA_PTR(pos, scalar_t),
+                                          OPENPARF_TENSOR_DATA_PTR(net_mask_ignore_large, uint8_t),
+                                          at::get_num_threads(),
+                                          OPENPARF_TENSOR_DATA_PTR(pin_features, scalar_t),
+                                          OPENPARF_TENSOR_DATA_PTR(ignore_pin_masks, bool));
+  });
+  return {pin_features, ignore_pin_masks};
+}
+
+std::tuple<at::Tensor, at::Tensor> DelayEstimationCompactNetForward(database::PlaceDB const& placedb,
+                                                                    at::Tensor               net_mask_ignore_large,
+                                                                    at::Tensor               pos,
+                                                                    at::Tensor               net_ids) {
+  CHECK_FLAT_CPU(pos);
+  CHECK_EVEN(pos);
+  CHECK_CONTIGUOUS(pos);
+  CHECK_FLAT_CPU(net_mask_ignore_large);
+  CHECK_CONTIGUOUS(net_mask_ignore_large);
+  CHECK_FLAT_CPU(net_ids);
+  CHECK_CONTIGUOUS(net_ids);
+  CHECK_TYPE(net_ids, torch::kInt32);
+
+  auto&                design         = placedb.db()->design();
+  auto&                netlist        = design.topModuleInst()->netlist();
+  int32_t              vdd_vss_net_id = design.VddVssNetId();
+  int32_t              num_nets       = net_ids.numel();
+  auto const*          net_id_data    = OPENPARF_TENSOR_DATA_PTR(net_ids, int32_t);
+  auto const*          ignore_large   = OPENPARF_TENSOR_DATA_PTR(net_mask_ignore_large, uint8_t);
+  std::vector<int32_t> sink_start(num_nets + 1, 0);
+  for (int32_t i = 0; i < num_nets; ++i) {
+    int32_t net_id    = net_id_data[i];
+    bool    is_timed  = placedb.netIdToClockId(net_id) == InvalidIndex<database::PlaceDB::IndexType>::value &&
+                     net_id != vdd_vss_net_id && ignore_large[net_id] != 0;
+    sink_start[i + 1] = sink_start[i] + (is_timed ? netlist.net(net_id).pinIds().size() - 1 : 0);
+  }
+  at::Tensor pin_ids      = at::empty({sink_start.back()}, net_ids.options());
+  at::Tensor pin_features = at::zeros({sink_start.back(), kNumCompactDelayFeatures}, pos.options());
+  auto*      pin_id_data  = OPENPARF_TENSOR_DATA_PTR(pin_ids, int32_t);
+  int32_t    num_threads  = std::max(at::get_num_threads(), 1);
+  int32_t    chunk_size   = std::max(int32_t(num_nets / num_threads / 16), 1);
+
+  OPENPARF_DISPATCH_FLOATING_TYPES(pos, "ExtractCompactDelayFeatures", [&] {
+    auto const* pos_data     = OPENPARF_TENSOR_DATA_PTR(pos, scalar_t);
+    auto*       feature_data = OPENPARF_TENSOR_DATA_PTR(pin_features, scalar_t);
+#pragma omp parallel for num_threads(num_threads) schedule(dynamic, chunk_size)
+    for (int32_t i = 0; i < num_nets; ++i) {
+      if (sink_start[i] == sink_start[i + 1]) {
+        continue;
+      }
+      const auto& net_pin_ids   = netlist.net(net_id_data[i]).pinIds();
+      int32_t     driver_pin_id = std::numeric_limits<int32_t>::max();
+      for (const auto& pin_id : net_pin_ids) {
+        if (netlist.pin(pin_id).attr().signalDirect() == SignalDirection::kOutput) {
+          driver_pin_id = pin_id;
+        }
+      }
+      openparfAssert(driver_pin_id != std::numeric_limits<int32_t>::max());
+      int32_t  source_inst_id = netlist.pin(driver_pin_id).instId();
+      scalar_t driver_x       = pos_data[source_inst_id << 1];
+      scalar_t driver_y       = pos_data[source_inst_id << 1 | 1];
+      bool     is_source_ram  = placedb.isInstRAM(source_inst_id);
+      bool     is_source_dsp  = placedb.isInstDSP(source_inst_id);
+      int32_t  k              = sink_start[i];
+      for (const auto& pin_id : net_pin_ids) {
+        if (pin_id == driver_pin_id) {
+          continue;
+        }
+        scalar_t* feature        = feature_data + kNumCompactDelayFeatures * k;
+        int32_t   target_inst_id = netlist.pin(pin_id).instId();
+        scalar_t  sink_x         = pos_data[target_inst_id << 1];
+        scalar_t  sink_y         = pos_data[target_inst_id << 1 | 1];
+        pin_id_data[k++]         = pin_id;
+        feature[0]               = std::min(driver_x, sink_x);
+        feature[1]               = std::fabs(driver_x - sink_x);
+        feature[2]               = std::fabs(driver_y - sink_y);
+        feature[3]               = is_source_ram || placedb.isInstRAM(target_inst_id);
+        feature[4]               = is_source_dsp || placedb.isInstDSP(target_inst_id);
+        feature[5]               = static_cast<scalar_t>(net_pin_ids.size() - 1);
+      }
+    }
+  });
+  return {pin_ids, pin_features};
+}
+
 #define REGISTER_KERNEL_LAUNCHER(T)                                                                                    \
   template void ExtractDelayFeatures<T>(database::PlaceDB const& placedb,                                              \
                                         T*                       pos,                                                  \
                                         uint8_t*                 net_mask_ignore_large,                                \
                                         T*                       pin_features,                                         \
-                                        bool*                    ignore_pin_masks);
+                                        bool*                    ignore_pin_masks);                                    \
+  template void ExtractCompactDelayFeatures<T>(database::PlaceDB const& placedb,                                       \
+                                               T const*                 pos,                                           \
+                                               uint8_t const*           net_mask_ignore_large,                         \
+                                               int32_t                  num_threads,                                   \
+                                               T*                       pin_features,                                  \
+                                               bool*                    ignore_pin_masks);
 
 REGISTER_KERNEL_LAUNCHER(float)
 REGISTER_KERNEL_LAUNCHER(double)
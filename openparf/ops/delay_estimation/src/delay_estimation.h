@@ -13,10 +13,26 @@
 OPENPARF_BEGIN_NAMESPACE
 
 namespace delay_estimation {
+
+/// @brief number of features per pin returned by `DelayEstimationCompactForward`,
+///  i.e., x of the left end, dx, dy, RAM flag, DSP flag and fanout
+constexpr int32_t kNumCompactDelayFeatures = 6;
+
 std::tuple<at::Tensor, at::Tensor> DelayEstimationForward(database::PlaceDB const& placedb,
                                                           at::Tensor               net_mask_ignore_large,
                                                           at::Tensor               pos);
 
+/// @brief compact features of the sink pins of the given nets only, the pins of clock nets, the VDD/VSS net and
+///  large nets are skipped. Return the sink pin ids and their features.
+std::tuple<at::Tensor, at::Tensor> DelayEstimationCompactNetForward(database::PlaceDB const& placedb,
+                                                                    at::Tensor               net_mask_ignore_large,
+                                                                    at::Tensor               pos,
+                                                                    at::Tensor               net_ids);
+
+std::tuple<at::Tensor, at::Tensor> DelayEstimationCompactForward(database::PlaceDB const& placedb,
+                                                                 at::Tensor               net_mask_ignore_large,
+                                                                 at::Tensor               pos);
+
 }
 
 OPENPARF_END_NAMESPACE
@@ -2,4 +2,11 @@
 
 PYBIND11_MODULE(TORCH_EXTENSION_NAME, m) {
   m.def("forward", &OPENPARF_NAMESPACE::delay_estimation::DelayEstimationForward, "Delay Estimation Forward");
+  m.def("compact_forward",
+        &OPENPARF_NAMESPACE::delay_estimation::DelayEstimationCompactForward,
+        "Delay Estimation Forward with compact pin features");
+  m.def("compact_net_forward",
+        &OPENPARF_NAMESPACE::delay_estimation::DelayEstimationCompactNetForward,
+        "Delay Estimation Forward with compact pin features on the sink pins of some nets");
+  m.attr("num_compact_features") = OPENPARF_NAMESPACE::delay_estimation::kNumCompactDelayFeatures;
 }
\ No newline at end of file
@@ -29,15 +29,10 @@ class DensityMapFunction(object):
                 smooth_flag,
                 deterministic_flag,
                 density_maps):
-        if pos.is_cuda:
-            func = density_map_cuda.movableForward
-        else:
-            func = density_map_cpp.movableForward
-        func(pos, inst_sizes_stretched, inst_weights,
-             bin_map_dims, xl, yl, xh, yh, movable_range, filler_range,
-             inst_sizes_stretched.shape[1],
-             deterministic_flag,
-             density_maps)
+        DensityMapFunction.scatter(pos, inst_sizes_stretched, inst_weights,
+                                   bin_map_dims, xl, yl, xh, yh,
+                                   movable_range, filler_range,
+                                   deterministic_flag, density_maps)
 
         # clear density map for area_type_mask = 0
         for area_type in range(len(density_maps)):
@@ -55,19 +50,41 @@ class DensityMapFunction(object):
 
         return density_maps
 
+    @staticmethod
+    def scatter(pos, inst_sizes_stretched, inst_weights,
+                bin_map_dims,
+                xl, yl, xh, yh, movable_range, filler_range,
+                deterministic_flag,
+                density_maps):
+        """Add the areas of movable and filler cells to density maps.
+        Cells with zero sizes are skipped.
+        """
+        if pos.is_cuda:
+            func = density_map_cuda.movableForward
+        else:
+            func = density_map_cpp.movableForward
+        func(pos, inst_sizes_stretched, inst_weights,
+             bin_map_dims, xl, yl, xh, yh, movable_range, filler_range,
+             inst_sizes_stretched.shape[1],
+             deterministic_flag,
+             density_maps)
+
 
 class DensityMap(object):
     """
     @brief Compute density map for both movable and fixed cells.
     The density map for fixed cells is pre-computed.
     Each call will only compute the density map for movable cells.
+    Movable and filler cells locked by lock() are folded into the static
+    density map together with fixed cells, and skipped afterwards.
     """
 
     def __init__(self, inst_sizes,
                  initial_density_maps,
                  bin_map_dims, area_type_mask,
                  xl, yl, xh, yh, movable_range, filler_range,
-                 fixed_range, stretch_flag, smooth_flag, deterministic_flag):
+                 fixed_range, stretch_flag, smooth_flag, deterministic_flag,
+                 compute_dtype=None, workspace=None):
         """
         @brief initialization
         @param inst_sizes cell (width, height) array consisting of movable cells, fixed cells, and filler cells in order
@@ -84,9 +101,13 @@ class DensityMap(object):
         @param stretch_flag whether stretch cell area
         @param smooth_flag whether perform smoothing
         @param deterministic_flag whether use deterministic mode
+        @param compute_dtype dtype of the stretched sizes and density maps, e.g., float32
+            with float64 positions; the dtype of inst_sizes by default
+        @param workspace optional workspace providing the density map buffers, see py_utils.workspace
         """
         super(DensityMap, self).__init__()
         self.inst_sizes = inst_sizes
+        self.compute_dtype = inst_sizes.dtype if compute_dtype is None else compute_dtype
         assert len(self.inst_sizes.shape) == 3 and self.inst_sizes.shape[-1] == 2
         self.num_insts = self.inst_sizes.shape[0]
         #self.inst_area_types = inst_area_types
@@ -104,12 +125,24 @@ class DensityMap(object):
         self.smooth_flag = smooth_flag
         self.deterministic_flag = deterministic_flag
         self.fixed_density_maps = None
+        # locked cells, see lock()
+        self.inst_lock_mask = None
+        # fixed and locked cells
+        self.static_density_maps = None
+        # stretched sizes with zero sizes for locked cells
+        self.inst_sizes_unlocked = None
+        # density maps reused across calls
+        self.density_map_buffers = None
+        self.workspace = workspace
 
         self.reset()
 
     def reset(self):
         """Reset stretched sizes, and weights
         """
+        # derived from the stretched sizes, rebuild at the next forward
+        self.static_density_maps = None
+        self.density_map_buffers = None
         self.bin_sizes = [None] * self.num_area_types
         self.bin_map_areas = [None] * self.num_area_types
         for area_type in range(self.num_area_types):
@@ -144,6 +177,9 @@ class DensityMap(object):
         else:
             self.inst_sizes_stretched = self.inst_sizes
             self.inst_weights = self.inst_sizes.new_ones(self.num_insts, self.num_area_types)
+        # stretching is done in the dtype of inst_sizes, the scatter in compute_dtype
+        self.inst_sizes_stretched = self.inst_sizes_stretched.to(self.compute_dtype)
+        self.inst_weights = self.inst_weights.to(self.compute_dtype)
 
     @property
     def num_area_types(self):
@@ -160,7 +196,7 @@ class DensityMap(object):
                 fixed_density_maps[area_type] = pos.new_zeros([M, N])
             else:
                 fixed_density_maps[area_type] = self.initial_density_maps[
-                    area_type].clone()
+                    area_type].to(pos.dtype, copy=True)
         if pos.is_cuda:
             func = density_map_cuda.fixedForward
         else:
@@ -183,17 +219,70 @@ class DensityMap(object):
                 max=self.bin_map_areas[area_type])
         return fixed_density_maps
 
-    def forward(self, pos):
+    def lock(self, inst_lock_mask):
         """
-        @brief API
-        @param pos cell centers. The array consists of (x, y) locations of all cells
+        @brief Fold cells that will not move anymore into the static density map.
+        The static map is built from the positions at the next forward.
+        @param inst_lock_mask length of #cells, 1 for locked cells
+        """
+        if inst_lock_mask is not None and inst_lock_mask.any():
+            self.inst_lock_mask = inst_lock_mask.clone()
+        else:
+            self.inst_lock_mask = None
+        self.static_density_maps = None
+
+    def staticForward(self, pos):
+        """Compute density map for fixed cells and locked cells
         """
         if self.fixed_density_maps is None:
             self.fixed_density_maps = self.fixedForward(pos)
+        if self.inst_lock_mask is None:
+            self.inst_sizes_unlocked = self.inst_sizes_stretched
+            return self.fixed_density_maps
+
+        locked = self.inst_lock_mask.view([-1, 1, 1]).bool()
+        static_density_maps = [x.clone() for x in self.fixed_density_maps]
+        DensityMapFunction.scatter(
+            pos, self.inst_sizes_stretched.masked_fill(~locked, 0),
+            self.inst_weights,
+            self.bin_map_dims,
+            self.xl, self.yl, self.xh, self.yh, self.movable_range,
+            self.filler_range, self.deterministic_flag, static_density_maps)
+        self.inst_sizes_unlocked = self.inst_sizes_stretched.masked_fill(locked, 0)
+        return static_density_maps
+
+    def initDensityMaps(self, pos):
+        """Density maps initialized with the static density maps,
+        written into buffers reused across calls
+        """
+        if self.static_density_maps is None:
+            self.static_density_maps = self.staticForward(pos)
+        if self.density_map_buffers is None:
+            if self.workspace is not None:
+                # named after the op, as density_op and overflow_op may be evaluated together
+                self.density_map_buffers = [
+                    self.workspace.like(
+                        "%s.density_map.%d" % (type(self).__name__, area_type), x)
+                    for area_type, x in enumerate(self.static_density_maps)
+                ]
+            else:
+                self.density_map_buffers = [
+                    torch.empty_like(x) for x in self.static_density_maps
+                ]
+        return [
+            buf.copy_(x)
+            for buf, x in zip(self.density_map_buffers, self.static_density_maps)
+        ]
 
-        density_maps = [x.clone() for x in self.fixed_density_maps]
+    def forward(self, pos):
+        """
+        @brief API
+        @param pos cell centers. The array consists of (x, y) locations of all cells
+        """
+        pos = pos.to(self.compute_dtype)
+        density_maps = self.initDensityMaps(pos)
         DensityMapFunction.forward(
-            pos, self.inst_sizes_stretched,
+            pos, self.inst_sizes_unlocked,
             self.inst_weights,
             self.bin_map_dims, self.area_type_mask,
             self.xl, self.yl, self.xh, self.yh, self.movable_range,
@@ -219,7 +308,9 @@ class DensityOverflow(DensityMap):
                  xl, yl, xh, yh, movable_range, filler_range,
                  fixed_range, stretch_flag, smooth_flag,
                  deterministic_flag,
-                 target_density):
+                 target_density,
+                 compute_dtype=None,
+                 workspace=None):
         self.target_density = target_density
         super(DensityOverflow,
               self).__init__(inst_sizes,
@@ -227,7 +318,8 @@ class DensityOverflow(DensityMap):
                              initial_density_maps,
                              bin_map_dims, area_type_mask,
                              xl, yl, xh, yh, movable_range,
-                             filler_range, fixed_range, stretch_flag, smooth_flag, deterministic_flag)
+                             filler_range, fixed_range, stretch_flag, smooth_flag, deterministic_flag,
+                             compute_dtype, workspace)
 
     def fixedForward(self, pos):
         """Fixed density map should have an upper limit of 1 even with target density
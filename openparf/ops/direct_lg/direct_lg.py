@@ -91,16 +91,35 @@ class DirectLegalize(object):
         self.param.numClockNet = 0
         self.param.numHalfColumn = 0
         self.param.maxClockNetPerHalfColumn = 0
+        self.inst_to_clock_indexes = []
+        self.legalizer = None
+
+    def persistent_legalizer(self):
+        """
+        @brief legalizer keeping the DL problem across calls, built at the first
+        call as subclasses complete the parameters after this initialization
+        """
+        if self.legalizer is None:
+            self.legalizer = direct_lg_cpp.DirectLegalizer(
+                self.placedb,
+                self.param,
+                self.inst_to_clock_indexes)
+        return self.legalizer
+
+    def phase_times(self):
+        """
+        @brief runtime in ms of building the problem and of the phases of the last call
+        """
+        if self.legalizer is None:
+            return {}
+        return dict(self.legalizer.phase_times())
 
     def forward(self, pos):
         if pos.is_cuda:
             local_pos = pos.cpu()
         else:
             local_pos = pos
-        return direct_lg_cpp.forward(
-            self.placedb,
-            self.param,
-            local_pos).to(pos.device)
+        return self.persistent_legalizer().forward(local_pos).to(pos.device)
 
     def __call__(self, pos):
         return self.forward(pos)
@@ -130,10 +149,7 @@ class ClockAwareDirectLegalize(DirectLegalize):
             return super(ClockAwareDirectLegalize, self).forward(pos)
         assert self.clock_available_clock_region is not None
         local_pos = pos.cpu() if pos.is_cuda else pos
-        p, hc_avail_map = direct_lg_cpp.clock_aware_forward(
-            self.placedb,
-            self.param,
+        p, hc_avail_map = self.persistent_legalizer().clock_aware_forward(
             local_pos,
-            self.inst_to_clock_indexes,
             self.clock_available_clock_region)
         return p.to(pos.device), hc_avail_map
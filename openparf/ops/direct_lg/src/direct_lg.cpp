@@ -8,7 +8,9 @@
 #include "ops/direct_lg/src/direct_lg.h"
 
 // C++ standard library headers
+#include <string>
 #include <tuple>
+#include <utility>
 #include <vector>
 
 // project headers
@@ -118,6 +120,114 @@ std::tuple<at::Tensor, at::Tensor> ClockAwareDirectLegalizeForward(
   return {pos, hc_avail_map};
 }
 
+DirectLegalizer::DirectLegalizer(database::PlaceDB const          &placedb,
+                                 py::object                        pyparam,
+                                 std::vector<std::vector<int32_t>> inst_to_clock_indexes)
+    : placedb_(placedb),
+      param_(direct_lg::DirectLegalizeParam::ParseFromPyObject(pyparam)),
+      inst_to_clock_indexes_(std::move(inst_to_clock_indexes)) {
+  using direct_lg::RealType;
+
+  Stopwatch stopwatch;
+  stopwatch.start();
+  param_.honorHalfColumnConstraint  = false;
+  param_.honorClockRegionConstraint = false;
+  prob_.useXarchLgRule              = param_.useXarchLgRule;
+  prob_.instXYs.resize(placedb.numInsts());
+  direct_lg::initDLProblem(placedb, prob_);
+  solver_.reset(new direct_lg::DLSolver(
+          prob_,
+          param_,
+          [](int32_t instance_id, const RealType &site_x, const RealType &site_y) -> bool { return true; },
+          [](RealType x, RealType y) { return -1; },
+          inst_to_clock_indexes_,
+          at::get_num_threads()));
+  build_time_ = stopwatch.elapsed<mus>() / 1000.0;
+}
+
+template<typename T>
+void DirectLegalizer::run(T const *init_pos, T *pos, uint8_t *hc_avail_map) {
+  for (uint32_t i = 0; i < prob_.instXYs.size(); ++i) {
+    prob_.instXYs[i].set(init_pos[(i << 1)], init_pos[(i << 1) + 1]);
+  }
+  solver_->updateInstLocs(prob_.instXYs);
+  solver_->run();
+
+  direct_lg::writeDLSolution(placedb_, prob_, *solver_, init_pos, pos);
+  if (param_.honorHalfColumnConstraint) {
+    direct_lg::writeHalfColumnAvailabilityMapSolution(placedb_, *solver_, hc_avail_map);
+  }
+}
+
+at::Tensor DirectLegalizer::forward(at::Tensor init_pos) {
+  using direct_lg::RealType;
+
+  CHECK_FLAT_CPU(init_pos);
+  CHECK_EVEN(init_pos);
+  CHECK_CONTIGUOUS(init_pos);
+
+  auto pos                          = at::zeros({placedb_.numInsts(), 3}, init_pos.options());
+  auto hc_avail_map                 = at::zeros({1}, torch::dtype(torch::kUInt8));
+  param_.honorHalfColumnConstraint  = false;
+  param_.honorClockRegionConstraint = false;
+  solver_->setClockFunctors(
+          [](int32_t instance_id, const RealType &site_x, const RealType &site_y) -> bool { return true; },
+          [](RealType x, RealType y) { return -1; });
+
+  OPENPARF_DISPATCH_FLOATING_TYPES(pos, "DirectLegalizer::forward", [&] {
+    run<scalar_t>(OPENPARF_TENSOR_DATA_PTR(init_pos, scalar_t),
+                  OPENPARF_TENSOR_DATA_PTR(pos, scalar_t),
+                  OPENPARF_TENSOR_DATA_PTR(hc_avail_map, uint8_t));
+  });
+  return pos;
+}
+
+std::tuple<at::Tensor, at::Tensor> DirectLegalizer::clockAwareForward(at::Tensor init_pos,
+                                                                      at::Tensor clock_available_clock_region) {
+  using direct_lg::RealType;
+
+  CHECK_FLAT_CPU(init_pos);
+  CHECK_EVEN(init_pos);
+  CHECK_CONTIGUOUS(init_pos);
+
+  CHECK_FLAT_CPU(clock_available_clock_region);
+  CHECK_CONTIGUOUS(clock_available_clock_region);
+
+  auto pos = at::zeros({placedb_.numInsts(), 3}, init_pos.options());
+  auto hc_avail_map =
+          at::zeros({placedb_.numClockNets(), placedb_.numHalfColumnRegions()}, torch::dtype(torch::kUInt8));
+  param_.honorHalfColumnConstraint  = true;
+  param_.honorClockRegionConstraint = true;
+
+  LayoutXy2GridIndexFunctorType<RealType> xy_to_cr_idx = [this](RealType x, RealType y) {
+    return placedb_.XyToCrIndex(x, y);
+  };
+  LayoutXy2GridIndexFunctorType<RealType> xy_to_half_column_idx_functor = [this](RealType x, RealType y) {
+    return placedb_.XyToHcIndex(x, y);
+  };
+  // the checker reads clock_available_clock_region, which outlives the run
+  solver_->setClockFunctors(
+          GenClockAvailChecker<RealType>(inst_to_clock_indexes_, clock_available_clock_region, xy_to_cr_idx),
+          xy_to_half_column_idx_functor);
+
+  OPENPARF_DISPATCH_FLOATING_TYPES(pos, "DirectLegalizer::clockAwareForward", [&] {
+    run<scalar_t>(OPENPARF_TENSOR_DATA_PTR(init_pos, scalar_t),
+                  OPENPARF_TENSOR_DATA_PTR(pos, scalar_t),
+                  OPENPARF_TENSOR_DATA_PTR(hc_avail_map, uint8_t));
+  });
+  return {pos, hc_avail_map};
+}
+
+std::vector<std::pair<std::string, double>> DirectLegalizer::phaseTimes() const {
+  auto const &times = solver_->phaseTimes();
+  return {{"build", build_time_},
+          {"preclustering", times.preclustering},
+          {"neighbors", times.neighbors},
+          {"iterations", times.iterations},
+          {"ripup", times.ripup},
+          {"slot_assign", times.slotAssign}};
+}
+
 OPENPARF_END_NAMESPACE
 
 PYBIND11_MODULE(TORCH_EXTENSION_NAME, m) {
@@ -125,4 +235,15 @@ PYBIND11_MODULE(TORCH_EXTENSION_NAME, m) {
           .def("clock_aware_forward",
                &OPENPARF_NAMESPACE::ClockAwareDirectLegalizeForward,
                "Clock-aware direct legalization forward");
+  py::class_<OPENPARF_NAMESPACE::DirectLegalizer>(m, "DirectLegalizer")
+          .def(py::init<OPENPARF_NAMESPACE::database::PlaceDB const &,
+                        py::object,
+                        std::vector<std::vector<int32_t>>>())
+          .def("forward",
+               &OPENPARF_NAMESPACE::DirectLegalizer::forward,
+               "Direct legalization forward on the persistent problem")
+          .def("clock_aware_forward",
+               &OPENPARF_NAMESPACE::DirectLegalizer::clockAwareForward,
+               "Clock-aware direct legalization forward on the persistent problem")
+          .def("phase_times", &OPENPARF_NAMESPACE::DirectLegalizer::phaseTimes);
 }
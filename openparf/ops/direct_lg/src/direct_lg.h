@@ -10,13 +10,21 @@
 #define OPENPARF_OPS_DIRECT_LG_SRC_DIRECT_LG_H_
 
 // C++ standard library headers
+#include <memory>
+#include <string>
 #include <tuple>
+#include <utility>
 #include <vector>
 
 // project headers
 #include "database/placedb.h"
 #include "util/torch.h"
 
+// local headers
+#include "ops/direct_lg/src/direct_lg_db.h"
+#include "ops/direct_lg/src/dl_problem.h"
+#include "ops/direct_lg/src/dl_solver.h"
+
 OPENPARF_BEGIN_NAMESPACE
 
 /**
@@ -44,6 +52,45 @@ std::tuple<at::Tensor, at::Tensor> ClockAwareDirectLegalizeForward(
         const std::vector<std::vector<int32_t>> &inst_to_clock_indexes,
         at::Tensor                               clock_available_clock_region);
 
+/**
+ * @brief Direct legalizer keeping the DL problem and the solver across calls.
+ * The netlist, the site map and the control sets are built once from the
+ * placement database, a call only sets the instance locations and the clock
+ * region availability before running the solver.
+ */
+class DirectLegalizer {
+ public:
+  /**
+   * @param placedb Placement database
+   * @param pyparam Python object recording the parameters
+   * @param inst_to_clock_indexes Clock indexes of each instance, only used by the clock-aware legalization
+   */
+  DirectLegalizer(database::PlaceDB const          &placedb,
+                  py::object                        pyparam,
+                  std::vector<std::vector<int32_t>> inst_to_clock_indexes);
+
+  /// @brief Same as directLegalizeForward
+  at::Tensor                                  forward(at::Tensor init_pos);
+
+  /// @brief Same as ClockAwareDirectLegalizeForward
+  std::tuple<at::Tensor, at::Tensor>          clockAwareForward(at::Tensor init_pos,
+                                                                at::Tensor clock_available_clock_region);
+
+  /// @brief Runtime in milliseconds of building the problem and of the phases of the last call
+  std::vector<std::pair<std::string, double>> phaseTimes() const;
+
+ private:
+  template<typename T>
+  void                                 run(T const *init_pos, T *pos, uint8_t *hc_avail_map);
+
+  database::PlaceDB const             &placedb_;
+  direct_lg::DirectLegalizeParam       param_;
+  std::vector<std::vector<int32_t>>    inst_to_clock_indexes_;
+  direct_lg::DLProblem                 prob_;
+  std::unique_ptr<direct_lg::DLSolver> solver_;   // refers to param_ and inst_to_clock_indexes_
+  double                               build_time_;
+};
+
 OPENPARF_END_NAMESPACE
 
 #endif   // OPENPARF_OPS_DIRECT_LG_SRC_DIRECT_LG_H_
@@ -46,13 +46,23 @@ void DLSolver::buildDLProblem(DLProblem const &prob) {
 
   // Initialize control sets
   initControlSets();
+}
 
-  // Initialize clock related data structures.
-  if (_param.honorClockRegionConstraint) {
-    initClockConstraints();
+/// Set the initial instance locations of the next run
+void DLSolver::updateInstLocs(const std::vector<XY<RealType>> &instXYs) {
+  openparfAssert(instXYs.size() == numInsts());
+  for (IndexType i = 0; i < instXYs.size(); ++i) {
+    _instArray[_instIdMapping[i]].loc = instXYs[i];
   }
 }
 
+/// Set the clock related functors of the next run
+void DLSolver::setClockFunctors(ClockAvailCheckerType<RealType>         legality_check_functor,
+                                LayoutXy2GridIndexFunctorType<RealType> xy_to_half_column_functor) {
+  _legality_check_functor    = std::move(legality_check_functor);
+  _xy_to_half_column_functor = std::move(xy_to_half_column_functor);
+}
+
 /// Build the netlist
 void DLSolver::buildNetlist(DLProblem const &prob) {
   // Construct instances and set their locations, types, and demands
@@ -396,16 +406,27 @@ bool DLSolver::checkHalfColumnSatAndPruneClock() {
 
 /// Top function to perform the direct legalization
 void DLSolver::run() {
-  DLStatus status;
+  DLStatus  status;
+  Stopwatch stopwatch;
+  auto      lap = [&]() { return stopwatch.lap<mus>() / 1000.0; };
+  stopwatch.start();
 
   for (auto &instance : _instArray) {
     instance.initLock();
   }
+  // Initialize clock related data structures.
+  // The score boards depend on the locations of the DONTCARE instances, so they are built at every run
+  _hcsbArray.clear();
+  if (_param.honorClockRegionConstraint) {
+    initClockConstraints();
+  }
   // Initialization
   initNets();
   preclustering();
+  _phaseTimes.preclustering = lap();
   initSiteNeighbors();
   allocateMemory();
+  _phaseTimes.neighbors = lap();
 
   // Perform DL kernel
   runDLInit();
@@ -423,6 +444,7 @@ void DLSolver::run() {
     printDLStatus();
   }
   printDLStatistics();
+  _phaseTimes.iterations = lap();
 
   // Iteratively perform post legalization to legalize remaining instances & to conform with
   // clock region constraints. Also conform with hc constraints by using a scoreboard relaxation
@@ -435,10 +457,12 @@ void DLSolver::run() {
   } while (!checkHalfColumnSatAndPruneClock());
 
   printPostLegalizationStatistics();
+  _phaseTimes.ripup = lap();
   // Perform slot assignment
   runSlotAssign();
 
   cacheSolution();
+  _phaseTimes.slotAssign = lap();
 
   for (auto &instance : _instArray) {
     instance.destroyLock();
@@ -600,6 +624,7 @@ void DLSolver::initSiteNeighbors() {
     // Set group ranges
     auto &site = _siteMap[i];
     site.nbrList.clear();
+    site.nbrRanges.clear();
     site.nbrList.reserve(list.size());
     if (!list.empty()) {
       site.nbrRanges.resize(numGroups + 1);
@@ -622,7 +647,7 @@ void DLSolver::initSiteNeighbors() {
 
 /// Allocate memory before a DL run
 void DLSolver::allocateMemory() {
-  _threadMemArray.resize(omp_get_max_threads());
+  _threadMemArray.resize(std::max<IndexType>(_num_threads, omp_get_max_threads()));
 }
 
 /// Run DL initialization
@@ -630,6 +655,8 @@ void DLSolver::runDLInit() {
   // Initialize sites
   for (IndexType i = 0; i < numSites(); ++i) {
     auto &site = _siteMap[i];
+    site.nbr.clear();
+    site.nbrGroupIdx = 0;
     if (site.numNbrGroups() > 0) {
       site.nbr.assign(site.nbrList.begin() + site.nbrRanges[0], site.nbrList.begin() + site.nbrRanges[1]);
       site.nbrGroupIdx = 1;
@@ -319,6 +319,15 @@ class DLSolver {
 
 
  public:
+  /// Runtime of the phases of a run, in milliseconds
+  struct PhaseTimes {
+    double preclustering = 0;   // Net initialization and pre-clustering
+    double neighbors     = 0;   // Site neighbor initialization
+    double iterations    = 0;   // DL candidate iterations
+    double ripup         = 0;   // Rip-up legalization and half column pruning
+    double slotAssign    = 0;   // Slot assignment
+  };
+
   DLSolver(const DLProblem &                        prob,
            const DirectLegalizeParam &              param,
            ClockAvailCheckerType<RealType>          legality_check_functor,
@@ -336,6 +345,17 @@ class DLSolver {
   // Get the final DL solution of a instance
   const DLInstanceSol &instSol(IndexType i) const { return _instArray[_instIdMapping[i]].sol; }
 
+  /// Set the initial instance locations of the next run, indexed by the original instance IDs.
+  /// The netlist and the site map are kept, so a solver can run again on new locations.
+  void                 updateInstLocs(const std::vector<XY<RealType>> &instXYs);
+
+  /// Set the clock region legality checker and the half column mapping of the next run
+  void                 setClockFunctors(ClockAvailCheckerType<RealType>         legality_check_functor,
+                                        LayoutXy2GridIndexFunctorType<RealType> xy_to_half_column_functor);
+
+  /// Runtime of the phases of the last run, in milliseconds
+  const PhaseTimes    &phaseTimes() const { return _phaseTimes; }
+
  private:
   IndexType    numInsts() const { return _instArray.size(); }
   IndexType    numNets() const { return _netArray.size(); }
@@ -458,6 +478,7 @@ class DLSolver {
   std::vector<HalfColumnRegionScoreBoard>  _hcsbArray;        // half column score board array
   const std::vector<std::vector<int32_t>> &_instClockIndex;   // Clock Indexes of instances
   IndexType                                _num_threads;      // number of threads
+  PhaseTimes                               _phaseTimes;       // runtime of the phases of the last run
 };
 
 /// Compute the centroid of a set of instances
@@ -17,7 +17,6 @@ from torch.nn import functional as F
 import logging
 
 from ..dct import dct
-from ..dct.discrete_spectral_transform import getExactExpk as precomputeExpk
 
 from ..density_map.density_map import DensityMapFunction, DensityOverflow
 
@@ -48,7 +47,9 @@ class ElectricOverflow(DensityOverflow):
                  target_density,
                  smooth_flag,
                  deterministic_flag,
-                 movable_macro_mask=None):
+                 movable_macro_mask=None,
+                 compute_dtype=None,
+                 workspace=None):
         self.movable_macro_mask = movable_macro_mask
         super(ElectricOverflow,
               self).__init__(inst_sizes=inst_sizes,
@@ -66,7 +67,9 @@ class ElectricOverflow(DensityOverflow):
                              stretch_flag=True,
                              smooth_flag=smooth_flag,
                              deterministic_flag=deterministic_flag,
-                             target_density=target_density)
+                             target_density=target_density,
+                             compute_dtype=compute_dtype,
+                             workspace=workspace)
 
     def reset(self):
         super(ElectricOverflow, self).reset()
@@ -85,60 +88,159 @@ class ElectricOverflow(DensityOverflow):
 
 
 class ElectrostaticSystem(object):
-    """Compute electrostatic system given density maps
+    """Compute electrostatic system given density maps.
+    Area types with the same bin map dimensions are solved together,
+    i.e., their density maps are stacked into a batch and each spectral
+    transform runs once over the batch.
+    Frozen area types are not solved; their latest results are reused.
     """
 
     def __init__(self, bin_map_dims, bin_sizes, dtype, device, fast_mode,
-                 xy_ratio):
+                 xy_ratio, batch_flag=True, dct_backend="fft",
+                 spectral_energy_flag=False, workspace=None):
+        """
+        @param batch_flag if false, solve each area type separately
+        @param dct_backend backend of the spectral transforms, see dct.selectBackend
+        @param spectral_energy_flag if true and not in fast mode, compute the energy from
+            the dct coefficients without potential maps
+        @param workspace optional workspace providing the scratch maps, see py_utils.workspace
+        """
         self.fast_mode = fast_mode
         # wirelength of x and y directions may have different weights
         # assume this is wx / wy
         self.xy_ratio = xy_ratio
-        num_area_types = len(bin_map_dims)
-        self.inv_wu2_plus_wv2 = [None] * num_area_types
-        self.wu_by_wu2_plus_wv2_half = [None] * num_area_types
-        self.wv_by_wu2_plus_wv2_half = [None] * num_area_types
+        self.bin_map_dims = [[x.item() for x in dims] for dims in bin_map_dims]
+        self.bin_sizes = bin_sizes
+        self.dtype = dtype
+        self.device = device
+        self.batch_flag = batch_flag
+        self.dct_backend = dct_backend
+        self.spectral_energy_flag = spectral_energy_flag
+        self.workspace = workspace
+
+        # frozen area types and their latest results
+        self.frozen_area_types = []
+        self.frozen_indices = None
+        self.frozen_potential_maps = None
+        self.frozen_field_maps = None
+        self.frozen_energy = None
+        # results of the latest forward
+        self.latest = None
+
+        self.build(range(len(self.bin_map_dims)))
+
+    def build(self, area_types):
+        """Build spectral solvers for area types
+        """
+        dtype = self.dtype
+        device = self.device
+        bin_sizes = self.bin_sizes
+
+        # group area types by bin map dimensions
+        groups = {}
+        for area_type in area_types:
+            M, N = self.bin_map_dims[area_type]
+            key = (M, N) if self.batch_flag else area_type
+            groups.setdefault(key, (M, N, []))[2].append(area_type)
+        self.groups = [area_types for M, N, area_types in groups.values()]
+        self.group_indices = [
+            torch.tensor(area_types, dtype=torch.int64, device=device)
+            for area_types in self.groups
+        ]
+        num_groups = len(self.groups)
+
+        # stacked coefficients of each group, [#area types in group, M, N]
+        self.inv_wu2_plus_wv2 = [None] * num_groups
+        self.wu_by_wu2_plus_wv2_half = [None] * num_groups
+        self.wv_by_wu2_plus_wv2_half = [None] * num_groups
+        self.energy_weights = [None] * num_groups
 
         # dct2, idct2, idct_idxst, idxst_idct functions
-        self.dct2 = [None] * num_area_types
-        self.idct2 = [None] * num_area_types
-        self.idct_idxst = [None] * num_area_types
-        self.idxst_idct = [None] * num_area_types
+        self.dct2 = [None] * num_groups
+        self.idct2 = [None] * num_groups
+        self.idct_idxst = [None] * num_groups
+        self.idxst_idct = [None] * num_groups
 
-        for area_type in range(num_area_types):
-            # expk
-            M = bin_map_dims[area_type][0].item()
-            N = bin_map_dims[area_type][1].item()
-            exact_expkM = precomputeExpk(M, dtype=dtype, device=device)
-            exact_expkN = precomputeExpk(N, dtype=dtype, device=device)
+        for group, (M, N, area_types) in enumerate(groups.values()):
+            # expk, shared with all the groups and systems of the same dimensions
+            exact_expkM = dct.getCachedExpk(M, dtype=dtype, device=device)
+            exact_expkN = dct.getCachedExpk(N, dtype=dtype, device=device)
 
             # init dct2, idct2, idct_idxst, idxst_idct with expkM and expkN
-            self.dct2[area_type] = dct.Dct2(exact_expkM, exact_expkN)
-            self.idct2[area_type] = dct.Idct2(exact_expkM, exact_expkN)
-            self.idct_idxst[area_type] = dct.IdctIdxst(exact_expkM,
-                                                       exact_expkN)
-            self.idxst_idct[area_type] = dct.IdxstIdct(exact_expkM,
-                                                       exact_expkN)
-
-            # wu and wv
-            wu = torch.arange(M, dtype=dtype,
-                              device=device).mul_(2 * np.pi / M).view([M, 1])
-            # scale wv because the aspect ratio of a bin may not be 1
-            # it is equivalent to scale by bin width / bin height
-            wv = torch.arange(N, dtype=dtype,
-                              device=device).mul_(2 * np.pi / N).view([
-                                  1, N
-                              ]).mul_(bin_sizes[area_type][0] /
-                                      bin_sizes[area_type][1] * self.xy_ratio)
-            wu2_plus_wv2 = wu.pow(2) + wv.pow(2)
-            wu2_plus_wv2[0,
-                         0] = 1.0  # avoid zero-division, it will be zeroed out
-            self.inv_wu2_plus_wv2[area_type] = 1.0 / wu2_plus_wv2
-            self.inv_wu2_plus_wv2[area_type][0, 0] = 0.0
-            self.wu_by_wu2_plus_wv2_half[area_type] = wu.mul(
-                self.inv_wu2_plus_wv2[area_type]).mul_(1. / 2)
-            self.wv_by_wu2_plus_wv2_half[area_type] = wv.mul(
-                self.inv_wu2_plus_wv2[area_type]).mul_(1. / 2)
+            backend = self.dct_backend
+            self.dct2[group] = dct.Dct2(exact_expkM, exact_expkN, backend)
+            self.idct2[group] = dct.Idct2(exact_expkM, exact_expkN, backend)
+            self.idct_idxst[group] = dct.IdctIdxst(exact_expkM, exact_expkN,
+                                                   backend)
+            self.idxst_idct[group] = dct.IdxstIdct(exact_expkM, exact_expkN,
+                                                   backend)
+
+            inv_wu2_plus_wv2 = []
+            wu_by_wu2_plus_wv2_half = []
+            wv_by_wu2_plus_wv2_half = []
+            energy_weights = []
+            for area_type in area_types:
+                # wu and wv
+                wu = torch.arange(M, dtype=dtype,
+                                  device=device).mul_(2 * np.pi / M).view([M, 1])
+                # scale wv because the aspect ratio of a bin may not be 1
+                # it is equivalent to scale by bin width / bin height
+                wv = torch.arange(N, dtype=dtype,
+                                  device=device).mul_(2 * np.pi / N).view([
+                                      1, N
+                                  ]).mul_(bin_sizes[area_type][0] /
+                                          bin_sizes[area_type][1] * self.xy_ratio)
+                wu2_plus_wv2 = wu.pow(2) + wv.pow(2)
+                wu2_plus_wv2[0,
+                             0] = 1.0  # avoid zero-division, it will be zeroed out
+                inv = 1.0 / wu2_plus_wv2
+                inv[0, 0] = 0.0
+                inv_wu2_plus_wv2.append(inv)
+                wu_by_wu2_plus_wv2_half.append(wu.mul(inv).mul_(1. / 2))
+                wv_by_wu2_plus_wv2_half.append(wv.mul(inv).mul_(1. / 2))
+                # idct2 weights the coefficients by 2 in each direction except for u = 0 or v = 0
+                weights = inv.mul(M * N / 4.0)
+                weights[1:, :].mul_(2)
+                weights[:, 1:].mul_(2)
+                energy_weights.append(weights)
+            self.inv_wu2_plus_wv2[group] = torch.stack(inv_wu2_plus_wv2)
+            self.wu_by_wu2_plus_wv2_half[group] = torch.stack(
+                wu_by_wu2_plus_wv2_half)
+            self.wv_by_wu2_plus_wv2_half[group] = torch.stack(
+                wv_by_wu2_plus_wv2_half)
+            self.energy_weights[group] = torch.stack(energy_weights)
+
+    def freeze(self, area_types):
+        """Stop solving area types whose density maps will not change anymore;
+        the results of the latest forward are reused for them.
+        The field maps of frozen area types are zeros, as no movable cell
+        of these area types is left.
+        @param area_types area types to freeze; an empty list unfreezes all
+        """
+        area_types = sorted(area_types)
+        if area_types == self.frozen_area_types:
+            return
+        if area_types:
+            assert self.latest is not None, "freeze area types after a forward"
+            potential_maps, field_map_xs, field_map_ys, energy = self.latest
+            self.frozen_indices = torch.tensor(area_types,
+                                               dtype=torch.int64,
+                                               device=self.device)
+            self.frozen_potential_maps = {
+                area_type: None if potential_maps[area_type] is None else
+                potential_maps[area_type].clone()
+                for area_type in area_types
+            }
+            self.frozen_field_maps = {
+                area_type: torch.zeros_like(field_map_xs[area_type])
+                for area_type in area_types
+            }
+            self.frozen_energy = energy.index_select(0, self.frozen_indices)
+        self.frozen_area_types = area_types
+        self.build([
+            area_type for area_type in range(len(self.bin_map_dims))
+            if area_type not in area_types
+        ])
 
     def forward(self, density_maps):
         """Compute potential, field, energy given density map;
@@ -149,43 +251,84 @@ class ElectrostaticSystem(object):
         field_map_ys = [None] * num_area_types
         potential_maps = [None] * num_area_types
         energy = density_maps[0].new_zeros(num_area_types)
-        for area_type in range(num_area_types):
+        for group, area_types in enumerate(self.groups):
+            if len(area_types) == 1:
+                batch_density_maps = density_maps[area_types[0]].unsqueeze(0)
+            else:
+                maps = [density_maps[area_type] for area_type in area_types]
+                batch_density_maps = torch.stack(
+                    maps,
+                    out=self._scratch("batch_density_maps",
+                                      (len(maps), ) + maps[0].size(),
+                                      maps[0]))
+
             # compute auv
-            auv = self.dct2[area_type].forward(density_maps[area_type])
+            auv = self.dct2[group].forward(batch_density_maps)
 
             # compute field xi
-            auv_by_wu2_plus_wv2_wu = auv.mul(
-                self.wu_by_wu2_plus_wv2_half[area_type])
-            auv_by_wu2_plus_wv2_wv = auv.mul(
-                self.wv_by_wu2_plus_wv2_half[area_type])
-
-            field_map_xs[area_type] = self.idxst_idct[area_type].forward(
+            auv_by_wu2_plus_wv2_wu = torch.mul(
+                auv,
+                self.wu_by_wu2_plus_wv2_half[group],
+                out=self._scratch("auv_by_wu2_plus_wv2_wu", auv.size(), auv))
+            auv_by_wu2_plus_wv2_wv = torch.mul(
+                auv,
+                self.wv_by_wu2_plus_wv2_half[group],
+                out=self._scratch("auv_by_wu2_plus_wv2_wv", auv.size(), auv))
+
+            batch_field_map_xs = self.idxst_idct[group].forward(
                 auv_by_wu2_plus_wv2_wu)
-            field_map_ys[area_type] = self.idct_idxst[area_type].forward(
+            batch_field_map_ys = self.idct_idxst[group].forward(
                 auv_by_wu2_plus_wv2_wv)
+            for i, area_type in enumerate(area_types):
+                field_map_xs[area_type] = batch_field_map_xs[i]
+                field_map_ys[area_type] = batch_field_map_ys[i]
 
             # energy = \sum q*phi
             # it takes around 80% of the computation time
             # so I will not always evaluate it
             if self.fast_mode:  # dummy for invoking backward propagation
                 pass
+            elif self.spectral_energy_flag:
+                # substituting phi = idct2(auv / (wu**2 + wv**2)) into \sum q*phi
+                # gives M*N/4 * \sum_{u,v} c_u c_v auv**2 / (wu**2 + wv**2),
+                # where c_0 = 1 and c_u = 2 otherwise
+                batch_energy = self._scratch("auv2", auv.size(), auv)
+                torch.mul(auv, auv, out=batch_energy)
+                batch_energy.mul_(self.energy_weights[group])
+                energy.index_copy_(0, self.group_indices[group],
+                                   batch_energy.sum(dim=(1, 2)))
             else:
                 # compute potential phi
                 # auv / (wu**2 + wv**2)
                 # I changed auv to save memory
-                auv_by_wu2_plus_wv2 = auv.mul_(
-                    self.inv_wu2_plus_wv2[area_type])
-                potential_maps[area_type] = self.idct2[area_type].forward(
+                auv_by_wu2_plus_wv2 = auv.mul_(self.inv_wu2_plus_wv2[group])
+                batch_potential_maps = self.idct2[group].forward(
                     auv_by_wu2_plus_wv2)
+                for i, area_type in enumerate(area_types):
+                    potential_maps[area_type] = batch_potential_maps[i]
                 # compute energy
-                energy[area_type] = density_maps[area_type].mul(
-                    potential_maps[area_type]).sum()
-                #energy[area_type] = potential_maps[area_type].sum()
-                # if area_type == 2:
-                #    print("energy[2] = ", energy[area_type].item())
-
+                energy.index_copy_(
+                    0, self.group_indices[group],
+                    batch_density_maps.mul(batch_potential_maps).sum(
+                        dim=(1, 2)))
+
+        if self.frozen_area_types:
+            for area_type in self.frozen_area_types:
+                potential_maps[area_type] = self.frozen_potential_maps[area_type]
+                field_map_xs[area_type] = self.frozen_field_maps[area_type]
+                field_map_ys[area_type] = self.frozen_field_maps[area_type]
+            energy.index_copy_(0, self.frozen_indices, self.frozen_energy)
+
+        self.latest = (potential_maps, field_map_xs, field_map_ys, energy)
         return potential_maps, field_map_xs, field_map_ys, energy
 
+    def _scratch(self, name, size, x):
+        """Map of the dtype and device of x, only valid within the solve of a group"""
+        if self.workspace is None:
+            return torch.empty(size, dtype=x.dtype, device=x.device)
+        return self.workspace.get("electrostatic_system." + name, size,
+                                  x.dtype, x.device)
+
 
 class ElectricPotentialFunction(Function):
     """
@@ -271,7 +414,11 @@ class ElectricPotential(ElectricOverflow):
                  deterministic_flag,
                  movable_macro_mask=None,
                  fast_mode=True,
-                 xy_ratio=1):
+                 xy_ratio=1,
+                 compute_dtype=None,
+                 dct_backend="fft",
+                 spectral_energy_flag=False,
+                 workspace=None):
         """
         @brief initialization
         Be aware that all scalars must be python type instead of tensors.
@@ -295,9 +442,18 @@ class ElectricPotential(ElectricOverflow):
         @param deterministic_flag control whether to use deterministic routine
         @param smooth_flag whether smooth density map
         @param fast_mode if true, only gradient is computed, while objective computation is skipped
+        @param compute_dtype dtype of the density maps and the electrostatic system;
+            the energy and the gradient are returned in the dtype of pos
+        @param dct_backend backend of the spectral transforms, fft, matmul or auto
+        @param spectral_energy_flag if true, compute the energy from the dct coefficients
+            instead of the potential maps
+        @param workspace optional workspace providing the density maps and the scratch maps
+            of the electrostatic system, see py_utils.workspace
         """
         self.fast_mode = fast_mode
         self.xy_ratio = xy_ratio
+        self.dct_backend = dct_backend
+        self.spectral_energy_flag = spectral_energy_flag
         super(ElectricPotential,
               self).__init__(inst_sizes=inst_sizes,
                              # inst_area_types=inst_area_types,
@@ -314,7 +470,9 @@ class ElectricPotential(ElectricOverflow):
                              target_density=target_density,
                              smooth_flag=smooth_flag,
                              deterministic_flag=deterministic_flag,
-                             movable_macro_mask=movable_macro_mask)
+                             movable_macro_mask=movable_macro_mask,
+                             compute_dtype=compute_dtype,
+                             workspace=workspace)
 
     def reset(self):
         """ Compute members derived from input
@@ -326,18 +484,41 @@ class ElectricPotential(ElectricOverflow):
         self.electrostatic_system = ElectrostaticSystem(
             bin_map_dims=self.bin_map_dims,
             bin_sizes=self.bin_sizes,
-            dtype=self.inst_sizes.dtype,
+            dtype=self.compute_dtype,
             device=self.inst_sizes.device,
             fast_mode=self.fast_mode,
-            xy_ratio=self.xy_ratio)
+            xy_ratio=self.xy_ratio,
+            dct_backend=self.dct_backend,
+            spectral_energy_flag=self.spectral_energy_flag,
+            workspace=self.workspace)
+
+    def lockedAreaTypes(self):
+        """Area types without any unlocked movable or filler cell;
+        their density maps do not change anymore
+        """
+        inst_areas = self.inst_sizes_stretched[..., 0] * self.inst_sizes_stretched[..., 1]
+        unlocked = self.inst_lock_mask == 0
+        has_unlocked = inst_areas.new_zeros(self.num_area_types, dtype=torch.bool)
+        for bgn, end in [self.movable_range, self.filler_range]:
+            if bgn < end:
+                has_unlocked |= ((inst_areas[bgn:end] > 0)
+                                 & unlocked[bgn:end].view([-1, 1])).any(dim=0)
+        return [
+            area_type for area_type, x in enumerate(has_unlocked.tolist()) if not x
+        ]
 
     def forward(self, pos):
-        if self.fixed_density_maps is None:
-            self.fixed_density_maps = self.fixedForward(pos)
-
-        density_maps = [x.clone() for x in self.fixed_density_maps]
-        return ElectricPotentialFunction.apply(
-            pos, self.inst_sizes_stretched,
+        dtype = pos.dtype
+        # the cast back-propagates the gradient in the dtype of pos
+        pos = pos.to(self.compute_dtype)
+        rebuild_flag = self.static_density_maps is None
+        if rebuild_flag:
+            # solve all area types once with the new static density maps
+            self.electrostatic_system.freeze([])
+
+        density_maps = self.initDensityMaps(pos)
+        energy = ElectricPotentialFunction.apply(
+            pos, self.inst_sizes_unlocked,
             self.inst_weights,  # self.inst_area_types,
             self.bin_map_dims,
             self.bin_map_areas,
@@ -345,3 +526,11 @@ class ElectricPotential(ElectricOverflow):
             self.xl, self.yl, self.xh, self.yh,
             self.movable_range, self.filler_range, self.smooth_flag, self.deterministic_flag,
             density_maps, self.electrostatic_system)
+
+        if rebuild_flag and self.inst_lock_mask is not None:
+            locked_area_types = self.lockedAreaTypes()
+            if locked_area_types:
+                logger.info("skip the electrostatic system of locked area types %s" %
+                            locked_area_types)
+            self.electrostatic_system.freeze(locked_area_types)
+        return energy.to(dtype)
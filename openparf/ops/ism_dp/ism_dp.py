@@ -49,6 +49,16 @@ class ISMDetailedPlaceParam(object):
         self.xWirelenWt = params.wirelength_weights[0]
         self.yWirelenWt = params.wirelength_weights[1]
 
+        # Stop ISM once this runtime in seconds is used up, no limit if 0
+        self.timeBudget = params.ism_dp_time_budget or 0.0
+        # Stop ISM once the wirelength improvement reaches this ratio, none if 0
+        self.targetImprov = params.ism_dp_target_improv or 0.0
+        # Windows of the parallel ISM passes, disabled if at most one window
+        num_windows = params.ism_dp_partition_dims or [0, 0]
+        self.numWindowsX = num_windows[0]
+        self.numWindowsY = num_windows[1]
+        self.numWindowPasses = params.ism_dp_window_passes or 0
+
         self.verbose = 1
 
 
@@ -80,6 +90,7 @@ class ISMDetailedPlace:
         self.param.honorClockConstraints = honor_clock_constraints
         self.clock_available_clock_region = None
         self.fixed_mask = None
+        self.engine = None
 
     def reset_clock_available_clock_region(self, clock_available_clock_region: torch.Tensor):
         assert clock_available_clock_region.dtype == torch.uint8
@@ -92,6 +103,22 @@ class ISMDetailedPlace:
     def reset_honor_clock_constraints(self, honor_clock_constraints: bool):
         self.param.honorClockConstraints = honor_clock_constraints
 
+    def persistent_placer(self):
+        """
+        @brief placer keeping the ISM solvers across calls
+        """
+        if self.engine is None:
+            self.engine = ism_dp_cpp.ISMDetailedPlaceEngine(self.placedb)
+        return self.engine
+
+    def phase_times(self):
+        """
+        @brief runtime in ms of building the placer and of the phases of the last call
+        """
+        if self.engine is None:
+            return {}
+        return dict(self.engine.phase_times())
+
     def forward(self, pos):
         if pos.is_cuda:
             local_pos = pos.cpu()
@@ -107,8 +134,7 @@ class ISMDetailedPlace:
             assert isinstance(
                 self.half_column_available_clock_region, torch.Tensor)
             assert self.half_column_available_clock_region.dtype == torch.uint8
-            return ism_dp_cpp.forward(
-                self.placedb,
+            return self.persistent_placer().forward(
                 self.param,
                 self.clock_available_clock_region,
                 self.half_column_available_clock_region,
@@ -116,8 +142,7 @@ class ISMDetailedPlace:
                 local_pos).to(pos.device)
         else:
             dummy = torch.zeros((1))
-            return ism_dp_cpp.forward(
-                self.placedb,
+            return self.persistent_placer().forward(
                 self.param,
                 dummy,
                 dummy,
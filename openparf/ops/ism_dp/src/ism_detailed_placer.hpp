@@ -11,6 +11,7 @@
 
 // C++ system library headers
 #include <algorithm>
+#include <memory>
 #include <string>
 #include <utility>
 #include <vector>
@@ -19,6 +20,7 @@
 #include "database/placedb.h"
 #include "ops/pin_utilization/src/pin_utilization_map_kernel.hpp"
 #include "ops/rudy/src/rudy_kernel.hpp"
+#include "util/stopwatch.h"
 
 // local headers
 #include "ops/ism_dp/src/ism_dp_db.hpp"
@@ -165,29 +167,54 @@ class ISMDetailedPlacer {
     }
   }
 
+  /// Set the parameters and the clock constraints of the next run, the placer and its ISM solvers are kept
+  /// The bin dimensions of the routing and pin utilization maps must not change
+  void reset(ISMDetailedPlaceParam                             param,
+             std::function<bool(uint32_t, uint32_t, uint32_t)> isCKAllowedInSite,
+             bool                                              honorClockConstraint,
+             int32_t                                           num_threads) {
+    openparfAssert(param.routeUtilBinDimX == param_.routeUtilBinDimX &&
+                   param.routeUtilBinDimY == param_.routeUtilBinDimY);
+    openparfAssert(param.pinUtilBinDimX == param_.pinUtilBinDimX && param.pinUtilBinDimY == param_.pinUtilBinDimY);
+    param_                = param;
+    isCKAllowedInSite_    = isCKAllowedInSite;
+    honorClockConstraint_ = honorClockConstraint;
+    num_threads_          = num_threads;
+  }
+
   /// Top function to run DP
+  /// ISM phases are skipped once the time budget is used up, the remaining budget is shared by the remaining phases
   void run(T *pos) {
+    stopwatch_.start();
+    phase_times_.clear();
     std::copy(pos, pos + db_.numInsts() * 3, state_.pos.data());
 
-    if (param_.verbose > 0) {
-      openparfPrint(kInfo, "--------------- CLB ISM ---------------\n");
+    if (!timeBudgetUsedUp()) {
+      if (param_.verbose > 0) {
+        openparfPrint(kInfo, "--------------- CLB ISM ---------------\n");
+      }
+      updateRoutePinUtil();
+      runCLBISM();
     }
-    updateRoutePinUtil();
-    runCLBISM();
-    if (param_.verbose > 0) {
-      openparfPrint(kInfo, "--------------- BLE ISM ---------------\n");
+    if (!timeBudgetUsedUp()) {
+      if (param_.verbose > 0) {
+        openparfPrint(kInfo, "--------------- BLE ISM ---------------\n");
+      }
+      updateRoutePinUtil();
+      runBLEISM();
     }
-    updateRoutePinUtil();
-    runBLEISM();
 
-    if (param_.verbose > 0) {
-      openparfPrint(kInfo, "----------- LUT/FF Pair ISM -----------\n");
+    if (!timeBudgetUsedUp()) {
+      if (param_.verbose > 0) {
+        openparfPrint(kInfo, "----------- LUT/FF Pair ISM -----------\n");
+      }
+      updateRoutePinUtil();
+      runPairISM();
     }
-    updateRoutePinUtil();
-    runPairISM();
 
     // Perform final intra-CLB optimization
     optimizeCLBs();
+    lapPhase("intra_clb");
 
     // Check placement feasibility
     // db_.checkPlaceFeasibility();
@@ -196,6 +223,9 @@ class ISMDetailedPlacer {
     std::copy(state_.pos.begin(), state_.pos.end(), pos);
   }
 
+  /// Runtime in milliseconds of the phases of the last run, skipped ISM phases are not listed
+  std::vector<std::pair<std::string, double>> const &phaseTimes() const { return phase_times_; }
+
  protected:
   /// @brief a function for debug
   std::string getInstName(IndexType inst_id) const {
@@ -344,7 +374,7 @@ class ISMDetailedPlacer {
   /// Top function to run CLB ISM
   void runCLBISM() {
     // Initialize the ISM parameters
-    ISMParam param;
+    ISMParam &param = clb_param_;
     initCLBISMParam(param);
 
     // Initialize the ISM problem
@@ -353,9 +383,12 @@ class ISMDetailedPlacer {
     initCLBISMProblem(clusters, prob, honorClockConstraint_);
 
     // Perform the ISM
-    ISMSolver solver(prob, param, num_threads_, honorClockConstraint_);
+    ISMSolver &solver = getISMSolver(clb_solver_, prob, param);
     solver.buildISMProblem(prob);
+    lapPhase("clb_build");
+    initISMParamStop(param, 3);
     solver.run();
+    lapPhase("clb_ism");
 
     // Write the CLB ISM solution back to the netlist
     auto zGetter = [&](IndexType node_id, const ISMSolver::ISMInstanceSol &sol) { return state_.pos[node_id * 3 + 2]; };
@@ -454,7 +487,7 @@ class ISMDetailedPlacer {
   /// Top function to run BLE ISM
   void runBLEISM() {
     // Initialize the ISM parameters
-    ISMParam param;
+    ISMParam &param = ble_param_;
     initBLEISMParam(param);
     // Initialize the ISM problem
     std::vector<IndexVector> clusters;
@@ -462,9 +495,12 @@ class ISMDetailedPlacer {
     initBLEISMProblem(clusters, prob);
 
     // Perform the ISM
-    ISMSolver solver(prob, param, num_threads_, honorClockConstraint_);
+    ISMSolver &solver = getISMSolver(ble_solver_, prob, param);
     solver.buildISMProblem(prob);
+    lapPhase("ble_build");
+    initISMParamStop(param, 2);
     solver.run();
+    lapPhase("ble_ism");
 
     // Write the BLE ISM solution back to the netlist
     auto zGetter = [&](IndexType node_id, const ISMSolver::ISMInstanceSol &sol) -> IndexType {
@@ -630,7 +666,7 @@ class ISMDetailedPlacer {
   /// Top function to run LUT/FF pair ISM
   void runPairISM() {
     // Initialize the ISM parameters
-    ISMParam param;
+    ISMParam &param = pair_param_;
     initPairISMParam(param);
 
     // Initialize the ISM problem
@@ -639,9 +675,12 @@ class ISMDetailedPlacer {
     initPairISMProblem(param, clusters, prob);
 
     // Perform the ISM
-    ISMSolver solver(prob, param, num_threads_, honorClockConstraint_);
+    ISMSolver &solver = getISMSolver(pair_solver_, prob, param);
     solver.buildISMProblem(prob);
+    lapPhase("pair_build");
+    initISMParamStop(param, 1);
     solver.run();
+    lapPhase("pair_ism");
 
     // Write the LUT/FF pair ISM solution back to the netlist
     auto zGetter = [&](IndexType node_id, const ISMSolver::ISMInstanceSol &sol) -> IndexType {
@@ -826,6 +865,36 @@ class ISMDetailedPlacer {
     param.mateCredit        = 2.0;
   }
 
+  /// Get the ISM solver of a phase, created at the first run and kept across runs with its memory
+  /// The site map of an ISM phase has the same dimensions at every run
+  ISMSolver &getISMSolver(std::unique_ptr<ISMSolver> &solver, const ISMProblem &prob, const ISMParam &param) {
+    if (!solver) {
+      solver.reset(new ISMSolver(prob, param, num_threads_, honorClockConstraint_));
+    }
+    solver->setHonorClockConstraints(honorClockConstraint_);
+    return *solver;
+  }
+
+  /// Initialize the stopping rule and the windows of an ISM phase
+  /// @param  param             the ISM parameters of the phase
+  /// @param  num_phases_left   number of ISM phases left including this one, sharing the remaining time budget
+  void initISMParamStop(ISMParam &param, IndexType num_phases_left) {
+    param.targetImprov    = param_.targetImprov;
+    param.numWindowsX     = param_.numWindowsX;
+    param.numWindowsY     = param_.numWindowsY;
+    param.numWindowPasses = param_.numWindowPasses;
+    param.maxRuntime      = 0;
+    if (param_.timeBudget > 0) {
+      double remaining = param_.timeBudget - stopwatch_.elapsed<mus>() * 1e-6;
+      // A positive limit even if the budget is used up, which stops the ISM right after its initialization
+      param.maxRuntime = std::max(remaining / num_phases_left, 1e-6);
+    }
+  }
+
+  bool timeBudgetUsedUp() { return param_.timeBudget > 0 && stopwatch_.elapsed<mus>() * 1e-6 >= param_.timeBudget; }
+
+  void lapPhase(std::string const &name) { phase_times_.emplace_back(name, stopwatch_.lap<mus>() / 1000.0); }
+
   /// Initialize ISM problem netlist for a given clustering solution (e.g., CLB/BLE...)
   /// @param  siteIdGetter   a function to get node-to-site mapping
   /// @param  clusters       contains the resulting clusters after function call
@@ -1352,6 +1421,18 @@ class ISMDetailedPlacer {
   bool                                              honorClockConstraint_;
 
   ISMDetailedPlaceState                             state_;   ///< intermediate state
+
+  // ISM parameters and solvers of the CLB, BLE and LUT/FF pair phases, kept across runs; a solver refers to its
+  // parameters
+  ISMParam                                          clb_param_;
+  ISMParam                                          ble_param_;
+  ISMParam                                          pair_param_;
+  std::unique_ptr<ISMSolver>                        clb_solver_;
+  std::unique_ptr<ISMSolver>                        ble_solver_;
+  std::unique_ptr<ISMSolver>                        pair_solver_;
+
+  Stopwatch                                         stopwatch_;
+  std::vector<std::pair<std::string, double>>       phase_times_;
 };
 }   // namespace ism_dp
 OPENPARF_END_NAMESPACE
@@ -9,6 +9,10 @@
 
 // C++ standard library headers
 #include <functional>
+#include <memory>
+#include <string>
+#include <utility>
+#include <vector>
 
 // project headers
 #include "database/placedb.h"
@@ -23,24 +27,17 @@
 OPENPARF_BEGIN_NAMESPACE
 
 namespace ism_dp {
-at::Tensor ismDetailedPlaceForward(database::PlaceDB const& placedb,
-                                   py::object               pyparam,
-                                   at::Tensor               clock_available_clock_region,
-                                   at::Tensor               hc_available_clock_region,
-                                   at::Tensor               fixed_mask,
-                                   at::Tensor               init_pos) {
-  CHECK_FLAT_CPU(init_pos);
-  CHECK_DIVISIBLE(init_pos, 3);
-  CHECK_CONTIGUOUS(init_pos);
-  ISMDetailedPlaceParam                             param = ISMDetailedPlaceParam::ParseFromPyobject(pyparam);
-  auto                                              pos   = init_pos.clone();
-  std::function<bool(uint32_t, uint32_t, uint32_t)> _isCKAllowedInSite;
-
-  param.fixedMask = OPENPARF_TENSOR_DATA_PTR(fixed_mask, uint8_t);
-
+namespace {
+/// Function telling whether a clock is allowed at a site, the availability maps are only read with clock constraints
+std::function<bool(uint32_t, uint32_t, uint32_t)> clockAvailChecker(database::PlaceDB const&     placedb,
+                                                                    ISMDetailedPlaceParam const& param,
+                                                                    at::Tensor clock_available_clock_region,
+                                                                    at::Tensor hc_available_clock_region) {
   if (param.honorClockConstraints) {
     openparfPrint(kInfo, "Clock region constraint activated for ISM DP\n");
-    _isCKAllowedInSite = [&](uint32_t clk_id, uint32_t site_x, uint32_t site_y) {
+    return [&placedb, clock_available_clock_region, hc_available_clock_region](uint32_t clk_id,
+                                                                               uint32_t site_x,
+                                                                               uint32_t site_y) {
       auto hc_id = placedb.XyToHcIndex(site_x, site_y);
       auto cr_id = placedb.XyToCrIndex(site_x, site_y);
       auto a1    = clock_available_clock_region.accessor<uint8_t, 2>();
@@ -50,10 +47,27 @@ at::Tensor ismDetailedPlaceForward(database::PlaceDB const& placedb,
       if (a1[clk_id][cr_id] == 0 || a2[clk_id][hc_id] == 0) return false;
       return true;
     };
-  } else {
-    openparfPrint(kInfo, "Clock region constraint not activated for ISM DP\n");
-    _isCKAllowedInSite = [&](uint32_t clk_id, uint32_t site_x, uint32_t site_y) { return true; };
   }
+  openparfPrint(kInfo, "Clock region constraint not activated for ISM DP\n");
+  return [](uint32_t clk_id, uint32_t site_x, uint32_t site_y) { return true; };
+}
+}   // namespace
+
+at::Tensor ismDetailedPlaceForward(database::PlaceDB const& placedb,
+                                   py::object               pyparam,
+                                   at::Tensor               clock_available_clock_region,
+                                   at::Tensor               hc_available_clock_region,
+                                   at::Tensor               fixed_mask,
+                                   at::Tensor               init_pos) {
+  CHECK_FLAT_CPU(init_pos);
+  CHECK_DIVISIBLE(init_pos, 3);
+  CHECK_CONTIGUOUS(init_pos);
+  ISMDetailedPlaceParam param = ISMDetailedPlaceParam::ParseFromPyobject(pyparam);
+  auto                  pos   = init_pos.clone();
+
+  param.fixedMask             = OPENPARF_TENSOR_DATA_PTR(fixed_mask, uint8_t);
+  auto _isCKAllowedInSite =
+          clockAvailChecker(placedb, param, clock_available_clock_region, hc_available_clock_region);
 
   OPENPARF_DISPATCH_FLOATING_TYPES(pos, "ismDetailedPlaceLauncher", [&] {
     ismDetailedPlaceLauncher<scalar_t>(placedb,
@@ -66,6 +80,60 @@ at::Tensor ismDetailedPlaceForward(database::PlaceDB const& placedb,
   return pos;
 }
 
+ISMDetailedPlaceEngine::ISMDetailedPlaceEngine(database::PlaceDB const& placedb)
+    : placedb_(placedb),
+      build_time_(0) {}
+
+ISMDetailedPlaceEngine::~ISMDetailedPlaceEngine() = default;
+
+template<>
+std::unique_ptr<ISMDetailedPlacer<float>>& ISMDetailedPlaceEngine::placer<float>() {
+  return float_placer_;
+}
+
+template<>
+std::unique_ptr<ISMDetailedPlacer<double>>& ISMDetailedPlaceEngine::placer<double>() {
+  return double_placer_;
+}
+
+at::Tensor ISMDetailedPlaceEngine::forward(py::object pyparam,
+                                           at::Tensor clock_available_clock_region,
+                                           at::Tensor hc_available_clock_region,
+                                           at::Tensor fixed_mask,
+                                           at::Tensor init_pos) {
+  CHECK_FLAT_CPU(init_pos);
+  CHECK_DIVISIBLE(init_pos, 3);
+  CHECK_CONTIGUOUS(init_pos);
+  ISMDetailedPlaceParam param = ISMDetailedPlaceParam::ParseFromPyobject(pyparam);
+  auto                  pos   = init_pos.clone();
+
+  param.fixedMask             = OPENPARF_TENSOR_DATA_PTR(fixed_mask, uint8_t);
+  auto isCKAllowedInSite =
+          clockAvailChecker(placedb_, param, clock_available_clock_region, hc_available_clock_region);
+
+  OPENPARF_DISPATCH_FLOATING_TYPES(pos, "ISMDetailedPlaceEngine::forward", [&] {
+    auto&     ism_placer = this->placer<scalar_t>();
+    Stopwatch stopwatch;
+    stopwatch.start();
+    if (!ism_placer) {
+      ism_placer.reset(new ISMDetailedPlacer<scalar_t>(
+              placedb_, param, isCKAllowedInSite, param.honorClockConstraints, at::get_num_threads()));
+    } else {
+      ism_placer->reset(param, isCKAllowedInSite, param.honorClockConstraints, at::get_num_threads());
+    }
+    build_time_ = stopwatch.elapsed<mus>() / 1000.0;
+    ism_placer->run(OPENPARF_TENSOR_DATA_PTR(pos, scalar_t));
+    phase_times_ = ism_placer->phaseTimes();
+  });
+  return pos;
+}
+
+std::vector<std::pair<std::string, double>> ISMDetailedPlaceEngine::phaseTimes() const {
+  std::vector<std::pair<std::string, double>> times = {{"build", build_time_}};
+  times.insert(times.end(), phase_times_.begin(), phase_times_.end());
+  return times;
+}
+
 }   // namespace ism_dp
 
 OPENPARF_END_NAMESPACE
@@ -74,4 +142,10 @@ PYBIND11_MODULE(TORCH_EXTENSION_NAME, m) {
   m.def("forward",
         &OPENPARF_NAMESPACE::ism_dp::ismDetailedPlaceForward,
         "Independent set matching based detailed placement forward");
+  py::class_<OPENPARF_NAMESPACE::ism_dp::ISMDetailedPlaceEngine>(m, "ISMDetailedPlaceEngine")
+          .def(py::init<OPENPARF_NAMESPACE::database::PlaceDB const&>())
+          .def("forward",
+               &OPENPARF_NAMESPACE::ism_dp::ISMDetailedPlaceEngine::forward,
+               "Independent set matching based detailed placement forward on the persistent placer")
+          .def("phase_times", &OPENPARF_NAMESPACE::ism_dp::ISMDetailedPlaceEngine::phaseTimes);
 }
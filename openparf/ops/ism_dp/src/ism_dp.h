@@ -8,6 +8,12 @@
 #ifndef OPENPARF_OPS_ISM_DP_SRC_ISM_DP_H_
 #define OPENPARF_OPS_ISM_DP_SRC_ISM_DP_H_
 
+// C++ standard library headers
+#include <memory>
+#include <string>
+#include <utility>
+#include <vector>
+
 // project headers
 #include "database/placedb.h"
 #include "util/torch.h"
@@ -16,6 +22,9 @@ OPENPARF_BEGIN_NAMESPACE
 
 namespace ism_dp {
 
+template<typename T>
+class ISMDetailedPlacer;
+
 /// @param init_pos cell locations, array of (x, y) pairs
 at::Tensor ismDetailedPlaceForward(database::PlaceDB const& placedb,
                                    py::object               pyparam,
@@ -23,6 +32,35 @@ at::Tensor ismDetailedPlaceForward(database::PlaceDB const& placedb,
                                    at::Tensor               hc_available_clock_region,
                                    at::Tensor               fixed_mask,
                                    at::Tensor               init_pos);
+
+/// Detailed placer keeping its state across calls: the site lookup, the utilization maps and, for each ISM phase,
+/// the solver with its thread memory. The ISM netlists are built again at each call from the clustering of the
+/// instances at their current locations.
+class ISMDetailedPlaceEngine {
+ public:
+  explicit ISMDetailedPlaceEngine(database::PlaceDB const& placedb);
+  ~ISMDetailedPlaceEngine();
+
+  /// Same as ismDetailedPlaceForward
+  at::Tensor                                  forward(py::object pyparam,
+                                                      at::Tensor clock_available_clock_region,
+                                                      at::Tensor hc_available_clock_region,
+                                                      at::Tensor fixed_mask,
+                                                      at::Tensor init_pos);
+
+  /// Runtime in milliseconds of building the placer and of the phases of the last call
+  std::vector<std::pair<std::string, double>> phaseTimes() const;
+
+ private:
+  template<typename T>
+  std::unique_ptr<ISMDetailedPlacer<T>>&      placer();
+
+  database::PlaceDB const&                    placedb_;
+  std::unique_ptr<ISMDetailedPlacer<float>>   float_placer_;
+  std::unique_ptr<ISMDetailedPlacer<double>>  double_placer_;
+  double                                      build_time_;
+  std::vector<std::pair<std::string, double>> phase_times_;
+};
 }   // namespace ism_dp
 
 OPENPARF_END_NAMESPACE
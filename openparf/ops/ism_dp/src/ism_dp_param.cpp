@@ -35,6 +35,11 @@ ISMDetailedPlaceParam ISMDetailedPlaceParam::ParseFromPyobject(const py::object
   param.pinUtilToFixWhiteSpace = pyparam.attr("pinUtilToFixWhiteSpace").cast<decltype(param.pinUtilToFixWhiteSpace)>();
   param.xWirelenWt             = pyparam.attr("xWirelenWt").cast<decltype(param.xWirelenWt)>();
   param.yWirelenWt             = pyparam.attr("yWirelenWt").cast<decltype(param.yWirelenWt)>();
+  param.timeBudget             = pyparam.attr("timeBudget").cast<decltype(param.timeBudget)>();
+  param.targetImprov           = pyparam.attr("targetImprov").cast<decltype(param.targetImprov)>();
+  param.numWindowsX            = pyparam.attr("numWindowsX").cast<decltype(param.numWindowsX)>();
+  param.numWindowsY            = pyparam.attr("numWindowsY").cast<decltype(param.numWindowsY)>();
+  param.numWindowPasses        = pyparam.attr("numWindowPasses").cast<decltype(param.numWindowPasses)>();
   param.verbose                = pyparam.attr("verbose").cast<decltype(param.verbose)>();
   param.honorClockConstraints  = pyparam.attr("honorClockConstraints").cast<bool>();
   return param;
@@ -39,6 +39,11 @@ struct ISMDetailedPlaceParam {
   double   pinUtilToFixWhiteSpace;     ///< We fix white spaces at places where pin utilization is higher than this
   double   xWirelenWt;                 ///< weight for wirelength in x direction
   double   yWirelenWt;                 ///< weight for wirelength in y direction
+  double   timeBudget;                 ///< Runtime budget in seconds of the ISM phases, no limit if 0
+  double   targetImprov;               ///< Stop an ISM phase once its wirelength improvement reaches this, 0 for none
+  uint32_t numWindowsX;                ///< Number of windows in x of the windowed ISM passes
+  uint32_t numWindowsY;                ///< Number of windows in y of the windowed ISM passes
+  uint32_t numWindowPasses;            ///< Number of windowed ISM passes before the global ISM iterations
   int32_t  verbose;                    ///< Verbose flag
   bool     honorClockConstraints;      ///< Whether honor clock region constraints.
   uint8_t *fixedMask;   ///< Besides SSMIR instances like IOs, instances marked fixed will not be moved during detailed
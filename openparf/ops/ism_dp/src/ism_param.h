@@ -34,6 +34,13 @@ struct ISMParam {
   RealType  minBatchImprov = 0.001;   // Stop ISM if the wirelength improv. is less than this among for a single batch
   RealType  xWirelenWt     = 1.0;     // The weight for x-directed wirelength
   RealType  yWirelenWt     = 1.0;     // The weight for y-directed wirelength
+  RealType  maxRuntime     = 0.0;     // Stop ISM after this runtime in seconds, no limit if 0
+  RealType  targetImprov   = 0.0;     // Stop ISM once the wirelength improv. since its start reaches this, 0 for none
+
+  // Windowed ISM passes run before the global iterations, disabled if there is at most one window
+  IndexType numWindowsX     = 0;   // Number of windows in x
+  IndexType numWindowsY     = 0;   // Number of windows in y
+  IndexType numWindowPasses = 0;   // Number of windowed passes, odd passes shift the windows by half a window
 
   // For message printing
   // 0: quiet
@@ -358,8 +358,36 @@ void ISMSolver::applyPinIdMapping(const IndexVector &pinIdMapping) {
 
 /// Top function to run the ISM
 void ISMSolver::run() {
+  _stopwatch.start();
   initISM();
 
+  // Run the windowed passes first, the global iterations then only grow independent sets from the instances frozen at
+  // the window boundaries of the last pass
+  if (_param.numWindowsX * _param.numWindowsY > 1) {
+    bool windowed = false;
+    for (IndexType pass = 0; pass < _param.numWindowPasses && !timeout() && !reachTarget(_wl); ++pass) {
+      runWindowedPass(pass);
+      windowed = true;
+      _wl = computeHPWL(_param.maxNetDegree);
+      if (_param.verbose > 0) {
+        openparfPrint(kInfo,
+                      "ISM Pass %3u: Approx. HPWL = %.6E (%.1lf * %.6E + %.1lf * %.6E)\n",
+                      pass,
+                      weightedWL(_wl),
+                      _param.xWirelenWt,
+                      _wl.x(),
+                      _param.yWirelenWt,
+                      _wl.y());
+      }
+    }
+    if (windowed) {
+      _priority.erase(std::remove_if(_priority.begin(),
+                                     _priority.end(),
+                                     [&](IndexType i) { return !_winFrozen[i]; }),
+                      _priority.end());
+    }
+  }
+
   // Iterativly run ISM until the stop condition holds
   std::vector<std::vector<IndexType>> indepSets;
   while (!stopCondition()) {
@@ -394,11 +422,12 @@ void ISMSolver::run() {
 void ISMSolver::initISM() {
   // Allocate memory
   _indepSet.dep.resize(numInsts());
-  _threadMemArray.resize(omp_get_max_threads());
+  _threadMemArray.resize(std::max<IndexType>(_num_threads, omp_get_max_threads()));
 
   // Initialize _priority
   // _priority contains all instances can be ISM seeds,
   // which need to have pins (non-fillers) and valid instance types (non-fixed)
+  _priority.clear();
   _priority.reserve(_numPhyInsts);
   for (IndexType i = 0; i < _numPhyInsts; ++i) {
     const auto &inst = _instArray[i];
@@ -413,8 +442,9 @@ void ISMSolver::initISM() {
   // Update all net bounding boxes
   computeAllNetBBoxes();
 
-  _iter = 0;
-  _wl   = computeHPWL(_param.maxNetDegree);
+  _iter   = 0;
+  _wl     = computeHPWL(_param.maxNetDegree);
+  _initWl = _wl;
   if (_param.verbose > 0) {
     auto wl = computeHPWL();
     openparfPrint(kInfo,
@@ -525,7 +555,7 @@ void ISMSolver::buildIndependentIndepSets(IndepSet &indepSet, std::vector<IndexV
       indepSet.ce[0] = kIndexTypeMax;
       indepSet.ce[1] = kIndexTypeMax;
 
-      buildIndepSet(_instArray[instId], indepSet);
+      buildIndepSet(_instArray[instId], indepSet, _bndBox);
       sets.emplace_back(indepSet.set);
     }
   }
@@ -534,7 +564,8 @@ void ISMSolver::buildIndependentIndepSets(IndepSet &indepSet, std::vector<IndexV
 /// Build an independent set from a given seed instance
 /// @param  seed      the seed instance
 /// @param  indepSet  the empty independet set building helper
-void ISMSolver::buildIndepSet(const ISMInstance &seed, IndepSet &indepSet) {
+/// @param  bndBox    the sites the independent set can grow to
+void ISMSolver::buildIndepSet(const ISMInstance &seed, IndepSet &indepSet, const Box<IndexType> &bndBox) {
   // Add the seed instance into the independent set
   addInstToIndepSet(seed, 0, indepSet);
   indepSet.type = seed.type;
@@ -549,7 +580,7 @@ void ISMSolver::buildIndepSet(const ISMInstance &seed, IndepSet &indepSet) {
   auto end = _spiralAccessor.end(_param.maxRadius);
   for (auto it = beg; it != end; ++it) {
     XY<IndexType> xy(initXY.x() + it->x() * _param.siteXStep, initXY.y() + it->y() * _param.siteYInterval);
-    if (_bndBox.contain(xy)) {
+    if (bndBox.contain(xy)) {
       for (IndexType i = 0; i < _param.siteYInterval; ++i) {
         const auto &site = _siteMap(xy.x(), xy.y() + i);
         if (site.instId == kIndexTypeMax) {
@@ -939,6 +970,12 @@ void ISMSolver::realizeMatching(const IndexVector &set, ISMMemory &mem) {
 
 /// Return true if the stopping condition holds
 bool ISMSolver::stopCondition() {
+  if (timeout()) {
+    if (_param.verbose > 0) {
+      openparfPrint(kInfo, "ISM Iter %3u: stop at the runtime limit of %g s\n", _iter, _param.maxRuntime);
+    }
+    return true;
+  }
   if (_iter && (_iter % _param.batchSize == 0)) {
     auto wl = computeHPWL(_param.maxNetDegree);
     if (_param.verbose > 0) {
@@ -953,7 +990,7 @@ bool ISMSolver::stopCondition() {
     }
     RealType improv = 1.0 - (_param.xWirelenWt * wl.x() + _param.yWirelenWt * wl.y()) /
                                     (_param.xWirelenWt * _wl.x() + _param.yWirelenWt * _wl.y());
-    if (improv < _param.minBatchImprov) {
+    if (improv < _param.minBatchImprov || reachTarget(wl)) {
       return true;
     }
     _wl = wl;
@@ -973,5 +1010,213 @@ XY<RealType> ISMSolver::computeHPWL(IndexType maxNetDegree) const {
   return res;
 }
 
+/// Run an ISM pass in spatially disjoint windows processed in parallel
+/// A net no larger than maxNetDegree belongs to the window having most of its movable instances, and an instance on a
+/// net of another window is frozen, so a window only moves its own instances and only updates the bounding boxes of its
+/// nets and its site control sets, which no other window reads. Net bounding boxes thus stay exact without
+/// synchronizing the windows between their batches.
+/// Windows are aligned to the spiral access steps, so mate sites and site control sets are never split, and odd passes
+/// shift them by half a window, so instances frozen at the window boundaries of one pass can move in the next one.
+void ISMSolver::runWindowedPass(IndexType pass) {
+  IndexType xSize   = _siteMap.xSize();
+  IndexType ySize   = _siteMap.ySize();
+  IndexType winW    = ceilAlign((xSize + _param.numWindowsX - 1) / _param.numWindowsX, _param.siteXStep);
+  IndexType winH    = ceilAlign((ySize + _param.numWindowsY - 1) / _param.numWindowsY, _param.siteYInterval);
+  IndexType offX    = (pass % 2 ? floorAlign(winW / 2, _param.siteXStep) : 0);
+  IndexType offY    = (pass % 2 ? floorAlign(winH / 2, _param.siteYInterval) : 0);
+  IndexType numWinX = (xSize + offX + winW - 1) / winW;
+  IndexType numWinY = (ySize + offY + winH - 1) / winH;
+
+  // Get the window of each movable instance, instances never leave their windows during the pass
+  _instWindow.assign(numInsts(), kIndexTypeMax);
+  for (IndexType i = 0; i < numInsts(); ++i) {
+    const auto &inst = _instArray[i];
+    if (inst.type != kIndexTypeMax) {
+      auto xy        = _siteMap.indexToXY(inst.sol.siteId);
+      _instWindow[i] = (xy.x() + offX) / winW * numWinY + (xy.y() + offY) / winH;
+    }
+  }
+
+  // Get the window of each net, the one having most of its movable instances
+  _netWindow.assign(numNets(), kIndexTypeMax);
+#pragma omp parallel for num_threads(_num_threads) schedule(dynamic, OMP_DYNAMIC_CHUNK_SIZE)
+  for (IndexType netId = 0; netId < numNets(); ++netId) {
+    const auto &net = _netArray[netId];
+    if (net.numPins() > _param.maxNetDegree) {
+      continue;
+    }
+    IndexType bestCount = 0;
+    for (IndexType pinId : net.pinIdArray) {
+      IndexType w = _instWindow[_pinArray[pinId].instId];
+      if (w == kIndexTypeMax) {
+        continue;
+      }
+      IndexType count = std::count_if(net.pinIdArray.begin(), net.pinIdArray.end(), [&](IndexType p) {
+        return _instWindow[_pinArray[p].instId] == w;
+      });
+      if (count > bestCount || (count == bestCount && w < _netWindow[netId])) {
+        bestCount          = count;
+        _netWindow[netId] = w;
+      }
+    }
+  }
+
+  // Freeze the instances on nets of other windows
+  _winFrozen.assign(numInsts(), 0);
+#pragma omp parallel for num_threads(_num_threads) schedule(dynamic, OMP_DYNAMIC_CHUNK_SIZE)
+  for (IndexType i = 0; i < _numPhyInsts; ++i) {
+    for (IndexType pinId : _instArray[i].pinIdArray) {
+      IndexType netId = _pinArray[pinId].netId;
+      if (_netArray[netId].numPins() <= _param.maxNetDegree && _netWindow[netId] != _instWindow[i]) {
+        _winFrozen[i] = 1;
+        break;
+      }
+    }
+  }
+
+  for (auto &mem : _threadMemArray) {
+    mem.indepSet.dep.assign(numInsts(), 0);
+    mem.netMarks.assign(numNets(), 0);
+  }
+#pragma omp parallel for num_threads(_num_threads) schedule(dynamic, 1)
+  for (IndexType w = 0; w < numWinX * numWinY; ++w) {
+    IndexType      wx = w / numWinY;
+    IndexType      wy = w % numWinY;
+    Box<IndexType> window(std::max(wx * winW - offX, 0),
+                          std::max(wy * winH - offY, 0),
+                          std::min((wx + 1) * winW - offX, xSize) - 1,
+                          std::min((wy + 1) * winH - offY, ySize) - 1);
+    runWindow(window, _threadMemArray[omp_get_thread_num()]);
+  }
+}
+
+/// Run ISM iterations in a window until the wirelength improv. of its nets is less than minBatchImprov for a batch
+/// @param  window  the sites of the window, bounds included
+/// @param  mem     the memory of the thread, whose dependency marks are all reset on return
+void ISMSolver::runWindow(const Box<IndexType> &window, ISMMemory &mem) {
+  auto &indepSet = mem.indepSet;
+
+  // Collect the seeds and the frozen instances of the window, and the nets incident to the seeds
+  mem.seeds.clear();
+  mem.frozen.clear();
+  mem.winNets.clear();
+  for (IndexType x = window.xl(); x <= window.xh(); ++x) {
+    for (IndexType y = window.yl(); y <= window.yh(); ++y) {
+      IndexType id = _siteMap(x, y).instId;
+      if (id == kIndexTypeMax || _instArray[id].type == kIndexTypeMax) {
+        continue;
+      }
+      if (_winFrozen[id]) {
+        mem.frozen.push_back(id);
+      } else if (id < _numPhyInsts) {
+        mem.seeds.push_back(id);
+        for (IndexType pinId : _instArray[id].pinIdArray) {
+          IndexType netId = _pinArray[pinId].netId;
+          if (_netArray[netId].numPins() <= _param.maxNetDegree && !mem.netMarks[netId]) {
+            mem.netMarks[netId] = 1;
+            mem.winNets.push_back(netId);
+          }
+        }
+      }
+    }
+  }
+  for (IndexType netId : mem.winNets) {
+    mem.netMarks[netId] = 0;
+  }
+  if (mem.seeds.empty()) {
+    return;
+  }
+
+  auto computeWindowWL = [&]() {
+    XY<RealType> wl(0, 0);
+    for (IndexType netId : mem.winNets) {
+      const auto &net = _netArray[netId];
+      wl.set(wl.x() + net.weight * net.bbox.width(), wl.y() + net.weight * net.bbox.height());
+    }
+    return weightedWL(wl);
+  };
+
+  RealType wl = computeWindowWL();
+  for (IndexType iter = 1; !timeout(); ++iter) {
+    // Frozen instances are dependent to any independent set
+    for (IndexType id : mem.frozen) {
+      indepSet.dep[id] = 1;
+    }
+
+    // Build independent sets from the seeds with less moves first, as computeInstancePriority does
+    std::stable_sort(mem.seeds.begin(), mem.seeds.end(), [&](IndexType a, IndexType b) {
+      return _instArray[a].numMovs < _instArray[b].numMovs;
+    });
+    mem.sets.clear();
+    for (IndexType instId : mem.seeds) {
+      if (!indepSet.dep[instId]) {
+        indepSet.set.clear();
+        indepSet.type  = kIndexTypeMax;
+        indepSet.cksr  = kIndexTypeMax;
+        indepSet.ce[0] = kIndexTypeMax;
+        indepSet.ce[1] = kIndexTypeMax;
+
+        buildIndepSet(_instArray[instId], indepSet, window);
+        mem.sets.emplace_back(indepSet.set);
+      }
+    }
+    for (const auto &set : mem.sets) {
+      clearIndepSetMarks(set, indepSet);
+    }
+
+    for (const auto &set : mem.sets) {
+      computeNetBBoxes(set, mem);
+      computeCostMatrix(set, mem);
+      computeMatching(mem);
+      realizeMatching(set, mem);
+    }
+
+    if (iter % _param.batchSize == 0) {
+      RealType newWL = computeWindowWL();
+      if (wl <= 0 || 1.0 - newWL / wl < _param.minBatchImprov) {
+        break;
+      }
+      wl = newWL;
+    }
+  }
+  for (IndexType id : mem.frozen) {
+    indepSet.dep[id] = 0;
+  }
+}
+
+/// Reset the dependency marks set by addInstToIndepSet for the instances of an independent set
+/// The marks depend on the sites of the instances, so this must be called before realizing the matching
+void ISMSolver::clearIndepSetMarks(const IndexVector &set, IndepSet &indepSet) const {
+  for (IndexType instId : set) {
+    const auto &inst     = _instArray[instId];
+    indepSet.dep[instId] = 0;
+    for (IndexType i : inst.conn) {
+      indepSet.dep[i] = 0;
+    }
+    if (_siteMap[inst.sol.siteId].ctrlSetId != kIndexTypeMax) {
+      XY<IndexType> siteXY(_siteMap.indexToXY(inst.sol.siteId));
+      IndexType     yBeg = floorAlign(siteXY.y(), _param.numSitePerCtrlSet);
+      IndexType     yEnd = yBeg + _param.numSitePerCtrlSet;
+      for (IndexType y = yBeg; y < yEnd; ++y) {
+        IndexType id = _siteMap(siteXY.x(), y).instId;
+        if (id != kIndexTypeMax) {
+          indepSet.dep[id] = 0;
+        }
+      }
+    }
+  }
+}
+
+/// Return true if the runtime limit is reached
+bool ISMSolver::timeout() {
+  return _param.maxRuntime > 0 && _stopwatch.elapsed<mus>() > _param.maxRuntime * 1e6;
+}
+
+/// Return true if the wirelength improv. since the start of the ISM reaches the target
+bool ISMSolver::reachTarget(const XY<RealType> &wl) const {
+  RealType initWL = weightedWL(_initWl);
+  return _param.targetImprov > 0 && initWL > 0 && 1.0 - weightedWL(wl) / initWL >= _param.targetImprov;
+}
+
 }   // namespace ism_dp
 OPENPARF_END_NAMESPACE
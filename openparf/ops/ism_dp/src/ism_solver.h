@@ -23,6 +23,7 @@
 
 // project headers
 #include "container/spiral_accessor.hpp"
+#include "util/stopwatch.h"
 
 // local headers
 #include "ops/ism_dp/src/ism_dp_type_trait.h"
@@ -154,6 +155,14 @@ class ISMSolver {
 
     // General purpose buffers
     IndexVector idxVec;
+
+    // For windowed ISM
+    IndepSet                 indepSet;   // The helper object for independent set building in a window
+    std::vector<IndexVector> sets;       // Independent sets of a window
+    IndexVector              seeds;      // Instances of a window that can be ISM seeds
+    IndexVector              frozen;     // Instances of a window that must not move
+    IndexVector              winNets;    // Nets incident to the seeds of a window
+    ByteVector               netMarks;   // Flags to collect the nets of a window
   };
 
  public:
@@ -162,6 +171,9 @@ class ISMSolver {
   void                  buildISMProblem(const ISMProblem &prob);
   void                  run();
   XY<RealType>          getLoc(IndexType inst_id) const;
+  void                  setHonorClockConstraints(bool honorClockConstraints) {
+    _honorClockConstraints = honorClockConstraints;
+  }
 
   // Get ISM final solution of a instnace
   const ISMInstanceSol &instSol(IndexType i) const { return _instArray[_instIdMapping[i]].sol; }
@@ -193,7 +205,7 @@ class ISMSolver {
   // ISM kernel functions
   void         computeInstancePriority();
   void         buildIndependentIndepSets(IndepSet &indepSet, std::vector<IndexVector> &sets);
-  void         buildIndepSet(const ISMInstance &seed, IndepSet &indepSet);
+  void         buildIndepSet(const ISMInstance &seed, IndepSet &indepSet, const Box<IndexType> &bndBox);
   IndexType    instToIndepSetFeasibility(const ISMInstance &inst, const IndepSet &indepSet);
   IndexType    computeCEMergeCost(IndexType a0, IndexType a1, IndexType b0, IndexType b1) const;
   void         addInstToIndepSet(const ISMInstance &inst, IndexType ceFlip, IndepSet &indepSet);
@@ -204,8 +216,19 @@ class ISMSolver {
   bool         stopCondition();
   XY<RealType> computeHPWL(IndexType maxNetDegree = kIndexTypeMax) const;
 
+  // Windowed ISM
+  void         runWindowedPass(IndexType pass);
+  void         runWindow(const Box<IndexType> &window, ISMMemory &mem);
+  void         clearIndepSetMarks(const IndexVector &set, IndepSet &indepSet) const;
+  bool         timeout();
+  bool         reachTarget(const XY<RealType> &wl) const;
+  RealType     weightedWL(const XY<RealType> &wl) const {
+    return _param.xWirelenWt * wl.x() + _param.yWirelenWt * wl.y();
+  }
+
   // Helping functions
   IndexType    floorAlign(IndexType v, IndexType a) const { return v / a * a; }
+  IndexType    ceilAlign(IndexType v, IndexType a) const { return (v + a - 1) / a * a; }
 
  private:
   const ISMParam &         _param;
@@ -230,7 +253,13 @@ class ISMSolver {
   bool                                                 _honorClockConstraints;
   IndexType                                            _iter;          // Number of ISM iterations done
   XY<RealType>                                         _wl;            // Current unscaled x- and y-derected HPWL
+  XY<RealType>                                         _initWl;        // Unscaled x- and y-derected HPWL before ISM
   IndexType                                            _num_threads;   // number of threads
+  Stopwatch                                            _stopwatch;     // Runtime of the current ISM
+
+  IndexVector _instWindow;   // Window of each movable instance in the current windowed pass
+  IndexVector _netWindow;    // Window of each net no larger than maxNetDegree in the current windowed pass
+  ByteVector  _winFrozen;    // Whether each instance is on a net of another window in the current windowed pass
 };
 
 }   // namespace ism_dp
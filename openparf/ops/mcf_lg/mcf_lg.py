@@ -32,6 +32,19 @@ class MinCostFlowLegalizer:
         if params.honor_half_column_constraints and params.maximum_clock_per_half_column:
             self.legalizer.set_max_clk_per_half_column(
                 params.maximum_clock_per_half_column)
+        if params.ssr_legalize_partition_flag:
+            # the clock region grid by default
+            num_windows = params.ssr_legalize_partition_dims or [0, 0]
+            self.legalizer.set_partition(
+                num_windows[0], num_windows[1], params.ssr_legalize_window_margin)
+        # warm start from the previous call, except with clock constraints
+        self.incremental_flag = bool(params.ssr_legalize_incremental_flag)
+        if self.incremental_flag and params.ssr_legalize_partition_flag:
+            logger.warning(
+                "ssr_legalize_partition_flag takes precedence over ssr_legalize_incremental_flag, "
+                "the incremental SSR legalization is disabled")
+            self.incremental_flag = False
+        self.legalizer.set_incremental(self.incremental_flag)
         self.inst_ids_groups = []
         data_cls.ssr_area_types = []
 
@@ -86,6 +99,10 @@ class MinCostFlowLegalizer:
             local_pos = pos
         with torch.no_grad():
             res = self.legalizer.forward(local_pos)
+            if self.incremental_flag and not self.honor_fence_region_constraints:
+                logger.info(
+                    "incremental SSR legalization: %d instances solved again, %d arcs rebuilt, "
+                    "%d instances moved to other sites" % self.legalizer.get_incremental_stats())
             pos.data.copy_(res)
             for i in range(len(self.inst_ids_groups)):
                 self.data_cls.inst_lock_mask[self.inst_ids_groups[i]] = 1
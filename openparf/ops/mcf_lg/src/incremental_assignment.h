@@ -0,0 +1,383 @@
+#ifndef OPENPARF_OPS_MCF_LG_SRC_INCREMENTAL_ASSIGNMENT_H_
+#define OPENPARF_OPS_MCF_LG_SRC_INCREMENTAL_ASSIGNMENT_H_
+
+// C++ standard library headers
+#include <algorithm>
+#include <array>
+#include <cmath>
+#include <cstdint>
+#include <functional>
+#include <limits>
+#include <queue>
+#include <tuple>
+#include <utility>
+#include <vector>
+
+// project headers
+#include "util/namespace.h"
+
+OPENPARF_BEGIN_NAMESPACE
+
+/// @brief Min-cost assignment of instances to sites over sparse instance-to-site arcs, kept across solves.
+///
+/// It is the min-cost flow of the legalizers solved with shortest augmenting paths and potentials, i.e., the
+/// Hungarian method on a sparse graph. Unlike a network simplex run from scratch, the assignment and the potentials of
+/// the last solve stay optimal for the instances whose arcs are unchanged. An instance whose arc costs change, e.g.,
+/// it moved a little, is re-priced and keeps its site as a warm start unless another site became cheaper, so a solve
+/// only augments again the instances whose best site changed, plus the instances whose dual constraints break when
+/// their sites are released.
+///
+/// An instance has arcs to the sites within a radius, initially the distance increment, widened by the increment for
+/// the instances of an augmenting search that cannot reach a free site. The cost of an arc is the Manhattan distance
+/// to the site times the instance weight and the scale factor, as in the flow problems of the legalizers.
+template<typename T>
+class IncrementalAssignment {
+ public:
+  using CostType = int64_t;
+
+  /// @brief statistics of the last solve
+  struct Stats {
+    int32_t num_updated_insts    = 0;   ///< instances un-assigned and augmented again
+    int32_t num_changed_arcs     = 0;   ///< arcs rebuilt with new costs
+    int32_t num_reassigned_insts = 0;   ///< instances assigned to another site than at the previous solve
+  };
+
+  /// @param sites centers of the sites
+  /// @param num_insts number of instances
+  /// @param dist_incr distance increment of the arc radius
+  /// @param scale_factor scale of the arc costs before rounding
+  /// @param arc_filter optional predicate of whether an instance may be assigned to a site
+  IncrementalAssignment(std::vector<std::array<T, 2>> sites,
+          int32_t                                     num_insts,
+          T                                           dist_incr,
+          int32_t                                     scale_factor,
+          std::function<bool(int32_t, int32_t)>       arc_filter = nullptr)
+      : sites_(std::move(sites)),
+        dist_incr_(std::max(dist_incr, (T) 1)),
+        scale_factor_(scale_factor),
+        arc_filter_(std::move(arc_filter)) {
+    int32_t num_sites = sites_.size();
+    site_insts_.resize(num_sites);
+    site_inst_.assign(num_sites, -1);
+    site_available_.assign(num_sites, 1);
+    v_.assign(num_sites, 0);
+    dist_.assign(num_sites, 0);
+    pred_.assign(num_sites, -1);
+    stamp_.assign(num_sites, 0);
+    epoch_ = 0;
+
+    insts_.resize(num_insts);
+    arcs_.resize(num_insts);
+    inst_site_.assign(num_insts, -1);
+    prev_inst_site_.assign(num_insts, -1);
+    u_.assign(num_insts, 0);
+  }
+
+  /// @brief set the position and the weight of an instance, inactive instances are not assigned
+  ///
+  /// An instance staying active keeps its site as a warm start, its arcs are rebuilt with the new costs and it is
+  /// only un-assigned if another site became cheaper, see reprice().
+  void updateInst(int32_t i, T x, T y, T weight, bool active = true) {
+    auto &inst = insts_[i];
+    if (active == inst.active && (!active || (x == inst.x && y == inst.y && weight == inst.weight))) return;
+    bool was_active = inst.active;
+    inst.active     = active;
+    if (!active || !was_active) release(i);
+    if (active) {
+      inst.x      = x;
+      inst.y      = y;
+      inst.weight = weight;
+      if (inst.radius == 0) inst.radius = dist_incr_;
+      buildArcs(i);
+      if (inst_site_[i] != -1) {
+        reprice(i);
+      } else if (was_active) {
+        free_insts_.push_back(i);
+      }
+    }
+  }
+
+  /// @brief set whether a site can be assigned, e.g., it is not occupied by an instance out of the problem
+  void updateSite(int32_t s, bool available) {
+    if (available == (bool) site_available_[s]) return;
+    site_available_[s] = available;
+    if (!available) {
+      int32_t i = site_inst_[s];
+      if (i != -1) {
+        site_inst_[s] = -1;
+        inst_site_[i] = -1;
+        u_[i]         = 0;
+        free_insts_.push_back(i);
+        counter_.num_updated_insts++;
+      }
+      v_[s] = 0;
+    } else {
+      // a free site has a zero potential, assigned instances preferring it now are solved again
+      for (int32_t i : site_insts_[s]) {
+        if (inst_site_[i] != -1 && u_[i] + v_[s] > arcCost(i, s)) release(i);
+      }
+    }
+  }
+
+  /// @brief assign all the active instances
+  /// @return false if some instance cannot be assigned even with arcs to all the sites
+  bool solve() {
+    bool feasible = true;
+    do {
+      feasible = augmentFreeInsts();
+    } while (feasible && settleFreedSites());
+
+    stats_   = counter_;
+    counter_ = Stats();
+    for (uint32_t i = 0; i < inst_site_.size(); i++) {
+      if (inst_site_[i] != prev_inst_site_[i]) stats_.num_reassigned_insts++;
+    }
+    prev_inst_site_ = inst_site_;
+    return feasible;
+  }
+
+  /// @brief site assigned to an instance, -1 if none
+  int32_t      instSite(int32_t i) const { return inst_site_[i]; }
+  Stats const &stats() const { return stats_; }
+
+ private:
+  struct Inst {
+    T    x      = 0;
+    T    y      = 0;
+    T    weight = 0;
+    T    radius = 0;
+    T    span   = 0;   ///< distance to the farthest site
+    bool active = false;
+  };
+
+  /// @brief augment from all the free instances
+  /// @return false if some instance cannot be assigned even with arcs to all the sites
+  bool augmentFreeInsts() {
+    while (!free_insts_.empty()) {
+      int32_t i = free_insts_.back();
+      free_insts_.pop_back();
+      if (!insts_[i].active || inst_site_[i] != -1) continue;
+      if (augment(i)) continue;
+      // the search got stuck, widen the radius of the instances it reached and retry
+      bool widened = false;
+      for (int32_t r : scanned_insts_) {
+        auto &inst = insts_[r];
+        if (inst.radius >= inst.span) continue;
+        inst.radius += dist_incr_;
+        widened = true;
+        buildArcs(r);
+        if (inst_site_[r] == -1) continue;
+        for (auto const &arc : arcs_[r]) {
+          if (u_[r] + v_[arc.first] > arc.second) {
+            release(r);
+            break;
+          }
+        }
+      }
+      if (!widened) return false;
+      free_insts_.push_back(i);
+    }
+    return true;
+  }
+
+  /// @brief zero the potentials of the sites left free by repriced instances, see reprice(), and un-assign the
+  /// instances whose dual constraints break for them, so that a free site has a zero potential again
+  /// @return whether some instance was un-assigned
+  bool settleFreedSites() {
+    bool released = false;
+    for (int32_t s : freed_sites_) {
+      if (site_inst_[s] != -1 || v_[s] == 0) continue;
+      v_[s] = 0;
+      for (int32_t r : site_insts_[s]) {
+        if (inst_site_[r] != -1 && u_[r] > arcCost(r, s)) {
+          release(r);
+          released = true;
+        }
+      }
+    }
+    freed_sites_.clear();
+    return released;
+  }
+
+  CostType arcCost(int32_t i, int32_t s) const {
+    for (auto const &arc : arcs_[i]) {
+      if (arc.first == s) return arc.second;
+    }
+    return std::numeric_limits<CostType>::max();
+  }
+
+  void buildArcs(int32_t i) {
+    for (auto const &arc : arcs_[i]) {
+      auto &insts = site_insts_[arc.first];
+      insts.erase(std::find(insts.begin(), insts.end(), i));
+    }
+    arcs_[i].clear();
+    auto &inst = insts_[i];
+    inst.span  = 0;
+    for (int32_t s = 0; s < (int32_t) sites_.size(); s++) {
+      T dist    = std::abs(sites_[s][0] - inst.x) + std::abs(sites_[s][1] - inst.y);
+      inst.span = std::max(inst.span, dist);
+      if (dist > inst.radius || (arc_filter_ && !arc_filter_(i, s))) continue;
+      arcs_[i].emplace_back(s, (CostType) (dist * inst.weight * scale_factor_));
+      site_insts_[s].push_back(i);
+    }
+    counter_.num_changed_arcs += arcs_[i].size();
+  }
+
+  /// @brief keep the site of an assigned instance whose arc costs changed. The potential of the instance becomes
+  /// u_i = min_s (c_is - v_s), so the reduced costs of its arcs stay non-negative. If its arc is no longer tight, the
+  /// potential of its site is raised to make it tight, as long as the site potential stays non-positive and the arcs
+  /// of the other assigned instances to the site keep non-negative reduced costs.
+  ///
+  /// Otherwise, or if the site left its arcs, the instance is un-assigned but its site keeps its potential, so the
+  /// other instances are not un-assigned in cascade. The instance mostly takes its site back, or another instance
+  /// takes it, and the sites left free get a zero potential at the end of the solve, see settleFreedSites().
+  void reprice(int32_t i) {
+    constexpr CostType kInf     = std::numeric_limits<CostType>::max();
+    int32_t            s        = inst_site_[i];
+    CostType           u        = kInf;
+    CostType           assigned = kInf;
+    for (auto const &arc : arcs_[i]) {
+      if (!site_available_[arc.first]) continue;
+      CostType reduced = arc.second - v_[arc.first];
+      u                = std::min(u, reduced);
+      if (arc.first == s) assigned = reduced;
+    }
+    CostType slack    = (assigned == kInf) ? kInf : assigned - u;
+    bool     raisable = (assigned != kInf && v_[s] + slack <= 0);
+    for (int32_t r : site_insts_[s]) {
+      if (!raisable || slack == 0) break;
+      if (r == i || !insts_[r].active || inst_site_[r] == -1) continue;
+      raisable = (arcCost(r, s) - u_[r] - v_[s] >= slack);
+    }
+    if (!raisable) {
+      u_[i]         = 0;
+      inst_site_[i] = -1;
+      site_inst_[s] = -1;
+      free_insts_.push_back(i);
+      freed_sites_.push_back(s);
+      counter_.num_updated_insts++;
+      return;
+    }
+    v_[s] += slack;
+    u_[i]  = u;
+  }
+
+  /// @brief un-assign an instance. Its site gets a zero potential as a free site, and the assigned instances whose
+  /// dual constraints break for that site are un-assigned in turn.
+  void release(int32_t i) {
+    std::vector<int32_t> stack(1, i);
+    while (!stack.empty()) {
+      int32_t k = stack.back();
+      stack.pop_back();
+      if (k != i && inst_site_[k] == -1) continue;
+      u_[k] = 0;
+      free_insts_.push_back(k);
+      counter_.num_updated_insts++;
+      int32_t s = inst_site_[k];
+      if (s == -1) continue;
+      inst_site_[k] = -1;
+      site_inst_[s] = -1;
+      if (!site_available_[s] || v_[s] == 0) continue;
+      v_[s] = 0;
+      for (int32_t r : site_insts_[s]) {
+        if (inst_site_[r] != -1 && u_[r] + v_[s] > arcCost(r, s)) stack.push_back(r);
+      }
+    }
+  }
+
+  /// @brief shortest augmenting path from a free instance to a free site with Dijkstra on the reduced costs
+  /// @return false if no free site is reachable, the instances reached are left in scanned_insts_
+  bool augment(int32_t root) {
+    using Entry = std::tuple<CostType, int32_t, int32_t>;   // distance, whether the site is assigned, site
+    std::priority_queue<Entry, std::vector<Entry>, std::greater<Entry>> heap;
+    scanned_insts_.clear();
+    scanned_sites_.clear();
+    // stamp_ is 2 * epoch_ + 1 for a reached site and 2 * epoch_ + 2 once its distance is final
+    epoch_++;
+    auto     reached = [&](int32_t s) { return stamp_[s] >= 2 * epoch_ + 1; };
+    auto     scanned = [&](int32_t s) { return stamp_[s] == 2 * epoch_ + 2; };
+    CostType min_dist = 0;
+    int32_t  i        = root;
+    int32_t  sink     = -1;
+    while (sink == -1) {
+      scanned_insts_.push_back(i);
+      for (auto const &arc : arcs_[i]) {
+        int32_t s = arc.first;
+        if (!site_available_[s] || scanned(s)) continue;
+        CostType d = min_dist + arc.second - u_[i] - v_[s];
+        if (!reached(s) || d < dist_[s]) {
+          dist_[s]  = d;
+          pred_[s]  = i;
+          stamp_[s] = 2 * epoch_ + 1;
+          heap.emplace(d, site_inst_[s] != -1, s);
+        }
+      }
+      int32_t s = -1;
+      while (!heap.empty()) {
+        auto top = heap.top();
+        heap.pop();
+        if (!scanned(std::get<2>(top)) && std::get<0>(top) == dist_[std::get<2>(top)]) {
+          s = std::get<2>(top);
+          break;
+        }
+      }
+      if (s == -1) return false;
+      min_dist  = dist_[s];
+      stamp_[s] = 2 * epoch_ + 2;
+      scanned_sites_.push_back(s);
+      if (site_inst_[s] == -1) {
+        sink = s;
+      } else {
+        i = site_inst_[s];
+      }
+    }
+
+    // update the potentials, reduced costs stay non-negative and are zero on the assigned arcs
+    u_[root] += min_dist;
+    for (uint32_t k = 1; k < scanned_insts_.size(); k++) {
+      int32_t r = scanned_insts_[k];
+      u_[r] += min_dist - dist_[inst_site_[r]];
+    }
+    for (int32_t s : scanned_sites_) {
+      v_[s] -= min_dist - dist_[s];
+    }
+    // flip the assignment along the path
+    for (int32_t s = sink;;) {
+      int32_t r    = pred_[s];
+      int32_t next = inst_site_[r];
+      inst_site_[r] = s;
+      site_inst_[s] = r;
+      if (r == root) break;
+      s = next;
+    }
+    return true;
+  }
+
+  std::vector<std::array<T, 2>>                          sites_;
+  T                                                      dist_incr_;
+  int32_t                                                scale_factor_;
+  std::function<bool(int32_t, int32_t)>                  arc_filter_;
+
+  std::vector<Inst>                                      insts_;
+  std::vector<std::vector<std::pair<int32_t, CostType>>> arcs_;         ///< (site, cost) of each instance
+  std::vector<std::vector<int32_t>>                      site_insts_;   ///< instances with an arc to each site
+  std::vector<int32_t>                                   inst_site_, site_inst_, prev_inst_site_;
+  std::vector<uint8_t>                                   site_available_;
+  std::vector<CostType>                                  u_, v_;        ///< potentials of instances and sites
+  std::vector<int32_t>                                   free_insts_;
+  std::vector<int32_t>                                   freed_sites_;   ///< sites left free by repriced instances
+
+  // Dijkstra workspace
+  std::vector<CostType>                                  dist_;
+  std::vector<int32_t>                                   pred_;
+  std::vector<int64_t>                                   stamp_;
+  int64_t                                                epoch_;
+  std::vector<int32_t>                                   scanned_insts_, scanned_sites_;
+
+  Stats                                                  counter_, stats_;
+};
+
+OPENPARF_END_NAMESPACE
+
+#endif   // OPENPARF_OPS_MCF_LG_SRC_INCREMENTAL_ASSIGNMENT_H_
@@ -18,7 +18,10 @@
  * This header is generated by VSCode extension psi-header.
  */
 
+#include <algorithm>
 #include <cstdint>
+#include <limits>
+#include <tuple>
 #include <vector>
 
 #include "ops/mcf_lg/src/mcf_lg_kernel.h"
@@ -79,6 +82,8 @@ at::Tensor MinCostFlowLegalizer<T>::forward(at::Tensor pos) {
     openparfPrint(kDebug, "Clock constraints is activated for SSSIR legalization.\n");
   } else {
     openparfPrint(kDebug, "Clock constraints is NOT activated for SSSIR legalization.\n");
+    if (num_windows_x * num_windows_y > 1) return forward_partitioned(pos);
+    if (incremental) return forward_incremental(pos);
   }
   // https://stackoverflow.com/questions/55266154/pytorch-preferred-way-to-copy-a-tensor
   at::Tensor res        = pos.clone().detach();
@@ -228,6 +233,106 @@ at::Tensor MinCostFlowLegalizer<T>::forward(at::Tensor pos) {
 }
 
 
+template<typename T>
+at::Tensor MinCostFlowLegalizer<T>::forward_partitioned(at::Tensor pos) {
+  at::Tensor res        = pos.clone().detach();
+  auto       pos_acc    = pos.template accessor<T, 2>();
+  auto       res_acc    = res.template accessor<T, 2>();
+  int32_t    num_models = sssir_model_infos.size();
+  openparfPrint(MessageType::kInfo, "========================================================\n");
+  openparfPrint(MessageType::kInfo, "Starting min cost flow legalization of %i SSSIR models in %i x %i windows\n",
+          num_models, num_windows_x, num_windows_y);
+
+  // Copy out the positions, weights and site centers, so windows are solved without touching tensors
+  std::vector<std::vector<std::array<T, 3>>> model_insts(num_models);
+  std::vector<std::vector<std::array<T, 2>>> model_sites(num_models);
+  for (int32_t idx = 0; idx < num_models; idx++) {
+    auto &m                          = sssir_model_infos[idx];
+    auto  inst_id_acc                = m.inst_ids.template accessor<int32_t, 1>();
+    auto  inst_weight_acc            = m.inst_weights.template accessor<T, 1>();
+    auto  inst_compatiable_sites_acc = m.inst_compatiable_sites.template accessor<T, 2>();
+    for (int32_t i = 0; i < m.num_insts; i++) {
+      int32_t inst_id = inst_id_acc[i];
+      // weights are indexed as in the monolithic problem, so both optimize the same displacement
+      model_insts[idx].push_back({pos_acc[inst_id][0], pos_acc[inst_id][1], inst_weight_acc[i]});
+    }
+    for (int32_t s = 0; s < m.num_sites; s++) {
+      model_sites[idx].push_back({(inst_compatiable_sites_acc[s][0] + inst_compatiable_sites_acc[s][2]) / 2,
+              (inst_compatiable_sites_acc[s][1] + inst_compatiable_sites_acc[s][3]) / 2});
+    }
+  }
+
+  auto                              site_map_dim = _placedb.siteMapDim();
+  std::vector<std::vector<int32_t>> model_inst_sites;
+  num_reconciled_insts = PartitionedAssignment<T>(site_per_iteration, scale_factor)
+                                 .solvePartitioned(model_insts, model_sites, site_map_dim.x(), site_map_dim.y(),
+                                         num_windows_x, num_windows_y, window_margin, at::get_num_threads(),
+                                         model_inst_sites);
+
+  for (int32_t idx = 0; idx < num_models; idx++) {
+    auto &m           = sssir_model_infos[idx];
+    auto  inst_id_acc = m.inst_ids.template accessor<int32_t, 1>();
+    for (int32_t i = 0; i < m.num_insts; i++) {
+      auto const &site           = model_sites[idx][model_inst_sites[idx][i]];
+      res_acc[inst_id_acc[i]][0] = site[0];
+      res_acc[inst_id_acc[i]][1] = site[1];
+    }
+  }
+  return res;
+}
+
+template<typename T>
+at::Tensor MinCostFlowLegalizer<T>::forward_incremental(at::Tensor pos) {
+  at::Tensor res        = pos.clone().detach();
+  auto       pos_acc    = pos.template accessor<T, 2>();
+  auto       res_acc    = res.template accessor<T, 2>();
+  int32_t    num_models = sssir_model_infos.size();
+  openparfPrint(MessageType::kInfo, "========================================================\n");
+  openparfPrint(MessageType::kInfo, "Starting incremental min cost flow legalization of %i SSSIR models\n", num_models);
+
+  if (assignments.empty()) {
+    // the arc radius grows by the ring distance of the monolithic problem at the first call
+    calculate_max_distance(pos);
+    for (auto &m : sssir_model_infos) {
+      auto                          inst_compatiable_sites_acc = m.inst_compatiable_sites.template accessor<T, 2>();
+      std::vector<std::array<T, 2>> sites;
+      for (int32_t s = 0; s < m.num_sites; s++) {
+        sites.push_back({(inst_compatiable_sites_acc[s][0] + inst_compatiable_sites_acc[s][2]) / 2,
+                (inst_compatiable_sites_acc[s][1] + inst_compatiable_sites_acc[s][3]) / 2});
+      }
+      assignments.emplace_back(std::move(sites), m.num_insts, (T) m.dist_incr_per_iter, scale_factor);
+    }
+  }
+
+  incremental_stats = typename IncrementalAssignment<T>::Stats();
+  for (int32_t idx = 0; idx < num_models; idx++) {
+    auto &m               = sssir_model_infos[idx];
+    auto &assignment      = assignments[idx];
+    auto  inst_id_acc     = m.inst_ids.template accessor<int32_t, 1>();
+    auto  inst_weight_acc = m.inst_weights.template accessor<T, 1>();
+    for (int32_t i = 0; i < m.num_insts; i++) {
+      int32_t inst_id = inst_id_acc[i];
+      assignment.updateInst(i, pos_acc[inst_id][0], pos_acc[inst_id][1], inst_weight_acc[i]);
+    }
+    openparfAssertMsg(assignment.solve(), "Model %i: %i instances but only %i sites\n", idx, m.num_insts,
+            m.num_sites);
+    auto const &stats = assignment.stats();
+    openparfPrint(kDebug, "Model %i: %i instances solved again, %i arcs rebuilt, %i instances moved to other sites\n",
+            idx, stats.num_updated_insts, stats.num_changed_arcs, stats.num_reassigned_insts);
+    incremental_stats.num_updated_insts += stats.num_updated_insts;
+    incremental_stats.num_changed_arcs += stats.num_changed_arcs;
+    incremental_stats.num_reassigned_insts += stats.num_reassigned_insts;
+
+    auto inst_compatiable_sites_acc = m.inst_compatiable_sites.template accessor<T, 2>();
+    for (int32_t i = 0; i < m.num_insts; i++) {
+      int32_t s                  = assignment.instSite(i);
+      res_acc[inst_id_acc[i]][0] = (inst_compatiable_sites_acc[s][0] + inst_compatiable_sites_acc[s][2]) / 2;
+      res_acc[inst_id_acc[i]][1] = (inst_compatiable_sites_acc[s][1] + inst_compatiable_sites_acc[s][3]) / 2;
+    }
+  }
+  return res;
+}
+
 template<typename T>
 bool MinCostFlowLegalizer<T>::inst_clock_legal_at_site(int32_t inst_id, int32_t site_x, int32_t site_y) {
   auto        cr_id = xy_to_clock_region_functor(site_x, site_y);
@@ -387,7 +492,15 @@ OPENPARF_END_NAMESPACE
                   "Set maximum number of clock nets in each half column")                                              \
           .def("reset_clock_available_clock_region",                                                                   \
                   &OPENPARF_NAMESPACE::MinCostFlowLegalizer<T>::reset_clock_available_clock_region,                    \
-                  "Reset the clock available clock region");
+                  "Reset the clock available clock region")                                                            \
+          .def("set_partition", &OPENPARF_NAMESPACE::MinCostFlowLegalizer<T>::set_partition,                           \
+                  "Legalize in parallel windows of the die, nx x ny windows with margin")                              \
+          .def("get_num_reconciled_insts", &OPENPARF_NAMESPACE::MinCostFlowLegalizer<T>::get_num_reconciled_insts,     \
+                  "Number of instances re-assigned by the global pass of the last partitioned legalization")           \
+          .def("set_incremental", &OPENPARF_NAMESPACE::MinCostFlowLegalizer<T>::set_incremental,                       \
+                  "Keep the assignment across calls and only solve again the instances that moved")                    \
+          .def("get_incremental_stats", &OPENPARF_NAMESPACE::MinCostFlowLegalizer<T>::get_incremental_stats,           \
+                  "Instances solved again, arcs rebuilt and instances moved to other sites in the last call");
 
 PYBIND11_MODULE(TORCH_EXTENSION_NAME, m) {
   INSTANTIATE_PYTHON_CLASS(float);
@@ -1,10 +1,14 @@
 
+#include <array>
 #include <functional>
+#include <tuple>
 #include <vector>
 
 #include "database/placedb.h"
 #include "lemon/list_graph.h"
 #include "lemon/network_simplex.h"
+#include "ops/mcf_lg/src/incremental_assignment.h"
+#include "ops/mcf_lg/src/partitioned_assignment.h"
 #include "util/torch.h"
 #include "util/util.h"
 
@@ -95,6 +99,11 @@ class MinCostFlowLegalizer {
         inst_to_clock_indexes(placedb.instToClocks()) {
     site_per_iteration         = 100;
     scale_factor               = 1000;
+    num_windows_x              = 1;
+    num_windows_y              = 1;
+    window_margin              = 0.5;
+    num_reconciled_insts       = 0;
+    incremental                = false;
     num_clock_nets             = placedb.numClockNets();
     num_half_column_regions    = placedb.numHalfColumnRegions();
     xy_to_clock_region_functor = [&](int32_t x, int32_t y) {
@@ -114,10 +123,40 @@ class MinCostFlowLegalizer {
     openparfAssert(c > 0);
     max_clock_net_per_half_column = c;
   }
+  /// @brief Legalize the instances of each model window by window over a grid of the die, then re-assign the instances
+  /// whose sites are claimed by several windows in a global pass over the remaining sites. Windows are solved in
+  /// parallel. Clock constraints couple all the sites, so the monolithic problem is still solved when they are honored.
+  /// @param nx number of windows in x, the number of clock region columns if not positive
+  /// @param ny number of windows in y, the number of clock region rows if not positive
+  /// @param margin candidate sites of a window extend beyond it by margin times the window size
+  void set_partition(int32_t nx, int32_t ny, double margin) {
+    openparfAssert(margin >= 0);
+    num_windows_x = (nx > 0) ? nx : _placedb.numCrX();
+    num_windows_y = (ny > 0) ? ny : _placedb.numCrY();
+    window_margin = margin;
+  }
+  /// @brief number of instances re-assigned by the global pass of the last partitioned legalization
+  int32_t get_num_reconciled_insts() const { return num_reconciled_insts; }
+  /// @brief Keep the assignment and the potentials of each model across calls, and only solve again the instances
+  /// that moved since the previous call, see IncrementalAssignment. Like the partitioned mode, it does not apply when
+  /// clock constraints are honored, and the partitioned mode takes precedence over it otherwise.
+  void set_incremental(bool v) {
+    incremental = v;
+    assignments.clear();
+  }
+  /// @brief numbers of instances solved again, of arcs rebuilt and of instances moved to another site in the last
+  /// incremental legalization
+  std::tuple<int32_t, int32_t, int32_t> get_incremental_stats() const {
+    return std::make_tuple(incremental_stats.num_updated_insts, incremental_stats.num_changed_arcs,
+            incremental_stats.num_reassigned_insts);
+  }
 
  private:
   void                                      calculate_max_distance(at::Tensor pos);
 
+  at::Tensor                                forward_partitioned(at::Tensor pos);
+  at::Tensor                                forward_incremental(at::Tensor pos);
+
   void                                      init_clock_constraints();
   bool                                      inst_clock_legal_at_site(int32_t inst_id, int32_t site_x, int32_t site_y);
   void                                      calculate_half_column_scoreboard_cost(at::Tensor pos);
@@ -131,6 +170,17 @@ class MinCostFlowLegalizer {
   int32_t                                   site_per_iteration;
   int32_t                                   scale_factor;
 
+  // Partitioned legalization
+  int32_t                                   num_windows_x;
+  int32_t                                   num_windows_y;
+  double                                    window_margin;
+  int32_t                                   num_reconciled_insts;
+
+  // Incremental legalization
+  bool                                      incremental;
+  std::vector<IncrementalAssignment<T>>     assignments;
+  typename IncrementalAssignment<T>::Stats  incremental_stats;
+
   // Clock constraint related structure
   bool                                      honor_clock_region_constraints;
   std::function<int32_t(int32_t, int32_t)>  xy_to_half_column_functor;
@@ -0,0 +1,274 @@
+#ifndef OPENPARF_OPS_MCF_LG_SRC_PARTITIONED_ASSIGNMENT_H_
+#define OPENPARF_OPS_MCF_LG_SRC_PARTITIONED_ASSIGNMENT_H_
+
+// C++ standard library headers
+#include <algorithm>
+#include <array>
+#include <cmath>
+#include <cstdint>
+#include <limits>
+#include <tuple>
+#include <utility>
+#include <vector>
+
+// 3rdparty headers
+#include "lemon/list_graph.h"
+#include "lemon/network_simplex.h"
+
+// project headers
+#include "util/message.h"
+
+OPENPARF_BEGIN_NAMESPACE
+
+/// @brief Min-cost assignment of instances to sites, solved with the network simplex as a whole or window by window.
+///
+/// The formulation is the one of the monolithic min cost flow legalization: the cost of an arc is the Manhattan
+/// distance to the site times the instance weight and the scale factor, and the instance-to-site arcs are added ring
+/// by ring until the flow is feasible. In the partitioned solve, the instances of each model are split into the
+/// windows of a grid of the die, each window being solved in parallel with the sites around it. Windows overlap, so a
+/// site may be claimed by several of them. An instance keeps its site if no other window claimed it, and the others
+/// are assigned in a global pass over the remaining sites. Keeping the cheapest claim instead would push the other
+/// claimants of a site to the far sites left over.
+template<typename T>
+class PartitionedAssignment {
+ public:
+  using GraphType    = lemon::ListDigraph;
+  using CapacityType = int32_t;
+  using CostType     = int32_t;
+  using SolverType   = lemon::NetworkSimplex<GraphType, CapacityType, CostType>;
+
+  /// @param site_per_iteration number of sites per ring of arcs
+  /// @param scale_factor scale of the arc costs before rounding
+  PartitionedAssignment(int32_t site_per_iteration, int32_t scale_factor)
+      : site_per_iteration_(site_per_iteration),
+        scale_factor_(scale_factor) {}
+
+  /// @brief assign each instance {x, y, weight} to its own site {x, y}
+  /// @param assignment index of the site of each instance
+  /// @return false if there are more instances than sites
+  bool solve(std::vector<std::array<T, 3>> const &insts,
+          std::vector<std::array<T, 2>> const    &sites,
+          std::vector<int32_t>                   &assignment) const {
+    using ResultType  = typename SolverType::ProblemType;
+    int32_t num_insts = insts.size();
+    int32_t num_sites = sites.size();
+    assignment.assign(num_insts, -1);
+    if (num_insts > num_sites) return false;
+    if (num_insts == 0) return true;
+
+    GraphType                       graph;
+    GraphType::ArcMap<CapacityType> capacity_lower_bound(graph), capacity_upper_bound(graph);
+    GraphType::ArcMap<CostType>     cost(graph);
+    SolverType                      solver(graph);
+    GraphType::Node                 source = graph.addNode();
+    GraphType::Node                 drain  = graph.addNode();
+    std::vector<GraphType::Node>    inst_nodes, site_nodes;
+    T                               min_x = std::numeric_limits<T>::max();
+    T                               min_y = std::numeric_limits<T>::max();
+    T                               max_x = std::numeric_limits<T>::lowest();
+    T                               max_y = std::numeric_limits<T>::lowest();
+    for (auto const &inst : insts) {
+      inst_nodes.emplace_back(graph.addNode());
+      auto arc                  = graph.addArc(source, inst_nodes.back());
+      cost[arc]                 = 0;
+      capacity_lower_bound[arc] = 0;
+      capacity_upper_bound[arc] = 1;
+      min_x                     = std::min(min_x, inst[0]);
+      min_y                     = std::min(min_y, inst[1]);
+      max_x                     = std::max(max_x, inst[0]);
+      max_y                     = std::max(max_y, inst[1]);
+    }
+    for (auto const &site : sites) {
+      site_nodes.emplace_back(graph.addNode());
+      auto arc                  = graph.addArc(site_nodes.back(), drain);
+      cost[arc]                 = 0;
+      capacity_lower_bound[arc] = 0;
+      capacity_upper_bound[arc] = 1;
+      min_x                     = std::min(min_x, site[0]);
+      min_y                     = std::min(min_y, site[1]);
+      max_x                     = std::max(max_x, site[0]);
+      max_y                     = std::max(max_y, site[1]);
+    }
+
+    // Add instance-to-site arcs ring by ring until the flow is feasible, the last ring takes all the remaining sites
+    int32_t iteration_num = std::max(num_sites / site_per_iteration_, 1);
+    T       dist_incr     = (max_x - min_x + max_y - min_y) / iteration_num;
+    std::vector<std::tuple<int32_t, int32_t, GraphType::Arc>> arcs;
+    for (int32_t iter = 0; iter < iteration_num; iter++) {
+      T    min_dis   = dist_incr * iter;
+      T    max_dis   = dist_incr * (iter + 1);
+      bool last_ring = (iter + 1 == iteration_num);
+      for (int32_t i = 0; i < num_insts; i++) {
+        for (int32_t s = 0; s < num_sites; s++) {
+          T m_dist = std::abs(sites[s][0] - insts[i][0]) + std::abs(sites[s][1] - insts[i][1]);
+          if (m_dist >= min_dis && (m_dist < max_dis || last_ring)) {
+            arcs.emplace_back(i, s, graph.addArc(inst_nodes[i], site_nodes[s]));
+            auto &arc                 = std::get<2>(arcs.back());
+            cost[arc]                 = (CostType) (m_dist * insts[i][2] * scale_factor_);
+            capacity_lower_bound[arc] = 0;
+            capacity_upper_bound[arc] = 1;
+          }
+        }
+      }
+      // An infeasible ring only means that more sites are needed
+      solver.reset();
+      auto result = solver.stSupply(source, drain, num_insts)
+                            .lowerMap(capacity_lower_bound)
+                            .upperMap(capacity_upper_bound)
+                            .costMap(cost)
+                            .run();
+      if (result == ResultType::OPTIMAL) {
+        for (auto const &arc : arcs) {
+          if (solver.flow(std::get<2>(arc))) assignment[std::get<0>(arc)] = std::get<1>(arc);
+        }
+        return true;
+      }
+    }
+    return false;
+  }
+
+  /// @brief assign the instances of each model to its sites window by window over a grid of the die
+  /// @param model_insts instances {x, y, weight} of each model
+  /// @param model_sites sites {x, y} of each model
+  /// @param width width of the die
+  /// @param height height of the die
+  /// @param num_windows_x number of windows in x
+  /// @param num_windows_y number of windows in y
+  /// @param margin candidate sites of a window extend beyond it by margin times the window size
+  /// @param num_threads number of threads of the windows
+  /// @param model_inst_sites index of the site of each instance of each model
+  /// @return number of instances re-assigned by the global pass
+  int32_t solvePartitioned(std::vector<std::vector<std::array<T, 3>>> const &model_insts,
+          std::vector<std::vector<std::array<T, 2>>> const                  &model_sites,
+          double                                                             width,
+          double                                                             height,
+          int32_t                                                            num_windows_x,
+          int32_t                                                            num_windows_y,
+          double                                                             margin,
+          int32_t                                                            num_threads,
+          std::vector<std::vector<int32_t>>                                 &model_inst_sites) const {
+    // A window of the instances of a model, with the candidate sites around it
+    struct WindowTask {
+      int32_t              model;
+      std::vector<int32_t> insts;   // indices of the instances in the model
+      std::vector<int32_t> sites;   // indices of the sites in the model
+      std::vector<int32_t> assignment;
+      bool                 solved;
+    };
+
+    int32_t                 num_models = model_insts.size();
+    double                  window_w   = width / num_windows_x;
+    double                  window_h   = height / num_windows_y;
+    std::vector<WindowTask> tasks;
+    for (int32_t idx = 0; idx < num_models; idx++) {
+      auto const &insts     = model_insts[idx];
+      auto const &sites     = model_sites[idx];
+      int32_t     num_insts = insts.size();
+      int32_t     num_sites = sites.size();
+      openparfAssertMsg(num_insts <= num_sites, "Model %i: %i instances but only %i sites\n", idx, num_insts,
+              num_sites);
+
+      std::vector<std::vector<int32_t>> window_insts(num_windows_x * num_windows_y);
+      for (int32_t i = 0; i < num_insts; i++) {
+        int32_t wx = std::min(std::max((int32_t) (insts[i][0] / window_w), 0), num_windows_x - 1);
+        int32_t wy = std::min(std::max((int32_t) (insts[i][1] / window_h), 0), num_windows_y - 1);
+        window_insts[wx * num_windows_y + wy].push_back(i);
+      }
+      for (int32_t w = 0; w < num_windows_x * num_windows_y; w++) {
+        if (window_insts[w].empty()) continue;
+        tasks.emplace_back();
+        auto &task  = tasks.back();
+        task.model  = idx;
+        task.insts  = std::move(window_insts[w]);
+        task.solved = false;
+        // Widen the margin until the window has enough candidate sites for its instances
+        double xl = (w / num_windows_y) * window_w;
+        double yl = (w % num_windows_y) * window_h;
+        for (double m = margin;; m = std::max(m * 2, 1.0)) {
+          double mx = m * window_w;
+          double my = m * window_h;
+          task.sites.clear();
+          for (int32_t s = 0; s < num_sites; s++) {
+            if (sites[s][0] >= xl - mx && sites[s][0] < xl + window_w + mx && sites[s][1] >= yl - my &&
+                    sites[s][1] < yl + window_h + my) {
+              task.sites.push_back(s);
+            }
+          }
+          if (task.sites.size() >= task.insts.size() || (int32_t) task.sites.size() == num_sites) break;
+        }
+      }
+    }
+
+#pragma omp parallel for num_threads(num_threads) schedule(dynamic, 1)
+    for (int32_t t = 0; t < (int32_t) tasks.size(); t++) {
+      auto                          &task = tasks[t];
+      std::vector<std::array<T, 3>> insts;
+      std::vector<std::array<T, 2>> sites;
+      for (auto i : task.insts) insts.push_back(model_insts[task.model][i]);
+      for (auto s : task.sites) sites.push_back(model_sites[task.model][s]);
+      task.solved = solve(insts, sites, task.assignment);
+    }
+
+    int32_t num_reconciled_insts = 0;
+    model_inst_sites.resize(num_models);
+    for (int32_t idx = 0; idx < num_models; idx++) {
+      auto const          &insts      = model_insts[idx];
+      auto const          &sites      = model_sites[idx];
+      int32_t              num_insts  = insts.size();
+      int32_t              num_sites  = sites.size();
+      auto                &inst_sites = model_inst_sites[idx];
+      std::vector<int32_t> site_insts(num_sites, -1);
+      std::vector<int32_t> num_claims(num_sites, 0);
+      inst_sites.assign(num_insts, -1);
+      for (auto const &task : tasks) {
+        if (task.model != idx || !task.solved) continue;
+        for (uint32_t k = 0; k < task.insts.size(); k++) {
+          int32_t i = task.insts[k];
+          int32_t s = task.sites[task.assignment[k]];
+          if (num_claims[s]++ == 0) {
+            site_insts[s] = i;
+            inst_sites[i] = s;
+          }
+        }
+      }
+      // All the instances claiming a site with others are assigned again, so that they may swap sites
+      for (int32_t s = 0; s < num_sites; s++) {
+        if (num_claims[s] > 1) {
+          inst_sites[site_insts[s]] = -1;
+          site_insts[s]             = -1;
+        }
+      }
+
+      std::vector<int32_t>          free_insts, free_sites;
+      std::vector<std::array<T, 3>> global_insts;
+      std::vector<std::array<T, 2>> global_sites;
+      for (int32_t i = 0; i < num_insts; i++) {
+        if (inst_sites[i] != -1) continue;
+        free_insts.push_back(i);
+        global_insts.push_back(insts[i]);
+      }
+      for (int32_t s = 0; s < num_sites; s++) {
+        if (site_insts[s] != -1) continue;
+        free_sites.push_back(s);
+        global_sites.push_back(sites[s]);
+      }
+      std::vector<int32_t> assignment;
+      openparfAssert(solve(global_insts, global_sites, assignment));
+      for (uint32_t k = 0; k < free_insts.size(); k++) {
+        inst_sites[free_insts[k]] = free_sites[assignment[k]];
+      }
+      openparfPrint(kDebug, "Model %i: %i instances, %i sites, %i re-assigned in the global pass\n", idx, num_insts,
+              num_sites, (int32_t) free_insts.size());
+      num_reconciled_insts += free_insts.size();
+    }
+    return num_reconciled_insts;
+  }
+
+ private:
+  int32_t site_per_iteration_;
+  int32_t scale_factor_;
+};
+
+OPENPARF_END_NAMESPACE
+
+#endif   // OPENPARF_OPS_MCF_LG_SRC_PARTITIONED_ASSIGNMENT_H_
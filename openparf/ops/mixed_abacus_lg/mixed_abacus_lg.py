@@ -25,7 +25,9 @@ from . import mixed_abacus_lg_cpp
 
 
 class MixedAbacusLegalizer(object):
-    def __init__(self, placedb, data_cls, lg_inst_ids: torch.Tensor, area_type_id):
+    def __init__(
+        self, placedb, data_cls, lg_inst_ids: torch.Tensor, area_type_id, num_window_cols=0
+    ):
         assert lg_inst_ids.dtype == torch.int32
         assert not lg_inst_ids.is_cuda
         assert lg_inst_ids.is_contiguous
@@ -34,6 +36,9 @@ class MixedAbacusLegalizer(object):
         self.data_cls = data_cls
         self.lg_inst_ids = lg_inst_ids.cpu()
         self.area_type_id = area_type_id
+        self.num_window_cols = num_window_cols
+        # site columns of the area type, the site map does not change across calls
+        self.column_index = mixed_abacus_lg_cpp.ColumnIndex(placedb, area_type_id)
 
         assert data_cls.shape_inst_map is not None
         assert data_cls.region_inst_map is not None
@@ -43,6 +48,7 @@ class MixedAbacusLegalizer(object):
         local_pos_xyz = pos_xyz.cpu() if pos_xyz.is_cuda else pos_xyz
         mixed_abacus_lg_cpp.forward(
             self.placedb,
+            self.column_index,
             local_pos_xyz,
             self.lg_inst_ids,
             self.area_type_id,
@@ -51,6 +57,7 @@ class MixedAbacusLegalizer(object):
             self.data_cls.shape_inst_map.b2as.cpu(),
             self.data_cls.region_inst_map.b2as.cpu(),
             self.data_cls.region_boxes.cpu(),
+            self.num_window_cols,
         )
         if local_pos_xyz is not pos_xyz:
             with torch.no_grad():
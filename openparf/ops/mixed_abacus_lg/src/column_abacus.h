@@ -0,0 +1,396 @@
+/**
+ * @file   column_abacus.h
+ * @brief  Column-wise Abacus of the mixed-size legalization, independent of the placement database
+ */
+#ifndef OPENPARF_OPS_MIXED_ABACUS_LG_SRC_COLUMN_ABACUS_H_
+#define OPENPARF_OPS_MIXED_ABACUS_LG_SRC_COLUMN_ABACUS_H_
+
+#include <algorithm>
+#include <cmath>
+#include <limits>
+#include <memory>
+#include <numeric>
+#include <utility>
+#include <vector>
+
+#include "container/vector_2d.hpp"
+#include "util/util.h"
+
+OPENPARF_BEGIN_NAMESPACE
+
+namespace mixed_abacus_legalizer {
+
+using container::XY;
+using Range = std::pair<int32_t, int32_t>;
+
+/// @brief Site columns of the resource of an area type, i.e., the rows of the column-wise Abacus
+struct Columns {
+  float                site_height;
+  std::vector<int32_t> col_yl;          ///< lowest y of the resource sites in each column
+  std::vector<int32_t> col_yh;          ///< highest y of the resource sites in each column
+  std::vector<int32_t> col_heights;     ///< total height of the resource sites in each column
+  std::vector<int32_t> feasible_cols;   ///< sorted columns with resource sites
+};
+
+namespace detail {
+
+class Cell {
+ public:
+  explicit Cell(int32_t id, XY<float> pos, float height, Range x_range, Range y_range)
+      : id_(id),
+        pos_(pos),
+        height_(height),
+        x_range_(x_range),
+        y_range_(y_range) {}
+  // Identity oriented getters and setters
+  int32_t          id() { return id_; }
+  XY<float>       &pos() { return pos_; }
+  const XY<float> &pos() const { return pos_; }
+  float           &height() { return height_; }
+  const float     &height() const { return height_; }
+  float            yh() { return pos_.y() + height_; }
+  float            yl() { return pos_.y(); }
+  int32_t          range_xmin() { return x_range_.first; }
+  int32_t const    range_xmin() const { return x_range_.first; }
+  int32_t          range_xmax() { return x_range_.second; }
+  int32_t const    range_xmax() const { return x_range_.second; }
+  int32_t         &range_ymin() { return y_range_.first; }
+  int32_t const   &range_ymin() const { return y_range_.first; }
+  int32_t         &range_ymax() { return y_range_.second; }
+  int32_t const   &range_ymax() const { return y_range_.second; }
+
+ private:
+  int32_t   id_;
+  XY<float> pos_;
+  float     height_;
+  Range     x_range_;
+  Range     y_range_;
+};
+
+class CellList {
+ public:
+  int32_t                     size() const { return cells_.size(); }
+
+  std::vector<Cell>          &cells() { return cells_; }
+
+  std::vector<Cell> const    &cells() const { return cells_; }
+
+  Cell                       &cell(int32_t id) { return cells_[id]; }
+
+  Cell const                 &cell(int32_t id) const { return cells_[id]; }
+
+  std::vector<int32_t> const &cell_inst_ids(int32_t id) const { return cell_inst_ids_list_[id]; }
+
+  Cell                       &operator[](int32_t id) { return cells_[id]; }
+
+  Cell const                 &operator[](int32_t id) const { return cells_[id]; }
+
+  Cell &emplace_back(XY<float> pos, float height, Range x_range, Range y_range, std::vector<int32_t> cell_inst_ids) {
+    cells_.emplace_back(cells_.size(), pos, height, x_range, y_range);
+    cell_inst_ids_list_.emplace_back(std::move(cell_inst_ids));
+    return cells_.back();
+  }
+
+ private:
+  std::vector<Cell>                 cells_;
+  std::vector<std::vector<int32_t>> cell_inst_ids_list_;
+};
+
+class Cluster {
+ public:
+  std::vector<Cell>        cells;
+  std::vector<float>       cell_offsets;
+
+  float                    height() const { return cell_offsets.back() + cells.back().height(); }
+
+  std::shared_ptr<Cluster> next;
+
+  float                    cost;
+  float                    prefix_cost;
+
+  float                    Yc;
+
+  explicit Cluster(Cell c, std::shared_ptr<Cluster> next_ptr)
+      : Yc(c.pos().y()),
+        cost(0),
+        prefix_cost(0),
+        next(std::move(next_ptr)) {
+    cells.push_back(c);
+    cell_offsets.push_back(0);
+  }
+
+  /**
+   * @brief return true if |this| is below the |other|
+   *
+   * @param other
+   * @return true
+   * @return false
+   */
+  bool overlap_with(const Cluster &other) const {
+    float top    = this->Yc;
+    float bottom = other.Yc + other.height();
+    return top < bottom;
+  }
+
+  /**
+   * @brief |this| must have lower y than |other|. Meanwhile, the caller should take care of
+   * the |next| pointer of the return Cluster object. This pointer by default is set
+   * to |this->next|
+   * @param other
+   * @return Cluster
+   */
+  Cluster merge_with(const Cluster &other) const {
+    Cluster cluster      = *this;
+
+    auto    cells_to_add = other.cells;
+
+    for (auto &cell : cells_to_add) {
+      float cell_offset = cluster.height();
+      cluster.cells.push_back(cell);
+      cluster.cell_offsets.push_back(cell_offset);
+    }
+
+    return cluster;
+  }
+
+  template<class T>
+  void update(int32_t yl, int32_t yh, float site_height, CellList &cell_list, T *pos) {
+    update_Yc(yl, yh, site_height, cell_list, pos);
+    update_cost();
+  }
+
+ private:
+  void update_cost() {
+    float new_cost = 0;
+
+    for (size_t i = 0; i < cells.size(); i++) {
+      auto &cell   = cells[i];
+      float weight = cell.height();
+      float off    = Yc + cell_offsets[i] - cell.pos().y();
+      new_cost += off * off * weight;
+    }
+
+    cost = new_cost;
+    if (next != nullptr) {
+      prefix_cost = next->prefix_cost + cost;
+    }
+  }
+
+  /**
+   * Updated the optimal y coordinate of the left-bottom corner of this cluster
+   * @param n_rows # of rows
+   */
+  template<class T>
+  void update_Yc(float yl, float yh, float site_height, CellList &cell_list, T *pos) {
+    float coefficient = 0;
+    float weight_sum  = 0;
+
+    for (size_t i = 0; i < cells.size(); i++) {
+      auto &cell   = cells[i];
+      float weight = cell.height();
+      coefficient += (cell.pos().y() - cell_offsets[i]) * weight;
+      weight_sum += weight;
+    }
+
+    float optimal_y = coefficient / weight_sum;
+    // round to the nearest yl + site_height * k
+    Yc              = std::round((optimal_y - yl) / site_height) * site_height + yl;
+
+    // Yc + height() <= yh && yl <= Yc
+    float Yc_max    = yh - height();
+    float Yc_min    = yl;
+
+    for (size_t i = 0; i < cells.size(); i++) {
+      // cell.range_ymin() <= Yc + cell_offset && Yc + cell_offset + cell.height() < cell.range_ymax()
+      Yc_max = std::min(Yc_max, cells[i].range_ymax() - cell_offsets[i] - cells[i].height());
+      Yc_min = std::max(Yc_min, cells[i].range_ymin() - cell_offsets[i]);
+    }
+
+    // if (Yc_min > Yc_max) {
+    //   for (size_t cell_i = 0; cell_i < cells.size(); cell_i++) {
+    //     std::cerr << "=====" << std::endl;
+    //     std::cerr << "cell " << cell_i << " : " << cells[cell_i].pos().x() << " " << cells[cell_i].pos().y() << " "
+    //               << cells[cell_i].height() << " y range " << cells[cell_i].range_ymin() << " "
+    //               << cells[cell_i].range_ymax() << " -> " << Yc + cell_offsets[cell_i] << " "
+    //               << Yc + cell_offsets[cell_i] + cells[cell_i].height() << std::endl;
+    //     auto &cell_inst_ids = cell_list.cell_inst_ids(cells[cell_i].id());
+    //     for (auto inst_id : cell_inst_ids) {
+    //       std::cerr << "  inst " << inst_id << " : " << pos[inst_id << 1] << " " << pos[inst_id << 1 | 1] <<
+    //       std::endl;
+    //     }
+    //   }
+    // }
+
+    openparfAssertMsg(Yc_min <= Yc_max, "Yc_min = %f, Yc_max = %f", Yc_min, Yc_max);
+
+    Yc = std::min(std::max(Yc, Yc_min), Yc_max);
+
+    // Yc must by yl + site_height * k
+    openparfAssertMsg(std::abs(Yc - std::round((Yc - yl) / site_height) * site_height - yl) < 1e-6,
+            "Yc = %f, yl = %f, site_height = %f", Yc, yl, site_height);
+  }
+};
+
+class ColumnPlacement {
+ public:
+  ColumnPlacement() : root(nullptr), height_sum(0) {}
+  std::shared_ptr<Cluster> root;
+  float                    height_sum;
+};
+
+}   // namespace detail
+
+/// @brief Sort the cells by y and place each of them in the column of least added cost, as the column-wise Abacus
+/// @param columns columns of the resource, cells are only placed in the feasible ones
+/// @param cell_list cells to place, sorted in place
+/// @param pos instance positions, only for debugging
+/// @param num_window_cols if positive, the feasible columns are split into windows of this many columns, which are
+/// legalized in parallel, and the cells not fitting in their windows are legalized over all the columns afterwards
+/// @param num_threads number of threads of the windows
+/// @return the placement of each column, indexed by x
+template<class T>
+std::vector<detail::ColumnPlacement> placeCells(Columns const &columns,
+        detail::CellList                                      &cell_list,
+        T                                                     *pos,
+        int32_t                                                num_window_cols,
+        int32_t                                                num_threads) {
+  using detail::Cell;
+  using detail::Cluster;
+  using detail::ColumnPlacement;
+  std::vector<int32_t> const          &ssr_col_heights   = columns.col_heights;
+  std::vector<int32_t> const          &col_yl            = columns.col_yl;
+  std::vector<int32_t> const          &col_yh            = columns.col_yh;
+  std::vector<int32_t> const          &feasible_cols     = columns.feasible_cols;
+  int32_t                              num_feasible_cols = feasible_cols.size();
+  float                                site_height       = columns.site_height;
+  std::vector<ColumnPlacement>         heads(ssr_col_heights.size());
+  std::vector<Cell>                   &cells = cell_list.cells();
+
+  std::sort(cells.begin(), cells.end(), [](const Cell &a, const Cell &b) -> bool {
+    return a.pos().y() == b.pos().y() ? a.height() > b.height() : a.pos().y() < b.pos().y();
+    // return a.height() == b.height() ? a.pos().y() < b.pos().y() : a.height() > b.height();
+  });
+
+  // place a cell in its best column among feasible_cols[begin, end), which only touches the heads of these columns.
+  // Columns are visited by increasing distance to the cell, the right one first on ties, and a side is abandoned
+  // once the x cost alone reaches the best cost, as the x cost only grows farther on.
+  auto place_cell = [&](Cell &cell, int32_t begin, int32_t end) -> bool {
+    float                    best_added_cost = std::numeric_limits<float>::max();
+    int32_t                  best_col        = -1;
+    std::shared_ptr<Cluster> best_col_first_cluster;
+    int32_t                  ix = std::floor(cell.pos().x());
+    int32_t right = std::lower_bound(feasible_cols.begin() + begin, feasible_cols.begin() + end, ix) -
+                    feasible_cols.begin();
+    int32_t left  = right - 1;
+    while (right < end || left >= begin) {
+      bool    go_right = right < end && (left < begin || feasible_cols[right] - ix <= ix - feasible_cols[left]);
+      int32_t Xc       = go_right ? feasible_cols[right++] : feasible_cols[left--];
+
+      float   x_cost   = (cell.pos().x() - Xc) * (cell.pos().x() - Xc);
+
+      if (x_cost >= best_added_cost) {
+        // column ix may still be followed by a closer one on the right
+        if (!go_right) {
+          left = begin - 1;
+        } else if (Xc >= cell.pos().x()) {
+          right = end;
+        }
+        continue;
+      }
+
+      if (!(cell.range_xmin() <= Xc && Xc < cell.range_xmax())) {
+        continue;
+      }
+
+      ColumnPlacement &head = heads[Xc];
+
+      // skip the column if it is overfull
+      if (head.height_sum + cell.height() > ssr_col_heights[Xc]) {
+        continue;
+      }
+
+      float column_origin_cost = head.root != nullptr ? head.root->prefix_cost : 0;
+
+      auto  cluster            = std::make_shared<Cluster>(cell, head.root);
+      cluster->update(col_yl[Xc], col_yh[Xc], site_height, cell_list, pos);
+
+      while (cluster->next != nullptr && cluster->overlap_with(*cluster->next)) {
+        *cluster = cluster->next->merge_with(*cluster);
+        cluster->update(col_yl[Xc], col_yh[Xc], site_height, cell_list, pos);
+      }
+
+      float added_cost = x_cost + cluster->prefix_cost - column_origin_cost;
+      if (added_cost < best_added_cost) {
+        best_col               = Xc;
+        best_added_cost        = added_cost;
+        best_col_first_cluster = cluster;
+      }
+    }
+
+    if (best_col == -1) {
+      return false;
+    }
+
+    /* update */ {
+      ColumnPlacement &head = heads[best_col];
+      head.root             = best_col_first_cluster;
+      head.height_sum += cell.height();
+    }
+    return true;
+  };
+
+  int32_t num_windows = 1;
+  std::vector<int32_t> deferred_cells;
+  if (num_window_cols > 0 && num_feasible_cols > num_window_cols) {
+    // each cell goes to the window of its nearest feasible column, windows share no column and are legalized in
+    // parallel, each in the sorted order of the cells
+    num_windows = (num_feasible_cols + num_window_cols - 1) / num_window_cols;
+    std::vector<std::vector<int32_t>> window_cells(num_windows);
+    for (int32_t i = 0; i < static_cast<int32_t>(cells.size()); i++) {
+      int32_t ix = std::floor(cells[i].pos().x());
+      int32_t k  = std::lower_bound(feasible_cols.begin(), feasible_cols.end(), ix) - feasible_cols.begin();
+      if (k == num_feasible_cols || (k > 0 && ix - feasible_cols[k - 1] < feasible_cols[k] - ix)) {
+        k--;
+      }
+      window_cells[k / num_window_cols].push_back(i);
+    }
+
+    std::vector<std::vector<int32_t>> window_deferred_cells(num_windows);
+#pragma omp parallel for num_threads(num_threads) schedule(dynamic, 1)
+    for (int32_t w = 0; w < num_windows; w++) {
+      int32_t begin = w * num_window_cols;
+      int32_t end   = std::min(begin + num_window_cols, num_feasible_cols);
+      for (int32_t i : window_cells[w]) {
+        if (!place_cell(cells[i], begin, end)) {
+          window_deferred_cells[w].push_back(i);
+        }
+      }
+    }
+
+    // the cells not fitting in their windows, e.g., constrained to a region out of them or in a full window
+    for (auto const &ids : window_deferred_cells) {
+      deferred_cells.insert(deferred_cells.end(), ids.begin(), ids.end());
+    }
+    std::sort(deferred_cells.begin(), deferred_cells.end());
+  } else {
+    deferred_cells.resize(cells.size());
+    std::iota(deferred_cells.begin(), deferred_cells.end(), 0);
+  }
+
+  for (int32_t i : deferred_cells) {
+    bool placed = place_cell(cells[i], 0, num_feasible_cols);
+    openparfAssertMsg(placed, "no feasible column for cell %d", cells[i].id());
+  }
+  if (num_windows > 1) {
+    openparfPrint(kInfo, "num_windows         : %d\n", num_windows);
+    openparfPrint(kInfo, "deferred_cell_count : %d\n", static_cast<int32_t>(deferred_cells.size()));
+  }
+
+  return heads;
+}
+
+}   // namespace mixed_abacus_legalizer
+
+OPENPARF_END_NAMESPACE
+
+#endif   // OPENPARF_OPS_MIXED_ABACUS_LG_SRC_COLUMN_ABACUS_H_
@@ -21,8 +21,10 @@
 #include "mixed_abacus_legalizer.h"
 
 #include <algorithm>
+#include <iterator>
 #include <limits>
 #include <memory>
+#include <numeric>
 #include <set>
 #include <string>
 #include <tuple>
@@ -40,13 +42,11 @@ namespace mixed_abacus_legalizer {
 
 using container::SpiralAccessor;
 using container::Vector2D;
-using container::XY;
 using database::Resource;
 using database::Site;
 using database::SiteMap;
 
 using SiteRefVec = std::vector<std::reference_wrapper<const Site>>;
-using Range      = std::pair<int32_t, int32_t>;
 
 namespace detail {
 
@@ -64,238 +64,6 @@ int32_t SelectResource(database::PlaceDB const &placedb, int32_t area_type_id) {
   return selected_rsc_id;
 }
 
-class ValidSiteMap {
-  using IndexType = database::PlaceDB::IndexType;
-
- public:
-  explicit ValidSiteMap(const SiteMap &site_map) : site_map_(site_map) {
-    valid_site_map_.resize(site_map.width(), site_map.height(), std::numeric_limits<IndexType>::max());
-    for (auto const &site : site_map) {
-      auto const &bbox = site.bbox();
-      for (int32_t ix = bbox.xl(); ix < bbox.xh(); ++ix) {
-        for (int32_t iy = bbox.yl(); iy < bbox.yh(); ++iy) {
-          valid_site_map_(ix, iy) = site_map.index1D(site.siteMapId().x(), site.siteMapId().y());
-        }
-      }
-    }
-  }
-
-  Site const &getValidSite(IndexType ix, IndexType iy) {
-    auto        id1d = valid_site_map_(ix, iy);
-    auto const &site = site_map_.at(id1d);
-    openparfAssert(site);
-    return *site;
-  }
-
- private:
-  const SiteMap      &site_map_;
-  Vector2D<IndexType> valid_site_map_;
-};
-
-class Cell {
- public:
-  explicit Cell(int32_t id, XY<float> pos, float height, Range x_range, Range y_range)
-      : id_(id),
-        pos_(pos),
-        height_(height),
-        x_range_(x_range),
-        y_range_(y_range) {}
-  // Identity oriented getters and setters
-  int32_t          id() { return id_; }
-  XY<float>       &pos() { return pos_; }
-  const XY<float> &pos() const { return pos_; }
-  float           &height() { return height_; }
-  const float     &height() const { return height_; }
-  float            yh() { return pos_.y() + height_; }
-  float            yl() { return pos_.y(); }
-  int32_t          range_xmin() { return x_range_.first; }
-  int32_t const    range_xmin() const { return x_range_.first; }
-  int32_t          range_xmax() { return x_range_.second; }
-  int32_t const    range_xmax() const { return x_range_.second; }
-  int32_t         &range_ymin() { return y_range_.first; }
-  int32_t const   &range_ymin() const { return y_range_.first; }
-  int32_t         &range_ymax() { return y_range_.second; }
-  int32_t const   &range_ymax() const { return y_range_.second; }
-
- private:
-  int32_t   id_;
-  XY<float> pos_;
-  float     height_;
-  Range     x_range_;
-  Range     y_range_;
-};
-
-class CellList {
- public:
-  int32_t                     size() const { return cells_.size(); }
-
-  std::vector<Cell>          &cells() { return cells_; }
-
-  std::vector<Cell> const    &cells() const { return cells_; }
-
-  Cell                       &cell(int32_t id) { return cells_[id]; }
-
-  Cell const                 &cell(int32_t id) const { return cells_[id]; }
-
-  std::vector<int32_t> const &cell_inst_ids(int32_t id) const { return cell_inst_ids_list_[id]; }
-
-  Cell                       &operator[](int32_t id) { return cells_[id]; }
-
-  Cell const                 &operator[](int32_t id) const { return cells_[id]; }
-
-  Cell &emplace_back(XY<float> pos, float height, Range x_range, Range y_range, std::vector<int32_t> cell_inst_ids) {
-    cells_.emplace_back(cells_.size(), pos, height, x_range, y_range);
-    cell_inst_ids_list_.emplace_back(std::move(cell_inst_ids));
-    return cells_.back();
-  }
-
- private:
-  std::vector<Cell>                 cells_;
-  std::vector<std::vector<int32_t>> cell_inst_ids_list_;
-};
-
-class Cluster {
- public:
-  std::vector<Cell>        cells;
-  std::vector<float>       cell_offsets;
-
-  float                    height() const { return cell_offsets.back() + cells.back().height(); }
-
-  std::shared_ptr<Cluster> next;
-
-  float                    cost;
-  float                    prefix_cost;
-
-  float                    Yc;
-
-  explicit Cluster(Cell c, std::shared_ptr<Cluster> next_ptr)
-      : Yc(c.pos().y()),
-        cost(0),
-        prefix_cost(0),
-        next(std::move(next_ptr)) {
-    cells.push_back(c);
-    cell_offsets.push_back(0);
-  }
-
-  /**
-   * @brief return true if |this| is below the |other|
-   *
-   * @param other
-   * @return true
-   * @return false
-   */
-  bool overlap_with(const Cluster &other) const {
-    float top    = this->Yc;
-    float bottom = other.Yc + other.height();
-    return top < bottom;
-  }
-
-  /**
-   * @brief |this| must have lower y than |other|. Meanwhile, the caller should take care of
-   * the |next| pointer of the return Cluster object. This pointer by default is set
-   * to |this->next|
-   * @param other
-   * @return Cluster
-   */
-  Cluster merge_with(const Cluster &other) const {
-    Cluster cluster      = *this;
-
-    auto    cells_to_add = other.cells;
-
-    for (auto &cell : cells_to_add) {
-      float cell_offset = cluster.height();
-      cluster.cells.push_back(cell);
-      cluster.cell_offsets.push_back(cell_offset);
-    }
-
-    return cluster;
-  }
-
-  template<class T>
-  void update(int32_t yl, int32_t yh, float site_height, CellList &cell_list, T *pos) {
-    update_Yc(yl, yh, site_height, cell_list, pos);
-    update_cost();
-  }
-
- private:
-  void update_cost() {
-    float new_cost = 0;
-
-    for (size_t i = 0; i < cells.size(); i++) {
-      auto &cell   = cells[i];
-      float weight = cell.height();
-      float off    = Yc + cell_offsets[i] - cell.pos().y();
-      new_cost += off * off * weight;
-    }
-
-    cost = new_cost;
-    if (next != nullptr) {
-      prefix_cost = next->prefix_cost + cost;
-    }
-  }
-
-  /**
-   * Updated the optimal y coordinate of the left-bottom corner of this cluster
-   * @param n_rows # of rows
-   */
-  template<class T>
-  void update_Yc(float yl, float yh, float site_height, CellList &cell_list, T *pos) {
-    float coefficient = 0;
-    float weight_sum  = 0;
-
-    for (size_t i = 0; i < cells.size(); i++) {
-      auto &cell   = cells[i];
-      float weight = cell.height();
-      coefficient += (cell.pos().y() - cell_offsets[i]) * weight;
-      weight_sum += weight;
-    }
-
-    float optimal_y = coefficient / weight_sum;
-    // round to the nearest yl + site_height * k
-    Yc              = std::round((optimal_y - yl) / site_height) * site_height + yl;
-
-    // Yc + height() <= yh && yl <= Yc
-    float Yc_max    = yh - height();
-    float Yc_min    = yl;
-
-    for (size_t i = 0; i < cells.size(); i++) {
-      // cell.range_ymin() <= Yc + cell_offset && Yc + cell_offset + cell.height() < cell.range_ymax()
-      Yc_max = std::min(Yc_max, cells[i].range_ymax() - cell_offsets[i] - cells[i].height());
-      Yc_min = std::max(Yc_min, cells[i].range_ymin() - cell_offsets[i]);
-    }
-
-    // if (Yc_min > Yc_max) {
-    //   for (size_t cell_i = 0; cell_i < cells.size(); cell_i++) {
-    //     std::cerr << "=====" << std::endl;
-    //     std::cerr << "cell " << cell_i << " : " << cells[cell_i].pos().x() << " " << cells[cell_i].pos().y() << " "
-    //               << cells[cell_i].height() << " y range " << cells[cell_i].range_ymin() << " "
-    //               << cells[cell_i].range_ymax() << " -> " << Yc + cell_offsets[cell_i] << " "
-    //               << Yc + cell_offsets[cell_i] + cells[cell_i].height() << std::endl;
-    //     auto &cell_inst_ids = cell_list.cell_inst_ids(cells[cell_i].id());
-    //     for (auto inst_id : cell_inst_ids) {
-    //       std::cerr << "  inst " << inst_id << " : " << pos[inst_id << 1] << " " << pos[inst_id << 1 | 1] <<
-    //       std::endl;
-    //     }
-    //   }
-    // }
-
-    openparfAssertMsg(Yc_min <= Yc_max, "Yc_min = %f, Yc_max = %f", Yc_min, Yc_max);
-
-    Yc = std::min(std::max(Yc, Yc_min), Yc_max);
-
-    // Yc must by yl + site_height * k
-    openparfAssertMsg(std::abs(Yc - std::round((Yc - yl) / site_height) * site_height - yl) < 1e-6,
-            "Yc = %f, yl = %f, site_height = %f", Yc, yl, site_height);
-  }
-};
-
-class ColumnPlacement {
- public:
-  ColumnPlacement() : root(nullptr), height_sum(0) {}
-  std::shared_ptr<Cluster> root;
-  float                    height_sum;
-};
-
 template<class T>
 Range buildXRange(const std::vector<int32_t> &cell_inst_ids,
         const int32_t                        *region_inst_map_b2as,
@@ -357,8 +125,65 @@ Range buildYRange(const std::vector<int32_t> &cell_inst_ids,
 
 }   // namespace detail
 
+ColumnIndex::ColumnIndex(database::PlaceDB const &placedb, int32_t area_type_id)
+    : area_type_id(area_type_id),
+      rsc_id(detail::SelectResource(placedb, area_type_id)),
+      num_feasible_sites(0) {
+  auto const              &layout     = placedb.db()->layout();
+  const database::SiteMap &site_map   = layout.siteMap();
+  int32_t                  num_site_x = placedb.siteMapDim().x();
+  int32_t                  num_site_y = placedb.siteMapDim().y();
+  col_yl.assign(num_site_x, num_site_y);
+  col_yh.assign(num_site_x, 0);
+  col_heights.assign(num_site_x, 0);
+  col_sites.resize(num_site_x);
+  for (const Site &site : site_map) {
+    if (layout.siteType(site).resourceCapacity(rsc_id) > 0) {
+      int32_t xl = site.bbox().xl();
+      int32_t yl = site.bbox().yl();
+      int32_t yh = site.bbox().yh();
+      col_yl[xl] = std::min(col_yl[xl], yl);
+      col_yh[xl] = std::max(col_yh[xl], yh);
+      col_heights[xl] += yh - yl;
+      num_feasible_sites++;
+    }
+  }
+  for (int32_t x = 0; x < num_site_x; x++) {
+    if (col_heights[x] > 0) {
+      feasible_cols.push_back(x);
+    }
+  }
+  site_height = std::accumulate(col_heights.begin(), col_heights.end(), 0., [&](float a, int b) {
+    return a + b;
+  }) / num_feasible_sites;
+
+  // cells are only placed in the feasible columns, so only the sites covering them are looked up
+  for (const Site &site : site_map) {
+    auto const &bbox = site.bbox();
+    for (int32_t x = bbox.xl(); x < bbox.xh(); x++) {
+      if (col_heights[x] > 0) {
+        col_sites[x].push_back(
+                SiteSpan{bbox.yl(), bbox.yh(), bbox.xl() + bbox.width() * 0.5, bbox.yl() + bbox.height() * 0.5});
+      }
+    }
+  }
+  for (auto &sites : col_sites) {
+    std::sort(sites.begin(), sites.end(), [](SiteSpan const &a, SiteSpan const &b) { return a.yl < b.yl; });
+  }
+}
+
+std::pair<double, double> ColumnIndex::siteCenter(int32_t x, int32_t y) const {
+  auto const &sites = col_sites[x];
+  auto        it    = std::upper_bound(sites.begin(), sites.end(), y,
+                 [](int32_t y, SiteSpan const &site) { return y < site.yl; });
+  openparfAssertMsg(it != sites.begin() && y < std::prev(it)->yh, "no site at (%d, %d)", x, y);
+  --it;
+  return std::make_pair(it->center_x, it->center_y);
+}
+
 template<class T>
 void mixedAbacusLegalize(database::PlaceDB const &placedb,
+        ColumnIndex const                        &column_index,
         T                                        *pos,
         int32_t                                  *lg_inst_ids,
         int32_t                                   area_type_id,
@@ -370,47 +195,21 @@ void mixedAbacusLegalize(database::PlaceDB const &placedb,
         int32_t                                   num_lg_insts,
         int32_t                                   num_shapes,
         int32_t                                   num_insts,
-        int32_t                                   num_regions) {
-  using detail::Cell;
+        int32_t                                   num_regions,
+        int32_t                                   num_window_cols) {
   using detail::CellList;
-  using detail::Cluster;
   using detail::ColumnPlacement;
-  using detail::ValidSiteMap;
-  std::string                  at_name      = placedb.place_params().area_type_names_[area_type_id];
-  auto const                  &layout       = placedb.db()->layout();
-  auto const                  &place_params = placedb.place_params();
-  int32_t                      rsc_id       = detail::SelectResource(placedb, area_type_id);
-  const database::SiteMap     &site_map     = layout.siteMap();
-  ValidSiteMap                 valid_site_map(site_map);
-  int32_t                      num_site_x = placedb.siteMapDim().x();
-  int32_t                      num_site_y = placedb.siteMapDim().y();
-  std::vector<int32_t>         ssr_col_heights(num_site_x, 0);
-  std::vector<int32_t>         col_yl(num_site_x, num_site_y);
-  std::vector<int32_t>         col_yh(num_site_x, 0);
-  int32_t                      total_ssr_sup = 0;
-  std::vector<int32_t>         col_ssr_sups(num_site_x, 0);
-  std::vector<ColumnPlacement> heads(num_site_x);
+  openparfAssert(column_index.area_type_id == area_type_id);
+  std::string                  at_name           = placedb.place_params().area_type_names_[area_type_id];
+  int32_t                      rsc_id            = column_index.rsc_id;
+  int32_t                      num_site_x        = placedb.siteMapDim().x();
+  int32_t                      num_site_y        = placedb.siteMapDim().y();
+  std::vector<int32_t> const  &col_yl            = column_index.col_yl;
+  std::vector<int32_t> const  &feasible_cols     = column_index.feasible_cols;
+  int32_t                      num_feasible_cols = feasible_cols.size();
+  float                        site_height       = column_index.site_height;
   CellList                     cell_list;
   std::unordered_set<int32_t>  lg_inst_ids_set(lg_inst_ids, lg_inst_ids + num_lg_insts);
-  int32_t                      num_feasible_sites = 0;
-  for (const Site &site : site_map) {
-    if (layout.siteType(site).resourceCapacity(rsc_id) > 0) {
-      int32_t xl = site.bbox().xl();
-      int32_t yl = site.bbox().yl();
-      int32_t yh = site.bbox().yh();
-      col_yl[xl] = std::min(col_yl[xl], yl);
-      col_yh[xl] = std::max(col_yh[xl], yh);
-      ssr_col_heights[xl] += yh - yl;
-      num_feasible_sites++;
-    }
-  }
-
-  int32_t num_feasible_cols = std::accumulate(ssr_col_heights.begin(), ssr_col_heights.end(), 0.,
-          [&](int a, int b) { return a + (b > 0); });
-  float   site_height       = std::accumulate(ssr_col_heights.begin(), ssr_col_heights.end(), 0., [&](float a, int b) {
-    return a + b;
-  }) / num_feasible_sites;
-
 
   int32_t macro_cell_count  = 0;
   int32_t macro_cell_region_count = 0;
@@ -461,77 +260,17 @@ void mixedAbacusLegalize(database::PlaceDB const &placedb,
   openparfPrint(kInfo, "macro_cell_count    : %d\n", macro_cell_count);
   openparfPrint(kInfo, "macro_cell_region   : %d\n", macro_cell_region_count);
 
-  std::vector<Cell> &cells = cell_list.cells();
-
-  std::sort(cells.begin(), cells.end(), [](const Cell &a, const Cell &b) -> bool {
-    return a.pos().y() == b.pos().y() ? a.height() > b.height() : a.pos().y() < b.pos().y();
-    // return a.height() == b.height() ? a.pos().y() < b.pos().y() : a.height() > b.height();
-  });
-
-  for (auto &cell : cells) {
-    float                    best_added_cost = std::numeric_limits<float>::max();
-    int                      best_col        = std::numeric_limits<int>::max();
-    std::shared_ptr<Cluster> best_col_first_cluster;
-    int                      ix = std::floor(cell.pos().x());
-    for (int dx = 0; dx < num_site_x; dx++) {
-      for (int sign : {1, -1}) {
-        int Xc = ix + dx * sign;
-
-        // skip the column if it is not feasible
-        if (!(0 <= Xc && Xc < num_site_x)) {
-          continue;
-        }
-
-        if (!(cell.range_xmin() <= Xc && Xc < cell.range_xmax())) {
-          continue;
-        }
-
-        float x_cost = (cell.pos().x() - Xc) * (cell.pos().x() - Xc);
-
-        if (x_cost >= best_added_cost) {
-          continue;
-        }
-
-        ColumnPlacement &head = heads[Xc];
-
-        // skip the column if it is overfull
-        if (head.height_sum + cell.height() > ssr_col_heights[Xc]) {
-          continue;
-        }
-
-        float column_origin_cost = head.root != nullptr ? head.root->prefix_cost : 0;
-
-        auto  cluster            = std::make_shared<Cluster>(cell, head.root);
-        cluster->update(col_yl[Xc], col_yh[Xc], site_height, cell_list, pos);
-
-        while (cluster->next != nullptr && cluster->overlap_with(*cluster->next)) {
-          *cluster = cluster->next->merge_with(*cluster);
-          cluster->update(col_yl[Xc], col_yh[Xc], site_height, cell_list, pos);
-        }
-
-        float added_cost = x_cost + cluster->prefix_cost - column_origin_cost;
-        if (added_cost < best_added_cost) {
-          best_col               = Xc;
-          best_added_cost        = added_cost;
-          best_col_first_cluster = cluster;
-        }
-      }
-    }
-
-    assert(best_col != std::numeric_limits<int>::max());
-
-    /* update */ {
-      ColumnPlacement &head = heads[best_col];
-      head.root             = best_col_first_cluster;
-      head.height_sum += cell.height();
-    }
-  }
+  std::vector<ColumnPlacement> heads =
+          placeCells(column_index, cell_list, pos, num_window_cols, at::get_num_threads());
 
   float   total_movement_x = 0;
   float   total_movement_y = 0;
   int32_t move_cell_count  = 0;
 
-  for (size_t Xc = 0; Xc < num_site_x; Xc++) {
+  int32_t num_threads      = at::get_num_threads();
+#pragma omp parallel for num_threads(num_threads) reduction(+ : total_movement_x, total_movement_y, move_cell_count)
+  for (int32_t k = 0; k < num_feasible_cols; k++) {
+    int32_t          Xc   = feasible_cols[k];
     ColumnPlacement &head = heads[Xc];
     for (auto cluster = head.root; cluster; cluster = cluster->next) {
       for (size_t j = 0; j < cluster->cells.size(); j++) {
@@ -545,22 +284,19 @@ void mixedAbacusLegalize(database::PlaceDB const &placedb,
           openparfAssertMsg(
                   std::abs(lb_y - std::round((lb_y - col_yl[Xc]) / site_height) * site_height - col_yl[Xc]) < 1e-6,
                   "lb_y = %f, col_yl[Xc] = %f, site_height = %f", lb_y, col_yl[Xc], site_height);
-          auto &site                 = valid_site_map.getValidSite(rv.x(), lb_y);
+          auto  center               = column_index.siteCenter(Xc, static_cast<int32_t>(lb_y));
 
           float old_pos_x            = pos[cell_inst_id << 1];
           float old_pos_y            = pos[cell_inst_id << 1 | 1];
 
-          pos[cell_inst_id << 1]     = site.bbox().xl() + site.bbox().width() * 0.5;
-          pos[cell_inst_id << 1 | 1] = site.bbox().yl() + site.bbox().height() * 0.5;
+          pos[cell_inst_id << 1]     = center.first;
+          pos[cell_inst_id << 1 | 1] = center.second;
 
           float movement_x           = std::abs(pos[cell_inst_id << 1] - old_pos_x);
           float movement_y           = std::abs(pos[cell_inst_id << 1 | 1] - old_pos_y);
           total_movement_x += movement_x;
           total_movement_y += movement_y;
 
-          // std::cerr << "move cell " << cell_inst_id << " from (" << old_pos_x << ", " << old_pos_y << ") to ("
-          //           << pos[cell_inst_id << 1] << ", " << pos[cell_inst_id << 1 | 1] << "), "
-          //           << "movement_x = " << movement_x << ", movement_y = " << movement_y << std::endl;
           move_cell_count++;
         }
       }
@@ -573,6 +309,7 @@ void mixedAbacusLegalize(database::PlaceDB const &placedb,
 }
 
 void mixedAbacusLegalizerForward(database::PlaceDB const &placedb,
+        ColumnIndex const                                &column_index,
         at::Tensor                                        pos,
         at::Tensor                                        lg_inst_ids,
         int32_t                                           area_type_id,
@@ -580,7 +317,8 @@ void mixedAbacusLegalizerForward(database::PlaceDB const &placedb,
         at::Tensor                                        shape_inst_map_b_starts,
         at::Tensor                                        shape_inst_map_b2as,
         at::Tensor                                        region_inst_map_b2as,
-        at::Tensor                                        region_boxes) {
+        at::Tensor                                        region_boxes,
+        int32_t                                           num_window_cols) {
   CHECK_FLAT_CPU(pos);
   CHECK_EVEN(pos);
   CHECK_CONTIGUOUS(pos);
@@ -612,21 +350,21 @@ void mixedAbacusLegalizerForward(database::PlaceDB const &placedb,
   AT_ASSERTM(num_insts == region_inst_map_b2as.numel(), "num_insts != region_inst_map_b2as.numel()");
 
   OPENPARF_DISPATCH_FLOATING_TYPES(pos, "ChainLegalizerForward", [&] {
-    mixedAbacusLegalize(placedb, OPENPARF_TENSOR_DATA_PTR(pos, scalar_t),
+    mixedAbacusLegalize(placedb, column_index, OPENPARF_TENSOR_DATA_PTR(pos, scalar_t),
             OPENPARF_TENSOR_DATA_PTR(lg_inst_ids, int32_t), area_type_id,
             OPENPARF_TENSOR_DATA_PTR(shape_inst_map_bs, int32_t),
             OPENPARF_TENSOR_DATA_PTR(shape_inst_map_b_starts, int32_t),
             OPENPARF_TENSOR_DATA_PTR(shape_inst_map_b2as, int32_t),
             OPENPARF_TENSOR_DATA_PTR(region_inst_map_b2as, int32_t), OPENPARF_TENSOR_DATA_PTR(region_boxes, scalar_t),
-            num_lg_insts, num_shapes, num_insts, num_regions);
+            num_lg_insts, num_shapes, num_insts, num_regions, num_window_cols);
   });
 }
 
 #define REGISTER_KERNEL_LAUNCHER(T)                                                                                    \
-  template void mixedAbacusLegalize<T>(database::PlaceDB const &placedb, T *pos, int32_t *lg_inst_ids,                 \
-          int32_t area_type_id, int32_t *shape_inst_map_bs, int32_t *shape_inst_map_b_starts,                          \
+  template void mixedAbacusLegalize<T>(database::PlaceDB const &placedb, ColumnIndex const &column_index, T *pos,      \
+          int32_t *lg_inst_ids, int32_t area_type_id, int32_t *shape_inst_map_bs, int32_t *shape_inst_map_b_starts,    \
           int32_t *shape_inst_map_b2as, int32_t *region_inst_map_b2as, T *region_boxes, int32_t num_lg_insts,          \
-          int32_t num_shapes, int32_t num_insts, int32_t num_regions);
+          int32_t num_shapes, int32_t num_insts, int32_t num_regions, int32_t num_window_cols);
 
 REGISTER_KERNEL_LAUNCHER(float)
 REGISTER_KERNEL_LAUNCHER(double)
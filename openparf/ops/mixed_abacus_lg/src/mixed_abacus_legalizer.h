@@ -20,15 +20,46 @@
 #ifndef OPENPARF_OPS_MIXED_ABACUS_LG_SRC_MIXED_ABACUS_LEGALIZER_H_
 #define OPENPARF_OPS_MIXED_ABACUS_LG_SRC_MIXED_ABACUS_LEGALIZER_H_
 
+#include <utility>
+#include <vector>
+
 #include "database/placedb.h"
 #include "util/torch.h"
 #include "util/util.h"
 
+#include "ops/mixed_abacus_lg/src/column_abacus.h"
+
 OPENPARF_BEGIN_NAMESPACE
 
 namespace mixed_abacus_legalizer {
 
+/// @brief Site columns of the resource of an area type with the sites covering them. The site map does not change
+/// during placement, so the index is built once per legalizer instead of scanning the site map at every call.
+class ColumnIndex : public Columns {
+ public:
+  struct SiteSpan {
+    int32_t yl;
+    int32_t yh;
+    double  center_x;
+    double  center_y;
+  };
+
+  ColumnIndex(database::PlaceDB const &placedb, int32_t area_type_id);
+
+  /// @brief center of the site of column x covering y, as the site map lookup of (x, y)
+  std::pair<double, double> siteCenter(int32_t x, int32_t y) const;
+
+  int32_t                            area_type_id;
+  int32_t                            rsc_id;
+  int32_t                            num_feasible_sites;
+  std::vector<std::vector<SiteSpan>> col_sites;       ///< sites covering each feasible column, sorted by y
+};
+
+/// @param column_index index of the area type, see ColumnIndex
+/// @param num_window_cols if positive, the feasible columns are split into windows of this many columns, which are
+/// legalized in parallel, and the cells not fitting in their windows are legalized over all the columns afterwards
 void mixedAbacusLegalizerForward(database::PlaceDB const &placedb,
+        ColumnIndex const                                &column_index,
         at::Tensor                                        pos,
         at::Tensor                                        lg_inst_ids,
         int32_t                                           area_type_id,
@@ -36,7 +67,8 @@ void mixedAbacusLegalizerForward(database::PlaceDB const &placedb,
         at::Tensor                                        shape_inst_map_b_starts,
         at::Tensor                                        shape_inst_map_b2as,
         at::Tensor                                        region_inst_map_b2as,
-        at::Tensor                                        region_boxes);
+        at::Tensor                                        region_boxes,
+        int32_t                                           num_window_cols);
 
 }   // namespace mixed_abacus_legalizer
 
@@ -22,4 +22,6 @@
 PYBIND11_MODULE(TORCH_EXTENSION_NAME, m) {
   m.def("forward", &OPENPARF_NAMESPACE::mixed_abacus_legalizer::mixedAbacusLegalizerForward,
           "Mixed Abacus Legalization forward");
+  py::class_<OPENPARF_NAMESPACE::mixed_abacus_legalizer::ColumnIndex>(m, "ColumnIndex")
+          .def(py::init<OPENPARF_NAMESPACE::database::PlaceDB const &, int32_t>());
 }
@@ -21,7 +21,8 @@ class PinUtilization(nn.Module):
                  inst_range,
                  unit_pin_capacity,
                  pin_stretch_ratio,
-                 deterministic_flag):
+                 deterministic_flag,
+                 workspace=None):
         """
 
         :param inst_pin_weights: pin weights for each instances, shape of (#instance,).
@@ -34,6 +35,7 @@ class PinUtilization(nn.Module):
         :param inst_range: index pair [lower bound, higher bound) of associated cells
         :param unit_pin_capacity: number of pins per unit area
         :param pin_stretch_ratio: stretch each pin to a ratio of the pin utilization bin
+        :param workspace: optional workspace providing the buffers reused across calls, see py_utils.workspace
         """
         super(PinUtilization, self).__init__()
 
@@ -51,6 +53,7 @@ class PinUtilization(nn.Module):
         self.unit_pin_capacity = unit_pin_capacity
         self.pin_stretch_ratio = pin_stretch_ratio
         self.deterministic_flag = deterministic_flag
+        self.workspace = workspace
 
     def forward(self,
                 inst_sizes: torch.Tensor,
@@ -59,27 +62,37 @@ class PinUtilization(nn.Module):
 
         :param inst_sizes: pair (width, height) of cell sizes, shape of (#instance, 2)
         :param inst_pos: center of instances, array of (x, y) pairs
+        :return: pin utilization map. With a workspace, the map is reused by the next call.
         """
 
         # Stretch each pin to a ratio of the pin utilization bin to make the pin density map more smoother
-        stretch_inst_sizes = inst_sizes.clone()
+        if self.workspace is not None:
+            stretch_inst_sizes = self.workspace.like("pin_utilization.inst_sizes", inst_sizes).copy_(inst_sizes)
+        else:
+            stretch_inst_sizes = inst_sizes.clone()
         stretch_inst_sizes[:, 0].clamp_(min=self.bin_size_x * self.pin_stretch_ratio)
         stretch_inst_sizes[:, 1].clamp_(min=self.bin_size_y * self.pin_stretch_ratio)
 
-        func = pin_utilization_cuda.forward if inst_pos.is_cuda else pin_utilization_cpp.forward
-        output = func(inst_pos,
-                      stretch_inst_sizes,
-                      self.inst_pin_weights,
-                      self.xl,
-                      self.yl,
-                      self.xh,
-                      self.yh,
-                      self.bin_size_x,
-                      self.bin_size_y,
-                      self.num_bins_x,
-                      self.num_bins_y,
-                      self.inst_range,
-                      self.deterministic_flag)
+        ext = pin_utilization_cuda if inst_pos.is_cuda else pin_utilization_cpp
+        args = [inst_pos,
+                stretch_inst_sizes,
+                self.inst_pin_weights,
+                self.xl,
+                self.yl,
+                self.xh,
+                self.yh,
+                self.bin_size_x,
+                self.bin_size_y,
+                self.num_bins_x,
+                self.num_bins_y,
+                self.inst_range,
+                self.deterministic_flag]
+        if self.workspace is not None:
+            output = self.workspace.get("pin_utilization.map", (self.num_bins_x, self.num_bins_y),
+                                        inst_pos.dtype, inst_pos.device)
+            ext.forward_out(*args, output)
+        else:
+            output = ext.forward(*args)
         # convert demand to utilization in each bin
         output.mul_(1 / (self.bin_size_x * self.bin_size_y * self.unit_pin_capacity))
         return output
@@ -32,19 +32,21 @@ void       pinDemandMapLauncher(T const  *pos,
               int32_t                     num_threads,
               T                          *pin_utilization_map);
 
-at::Tensor pinUtilizationMapForward(at::Tensor pos,
-        at::Tensor                             inst_sizes,
-        at::Tensor                             pin_weights,
-        double                                 xl,
-        double                                 yl,
-        double                                 xh,
-        double                                 yh,
-        double                                 bin_size_x,
-        double                                 bin_size_y,
-        int32_t                                num_bins_x,
-        int32_t                                num_bins_y,
-        std::pair<int32_t, int32_t>            range,
-        int32_t                                deterministic_flag) {
+/// fill the pin utilization map given by the caller, e.g., a buffer reused across calls
+void pinUtilizationMapForwardOut(at::Tensor pos,
+        at::Tensor                          inst_sizes,
+        at::Tensor                          pin_weights,
+        double                              xl,
+        double                              yl,
+        double                              xh,
+        double                              yh,
+        double                              bin_size_x,
+        double                              bin_size_y,
+        int32_t                             num_bins_x,
+        int32_t                             num_bins_y,
+        std::pair<int32_t, int32_t>         range,
+        int32_t                             deterministic_flag,
+        at::Tensor                          pin_utilization_map) {
   CHECK_FLAT_CPU(pos);
   CHECK_EVEN(pos);
   CHECK_CONTIGUOUS(pos);
@@ -56,7 +58,12 @@ at::Tensor pinUtilizationMapForward(at::Tensor pos,
   CHECK_FLAT_CPU(pin_weights);
   CHECK_CONTIGUOUS(pin_weights);
 
-  at::Tensor pin_utilization_map = at::zeros({num_bins_x, num_bins_y}, pos.options());
+  CHECK_FLAT_CPU(pin_utilization_map);
+  CHECK_CONTIGUOUS(pin_utilization_map);
+  AT_ASSERTM(pin_utilization_map.numel() == num_bins_x * num_bins_y,
+          "pin_utilization_map must have num_bins_x * num_bins_y elements");
+
+  pin_utilization_map.zero_();
 
   OPENPARF_DISPATCH_FLOATING_TYPES(pos, "pinDemandMapLauncher", [&] {
     pinDemandMapLauncher<scalar_t>(OPENPARF_TENSOR_DATA_PTR(pos, scalar_t),
@@ -64,7 +71,24 @@ at::Tensor pinUtilizationMapForward(at::Tensor pos,
             yh, bin_size_x, bin_size_y, num_bins_x, num_bins_y, range, deterministic_flag, at::get_num_threads(),
             OPENPARF_TENSOR_DATA_PTR(pin_utilization_map, scalar_t));
   });
+}
 
+at::Tensor pinUtilizationMapForward(at::Tensor pos,
+        at::Tensor                             inst_sizes,
+        at::Tensor                             pin_weights,
+        double                                 xl,
+        double                                 yl,
+        double                                 xh,
+        double                                 yh,
+        double                                 bin_size_x,
+        double                                 bin_size_y,
+        int32_t                                num_bins_x,
+        int32_t                                num_bins_y,
+        std::pair<int32_t, int32_t>            range,
+        int32_t                                deterministic_flag) {
+  at::Tensor pin_utilization_map = at::empty({num_bins_x, num_bins_y}, pos.options());
+  pinUtilizationMapForwardOut(pos, inst_sizes, pin_weights, xl, yl, xh, yh, bin_size_x, bin_size_y, num_bins_x,
+          num_bins_y, range, deterministic_flag, pin_utilization_map);
   return pin_utilization_map;
 }
 
@@ -72,4 +96,6 @@ OPENPARF_END_NAMESPACE
 
 PYBIND11_MODULE(TORCH_EXTENSION_NAME, m) {
   m.def("forward", &OPENPARF_NAMESPACE::pinUtilizationMapForward, "compute pin utilization map");
+  m.def("forward_out", &OPENPARF_NAMESPACE::pinUtilizationMapForwardOut,
+          "compute pin utilization map into a given tensor");
 }
@@ -42,6 +42,9 @@ class regionMcfLegalizer(object):
             self.dtype = torch.float32
         else:
             assert False, "Unsupported dtype %s" % self.params.dtype
+        # warm start from the previous call
+        self.incremental_flag = bool(params.ssr_legalize_incremental_flag)
+        self.legalizer.set_incremental(self.incremental_flag)
         self.inst_ids_groups = []
         data_cls.ssr_area_types = []
 
@@ -95,6 +98,11 @@ class regionMcfLegalizer(object):
         )
         with torch.no_grad():
             res = self.legalizer.forward(local_pos, is_legalized_insts, self.placedb)
+            if self.incremental_flag:
+                logger.info(
+                    "incremental region SSR legalization: %d instances solved again, %d arcs rebuilt, "
+                    "%d instances moved to other sites" % self.legalizer.get_incremental_stats()
+                )
             pos.data.copy_(res)
             for i in range(len(self.inst_ids_groups)):
                 self.data_cls.inst_lock_mask[self.inst_ids_groups[i]] = 1
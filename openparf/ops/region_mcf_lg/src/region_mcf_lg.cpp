@@ -229,6 +229,21 @@ at::Tensor RegionMcfLegalizer<T>::forward(at::Tensor pos,
     }
   }
 
+  if (incremental) {
+    std::vector<std::vector<uint8_t>> site_available(num_models);
+    for (int idx = 0; idx < num_models; idx++) {
+      auto &m                          = sssir_model_infos[idx];
+      auto  inst_compatiable_sites_acc = m.inst_compatiable_sites.template accessor<T, 2>();
+      for (int32_t s = 0; s < m.num_sites; s++) {
+        T     site_x = (inst_compatiable_sites_acc[s][0] + inst_compatiable_sites_acc[s][2]) / 2.0;
+        T     site_y = (inst_compatiable_sites_acc[s][1] + inst_compatiable_sites_acc[s][3]) / 2.0;
+        auto &site   = valid_site_map.getValidSite(static_cast<int32_t>(site_x), static_cast<int32_t>(site_y));
+        site_available[idx].push_back(!site_mask.getSiteMask(site));
+      }
+    }
+    return forward_incremental(pos, is_legalized_insts, site_available);
+  }
+
   calculate_max_distance(pos);
   for (int idx = 0; idx < num_models; idx++) {
     openparfPrint(kInfo, "Model %i:  %i instances, %i sites\n", idx, sssir_model_infos[idx].num_insts,
@@ -354,13 +369,83 @@ at::Tensor RegionMcfLegalizer<T>::forward(at::Tensor pos,
 }
 
 
+template<typename T>
+at::Tensor RegionMcfLegalizer<T>::forward_incremental(at::Tensor pos,
+        at::Tensor                                               is_legalized_insts,
+        std::vector<std::vector<uint8_t>> const                 &site_available) {
+  at::Tensor res                    = pos.clone().detach();
+  auto       pos_acc                = pos.template accessor<T, 2>();
+  auto       res_acc                = res.template accessor<T, 2>();
+  auto       acc_is_legalized_insts = is_legalized_insts.template accessor<int32_t, 1>();
+  int32_t    num_models             = sssir_model_infos.size();
+
+  if (assignments.empty()) {
+    // the arc radius grows by the ring distance of the monolithic problem at the first call
+    calculate_max_distance(pos);
+    for (auto &m : sssir_model_infos) {
+      auto                          inst_id_acc                = m.inst_ids.template accessor<int32_t, 1>();
+      auto                          inst_compatiable_sites_acc = m.inst_compatiable_sites.template accessor<T, 2>();
+      std::vector<int32_t>          inst_ids(m.num_insts);
+      std::vector<std::array<T, 2>> sites;
+      for (int32_t i = 0; i < m.num_insts; i++) {
+        inst_ids[i] = inst_id_acc[i];
+      }
+      for (int32_t s = 0; s < m.num_sites; s++) {
+        sites.push_back({(inst_compatiable_sites_acc[s][0] + inst_compatiable_sites_acc[s][2]) / 2,
+                (inst_compatiable_sites_acc[s][1] + inst_compatiable_sites_acc[s][3]) / 2});
+      }
+      auto const &placedb      = placedb_;
+      auto        region_legal = [inst_ids, sites, &placedb](int32_t i, int32_t s) {
+        return isRegionLegal(inst_ids[i], geometry::Point<T, 2>(sites[s][0], sites[s][1]), placedb);
+      };
+      assignments.emplace_back(std::move(sites), m.num_insts, (T) m.dist_incr_per_iter, scale_factor, region_legal);
+    }
+  }
+
+  incremental_stats = typename IncrementalAssignment<T>::Stats();
+  for (int32_t idx = 0; idx < num_models; idx++) {
+    auto &m               = sssir_model_infos[idx];
+    auto &assignment      = assignments[idx];
+    auto  inst_id_acc     = m.inst_ids.template accessor<int32_t, 1>();
+    auto  inst_weight_acc = m.inst_weights.template accessor<T, 1>();
+    for (int32_t s = 0; s < m.num_sites; s++) {
+      assignment.updateSite(s, site_available[idx][s]);
+    }
+    // legalized instances are out of the problem, and so are their sites
+    for (int32_t i = 0; i < m.num_insts; i++) {
+      int32_t inst_id = inst_id_acc[i];
+      assignment.updateInst(i, pos_acc[inst_id][0], pos_acc[inst_id][1], inst_weight_acc[i],
+              !acc_is_legalized_insts[inst_id]);
+    }
+    openparfAssertMsg(assignment.solve(), "Model %i: not enough legal sites for %i instances\n", idx, m.num_insts);
+    auto const &stats = assignment.stats();
+    openparfPrint(kInfo, "Model %i: %i instances solved again, %i arcs rebuilt, %i instances moved to other sites\n",
+            idx, stats.num_updated_insts, stats.num_changed_arcs, stats.num_reassigned_insts);
+    incremental_stats.num_updated_insts += stats.num_updated_insts;
+    incremental_stats.num_changed_arcs += stats.num_changed_arcs;
+    incremental_stats.num_reassigned_insts += stats.num_reassigned_insts;
+
+    auto inst_compatiable_sites_acc = m.inst_compatiable_sites.template accessor<T, 2>();
+    for (int32_t i = 0; i < m.num_insts; i++) {
+      int32_t s = assignment.instSite(i);
+      if (s == -1) continue;
+      res_acc[inst_id_acc[i]][0] = (inst_compatiable_sites_acc[s][0] + inst_compatiable_sites_acc[s][2]) / 2;
+      res_acc[inst_id_acc[i]][1] = (inst_compatiable_sites_acc[s][1] + inst_compatiable_sites_acc[s][3]) / 2;
+    }
+  }
+  return res;
+}
+
+
 OPENPARF_END_NAMESPACE
 
 #define INSTANTIATE_PYTHON_CLASS(T)                                                                                    \
   py::class_<OPENPARF_NAMESPACE::RegionMcfLegalizer<T>>(m, "RegionMcfLegalizer_" #T)                                   \
           .def(py::init<OPENPARF_NAMESPACE::database::PlaceDB const &>())                                              \
           .def("add_sssir_instances", &OPENPARF_NAMESPACE::RegionMcfLegalizer<T>::add_sssir_instances)                 \
-          .def("forward", &OPENPARF_NAMESPACE::RegionMcfLegalizer<T>::forward);
+          .def("forward", &OPENPARF_NAMESPACE::RegionMcfLegalizer<T>::forward)                                         \
+          .def("set_incremental", &OPENPARF_NAMESPACE::RegionMcfLegalizer<T>::set_incremental)                         \
+          .def("get_incremental_stats", &OPENPARF_NAMESPACE::RegionMcfLegalizer<T>::get_incremental_stats);
 
 PYBIND11_MODULE(TORCH_EXTENSION_NAME, m) {
   INSTANTIATE_PYTHON_CLASS(float);
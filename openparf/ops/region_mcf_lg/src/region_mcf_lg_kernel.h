@@ -27,6 +27,7 @@
 #include "database/placedb.h"
 #include "lemon/list_graph.h"
 #include "lemon/network_simplex.h"
+#include "ops/mcf_lg/src/incremental_assignment.h"
 #include "util/torch.h"
 #include "util/util.h"
 
@@ -102,12 +103,27 @@ class RegionMcfLegalizer {
   explicit RegionMcfLegalizer(database::PlaceDB const &placedb) : placedb_(placedb) {
     site_per_iteration = 100;
     scale_factor       = 1000;
+    incremental        = false;
   }
   at::Tensor forward(at::Tensor pos, at::Tensor is_legalized_insts, database::PlaceDB const &placedb);
   void       add_sssir_instances(at::Tensor inst_ids, at::Tensor inst_weights, at::Tensor inst_compatiable_sites);
+  /// @brief Keep the assignment and the potentials of each model across calls, and only solve again the instances
+  /// that moved and the ones affected by sites occupied or released by legalized instances, see IncrementalAssignment
+  void       set_incremental(bool v) {
+    incremental = v;
+    assignments.clear();
+  }
+  /// @brief numbers of instances solved again, of arcs rebuilt and of instances moved to another site in the last
+  /// incremental legalization
+  std::tuple<int32_t, int32_t, int32_t> get_incremental_stats() const {
+    return std::make_tuple(incremental_stats.num_updated_insts, incremental_stats.num_changed_arcs,
+            incremental_stats.num_reassigned_insts);
+  }
 
  private:
   void                        calculate_max_distance(at::Tensor pos);
+  at::Tensor                  forward_incremental(at::Tensor pos, at::Tensor is_legalized_insts,
+                           std::vector<std::vector<uint8_t>> const &site_available);
 
   std::vector<SSSIRModelInfo> sssir_model_infos;
   MinCostFlowProblem          mcf_problem;
@@ -117,6 +133,11 @@ class RegionMcfLegalizer {
   int32_t                     site_per_iteration;
   int32_t                     scale_factor;
 
+  // Incremental legalization
+  bool                                     incremental;
+  std::vector<IncrementalAssignment<T>>    assignments;
+  typename IncrementalAssignment<T>::Stats incremental_stats;
+
   // I give up, binding is too complicated
   database::PlaceDB const    &placedb_;
 };
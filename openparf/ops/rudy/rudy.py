@@ -30,7 +30,11 @@ class Rudy(nn.Module):
                  unit_vertical_capacity,
                  deterministic_flag,
                  initial_horizontal_utilization_map=None,
-                 initial_vertical_utilization_map=None):
+                 initial_vertical_utilization_map=None,
+                 incremental_flag=False,
+                 bbox_tolerance=0.0,
+                 rebuild_interval=0,
+                 workspace=None):
         """ Constructor of RUDY/RISA operator.
 
         :param netpin_start: starting index in netpin map for each net, length of #nets+1, the last entry is #pins
@@ -46,6 +50,13 @@ class Rudy(nn.Module):
         :param unit_vertical_capacity: the number of vertical routing tracks per unit distance
         :param initial_horizontal_utilization_map: initial horizontal rudy map, length of num_bins_x * num_bins_y
         :param initial_vertical_utilization_map initial vertical rudy map, length of num_bins_x * num_bins_y
+        :param incremental_flag: cache the bounding boxes of nets and only rasterize the nets whose
+            bounding boxes changed since the previous call
+        :param bbox_tolerance: in the incremental mode, a net keeps its cached bounding box if the box stays
+            in the same bins and no edge moves by more than this fraction of a bin; 0 updates every moved net
+        :param rebuild_interval: in the incremental mode, rasterize all nets again every this number of calls
+            to discard the accumulated tolerance and rounding errors; 0 for never
+        :param workspace: optional workspace providing the demand and utilization maps, see py_utils.workspace
         """
         super(Rudy, self).__init__()
         self.netpin_start = netpin_start
@@ -64,44 +75,149 @@ class Rudy(nn.Module):
         self.determistic_flag = deterministic_flag
         self.initial_horizontal_utilization_map = initial_horizontal_utilization_map
         self.initial_vertical_utilization_map = initial_vertical_utilization_map
+        self.incremental_flag = incremental_flag
+        self.bbox_tolerance = bbox_tolerance
+        self.rebuild_interval = rebuild_interval
+        self.workspace = workspace
+        self.reset()
 
-    def forward(self, pin_pos):
+    def reset(self):
+        """ Drop the cached bounding boxes and maps, the next call rasterizes all nets. """
+        # horizontal and vertical demand before the conversion to utilization
+        self.demand_maps = None
+        # route, horizontal and vertical utilization maps returned by forward
+        self.utilization_maps = None
+        # bounding boxes and weights of nets rasterized into the demand maps, #nets x 4
+        self.net_bboxes = None
+        self.cached_net_weights = None
+        self.new_net_bboxes = None
+        self.num_calls_since_rebuild = 0
+
+    def forward(self, pin_pos, rebuild_flag=False):
         """ Forward function that calculates the routing congestion map
 
         :param pin_pos: tensor of pin position, length of 2 * #pins, in the form of xyxyxy...
-        :return: rudy map, length of num_bins_x * num_bins_y
+        :param rebuild_flag: in the incremental mode, rasterize all nets instead of the changed ones,
+            e.g., to check the drift of the incremental maps
+        :return: rudy map, length of num_bins_x * num_bins_y. The maps are reused by the next call.
         """
-        horizontal_utilization_map = torch.zeros((self.num_bins_x, self.num_bins_y),
-                                                 dtype=pin_pos.dtype,
-                                                 device=pin_pos.device)
-        vertical_utilization_map = torch.zeros_like(horizontal_utilization_map)
-        foo = rudy_cuda.forward if pin_pos.is_cuda else rudy_cpp.forward
-        foo(pin_pos,
-            self.netpin_start,
-            self.flat_netpin,
-            self.net_weights,
-            self.bin_size_x,
-            self.bin_size_y,
-            self.xl,
-            self.yl,
-            self.xh,
-            self.yh,
-            self.num_bins_x,
-            self.num_bins_y,
-            self.determistic_flag,
-            horizontal_utilization_map,
-            vertical_utilization_map)
+        self._allocate(pin_pos)
+        ext = rudy_cuda if pin_pos.is_cuda else rudy_cpp
+        if self.incremental_flag:
+            self._update(ext, pin_pos, rebuild_flag)
+        else:
+            horizontal_demand_map, vertical_demand_map = self.demand_maps
+            horizontal_demand_map.zero_()
+            vertical_demand_map.zero_()
+            ext.forward(pin_pos,
+                        self.netpin_start,
+                        self.flat_netpin,
+                        self.net_weights,
+                        self.bin_size_x,
+                        self.bin_size_y,
+                        self.xl,
+                        self.yl,
+                        self.xh,
+                        self.yh,
+                        self.num_bins_x,
+                        self.num_bins_y,
+                        self.determistic_flag,
+                        horizontal_demand_map,
+                        vertical_demand_map)
 
         # Convert demand to utilization in each bin
+        route_utilization_map, horizontal_utilization_map, vertical_utilization_map = self.utilization_maps
         bin_area = self.bin_size_x * self.bin_size_y
-        horizontal_utilization_map.mul_(1.0 / (bin_area * self.unit_horizontal_capacity))
-        vertical_utilization_map.mul_(1.0 / (bin_area * self.unit_vertical_capacity))
+        torch.mul(self.demand_maps[0], 1.0 / (bin_area * self.unit_horizontal_capacity),
+                  out=horizontal_utilization_map)
+        torch.mul(self.demand_maps[1], 1.0 / (bin_area * self.unit_vertical_capacity),
+                  out=vertical_utilization_map)
         if self.initial_horizontal_utilization_map is not None:
             horizontal_utilization_map.add_(self.initial_horizontal_utilization_map)
         if self.initial_vertical_utilization_map is not None:
             vertical_utilization_map.add_(self.initial_vertical_utilization_map)
 
-        route_utilization_map = torch.max(horizontal_utilization_map.abs(), vertical_utilization_map.abs())
+        torch.max(horizontal_utilization_map.abs(), vertical_utilization_map.abs(), out=route_utilization_map)
 
         # Routing Utilization Overflow
         return route_utilization_map, horizontal_utilization_map, vertical_utilization_map
+
+    def _allocate(self, pin_pos):
+        if self.demand_maps is not None and self.demand_maps[0].dtype == pin_pos.dtype \
+                and self.demand_maps[0].device == pin_pos.device:
+            return
+        self.reset()
+        size = (self.num_bins_x, self.num_bins_y)
+        if self.workspace is not None:
+            # the incremental mode keeps the demand maps across calls, so the names are owned by this op
+            self.demand_maps = [self.workspace.get("rudy.demand_map.%d" % i, size, pin_pos.dtype, pin_pos.device,
+                                                   zero_flag=True) for i in range(2)]
+            self.utilization_maps = [self.workspace.get("rudy.utilization_map.%d" % i, size, pin_pos.dtype,
+                                                        pin_pos.device, zero_flag=True) for i in range(3)]
+            return
+        self.demand_maps = [torch.zeros(size, dtype=pin_pos.dtype, device=pin_pos.device) for _ in range(2)]
+        self.utilization_maps = [torch.zeros_like(self.demand_maps[0]) for _ in range(3)]
+
+    def _changed_nets(self, old_bboxes, new_bboxes, net_weights):
+        """ Mask of nets whose bounding boxes or weights changed beyond the tolerance """
+        if self.bbox_tolerance > 0:
+            bin_sizes = new_bboxes.new_tensor([self.bin_size_x, self.bin_size_y] * 2)
+            origin = new_bboxes.new_tensor([self.xl, self.yl] * 2)
+            changed = ((new_bboxes - old_bboxes).abs_() > bin_sizes * self.bbox_tolerance).any(dim=1)
+            # crossing a bin boundary always counts as a change
+            changed |= (torch.floor((old_bboxes - origin) / bin_sizes)
+                        != torch.floor((new_bboxes - origin) / bin_sizes)).any(dim=1)
+        else:
+            changed = (new_bboxes != old_bboxes).any(dim=1)
+        if net_weights.numel():
+            changed |= net_weights != self.cached_net_weights
+        return changed
+
+    def _update(self, ext, pin_pos, rebuild_flag):
+        num_nets = self.netpin_start.numel() - 1
+        if self.new_net_bboxes is None:
+            self.new_net_bboxes = pin_pos.new_empty((num_nets, 4))
+        ext.net_bboxes(pin_pos, self.netpin_start, self.flat_netpin, self.new_net_bboxes)
+        net_weights = self.net_weights if self.net_weights is not None else pin_pos.new_empty(0)
+        horizontal_demand_map, vertical_demand_map = self.demand_maps
+
+        if self.net_bboxes is None or rebuild_flag or \
+                (self.rebuild_interval and self.num_calls_since_rebuild >= self.rebuild_interval):
+            horizontal_demand_map.zero_()
+            vertical_demand_map.zero_()
+            self.net_bboxes = self.new_net_bboxes.clone()
+            self.cached_net_weights = net_weights.clone()
+            self.num_calls_since_rebuild = 0
+            old_net_bboxes = old_net_weights = pin_pos.new_empty(0)
+            net_ids = torch.arange(num_nets, dtype=torch.int32, device=pin_pos.device)
+        else:
+            self.num_calls_since_rebuild += 1
+            changed = self._changed_nets(self.net_bboxes, self.new_net_bboxes, net_weights)
+            net_ids = changed.nonzero().view(-1)
+            if net_ids.numel() == 0:
+                return
+            old_net_bboxes = self.net_bboxes
+            old_net_weights = self.cached_net_weights
+            net_ids = net_ids.int()
+
+        ext.update(old_net_bboxes,
+                   old_net_weights,
+                   self.new_net_bboxes,
+                   net_weights,
+                   net_ids,
+                   self.netpin_start,
+                   self.bin_size_x,
+                   self.bin_size_y,
+                   self.xl,
+                   self.yl,
+                   self.num_bins_x,
+                   self.num_bins_y,
+                   self.determistic_flag,
+                   horizontal_demand_map,
+                   vertical_demand_map)
+        if old_net_bboxes.numel():
+            # the cached boxes and weights follow what the demand maps hold
+            ids = net_ids.long()
+            self.net_bboxes[ids] = self.new_net_bboxes[ids]
+            if net_weights.numel():
+                self.cached_net_weights[ids] = net_weights[ids]
@@ -61,8 +61,79 @@ void rudy_forward(at::Tensor pin_pos,
   });
 }
 
+/// @brief Compute the bounding boxes of nets
+/// @param net_bboxes output, #nets x 4 in the form of (xl, yl, xh, yh)
+void rudy_net_bboxes(at::Tensor pin_pos, at::Tensor netpin_start, at::Tensor flat_netpin, at::Tensor net_bboxes) {
+  CHECK_FLAT_CPU(pin_pos);
+  CHECK_EVEN(pin_pos);
+  CHECK_CONTIGUOUS(pin_pos);
+  CHECK_FLAT_CPU(netpin_start);
+  CHECK_CONTIGUOUS(netpin_start);
+  CHECK_FLAT_CPU(flat_netpin);
+  CHECK_CONTIGUOUS(flat_netpin);
+  CHECK_CONTIGUOUS(net_bboxes);
+
+  int32_t num_nets = netpin_start.numel() - 1;
+  AT_ASSERTM(net_bboxes.numel() == num_nets * 4, "net_bboxes must be #nets x 4");
+
+  OPENPARF_DISPATCH_FLOATING_TYPES(pin_pos, "rudyNetBBoxLauncher", [&] {
+    rudyNetBBoxLauncher<scalar_t>(OPENPARF_TENSOR_DATA_PTR(pin_pos, scalar_t),
+            OPENPARF_TENSOR_DATA_PTR(netpin_start, int), OPENPARF_TENSOR_DATA_PTR(flat_netpin, int), num_nets,
+            at::get_num_threads(), OPENPARF_TENSOR_DATA_PTR(net_bboxes, scalar_t));
+  });
+}
+
+/// @brief Replace the demand of nets |net_ids| rasterized from the old bounding boxes and
+/// weights with the demand rasterized from the new ones.
+/// The maps are the demand before the conversion to utilization.
+/// @param old_net_bboxes empty for no old demand to remove
+/// @param old_net_weights empty for unit weights
+/// @param new_net_weights empty for unit weights
+void rudy_update(at::Tensor old_net_bboxes,
+        at::Tensor          old_net_weights,
+        at::Tensor          new_net_bboxes,
+        at::Tensor          new_net_weights,
+        at::Tensor          net_ids,
+        at::Tensor          netpin_start,
+        double              bin_size_x,
+        double              bin_size_y,
+        double              xl,
+        double              yl,
+        int32_t             num_bins_x,
+        int32_t             num_bins_y,
+        int32_t             deterministic_flag,
+        at::Tensor          horizontal_utilization_map,
+        at::Tensor          vertical_utilization_map) {
+  CHECK_CONTIGUOUS(old_net_bboxes);
+  CHECK_CONTIGUOUS(old_net_weights);
+  CHECK_CONTIGUOUS(new_net_bboxes);
+  CHECK_CONTIGUOUS(new_net_weights);
+  CHECK_FLAT_CPU(net_ids);
+  CHECK_CONTIGUOUS(net_ids);
+  CHECK_FLAT_CPU(netpin_start);
+  CHECK_CONTIGUOUS(netpin_start);
+  CHECK_FLAT_CPU(horizontal_utilization_map);
+  CHECK_CONTIGUOUS(horizontal_utilization_map);
+  CHECK_FLAT_CPU(vertical_utilization_map);
+  CHECK_CONTIGUOUS(vertical_utilization_map);
+
+  OPENPARF_DISPATCH_FLOATING_TYPES(new_net_bboxes, "rudyUpdateLauncher", [&] {
+    rudyUpdateLauncher<scalar_t>(
+            old_net_bboxes.numel() > 0 ? OPENPARF_TENSOR_DATA_PTR(old_net_bboxes, scalar_t) : nullptr,
+            old_net_weights.numel() > 0 ? OPENPARF_TENSOR_DATA_PTR(old_net_weights, scalar_t) : nullptr,
+            OPENPARF_TENSOR_DATA_PTR(new_net_bboxes, scalar_t),
+            new_net_weights.numel() > 0 ? OPENPARF_TENSOR_DATA_PTR(new_net_weights, scalar_t) : nullptr,
+            OPENPARF_TENSOR_DATA_PTR(net_ids, int), net_ids.numel(), OPENPARF_TENSOR_DATA_PTR(netpin_start, int),
+            bin_size_x, bin_size_y, xl, yl, num_bins_x, num_bins_y, deterministic_flag, at::get_num_threads(),
+            OPENPARF_TENSOR_DATA_PTR(horizontal_utilization_map, scalar_t),
+            OPENPARF_TENSOR_DATA_PTR(vertical_utilization_map, scalar_t));
+  });
+}
+
 OPENPARF_END_NAMESPACE
 
 PYBIND11_MODULE(TORCH_EXTENSION_NAME, m) {
   m.def("forward", &OPENPARF_NAMESPACE::rudy_forward, "compute RUDY map");
+  m.def("net_bboxes", &OPENPARF_NAMESPACE::rudy_net_bboxes, "compute bounding boxes of nets");
+  m.def("update", &OPENPARF_NAMESPACE::rudy_update, "update RUDY demand of nets with new bounding boxes");
 }
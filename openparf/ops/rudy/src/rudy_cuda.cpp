@@ -28,6 +28,31 @@ void RudyCudaLauncher(T *pin_pos,
         T                  *horizontal_utilization_map,
         T                  *vertical_utilization_map);
 
+template<typename T>
+void RudyNetBBoxCudaLauncher(T const *pin_pos,
+        int32_t const               *netpin_start,
+        int32_t const               *flat_netpin,
+        int32_t                      num_nets,
+        T                           *net_bboxes);
+
+template<typename T>
+void RudyUpdateCudaLauncher(T const *old_net_bboxes,
+        T const                     *old_net_weights,
+        T const                     *new_net_bboxes,
+        T const                     *new_net_weights,
+        int32_t const               *net_ids,
+        int32_t                      num_ids,
+        int32_t const               *netpin_start,
+        T                            bin_size_x,
+        T                            bin_size_y,
+        T                            xl,
+        T                            yl,
+        int32_t                      num_bins_x,
+        int32_t                      num_bins_y,
+        int32_t                      deterministic_flag,
+        T                           *horizontal_utilization_map,
+        T                           *vertical_utilization_map);
+
 void    rudy_forward(at::Tensor pin_pos,
            at::Tensor           netpin_start,
            at::Tensor           flat_netpin,
@@ -78,8 +103,71 @@ void    rudy_forward(at::Tensor pin_pos,
   });
 }
 
+void rudy_net_bboxes(at::Tensor pin_pos, at::Tensor netpin_start, at::Tensor flat_netpin, at::Tensor net_bboxes) {
+  CHECK_FLAT_CUDA(pin_pos);
+  CHECK_EVEN(pin_pos);
+  CHECK_CONTIGUOUS(pin_pos);
+  CHECK_FLAT_CUDA(netpin_start);
+  CHECK_CONTIGUOUS(netpin_start);
+  CHECK_FLAT_CUDA(flat_netpin);
+  CHECK_CONTIGUOUS(flat_netpin);
+  CHECK_CONTIGUOUS(net_bboxes);
+
+  int32_t num_nets = netpin_start.numel() - 1;
+  AT_ASSERTM(net_bboxes.numel() == num_nets * 4, "net_bboxes must be #nets x 4");
+
+  OPENPARF_DISPATCH_FLOATING_TYPES(pin_pos, "RudyNetBBoxCudaLauncher", [&] {
+    RudyNetBBoxCudaLauncher<scalar_t>(OPENPARF_TENSOR_DATA_PTR(pin_pos, scalar_t),
+            OPENPARF_TENSOR_DATA_PTR(netpin_start, int32_t), OPENPARF_TENSOR_DATA_PTR(flat_netpin, int32_t), num_nets,
+            OPENPARF_TENSOR_DATA_PTR(net_bboxes, scalar_t));
+  });
+}
+
+void rudy_update(at::Tensor old_net_bboxes,
+        at::Tensor          old_net_weights,
+        at::Tensor          new_net_bboxes,
+        at::Tensor          new_net_weights,
+        at::Tensor          net_ids,
+        at::Tensor          netpin_start,
+        double              bin_size_x,
+        double              bin_size_y,
+        double              xl,
+        double              yl,
+        int32_t             num_bins_x,
+        int32_t             num_bins_y,
+        int32_t             deterministic_flag,
+        at::Tensor          horizontal_utilization_map,
+        at::Tensor          vertical_utilization_map) {
+  CHECK_CONTIGUOUS(old_net_bboxes);
+  CHECK_CONTIGUOUS(old_net_weights);
+  CHECK_CONTIGUOUS(new_net_bboxes);
+  CHECK_CONTIGUOUS(new_net_weights);
+  CHECK_FLAT_CUDA(net_ids);
+  CHECK_CONTIGUOUS(net_ids);
+  CHECK_FLAT_CUDA(netpin_start);
+  CHECK_CONTIGUOUS(netpin_start);
+  CHECK_FLAT_CUDA(horizontal_utilization_map);
+  CHECK_CONTIGUOUS(horizontal_utilization_map);
+  CHECK_FLAT_CUDA(vertical_utilization_map);
+  CHECK_CONTIGUOUS(vertical_utilization_map);
+
+  OPENPARF_DISPATCH_FLOATING_TYPES(new_net_bboxes, "RudyUpdateCudaLauncher", [&] {
+    RudyUpdateCudaLauncher<scalar_t>(
+            old_net_bboxes.numel() > 0 ? OPENPARF_TENSOR_DATA_PTR(old_net_bboxes, scalar_t) : nullptr,
+            old_net_weights.numel() > 0 ? OPENPARF_TENSOR_DATA_PTR(old_net_weights, scalar_t) : nullptr,
+            OPENPARF_TENSOR_DATA_PTR(new_net_bboxes, scalar_t),
+            new_net_weights.numel() > 0 ? OPENPARF_TENSOR_DATA_PTR(new_net_weights, scalar_t) : nullptr,
+            OPENPARF_TENSOR_DATA_PTR(net_ids, int32_t), net_ids.numel(), OPENPARF_TENSOR_DATA_PTR(netpin_start, int32_t),
+            bin_size_x, bin_size_y, xl, yl, num_bins_x, num_bins_y, deterministic_flag,
+            OPENPARF_TENSOR_DATA_PTR(horizontal_utilization_map, scalar_t),
+            OPENPARF_TENSOR_DATA_PTR(vertical_utilization_map, scalar_t));
+  });
+}
+
 OPENPARF_END_NAMESPACE
 
 PYBIND11_MODULE(TORCH_EXTENSION_NAME, m) {
   m.def("forward", &OPENPARF_NAMESPACE::rudy_forward, "compute RUDY map (CUDA)");
+  m.def("net_bboxes", &OPENPARF_NAMESPACE::rudy_net_bboxes, "compute bounding boxes of nets (CUDA)");
+  m.def("update", &OPENPARF_NAMESPACE::rudy_update, "update RUDY demand of nets with new bounding boxes (CUDA)");
 }
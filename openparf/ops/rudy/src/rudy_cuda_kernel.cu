@@ -152,6 +152,200 @@ void RudyCudaLauncher(T *pin_pos,
   }
 }
 
+/// @brief Atomic addition of signed fixed point numbers, as the update removes demand.
+/// CUDA only provides atomicAdd for unsigned 64-bit integers, which wraps around
+/// in two's complement just like signed additions.
+struct SignedFixedPointAtomicAdd {
+  typedef long long int type;
+
+  type                  scale_factor;
+
+  explicit SignedFixedPointAtomicAdd(type sf) : scale_factor(sf) {}
+
+  template<typename V>
+  __device__ __forceinline__ void operator()(type* dst, V v) const {
+    type sv = v * scale_factor;
+    atomicAdd(reinterpret_cast<unsigned long long int*>(dst), static_cast<unsigned long long int>(sv));
+  }
+};
+
+template<typename T, typename AtomicOp>
+inline __device__ void rasterizeNetBBox(T x_min,
+        T                                  y_min,
+        T                                  x_max,
+        T                                  y_max,
+        T                                  wt,
+        T                                  bin_size_x,
+        T                                  bin_size_y,
+        T                                  xl,
+        T                                  yl,
+        int32_t                            num_bins_x,
+        int32_t                            num_bins_y,
+        AtomicOp                           atomic_op,
+        typename AtomicOp::type           *horizontal_utilization_map,
+        typename AtomicOp::type           *vertical_utilization_map) {
+  int32_t bin_index_xl = int32_t((x_min - xl) / bin_size_x);
+  int32_t bin_index_xh = int32_t((x_max - xl) / bin_size_x) + 1;
+  bin_index_xl         = OPENPARF_STD_NAMESPACE::max(bin_index_xl, 0);
+  bin_index_xh         = OPENPARF_STD_NAMESPACE::min(bin_index_xh, num_bins_x);
+  int32_t bin_index_yl = int32_t((y_min - yl) / bin_size_y);
+  int32_t bin_index_yh = int32_t((y_max - yl) / bin_size_y) + 1;
+  bin_index_yl         = OPENPARF_STD_NAMESPACE::max(bin_index_yl, 0);
+  bin_index_yh         = OPENPARF_STD_NAMESPACE::min(bin_index_yh, num_bins_y);
+
+  for (int32_t x = bin_index_xl; x < bin_index_xh; ++x) {
+    for (int32_t y = bin_index_yl; y < bin_index_yh; ++y) {
+      T bin_xl = xl + x * bin_size_x;
+      T bin_yl = yl + y * bin_size_y;
+      T bin_xh = bin_xl + bin_size_x;
+      T bin_yh = bin_yl + bin_size_y;
+      T overlap =
+              OPENPARF_STD_NAMESPACE::max(
+                      OPENPARF_STD_NAMESPACE::min(x_max, bin_xh) - OPENPARF_STD_NAMESPACE::max(x_min, bin_xl),
+                      (T) 0) *
+              OPENPARF_STD_NAMESPACE::max(
+                      OPENPARF_STD_NAMESPACE::min(y_max, bin_yh) - OPENPARF_STD_NAMESPACE::max(y_min, bin_yl), (T) 0);
+      overlap *= wt;
+      int32_t index = x * num_bins_y + y;
+      if (y_max - y_min > cuda::numeric_limits<T>::epsilon()) {
+        atomic_op(horizontal_utilization_map + index, overlap / (y_max - y_min + cuda::numeric_limits<T>::epsilon()));
+      }
+      if (x_max - x_min > cuda::numeric_limits<T>::epsilon()) {
+        atomic_op(vertical_utilization_map + index, overlap / (x_max - x_min + cuda::numeric_limits<T>::epsilon()));
+      }
+    }
+  }
+}
+
+template<typename T>
+__global__ void RudyNetBBoxCudaKernel(T const *pin_pos,
+        int32_t const                          *netpin_start,
+        int32_t const                          *flat_netpin,
+        int32_t                                 num_nets,
+        T                                      *net_bboxes) {
+  int32_t i = threadIdx.x + blockDim.x * blockIdx.x;
+  if (i < num_nets) {
+    T x_max = -cuda::numeric_limits<T>::max();
+    T x_min = cuda::numeric_limits<T>::max();
+    T y_max = -cuda::numeric_limits<T>::max();
+    T y_min = cuda::numeric_limits<T>::max();
+    for (int32_t j = netpin_start[i]; j < netpin_start[i + 1]; ++j) {
+      int32_t pin_id = flat_netpin[j];
+      T       xx     = pin_pos[pin_id << 1];
+      T       yy     = pin_pos[(pin_id << 1) | 1];
+      x_max          = OPENPARF_STD_NAMESPACE::max(xx, x_max);
+      x_min          = OPENPARF_STD_NAMESPACE::min(xx, x_min);
+      y_max          = OPENPARF_STD_NAMESPACE::max(yy, y_max);
+      y_min          = OPENPARF_STD_NAMESPACE::min(yy, y_min);
+    }
+    T *bbox = net_bboxes + (i << 2);
+    bbox[0] = x_min;
+    bbox[1] = y_min;
+    bbox[2] = x_max;
+    bbox[3] = y_max;
+  }
+}
+
+template<typename T, typename AtomicOp>
+__global__ void RudyUpdateCudaKernel(T const *old_net_bboxes,
+        T const                              *old_net_weights,
+        T const                              *new_net_bboxes,
+        T const                              *new_net_weights,
+        int32_t const                        *net_ids,
+        int32_t                               num_ids,
+        int32_t const                        *netpin_start,
+        T                                     bin_size_x,
+        T                                     bin_size_y,
+        T                                     xl,
+        T                                     yl,
+        int32_t                               num_bins_x,
+        int32_t                               num_bins_y,
+        AtomicOp                              atomic_op,
+        typename AtomicOp::type              *horizontal_utilization_map,
+        typename AtomicOp::type              *vertical_utilization_map) {
+  int32_t k = threadIdx.x + blockDim.x * blockIdx.x;
+  if (k < num_ids) {
+    int32_t i  = net_ids[k];
+    T       wt = netWiringDistributionMapWeight<T>(netpin_start[i + 1] - netpin_start[i]);
+    if (old_net_bboxes) {
+      T const *bbox = old_net_bboxes + (i << 2);
+      rasterizeNetBBox<T>(bbox[0], bbox[1], bbox[2], bbox[3], old_net_weights ? -wt * old_net_weights[i] : -wt,
+              bin_size_x, bin_size_y, xl, yl, num_bins_x, num_bins_y, atomic_op, horizontal_utilization_map,
+              vertical_utilization_map);
+    }
+    T const *bbox = new_net_bboxes + (i << 2);
+    rasterizeNetBBox<T>(bbox[0], bbox[1], bbox[2], bbox[3], new_net_weights ? wt * new_net_weights[i] : wt,
+            bin_size_x, bin_size_y, xl, yl, num_bins_x, num_bins_y, atomic_op, horizontal_utilization_map,
+            vertical_utilization_map);
+  }
+}
+
+template<typename T>
+void RudyNetBBoxCudaLauncher(T const *pin_pos,
+        int32_t const               *netpin_start,
+        int32_t const               *flat_netpin,
+        int32_t                      num_nets,
+        T                           *net_bboxes) {
+  int32_t thread_count = 256;
+  int32_t block_count  = ceilDiv(num_nets, thread_count);
+  RudyNetBBoxCudaKernel<<<(uint32_t) block_count, {(uint32_t) thread_count, 1u, 1u}>>>(pin_pos, netpin_start,
+          flat_netpin, num_nets, net_bboxes);
+}
+
+template<typename T>
+void RudyUpdateCudaLauncher(T const *old_net_bboxes,
+        T const                     *old_net_weights,
+        T const                     *new_net_bboxes,
+        T const                     *new_net_weights,
+        int32_t const               *net_ids,
+        int32_t                      num_ids,
+        int32_t const               *netpin_start,
+        T                            bin_size_x,
+        T                            bin_size_y,
+        T                            xl,
+        T                            yl,
+        int32_t                      num_bins_x,
+        int32_t                      num_bins_y,
+        int32_t                      deterministic_flag,
+        T                           *horizontal_utilization_map,
+        T                           *vertical_utilization_map) {
+  int32_t thread_count    = 256;
+  int32_t block_count     = ceilDiv(num_ids, thread_count);
+  int32_t num_bins        = num_bins_x * num_bins_y;
+  int32_t bin_block_count = ceilDiv(num_bins, thread_count);
+  if (deterministic_flag) {
+    using AtomicIntType = SignedFixedPointAtomicAdd::type;
+    SignedFixedPointAtomicAdd atomic_op(1e10);
+    AtomicIntType            *buf_hmap = nullptr;
+    AtomicIntType            *buf_vmap = nullptr;
+    allocateCUDA(buf_hmap, num_bins);
+    allocateCUDA(buf_vmap, num_bins);
+    DEFER({
+      destroyCUDA(buf_hmap);
+      destroyCUDA(buf_vmap);
+    });
+    copyScaleArray<<<bin_block_count, thread_count>>>(buf_hmap, horizontal_utilization_map, atomic_op.scale_factor,
+            num_bins);
+    copyScaleArray<<<bin_block_count, thread_count>>>(buf_vmap, vertical_utilization_map, atomic_op.scale_factor,
+            num_bins);
+    if (num_ids) {
+      RudyUpdateCudaKernel<T, decltype(atomic_op)><<<(uint32_t) block_count, {(uint32_t) thread_count, 1u, 1u}>>>(
+              old_net_bboxes, old_net_weights, new_net_bboxes, new_net_weights, net_ids, num_ids, netpin_start,
+              bin_size_x, bin_size_y, xl, yl, num_bins_x, num_bins_y, atomic_op, buf_hmap, buf_vmap);
+    }
+    copyScaleArray<<<bin_block_count, thread_count>>>(horizontal_utilization_map, buf_hmap,
+            static_cast<T>(1.0 / atomic_op.scale_factor), num_bins);
+    copyScaleArray<<<bin_block_count, thread_count>>>(vertical_utilization_map, buf_vmap,
+            static_cast<T>(1.0 / atomic_op.scale_factor), num_bins);
+  } else if (num_ids) {
+    AtomicAdd<T> atomic_op;
+    RudyUpdateCudaKernel<T, decltype(atomic_op)><<<(uint32_t) block_count, {(uint32_t) thread_count, 1u, 1u}>>>(
+            old_net_bboxes, old_net_weights, new_net_bboxes, new_net_weights, net_ids, num_ids, netpin_start,
+            bin_size_x, bin_size_y, xl, yl, num_bins_x, num_bins_y, atomic_op, horizontal_utilization_map,
+            vertical_utilization_map);
+  }
+}
+
 // manually instantiate the template function
 #define REGISTER_KERNEL_LAUNCHER(T)                                                                                    \
   template void RudyCudaLauncher<T>(T * pin_pos, int32_t * netpin_start, int32_t * flat_netpin, T * net_weights,       \
@@ -163,4 +357,18 @@ REGISTER_KERNEL_LAUNCHER(double)
 
 #undef REGISTER_KERNEL_LAUNCHER
 
+#define REGISTER_KERNEL_LAUNCHER(T)                                                                                    \
+  template void RudyNetBBoxCudaLauncher<T>(T const *pin_pos, int32_t const *netpin_start,                              \
+          int32_t const *flat_netpin, int32_t num_nets, T *net_bboxes);                                                \
+  template void RudyUpdateCudaLauncher<T>(T const *old_net_bboxes, T const *old_net_weights,                           \
+          T const *new_net_bboxes, T const *new_net_weights, int32_t const *net_ids, int32_t num_ids,                  \
+          int32_t const *netpin_start, T bin_size_x, T bin_size_y, T xl, T yl, int32_t num_bins_x,                     \
+          int32_t num_bins_y, int32_t deterministic_flag, T *horizontal_utilization_map,                               \
+          T *vertical_utilization_map);
+
+REGISTER_KERNEL_LAUNCHER(float)
+REGISTER_KERNEL_LAUNCHER(double)
+
+#undef REGISTER_KERNEL_LAUNCHER
+
 OPENPARF_END_NAMESPACE
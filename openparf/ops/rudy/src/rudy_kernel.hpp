@@ -20,6 +20,63 @@ OPENPARF_BEGIN_NAMESPACE
 template<typename T>
 inline DEFINE_NET_WIRING_DISTRIBUTION_MAP_WEIGHT;
 
+/// @brief Add the demand of a net with bounding box (x_min, y_min, x_max, y_max)
+/// and weight wt to the bins it overlaps. A negative weight removes the demand.
+template<typename T, typename V, typename AtomicOp>
+inline void rasterizeNetBBox(T                x_min,
+        T                                 y_min,
+        T                                 x_max,
+        T                                 y_max,
+        T                                 wt,
+        T                                 bin_size_x,
+        T                                 bin_size_y,
+        T                                 inv_bin_size_x,
+        T                                 inv_bin_size_y,
+        T                                 xl,
+        T                                 yl,
+        V                                 num_bins_x,
+        V                                 num_bins_y,
+        AtomicOp                          atomic_op,
+        typename AtomicOp::type*          horizontal_utilization_map,
+        typename AtomicOp::type*          vertical_utilization_map) {
+  // compute the bin box that this net will affect
+  auto bin_index_xl = int32_t((x_min - xl) * inv_bin_size_x);
+  auto bin_index_xh = int32_t((x_max - xl) * inv_bin_size_x) + 1;
+  bin_index_xl      = OPENPARF_STD_NAMESPACE::max(bin_index_xl, (decltype(bin_index_xl)) 0);
+  bin_index_xh      = OPENPARF_STD_NAMESPACE::min(bin_index_xh, (decltype(bin_index_xh)) num_bins_x);
+  auto bin_index_yl = int32_t((y_min - yl) * inv_bin_size_y);
+  auto bin_index_yh = int32_t((y_max - yl) * inv_bin_size_y) + 1;
+  bin_index_yl      = OPENPARF_STD_NAMESPACE::max(bin_index_yl, (decltype(bin_index_yl)) 0);
+  bin_index_yh      = OPENPARF_STD_NAMESPACE::min(bin_index_yh, (decltype(bin_index_yh)) num_bins_y);
+
+  for (auto x = bin_index_xl; x < bin_index_xh; x++) {
+    for (auto y = bin_index_yl; y < bin_index_yh; y++) {
+      T bin_xl = xl + x * bin_size_x;
+      T bin_yl = yl + y * bin_size_y;
+      T bin_xh = bin_xl + bin_size_x;
+      T bin_yh = bin_yl + bin_size_y;
+      T overlap =
+              OPENPARF_STD_NAMESPACE::max(
+                      OPENPARF_STD_NAMESPACE::min(x_max, bin_xh) - OPENPARF_STD_NAMESPACE::max(x_min, bin_xl),
+                      (T) 0) *
+              OPENPARF_STD_NAMESPACE::max(
+                      OPENPARF_STD_NAMESPACE::min(y_max, bin_yh) - OPENPARF_STD_NAMESPACE::max(y_min, bin_yl), (T) 0);
+      overlap *= wt;
+      auto index = x * num_bins_y + y;
+      /**
+       * Follow Wuxi's implementation, a tolerance is added to avoid
+       * 0-size bounding box
+       */
+      if (y_max - y_min > std::numeric_limits<T>::epsilon()) {
+        atomic_op(&horizontal_utilization_map[index], overlap / (y_max - y_min + std::numeric_limits<T>::epsilon()));
+      }
+      if (x_max - x_min > std::numeric_limits<T>::epsilon()) {
+        atomic_op(&vertical_utilization_map[index], overlap / (x_max - x_min + std::numeric_limits<T>::epsilon()));
+      }
+    }
+  }
+}
+
 template<typename T, typename V, typename AtomicOp>
 void rudyKernel(const T*         pin_pos,
         const V*                 netpin_start,
@@ -60,48 +117,12 @@ void rudyKernel(const T*         pin_pos,
       y_min          = OPENPARF_STD_NAMESPACE::min(y_min, yy);
     }
 
-    // compute the bin box that this net will affect
-    auto bin_index_xl = int32_t((x_min - xl) * inv_bin_size_x);
-    auto bin_index_xh = int32_t((x_max - xl) * inv_bin_size_x) + 1;
-    bin_index_xl      = OPENPARF_STD_NAMESPACE::max(bin_index_xl, (decltype(bin_index_xl)) 0);
-    bin_index_xh      = OPENPARF_STD_NAMESPACE::min(bin_index_xh, (decltype(bin_index_xh)) num_bins_x);
-    auto bin_index_yl = int32_t((y_min - yl) * inv_bin_size_y);
-    auto bin_index_yh = int32_t((y_max - yl) * inv_bin_size_y) + 1;
-    bin_index_yl      = OPENPARF_STD_NAMESPACE::max(bin_index_yl, (decltype(bin_index_yl)) 0);
-    bin_index_yh      = OPENPARF_STD_NAMESPACE::min(bin_index_yh, (decltype(bin_index_yh)) num_bins_y);
-
-
-    T wt              = netWiringDistributionMapWeight<T>(netpin_start[i + 1] - netpin_start[i]);
+    T wt = netWiringDistributionMapWeight<T>(netpin_start[i + 1] - netpin_start[i]);
     if (net_weights) {
       wt *= net_weights[i];
     }
-
-    for (auto x = bin_index_xl; x < bin_index_xh; x++) {
-      for (auto y = bin_index_yl; y < bin_index_yh; y++) {
-        T bin_xl = xl + x * bin_size_x;
-        T bin_yl = yl + y * bin_size_y;
-        T bin_xh = bin_xl + bin_size_x;
-        T bin_yh = bin_yl + bin_size_y;
-        T overlap =
-                OPENPARF_STD_NAMESPACE::max(
-                        OPENPARF_STD_NAMESPACE::min(x_max, bin_xh) - OPENPARF_STD_NAMESPACE::max(x_min, bin_xl),
-                        (T) 0) *
-                OPENPARF_STD_NAMESPACE::max(
-                        OPENPARF_STD_NAMESPACE::min(y_max, bin_yh) - OPENPARF_STD_NAMESPACE::max(y_min, bin_yl), (T) 0);
-        overlap *= wt;
-        auto index = x * num_bins_y + y;
-        /**
-         * Follow Wuxi's implementation, a tolerance is added to avoid
-         * 0-size bounding box
-         */
-        if (y_max - y_min > std::numeric_limits<T>::epsilon()) {
-          atomic_op(&horizontal_utilization_map[index], overlap / (y_max - y_min + std::numeric_limits<T>::epsilon()));
-        }
-        if (x_max - x_min > std::numeric_limits<T>::epsilon()) {
-          atomic_op(&vertical_utilization_map[index], overlap / (x_max - x_min + std::numeric_limits<T>::epsilon()));
-        }
-      }
-    }
+    rasterizeNetBBox<T>(x_min, y_min, x_max, y_max, wt, bin_size_x, bin_size_y, inv_bin_size_x, inv_bin_size_y, xl,
+            yl, num_bins_x, num_bins_y, atomic_op, horizontal_utilization_map, vertical_utilization_map);
   }
 }
 
@@ -153,6 +174,128 @@ void rudyLauncher(const T* pin_pos,
             vertical_utilization_map);
   }
 }
+/// @brief Compute the bounding box (xl, yl, xh, yh) of each net
+template<typename T, typename V>
+void rudyNetBBoxLauncher(const T* pin_pos,
+        const V*                  netpin_start,
+        const V*                  flat_netpin,
+        const V                   num_nets,
+        int32_t                   num_threads,
+        T*                        net_bboxes) {
+  int32_t chunk_size = OPENPARF_STD_NAMESPACE::max(int32_t(num_nets / num_threads / 16), 1);
+#pragma omp parallel for num_threads(num_threads) schedule(static, chunk_size)
+  for (int32_t i = 0; i < (int32_t) num_nets; i++) {
+    T x_max = std::numeric_limits<T>::lowest();
+    T x_min = std::numeric_limits<T>::max();
+    T y_max = std::numeric_limits<T>::lowest();
+    T y_min = std::numeric_limits<T>::max();
+    for (auto j = netpin_start[i]; j < netpin_start[i + 1]; j++) {
+      auto    pin_id = flat_netpin[j];
+      const T xx     = pin_pos[pin_id << 1];
+      const T yy     = pin_pos[(pin_id << 1) + 1];
+      x_max          = OPENPARF_STD_NAMESPACE::max(x_max, xx);
+      x_min          = OPENPARF_STD_NAMESPACE::min(x_min, xx);
+      y_max          = OPENPARF_STD_NAMESPACE::max(y_max, yy);
+      y_min          = OPENPARF_STD_NAMESPACE::min(y_min, yy);
+    }
+    T* bbox = net_bboxes + (i << 2);
+    bbox[0] = x_min;
+    bbox[1] = y_min;
+    bbox[2] = x_max;
+    bbox[3] = y_max;
+  }
+}
+
+template<typename T, typename V, typename AtomicOp>
+void rudyUpdateKernel(const T* old_net_bboxes,
+        const T*               old_net_weights,
+        const T*               new_net_bboxes,
+        const T*               new_net_weights,
+        const V*               net_ids,
+        const V                num_ids,
+        const V*               netpin_start,
+        const T                bin_size_x,
+        const T                bin_size_y,
+        const T                xl,
+        const T                yl,
+        const V                num_bins_x,
+        const V                num_bins_y,
+        AtomicOp               atomic_op,
+        const V                num_threads,
+        typename AtomicOp::type* horizontal_utilization_map,
+        typename AtomicOp::type* vertical_utilization_map) {
+  const T inv_bin_size_x = 1.0 / bin_size_x;
+  const T inv_bin_size_y = 1.0 / bin_size_y;
+  int32_t chunk_size     = OPENPARF_STD_NAMESPACE::max(int32_t(num_ids / num_threads / 16), 1);
+
+#pragma omp parallel for num_threads(num_threads) schedule(static, chunk_size)
+  for (int32_t k = 0; k < (int32_t) num_ids; k++) {
+    auto i  = net_ids[k];
+    T    wt = netWiringDistributionMapWeight<T>(netpin_start[i + 1] - netpin_start[i]);
+    if (old_net_bboxes) {
+      const T* bbox = old_net_bboxes + (i << 2);
+      rasterizeNetBBox<T>(bbox[0], bbox[1], bbox[2], bbox[3], old_net_weights ? -wt * old_net_weights[i] : -wt,
+              bin_size_x, bin_size_y, inv_bin_size_x, inv_bin_size_y, xl, yl, num_bins_x, num_bins_y, atomic_op,
+              horizontal_utilization_map, vertical_utilization_map);
+    }
+    const T* bbox = new_net_bboxes + (i << 2);
+    rasterizeNetBBox<T>(bbox[0], bbox[1], bbox[2], bbox[3], new_net_weights ? wt * new_net_weights[i] : wt,
+            bin_size_x, bin_size_y, inv_bin_size_x, inv_bin_size_y, xl, yl, num_bins_x, num_bins_y, atomic_op,
+            horizontal_utilization_map, vertical_utilization_map);
+  }
+}
+
+/// @brief Replace the demand of nets |net_ids| rasterized from the old bounding boxes and weights
+/// with the demand from the new ones. Without old bounding boxes, only add the new demand.
+template<typename T, typename V>
+void rudyUpdateLauncher(const T* old_net_bboxes,
+        const T*                 old_net_weights,
+        const T*                 new_net_bboxes,
+        const T*                 new_net_weights,
+        const V*                 net_ids,
+        const V                  num_ids,
+        const V*                 netpin_start,
+        const T                  bin_size_x,
+        const T                  bin_size_y,
+        const T                  xl,
+        const T                  yl,
+        const V                  num_bins_x,
+        const V                  num_bins_y,
+        int32_t                  deterministic_flag,
+        int32_t                  num_threads,
+        T*                       horizontal_utilization_map,
+        T*                       vertical_utilization_map) {
+  if (deterministic_flag) {
+    using AtomicIntType                   = int64_t;
+    AtomicIntType            scale_factor = 1e10;
+    AtomicAdd<AtomicIntType> atomic_op(scale_factor);
+
+    AtomicIntType*           buf_hmap = new AtomicIntType[num_bins_x * num_bins_y];
+    AtomicIntType*           buf_vmap = new AtomicIntType[num_bins_x * num_bins_y];
+    DEFER({
+      delete[] buf_hmap;
+      delete[] buf_vmap;
+    });
+
+    copyScaleArray(buf_hmap, horizontal_utilization_map, scale_factor, num_bins_x * num_bins_y, num_threads);
+    copyScaleArray(buf_vmap, vertical_utilization_map, scale_factor, num_bins_x * num_bins_y, num_threads);
+
+    rudyUpdateKernel<T, V, decltype(atomic_op)>(old_net_bboxes, old_net_weights, new_net_bboxes, new_net_weights,
+            net_ids, num_ids, netpin_start, bin_size_x, bin_size_y, xl, yl, num_bins_x, num_bins_y, atomic_op,
+            num_threads, buf_hmap, buf_vmap);
+
+    copyScaleArray(horizontal_utilization_map, buf_hmap, static_cast<T>(1.0 / scale_factor), num_bins_x * num_bins_y,
+            num_threads);
+    copyScaleArray(vertical_utilization_map, buf_vmap, static_cast<T>(1.0 / scale_factor), num_bins_x * num_bins_y,
+            num_threads);
+  } else {
+    AtomicAdd<T> atomic_op;
+    rudyUpdateKernel<T, V, decltype(atomic_op)>(old_net_bboxes, old_net_weights, new_net_bboxes, new_net_weights,
+            net_ids, num_ids, netpin_start, bin_size_x, bin_size_y, xl, yl, num_bins_x, num_bins_y, atomic_op,
+            num_threads, horizontal_utilization_map, vertical_utilization_map);
+  }
+}
+
 OPENPARF_END_NAMESPACE
 
 #endif   // OPENPARF_OPS_RUDY_SRC_RUDY_KERNEL_HPP_
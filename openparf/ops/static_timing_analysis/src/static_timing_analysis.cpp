@@ -303,6 +303,422 @@ std::tuple<at::Tensor, at::Tensor, at::Tensor> StaticTimingAnalysisForward(datab
   return {pin_arrivals, pin_requires, ignored_net_masks};
 }
 
+namespace {
+
+/// @brief below this number of instances, a level is propagated sequentially
+constexpr int32_t kMinParallelLevelSize = 256;
+
+/**
+ * @brief Level-synchronous Kahn traversal. Starts from the instances flagged in `is_start` and visits the neighbors
+ *  given by `neighborOf` over the arcs in `[arc_start[u], arc_start[u + 1])`. Instances flagged in `is_start` are never
+ *  reached through arcs, which is the same convention as the queue-based traversal of `StaticTimingAnalysis`.
+ */
+template<class NeighborOf>
+void levelize(std::vector<int32_t> const& arc_start,
+              std::vector<uint8_t> const& is_start,
+              NeighborOf                  neighborOf,
+              std::vector<int32_t>&       level_start,
+              std::vector<int32_t>&       level_insts,
+              std::vector<uint8_t>&       is_reached) {
+  int32_t              num_insts = is_start.size();
+  std::vector<int32_t> degrees(num_insts, 0);
+  for (int32_t i = 0; i < (int32_t) arc_start.back(); ++i) {
+    int32_t v = neighborOf(i);
+    if (!is_start[v]) {
+      degrees[v] += 1;
+    }
+  }
+  is_reached.assign(num_insts, 0);
+  level_insts.clear();
+  level_start.assign(1, 0);
+  for (int32_t inst_id = 0; inst_id < num_insts; ++inst_id) {
+    if (is_start[inst_id]) {
+      level_insts.push_back(inst_id);
+      is_reached[inst_id] = 1;
+    }
+  }
+  int32_t begin = 0;
+  while (begin < (int32_t) level_insts.size()) {
+    int32_t end = level_insts.size();
+    level_start.push_back(end);
+    for (int32_t i = begin; i < end; ++i) {
+      int32_t u = level_insts[i];
+      for (int32_t j = arc_start[u]; j < arc_start[u + 1]; ++j) {
+        int32_t v = neighborOf(j);
+        if (!is_start[v] && --degrees[v] == 0) {
+          level_insts.push_back(v);
+          is_reached[v] = 1;
+        }
+      }
+    }
+    begin = end;
+  }
+}
+
+}   // namespace
+
+TimingGraph::TimingGraph(database::PlaceDB const& placedb, at::Tensor net_mask_ignore_large) {
+  CHECK_FLAT_CPU(net_mask_ignore_large);
+  CHECK_CONTIGUOUS(net_mask_ignore_large);
+  auto        db             = placedb.db();
+  auto&       design         = db->design();
+  auto&       netlist        = design.topModuleInst()->netlist();
+  int32_t     num_nets       = netlist.numNets();
+  int32_t     vdd_vss_net_id = design.VddVssNetId();
+  auto const* ignore_large   = OPENPARF_TENSOR_DATA_PTR(net_mask_ignore_large, std::uint8_t);
+  auto        isClockNet     = [&placedb](int32_t net_id) {
+    return placedb.netIdToClockId(net_id) != InvalidIndex<database::PlaceDB::IndexType>::value;
+  };
+
+  num_insts_         = netlist.numInsts();
+  num_pins_          = netlist.numPins();
+  ignored_net_masks_ = at::zeros({num_nets}, at::TensorOptions().dtype(torch::kBool));
+  auto* ignored      = OPENPARF_TENSOR_DATA_PTR(ignored_net_masks_, bool);
+
+  // any cell connecting clock signals is identified as clock terminals.
+  is_clock_terminals_.assign(num_insts_, 0);
+  for (auto const& net_id : netlist.netIds()) {
+    if (isClockNet(net_id)) {
+      for (auto const& pin_id : netlist.net(net_id).pinIds()) {
+        is_clock_terminals_[netlist.pin(pin_id).instId()] = 1;
+      }
+    }
+  }
+
+  // timing arcs upon data path, sorted by source instance with a counting sort
+  std::vector<int32_t> net_driver_pin_ids(num_nets, std::numeric_limits<int32_t>::max());
+  out_arc_start_.assign(num_insts_ + 1, 0);
+  in_arc_start_.assign(num_insts_ + 1, 0);
+  for (auto const& net_id : netlist.netIds()) {
+    if (isClockNet(net_id) || net_id == vdd_vss_net_id || ignore_large[net_id] == 0) {
+      ignored[net_id] = true;
+      continue;
+    }
+    auto const& pin_ids       = netlist.net(net_id).pinIds();
+    int32_t&    driver_pin_id = net_driver_pin_ids[net_id];
+    for (auto const& pin_id : pin_ids) {
+      if (netlist.pin(pin_id).attr().signalDirect() == SignalDirection::kOutput) {
+        openparfAssert(driver_pin_id == std::numeric_limits<int32_t>::max());
+        driver_pin_id = pin_id;
+      }
+    }
+    openparfAssert(driver_pin_id != std::numeric_limits<int32_t>::max());
+    out_arc_start_[netlist.pin(driver_pin_id).instId() + 1] += pin_ids.size() - 1;
+    for (auto const& pin_id : pin_ids) {
+      if (pin_id != driver_pin_id) {
+        in_arc_start_[netlist.pin(pin_id).instId() + 1] += 1;
+      }
+    }
+  }
+  for (int32_t inst_id = 0; inst_id < num_insts_; ++inst_id) {
+    out_arc_start_[inst_id + 1] += out_arc_start_[inst_id];
+    in_arc_start_[inst_id + 1] += in_arc_start_[inst_id];
+  }
+  int32_t num_arcs = out_arc_start_.back();
+  arc_target_inst_ids_.resize(num_arcs);
+  arc_source_inst_ids_.resize(num_arcs);
+  arc_driver_pin_ids_.resize(num_arcs);
+  arc_sink_pin_ids_.resize(num_arcs);
+  in_arcs_.resize(num_arcs);
+  std::vector<int32_t> out_offsets(out_arc_start_.begin(), out_arc_start_.end() - 1);
+  std::vector<int32_t> in_offsets(in_arc_start_.begin(), in_arc_start_.end() - 1);
+  for (auto const& net_id : netlist.netIds()) {
+    if (ignored[net_id]) {
+      continue;
+    }
+    int32_t driver_pin_id  = net_driver_pin_ids[net_id];
+    int32_t source_inst_id = netlist.pin(driver_pin_id).instId();
+    for (auto const& pin_id : netlist.net(net_id).pinIds()) {
+      if (pin_id == driver_pin_id) {
+        continue;
+      }
+      int32_t target_inst_id                 = netlist.pin(pin_id).instId();
+      int32_t arc_id                         = out_offsets[source_inst_id]++;
+      arc_target_inst_ids_[arc_id]           = target_inst_id;
+      arc_source_inst_ids_[arc_id]           = source_inst_id;
+      arc_driver_pin_ids_[arc_id]            = driver_pin_id;
+      arc_sink_pin_ids_[arc_id]              = pin_id;
+      in_arcs_[in_offsets[target_inst_id]++] = arc_id;
+    }
+  }
+
+  // timing source = clock terminals + data input; timing terminal = clock terminals + data output
+  std::vector<uint8_t> is_timing_sources(num_insts_), is_timing_terminals(num_insts_);
+  for (int32_t inst_id = 0; inst_id < num_insts_; ++inst_id) {
+    is_timing_sources[inst_id] = is_clock_terminals_[inst_id] || in_arc_start_[inst_id] == in_arc_start_[inst_id + 1];
+    is_timing_terminals[inst_id] =
+            is_clock_terminals_[inst_id] || out_arc_start_[inst_id] == out_arc_start_[inst_id + 1];
+  }
+  levelize(
+          out_arc_start_, is_timing_sources, [&](int32_t i) { return arc_target_inst_ids_[i]; }, level_start_,
+          level_insts_, is_arrival_reached_);
+  levelize(
+          in_arc_start_, is_timing_terminals, [&](int32_t i) { return arc_source_inst_ids_[in_arcs_[i]]; },
+          reversed_level_start_, reversed_level_insts_, is_require_reached_);
+
+  auto setLevels = [&](std::vector<int32_t> const& start, std::vector<int32_t> const& insts,
+                       std::vector<int32_t>& inst_levels) {
+    inst_levels.assign(num_insts_, -1);
+    for (int32_t level = 0; level + 1 < (int32_t) start.size(); ++level) {
+      for (int32_t i = start[level]; i < start[level + 1]; ++i) {
+        inst_levels[insts[i]] = level;
+      }
+    }
+  };
+  setLevels(level_start_, level_insts_, inst_levels_);
+  setLevels(reversed_level_start_, reversed_level_insts_, inst_reversed_levels_);
+  sink_pin_arc_ids_.assign(num_pins_, -1);
+  for (int32_t arc_id = 0; arc_id < num_arcs; ++arc_id) {
+    sink_pin_arc_ids_[arc_sink_pin_ids_[arc_id]] = arc_id;
+  }
+}
+
+template<class T>
+void TimingGraph::propagate(T const* pin_delays,
+                            T*       pin_arrivals,
+                            T*       pin_requires,
+                            T*       inst_arrivals,
+                            T*       inst_requires,
+                            T        timing_period) const {
+  int32_t num_threads = std::max(at::get_num_threads(), 1);
+  std::fill(inst_arrivals, inst_arrivals + num_insts_, 0);
+  std::fill(inst_requires, inst_requires + num_insts_, std::numeric_limits<T>::max());
+
+  // arrivals: instances of a level only read arrivals of previous levels, and every driver pin and sink pin is
+  // written by the source instance of its arcs only
+  for (int32_t level = 0; level < numLevels(); ++level) {
+    int32_t begin = level_start_[level];
+    int32_t end   = level_start_[level + 1];
+#pragma omp parallel for num_threads(num_threads) schedule(dynamic, 64) if (end - begin >= kMinParallelLevelSize)
+    for (int32_t i = begin; i < end; ++i) {
+      int32_t u = level_insts_[i];
+      if (level > 0) {
+        T arrival = 0;
+        for (int32_t j = in_arc_start_[u]; j < in_arc_start_[u + 1]; ++j) {
+          int32_t arc_id = in_arcs_[j];
+          T       delay  = pin_delays[arc_sink_pin_ids_[arc_id]];
+          arrival        = std::max(arrival, inst_arrivals[arc_source_inst_ids_[arc_id]] + delay);
+        }
+        inst_arrivals[u] = arrival;
+      }
+      for (int32_t arc_id = out_arc_start_[u]; arc_id < out_arc_start_[u + 1]; ++arc_id) {
+        int32_t sink_pin_id                       = arc_sink_pin_ids_[arc_id];
+        pin_arrivals[arc_driver_pin_ids_[arc_id]] = inst_arrivals[u];
+        pin_arrivals[sink_pin_id]                 = inst_arrivals[u] + pin_delays[sink_pin_id];
+      }
+    }
+  }
+
+  // instance requires, level by level from the timing terminals
+  for (int32_t level = 0; level + 1 < (int32_t) reversed_level_start_.size(); ++level) {
+    int32_t begin = reversed_level_start_[level];
+    int32_t end   = reversed_level_start_[level + 1];
+#pragma omp parallel for num_threads(num_threads) schedule(dynamic, 64) if (end - begin >= kMinParallelLevelSize)
+    for (int32_t i = begin; i < end; ++i) {
+      int32_t u = reversed_level_insts_[i];
+      if (level == 0) {
+        inst_requires[u] = timing_period;
+        continue;
+      }
+      T require = std::numeric_limits<T>::max();
+      for (int32_t arc_id = out_arc_start_[u]; arc_id < out_arc_start_[u + 1]; ++arc_id) {
+        require = std::min(require,
+                           inst_requires[arc_target_inst_ids_[arc_id]] - pin_delays[arc_sink_pin_ids_[arc_id]]);
+      }
+      inst_requires[u] = require;
+    }
+  }
+
+  // pin requires of the arcs, grouped by source instance so that each driver pin is owned by one thread
+#pragma omp parallel for num_threads(num_threads) schedule(dynamic, 256)
+  for (int32_t u = 0; u < num_insts_; ++u) {
+    for (int32_t arc_id = out_arc_start_[u]; arc_id < out_arc_start_[u + 1]; ++arc_id) {
+      pin_requires[arc_driver_pin_ids_[arc_id]] = std::numeric_limits<T>::max();
+    }
+    for (int32_t arc_id = out_arc_start_[u]; arc_id < out_arc_start_[u + 1]; ++arc_id) {
+      int32_t target_inst_id = arc_target_inst_ids_[arc_id];
+      if (!is_require_reached_[target_inst_id]) {
+        continue;
+      }
+      int32_t driver_pin_id       = arc_driver_pin_ids_[arc_id];
+      int32_t sink_pin_id         = arc_sink_pin_ids_[arc_id];
+      pin_requires[sink_pin_id]   = inst_requires[target_inst_id];
+      pin_requires[driver_pin_id] = std::min(pin_requires[driver_pin_id],
+                                             inst_requires[target_inst_id] - pin_delays[sink_pin_id]);
+    }
+  }
+}
+
+template<class T>
+void TimingGraph::propagateIncremental(int32_t const* pin_ids, T const* delays, int32_t num_changed_pins) {
+  T*                                pin_delays    = OPENPARF_TENSOR_DATA_PTR(pin_delays_, T);
+  T*                                pin_arrivals  = OPENPARF_TENSOR_DATA_PTR(pin_arrivals_, T);
+  T*                                pin_requires  = OPENPARF_TENSOR_DATA_PTR(pin_requires_, T);
+  T*                                inst_arrivals = OPENPARF_TENSOR_DATA_PTR(inst_arrivals_, T);
+  T*                                inst_requires = OPENPARF_TENSOR_DATA_PTR(inst_requires_, T);
+  std::vector<std::vector<int32_t>> buckets;
+  std::vector<int32_t>              dirty_insts;
+  // sources and terminals (level 0) keep their times, unreached instances (level -1) are never timed
+  auto                              enqueue = [&](int32_t u, int32_t level) {
+    if (level > 0 && !is_queued_[u]) {
+      is_queued_[u] = 1;
+      buckets[level].push_back(u);
+    }
+  };
+  // instances with a changed out-arc get their driver pin requires recomputed at the end
+  auto markDirty = [&](int32_t u) {
+    if (!is_dirty_[u]) {
+      is_dirty_[u] = 1;
+      dirty_insts.push_back(u);
+    }
+  };
+  is_queued_.resize(num_insts_, 0);
+  is_dirty_.resize(num_insts_, 0);
+  num_updated_insts_ = 0;
+
+  // arrivals, in topological order from the targets of the changed arcs
+  buckets.assign(numLevels(), {});
+  for (int32_t i = 0; i < num_changed_pins; ++i) {
+    int32_t sink_pin_id     = pin_ids[i];
+    int32_t arc_id          = sink_pin_arc_ids_[sink_pin_id];
+    pin_delays[sink_pin_id] = delays[i];
+    if (arc_id < 0 || !is_arrival_reached_[arc_source_inst_ids_[arc_id]]) {
+      continue;
+    }
+    pin_arrivals[sink_pin_id] = inst_arrivals[arc_source_inst_ids_[arc_id]] + delays[i];
+    enqueue(arc_target_inst_ids_[arc_id], inst_levels_[arc_target_inst_ids_[arc_id]]);
+  }
+  for (int32_t level = 1; level < numLevels(); ++level) {
+    for (int32_t u : buckets[level]) {
+      is_queued_[u] = 0;
+      num_updated_insts_ += 1;
+      T arrival = 0;
+      for (int32_t j = in_arc_start_[u]; j < in_arc_start_[u + 1]; ++j) {
+        int32_t arc_id = in_arcs_[j];
+        T       delay  = pin_delays[arc_sink_pin_ids_[arc_id]];
+        arrival        = std::max(arrival, inst_arrivals[arc_source_inst_ids_[arc_id]] + delay);
+      }
+      if (arrival == inst_arrivals[u]) {
+        continue;
+      }
+      inst_arrivals[u] = arrival;
+      for (int32_t arc_id = out_arc_start_[u]; arc_id < out_arc_start_[u + 1]; ++arc_id) {
+        int32_t sink_pin_id                       = arc_sink_pin_ids_[arc_id];
+        pin_arrivals[arc_driver_pin_ids_[arc_id]] = arrival;
+        pin_arrivals[sink_pin_id]                 = arrival + pin_delays[sink_pin_id];
+        enqueue(arc_target_inst_ids_[arc_id], inst_levels_[arc_target_inst_ids_[arc_id]]);
+      }
+    }
+  }
+
+  // requires, in reversed topological order from the sources of the changed arcs
+  buckets.assign(reversed_level_start_.size() - 1, {});
+  for (int32_t i = 0; i < num_changed_pins; ++i) {
+    int32_t arc_id = sink_pin_arc_ids_[pin_ids[i]];
+    if (arc_id >= 0) {
+      markDirty(arc_source_inst_ids_[arc_id]);
+      enqueue(arc_source_inst_ids_[arc_id], inst_reversed_levels_[arc_source_inst_ids_[arc_id]]);
+    }
+  }
+  for (int32_t level = 1; level < (int32_t) buckets.size(); ++level) {
+    for (int32_t u : buckets[level]) {
+      is_queued_[u] = 0;
+      num_updated_insts_ += 1;
+      T require = std::numeric_limits<T>::max();
+      for (int32_t arc_id = out_arc_start_[u]; arc_id < out_arc_start_[u + 1]; ++arc_id) {
+        require = std::min(require,
+                           inst_requires[arc_target_inst_ids_[arc_id]] - pin_delays[arc_sink_pin_ids_[arc_id]]);
+      }
+      if (require == inst_requires[u]) {
+        continue;
+      }
+      inst_requires[u] = require;
+      for (int32_t j = in_arc_start_[u]; j < in_arc_start_[u + 1]; ++j) {
+        int32_t arc_id                          = in_arcs_[j];
+        pin_requires[arc_sink_pin_ids_[arc_id]] = require;
+        markDirty(arc_source_inst_ids_[arc_id]);
+        enqueue(arc_source_inst_ids_[arc_id], inst_reversed_levels_[arc_source_inst_ids_[arc_id]]);
+      }
+    }
+  }
+  for (int32_t u : dirty_insts) {
+    is_dirty_[u] = 0;
+    for (int32_t arc_id = out_arc_start_[u]; arc_id < out_arc_start_[u + 1]; ++arc_id) {
+      pin_requires[arc_driver_pin_ids_[arc_id]] = std::numeric_limits<T>::max();
+    }
+    for (int32_t arc_id = out_arc_start_[u]; arc_id < out_arc_start_[u + 1]; ++arc_id) {
+      int32_t target_inst_id = arc_target_inst_ids_[arc_id];
+      if (is_require_reached_[target_inst_id]) {
+        int32_t driver_pin_id       = arc_driver_pin_ids_[arc_id];
+        pin_requires[driver_pin_id] = std::min(pin_requires[driver_pin_id],
+                                               inst_requires[target_inst_id] - pin_delays[arc_sink_pin_ids_[arc_id]]);
+      }
+    }
+  }
+}
+
+std::tuple<at::Tensor, at::Tensor, at::Tensor> TimingGraph::forward(at::Tensor pin_delays,
+                                                                    double     timing_period) const {
+  CHECK_FLAT_CPU(pin_delays);
+  CHECK_CONTIGUOUS(pin_delays);
+  AT_ASSERTM(pin_delays.numel() == num_pins_, "pin_delays does not match the timing graph");
+  at::Tensor pin_arrivals  = at::zeros({num_pins_}, pin_delays.options());
+  at::Tensor pin_requires  = at::zeros({num_pins_}, pin_delays.options());
+  at::Tensor inst_arrivals = at::empty({num_insts_}, pin_delays.options());
+  at::Tensor inst_requires = at::empty({num_insts_}, pin_delays.options());
+  OPENPARF_DISPATCH_FLOATING_TYPES(pin_delays, "TimingGraph::forward", [&] {
+    propagate<scalar_t>(OPENPARF_TENSOR_DATA_PTR(pin_delays, scalar_t),
+                        OPENPARF_TENSOR_DATA_PTR(pin_arrivals, scalar_t),
+                        OPENPARF_TENSOR_DATA_PTR(pin_requires, scalar_t),
+                        OPENPARF_TENSOR_DATA_PTR(inst_arrivals, scalar_t),
+                        OPENPARF_TENSOR_DATA_PTR(inst_requires, scalar_t),
+                        timing_period);
+  });
+  return {pin_arrivals, pin_requires, ignored_net_masks_.clone()};
+}
+
+std::tuple<at::Tensor, at::Tensor, at::Tensor> TimingGraph::analyze(at::Tensor pin_delays, double timing_period) {
+  CHECK_FLAT_CPU(pin_delays);
+  CHECK_CONTIGUOUS(pin_delays);
+  AT_ASSERTM(pin_delays.numel() == num_pins_, "pin_delays does not match the timing graph");
+  pin_delays_    = pin_delays.clone();
+  pin_arrivals_  = at::zeros({num_pins_}, pin_delays.options());
+  pin_requires_  = at::zeros({num_pins_}, pin_delays.options());
+  inst_arrivals_ = at::empty({num_insts_}, pin_delays.options());
+  inst_requires_ = at::empty({num_insts_}, pin_delays.options());
+  OPENPARF_DISPATCH_FLOATING_TYPES(pin_delays, "TimingGraph::analyze", [&] {
+    propagate<scalar_t>(OPENPARF_TENSOR_DATA_PTR(pin_delays_, scalar_t),
+                        OPENPARF_TENSOR_DATA_PTR(pin_arrivals_, scalar_t),
+                        OPENPARF_TENSOR_DATA_PTR(pin_requires_, scalar_t),
+                        OPENPARF_TENSOR_DATA_PTR(inst_arrivals_, scalar_t),
+                        OPENPARF_TENSOR_DATA_PTR(inst_requires_, scalar_t),
+                        timing_period);
+  });
+  return {pin_arrivals_.clone(), pin_requires_.clone(), ignored_net_masks_.clone()};
+}
+
+std::tuple<at::Tensor, at::Tensor, at::Tensor> TimingGraph::update(at::Tensor pin_ids, at::Tensor pin_delays) {
+  AT_ASSERTM(pin_delays_.defined(), "TimingGraph::analyze must be called before TimingGraph::update");
+  CHECK_FLAT_CPU(pin_ids);
+  CHECK_CONTIGUOUS(pin_ids);
+  CHECK_TYPE(pin_ids, torch::kInt32);
+  CHECK_FLAT_CPU(pin_delays);
+  CHECK_CONTIGUOUS(pin_delays);
+  AT_ASSERTM(pin_delays.scalar_type() == pin_delays_.scalar_type(), "pin_delays must have the dtype of analyze");
+  AT_ASSERTM(pin_ids.numel() == pin_delays.numel(), "pin_ids and pin_delays must have the same size");
+  OPENPARF_DISPATCH_FLOATING_TYPES(pin_delays, "TimingGraph::update", [&] {
+    propagateIncremental<scalar_t>(OPENPARF_TENSOR_DATA_PTR(pin_ids, int32_t),
+                                   OPENPARF_TENSOR_DATA_PTR(pin_delays, scalar_t),
+                                   pin_ids.numel());
+  });
+  return {pin_arrivals_.clone(), pin_requires_.clone(), ignored_net_masks_.clone()};
+}
+
+template void TimingGraph::propagate<float>(float const*, float*, float*, float*, float*, float) const;
+template void TimingGraph::propagate<double>(double const*, double*, double*, double*, double*, double) const;
+template void TimingGraph::propagateIncremental<float>(int32_t const*, float const*, int32_t);
+template void TimingGraph::propagateIncremental<double>(int32_t const*, double const*, int32_t);
+
 #define REGISTER_KERNEL_LAUNCHER(T)                                                                                    \
   template void StaticTimingAnalysis<T>(const database::PlaceDB& placedb,                                              \
                                         T*                       pin_delays,                                           \
@@ -3,6 +3,7 @@
 
 // c++ libraries headers
 #include <tuple>
+#include <vector>
 
 // project headers
 #include "database/placedb.h"
@@ -18,6 +19,82 @@ std::tuple<at::Tensor, at::Tensor, at::Tensor> StaticTimingAnalysisForward(datab
                                                                            at::Tensor net_mask_ignore_large,
                                                                            double                   timing_period);
 
+/**
+ * @brief Persistent timing graph of the data path.
+ *  The graph, i.e., clock terminals, the timing arcs and their topological levels, only depends on the netlist and
+ *  the large-net mask, so it is built once and reused. Each forward only reads the pin delays and propagates the
+ *  arrival and required times level by level in parallel. The results are identical to `StaticTimingAnalysisForward`.
+ */
+class TimingGraph {
+ public:
+  TimingGraph(database::PlaceDB const& placedb, at::Tensor net_mask_ignore_large);
+
+  /// @brief return pin arrivals, pin requires and the ignored net masks (clock, VDD/VSS and large nets)
+  std::tuple<at::Tensor, at::Tensor, at::Tensor> forward(at::Tensor pin_delays, double timing_period) const;
+
+  /// @brief same as `forward`, but keeps the delays and the timing of the design for `update`
+  std::tuple<at::Tensor, at::Tensor, at::Tensor> analyze(at::Tensor pin_delays, double timing_period);
+
+  /// @brief set the delays of some sink pins and update the timing kept by the last `analyze`.
+  ///  Only the fan-out cones (arrivals) and the fan-in cones (requires) of the changed arcs are visited,
+  ///  and the propagation stops at instances whose times do not change. The results are identical to `analyze`.
+  std::tuple<at::Tensor, at::Tensor, at::Tensor> update(at::Tensor pin_ids, at::Tensor pin_delays);
+
+  int32_t numArcs() const { return arc_sink_pin_ids_.size(); }
+  int32_t numLevels() const { return level_start_.size() - 1; }
+  /// @brief number of instances whose times were recomputed by the last `update`
+  int32_t numUpdatedInsts() const { return num_updated_insts_; }
+
+ private:
+  template<class T>
+  void propagate(T const* pin_delays,
+                 T*       pin_arrivals,
+                 T*       pin_requires,
+                 T*       inst_arrivals,
+                 T*       inst_requires,
+                 T        timing_period) const;
+
+  template<class T>
+  void propagateIncremental(int32_t const* pin_ids, T const* delays, int32_t num_changed_pins);
+
+  int32_t              num_insts_;
+  int32_t              num_pins_;
+  at::Tensor           ignored_net_masks_;
+  std::vector<uint8_t> is_clock_terminals_;
+  /// out-arcs of instances in CSR format, arcs are sorted by source instance
+  std::vector<int32_t> out_arc_start_;
+  std::vector<int32_t> arc_target_inst_ids_;
+  std::vector<int32_t> arc_driver_pin_ids_;
+  std::vector<int32_t> arc_sink_pin_ids_;
+  /// in-arcs of instances in CSR format, storing arc indices
+  std::vector<int32_t> in_arc_start_;
+  std::vector<int32_t> in_arcs_;
+  std::vector<int32_t> arc_source_inst_ids_;
+  /// instances reached by arrival propagation grouped by topological level
+  std::vector<int32_t> level_start_;
+  std::vector<int32_t> level_insts_;
+  std::vector<uint8_t> is_arrival_reached_;
+  /// instances reached by required-time propagation grouped by reversed topological level
+  std::vector<int32_t> reversed_level_start_;
+  std::vector<int32_t> reversed_level_insts_;
+  std::vector<uint8_t> is_require_reached_;
+  /// level of each instance in arrival/required-time propagation, -1 if it is not reached
+  std::vector<int32_t> inst_levels_;
+  std::vector<int32_t> inst_reversed_levels_;
+  /// timing arc of each sink pin, -1 if the pin is not the sink of any arc
+  std::vector<int32_t> sink_pin_arc_ids_;
+
+  /// state of the last `analyze` for `update`
+  at::Tensor           pin_delays_;
+  at::Tensor           pin_arrivals_;
+  at::Tensor           pin_requires_;
+  at::Tensor           inst_arrivals_;
+  at::Tensor           inst_requires_;
+  std::vector<uint8_t> is_queued_;
+  std::vector<uint8_t> is_dirty_;
+  int32_t              num_updated_insts_ = 0;
+};
+
 }   // namespace static_timing_analysis
 
 OPENPARF_END_NAMESPACE
@@ -4,4 +4,18 @@ PYBIND11_MODULE(TORCH_EXTENSION_NAME, m) {
   m.def("forward",
         &OPENPARF_NAMESPACE::static_timing_analysis::StaticTimingAnalysisForward,
         "Static Timing Analysis Forward");
-}
\ No newline at end of file
+  py::class_<OPENPARF_NAMESPACE::static_timing_analysis::TimingGraph>(m, "TimingGraph")
+          .def(py::init<OPENPARF_NAMESPACE::database::PlaceDB const &, at::Tensor>())
+          .def("forward",
+               &OPENPARF_NAMESPACE::static_timing_analysis::TimingGraph::forward,
+               "Static Timing Analysis Forward on the persistent timing graph")
+          .def("analyze",
+               &OPENPARF_NAMESPACE::static_timing_analysis::TimingGraph::analyze,
+               "Static Timing Analysis Forward, keeping the timing for incremental updates")
+          .def("update",
+               &OPENPARF_NAMESPACE::static_timing_analysis::TimingGraph::update,
+               "Incremental Static Timing Analysis on the changed pin delays")
+          .def("num_arcs", &OPENPARF_NAMESPACE::static_timing_analysis::TimingGraph::numArcs)
+          .def("num_levels", &OPENPARF_NAMESPACE::static_timing_analysis::TimingGraph::numLevels)
+          .def("num_updated_insts", &OPENPARF_NAMESPACE::static_timing_analysis::TimingGraph::numUpdatedInsts);
+}
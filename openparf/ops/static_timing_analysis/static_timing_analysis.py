@@ -1,7 +1,12 @@
+import logging
+
+import torch
 from torch import nn
 
 from . import static_timing_analysis_cpp
 
+logger = logging.getLogger(__name__)
+
 
 class StaticTimingAnalysis(nn.Module):
     def __init__(self, placedb, data_cls, timing_period):
@@ -9,11 +14,35 @@ class StaticTimingAnalysis(nn.Module):
         self.placedb = placedb
         self.data_cls = data_cls
         self.timing_period = timing_period
+        # the timing graph only depends on the netlist, build it at the first call and reuse it
+        self.timing_graph = None
 
     def forward(self, pin_delays):
-        device = pin_delays.device
-        pin_arrivals, pin_requires, ignored_net_masks = static_timing_analysis_cpp.forward(
-            self.placedb, pin_delays.cpu(), self.data_cls.net_mask_ignore_large.cpu(), self.timing_period)
+        results = self._graph().forward(pin_delays.cpu().contiguous(), self.timing_period)
+        return self._to_device(results, pin_delays.device)
+
+    def analyze(self, pin_delays):
+        """Same as forward, but keeps the timing of the design for `update`"""
+        results = self._graph().analyze(pin_delays.cpu().contiguous(), self.timing_period)
+        return self._to_device(results, pin_delays.device)
+
+    def update(self, pin_ids, pin_delays):
+        """Set the delays of some sink pins and only re-time their fan-in and fan-out cones.
+
+        :param pin_ids: ids of the pins whose delays change
+        :param pin_delays: new delays of these pins
+        """
+        results = self.timing_graph.update(pin_ids.int().cpu().contiguous(), pin_delays.cpu().contiguous())
+        return self._to_device(results, pin_delays.device)
+
+    def _graph(self):
+        if self.timing_graph is None:
+            self.timing_graph = static_timing_analysis_cpp.TimingGraph(
+                self.placedb, self.data_cls.net_mask_ignore_large.cpu().contiguous())
+        return self.timing_graph
+
+    def _to_device(self, results, device):
+        pin_arrivals, pin_requires, ignored_net_masks = results
         pin_slacks = pin_requires - pin_arrivals
         if pin_arrivals.device != device:
             pin_arrivals = pin_arrivals.to(device)
@@ -21,6 +50,61 @@ class StaticTimingAnalysis(nn.Module):
             pin_requires = pin_requires.to(device)
         if pin_slacks.device != device:
             pin_slacks = pin_slacks.to(device)
-        if ignored_net_masks != device:
+        if ignored_net_masks.device != device:
             ignored_net_masks = ignored_net_masks.to(device)
         return pin_arrivals, pin_requires, pin_slacks, ignored_net_masks
+
+
+class IncrementalTimingAnalysis(nn.Module):
+    """Delay estimation followed by static timing analysis, driven by instance movement.
+
+    Instances are compared against their positions at the time their delays were last estimated. Only the nets of
+    instances that moved more than `move_threshold` are re-estimated, and only the cones of the changed pins are
+    re-timed. A full analysis is run at the first call and when more than `max_moved_ratio` of the instances moved.
+    Fillers, which come after the `num_insts` instances of the design in the positions, are ignored.
+    """
+
+    def __init__(self, estimate_delay_op, static_timing_op, num_insts, incremental_flag=True, move_threshold=0.5,
+                 max_moved_ratio=0.2):
+        super(IncrementalTimingAnalysis, self).__init__()
+        self.estimate_delay_op = estimate_delay_op
+        self.static_timing_op = static_timing_op
+        self.num_insts = num_insts
+        self.incremental_flag = incremental_flag
+        self.move_threshold = move_threshold
+        self.max_moved_ratio = max_moved_ratio
+        self.reset()
+
+    def reset(self):
+        """Run a full analysis at the next call"""
+        self.anchor_pos = None
+        self.results = None
+
+    def forward(self, pos):
+        """
+        :param pos: instance positions, possibly followed by fillers
+        :return: pin arrivals, pin requires, pin slacks and ignored net masks, as `StaticTimingAnalysis`
+        """
+        with torch.no_grad():
+            xy = pos.data.view(-1, 2)[:self.num_insts]
+            if not self.incremental_flag or self.anchor_pos is None:
+                return self._analyze(pos, xy)
+            moved = (xy - self.anchor_pos).abs().max(dim=1)[0] > self.move_threshold
+            num_moved = int(moved.sum())
+            if num_moved > self.max_moved_ratio * moved.numel():
+                return self._analyze(pos, xy)
+            if num_moved == 0:
+                return self.results
+            self.anchor_pos[moved] = xy[moved]
+            pin_ids, pin_delays = self.estimate_delay_op.update(pos, moved)
+            self.results = self.static_timing_op.update(pin_ids, pin_delays)
+            logger.debug(
+                "incremental timing: %d moved instances, %d pins re-estimated, %d instances re-timed"
+                % (num_moved, pin_ids.numel(), self.static_timing_op.timing_graph.num_updated_insts()))
+            return self.results
+
+    def _analyze(self, pos, xy):
+        pin_delays, ignore_pin_masks = self.estimate_delay_op(pos)
+        self.results = self.static_timing_op.analyze(pin_delays)
+        self.anchor_pos = xy.clone()
+        return self.results
@@ -108,13 +108,20 @@ class WAWL(nn.Module):
         self.gamma = gamma
 
     def forward(self, pos):
+        net_weights = self.net_weights
+        inv_gamma = 1.0 / self.gamma  # do not store inv_gamma as gamma is changing
+        # pin positions may be in a lower precision than the net weights,
+        # e.g., in mixed-precision global placement
+        if net_weights.dtype != pos.dtype:
+            net_weights = net_weights.to(pos.dtype)
+            inv_gamma = inv_gamma.to(pos.dtype)
         return WAWLFunction.apply(
             pos,
             self.flat_netpin,
             self.netpin_start,
             self.pin2net_map,
-            self.net_weights,
+            net_weights,
             self.net_mask,
             self.pin_mask,
-            1.0 / self.gamma  # do not store inv_gamma as gamma is changing
+            inv_gamma
         )
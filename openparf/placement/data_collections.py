@@ -125,6 +125,15 @@ numpy2torch_type_map = {
 }
 
 
+def vector2tensor(vec, dtype, device):
+    """Convert a vector bound from C++ to a tensor without going through a python list.
+    The numpy view of the vector is copied once into memory owned by the tensor,
+    so in-place updates of the tensor never modify the database.
+    """
+    array = np.array(vec.numpy(), dtype=torch2numpy_type_map[dtype])
+    return torch.from_numpy(array).to(device)
+
+
 class DataCollections(object):
     """A collection of all data tensors"""
 
@@ -150,30 +159,32 @@ class DataCollections(object):
             #                "area type must be sorted in a way that zero movable area should appear at the end"
             #        self.num_area_types = area_type + 1
             total_movable_areas = np.array(
-                placedb.totalMovableInstAreas().tolist(), dtype=ntype
+                placedb.totalMovableInstAreas().numpy(), dtype=ntype
             )
             self.total_movable_areas = torch.from_numpy(total_movable_areas).to(device)
             # 1 for area type with movable types, 0 for without
             # record the area types we really care
             self.area_type_mask = self.total_movable_areas > 0
-            total_fixed_areas = np.array(placedb.totalFixedInstAreas(), dtype=ntype)
+            total_fixed_areas = np.array(
+                placedb.totalFixedInstAreas().numpy(), dtype=ntype
+            )
             self.total_fixed_areas = torch.from_numpy(total_fixed_areas).to(device)
             self.movable_range = placedb.movableRange()
             self.fixed_range = placedb.fixedRange()
             self.filler_range = None
             # bin maps
-            self.bin_map_dims = np.array(placedb.binMapDims().tolist(), dtype=np.int32)
-            self.bin_map_sizes = np.array(placedb.binMapSizes().tolist(), dtype=ntype)
+            self.bin_map_dims = np.array(placedb.binMapDims().numpy(), dtype=np.int32)
+            self.bin_map_sizes = np.array(placedb.binMapSizes().numpy(), dtype=ntype)
             self.initial_density_maps = [None] * placedb.numAreaTypes()
             self.total_filler_areas = np.zeros_like(total_movable_areas)
             self.filler_sizes = np.zeros([placedb.numAreaTypes(), 2], dtype=ntype)
             self.num_fillers = np.zeros(placedb.numAreaTypes(), dtype=np.int32)
-            inst_sizes = np.array(placedb.instSizes().tolist(), dtype=ntype).reshape(
+            inst_sizes = np.array(placedb.instSizes().numpy(), dtype=ntype).reshape(
                 [placedb.numInsts(), -1, 2]
             )
             self.area_type_inst_groups = [
-                np.array(x, dtype=np.int32)
-                for x in placedb.areaTypeInstGroups().tolist()
+                np.array(x.numpy(), dtype=np.int32)
+                for x in placedb.areaTypeInstGroups()
             ]
             self.num_insts = np.array(
                 [len(x) for x in self.area_type_inst_groups], dtype=np.int32
@@ -182,7 +193,7 @@ class DataCollections(object):
             for area_type in range(placedb.numAreaTypes()):
                 if total_movable_areas[area_type] > 0:
                     bin_capacity_map = np.array(
-                        placedb.binCapacityMap(area_type).tolist(), dtype=ntype
+                        placedb.binCapacityMap(area_type).numpy(), dtype=ntype
                     )
                     bin_size = placedb.binMapSize(area_type)
                     bin_area = bin_size.product()
@@ -230,9 +241,7 @@ class DataCollections(object):
                 self.fixed_range[1] + self.num_fillers.sum(),
             )
             # centers for movable and fixed instances
-            self.inst_locs_xyz = torch.tensor(
-                placedb.instLocs().tolist(), dtype=ttype, device=device
-            )
+            self.inst_locs_xyz = vector2tensor(placedb.instLocs(), ttype, device)
             self.inst_sizes = torch.zeros(
                 [self.filler_range[1], placedb.numAreaTypes(), 2],
                 dtype=ttype,
@@ -242,9 +251,7 @@ class DataCollections(object):
             #                                   dtype=torch.uint8,
             #                                   device=device)
             self.inst_sizes[self.movable_range[0] : self.fixed_range[1]].copy_(
-                torch.tensor(
-                    placedb.instSizes().tolist(), dtype=ttype, device=device
-                ).view(placedb.numInsts(), placedb.numAreaTypes(), 2)
+                torch.from_numpy(inst_sizes)
             )
             # self.inst_area_types[self.movable_range[0]:self.
             #                     fixed_range[1]].copy_(
@@ -273,18 +280,29 @@ class DataCollections(object):
                     .long()
                     .to(device)
                 )
+            # flattened segments of area_type_inst_groups for segmented reductions,
+            # i.e., area_type_inst_group_ids[i] belongs to area type area_type_inst_group_segments[i].
+            # An instance appears once for each area type it belongs to.
+            self.area_type_inst_group_ids = torch.cat(self.area_type_inst_groups)
+            self.area_type_inst_group_segments = torch.cat(
+                [
+                    torch.full_like(x, area_type)
+                    for area_type, x in enumerate(self.area_type_inst_groups)
+                ]
+            )
+            self.area_type_inst_group_counts = torch.tensor(
+                [len(x) for x in self.area_type_inst_groups],
+                dtype=torch.long,
+                device=device,
+            )
             # a long type variable for torch functions
             # self.inst_area_types_long = self.inst_area_types.long()
             self.inst_areas = self.inst_sizes[..., 0] * self.inst_sizes[..., 1]
             # maximum instance sizes across all area types
             self.inst_sizes_max, _ = self.inst_sizes.max(dim=1)
 
-            self.is_inst_luts = torch.tensor(
-                placedb.isInstLUTs().tolist(), dtype=torch.uint8, device=device
-            )
-            self.is_inst_ffs = torch.tensor(
-                placedb.isInstFFs().tolist(), dtype=torch.uint8, device=device
-            )
+            self.is_inst_luts = vector2tensor(placedb.isInstLUTs(), torch.uint8, device)
+            self.is_inst_ffs = vector2tensor(placedb.isInstFFs(), torch.uint8, device)
 
             # Find the unique clock net for each instance.
             # If None, use `-1` to indicate the such instance is not connected to any clock net/signal.
@@ -322,58 +340,38 @@ class DataCollections(object):
             # net/signal.
             assert self.movable_range[1] == self.fixed_range[0]
 
-            self.inst_model_ids = torch.tensor(
-                placedb.getInstModelIds().tolist(), dtype=torch.int32, device=device
+            self.inst_model_ids = vector2tensor(
+                placedb.getInstModelIds(), torch.int32, device
             )
 
             # self.inst_resource_categories = torch.tensor(placedb.instResourceCategories().tolist(),
             #        dtype=torch.uint8,
             #        device=device)
-            self.resource_categories = torch.tensor(
-                placedb.resourceCategories().tolist(), dtype=torch.uint8, device=device
+            self.resource_categories = vector2tensor(
+                placedb.resourceCategories(), torch.uint8, device
             )
 
-            self.pin_offsets = torch.tensor(
-                placedb.pinOffsets().tolist(), dtype=ttype, device=device
-            )
+            self.pin_offsets = vector2tensor(placedb.pinOffsets(), ttype, device)
             # no longer need pin offsets
             self.pin_offsets.zero_()
-            self.pin_signal_directs = torch.tensor(
-                placedb.pinSignalDirects().tolist(), dtype=torch.uint8, device=device
-            )
-            self.pin_signal_types = torch.tensor(
-                placedb.pinSignalTypes().tolist(), dtype=torch.uint8, device=device
+            self.pin_signal_directs = vector2tensor(
+                placedb.pinSignalDirects(), torch.uint8, device
             )
-            self.net_weights = torch.tensor(
-                placedb.netWeights(), dtype=ttype, device=device
+            self.pin_signal_types = vector2tensor(
+                placedb.pinSignalTypes(), torch.uint8, device
             )
+            self.net_weights = vector2tensor(placedb.netWeights(), ttype, device)
             # bidirectional mapping between nodes and pins
             self.inst_pin_map = A2MultiBMap(
-                torch.tensor(
-                    placedb.instPins().data().tolist(), dtype=torch.int32, device=device
-                ),
-                torch.tensor(
-                    placedb.instPins().indexBeginData().tolist(),
-                    dtype=torch.int32,
-                    device=device,
-                ),
-                torch.tensor(
-                    placedb.pin2Inst().tolist(), dtype=torch.int32, device=device
-                ),
+                vector2tensor(placedb.instPins().data(), torch.int32, device),
+                vector2tensor(placedb.instPins().indexBeginData(), torch.int32, device),
+                vector2tensor(placedb.pin2Inst(), torch.int32, device),
             )
             # bidirectional mapping between nets and pins
             self.net_pin_map = A2MultiBMap(
-                torch.tensor(
-                    placedb.netPins().data().tolist(), dtype=torch.int32, device=device
-                ),
-                torch.tensor(
-                    placedb.netPins().indexBeginData().tolist(),
-                    dtype=torch.int32,
-                    device=device,
-                ),
-                torch.tensor(
-                    placedb.pin2Net().tolist(), dtype=torch.int32, device=device
-                ),
+                vector2tensor(placedb.netPins().data(), torch.int32, device),
+                vector2tensor(placedb.netPins().indexBeginData(), torch.int32, device),
+                vector2tensor(placedb.pin2Net(), torch.int32, device),
             )
 
             self.net_mask = torch.ones(
@@ -405,8 +403,8 @@ class DataCollections(object):
             # self.ff_ctrlsets, self.ff_ctrlsets_cksr_size, self.ff_ctrlsets_ce_size = self.compute_ff_ctrlsets(placedb, device)
 
             # site related
-            self.site_bboxes = torch.tensor(
-                placedb.collectFlattenSiteBoxes(), dtype=ttype, device=device
+            self.site_bboxes = vector2tensor(
+                placedb.collectFlattenSiteBoxes(), ttype, device
             ).view([-1, 4])
             self.site_map_dim = (
                 placedb.siteMapDim().width(),
@@ -420,16 +418,12 @@ class DataCollections(object):
             )
             for resource in range(placedb.numResources()):
                 if placedb.isResourceLUT(resource):
-                    self.site_lut_capacities += torch.tensor(
-                        placedb.collectSiteCapacities(resource).tolist(),
-                        dtype=torch.int32,
-                        device=device,
+                    self.site_lut_capacities += vector2tensor(
+                        placedb.collectSiteCapacities(resource), torch.int32, device
                     )
                 if placedb.isResourceFF(resource):
-                    self.site_ff_capacities += torch.tensor(
-                        placedb.collectSiteCapacities(resource).tolist(),
-                        dtype=torch.int32,
-                        device=device,
+                    self.site_ff_capacities += vector2tensor(
+                        placedb.collectSiteCapacities(resource), torch.int32, device
                     )
             # target density
             self.target_density = torch.tensor(
@@ -476,19 +470,11 @@ class DataCollections(object):
             # shape alignment database
             if params.align_shape_flag:
                 self.shape_inst_map = A2MultiBMap(
-                    torch.tensor(
-                        placedb.shapeInsts().data().tolist(),
-                        dtype=torch.int32,
-                        device=device,
-                    ),
-                    torch.tensor(
-                        placedb.shapeInsts().indexBeginData().tolist(),
-                        dtype=torch.int32,
-                        device=device,
-                    ),
-                    torch.tensor(
-                        placedb.inst2Shape().tolist(), dtype=torch.int32, device=device
+                    vector2tensor(placedb.shapeInsts().data(), torch.int32, device),
+                    vector2tensor(
+                        placedb.shapeInsts().indexBeginData(), torch.int32, device
                     ),
+                    vector2tensor(placedb.inst2Shape(), torch.int32, device),
                 )
             else:
                 self.shape_inst_map = None
@@ -496,22 +482,14 @@ class DataCollections(object):
             # region alignment database
             if params.align_region_flag:
                 self.region_inst_map = A2MultiBMap(
-                    torch.tensor(
-                        placedb.regionInsts().data().tolist(),
-                        dtype=torch.int32,
-                        device=device,
-                    ),
-                    torch.tensor(
-                        placedb.regionInsts().indexBeginData().tolist(),
-                        dtype=torch.int32,
-                        device=device,
-                    ),
-                    torch.tensor(
-                        placedb.inst2Region().tolist(), dtype=torch.int32, device=device
+                    vector2tensor(placedb.regionInsts().data(), torch.int32, device),
+                    vector2tensor(
+                        placedb.regionInsts().indexBeginData(), torch.int32, device
                     ),
+                    vector2tensor(placedb.inst2Region(), torch.int32, device),
                 )
-                self.region_boxes = torch.tensor(
-                    placedb.collectFlattenRegionBoxes(), dtype=dtype, device=device
+                self.region_boxes = vector2tensor(
+                    placedb.collectFlattenRegionBoxes(), ttype, device
                 ).reshape([-1, 4])
             else:
                 self.region_inst_map = None
@@ -524,23 +502,15 @@ class DataCollections(object):
                 )
                 cla_ids, lut_ids = chain_info_cpp.MakeNestedNewIdx(self.chain_info_vec)
                 self.chain_cla_ids = Nested2DVector(
-                    bs=torch.tensor(
-                        cla_ids.data().tolist(), dtype=torch.int32, device=device
-                    ),
-                    b_starts=torch.tensor(
-                        cla_ids.indexBeginData().tolist(),
-                        dtype=torch.int32,
-                        device=device,
+                    bs=vector2tensor(cla_ids.data(), torch.int32, device),
+                    b_starts=vector2tensor(
+                        cla_ids.indexBeginData(), torch.int32, device
                     ),
                 )
                 self.chain_lut_ids = Nested2DVector(
-                    bs=torch.tensor(
-                        lut_ids.data().tolist(), dtype=torch.int32, device=device
-                    ),
-                    b_starts=torch.tensor(
-                        lut_ids.indexBeginData().tolist(),
-                        dtype=torch.int32,
-                        device=device,
+                    bs=vector2tensor(lut_ids.data(), torch.int32, device),
+                    b_starts=vector2tensor(
+                        lut_ids.indexBeginData(), torch.int32, device
                     ),
                 )
             else:
@@ -559,13 +529,9 @@ class DataCollections(object):
                     self.ssr_chain_info_vec
                 )
                 self.ssr_chain_ids = Nested2DVector(
-                    bs=torch.tensor(
-                        ssr_chain_ids.data().tolist(), dtype=torch.int32, device=device
-                    ),
-                    b_starts=torch.tensor(
-                        ssr_chain_ids.indexBeginData().tolist(),
-                        dtype=torch.int32,
-                        device=device,
+                    bs=vector2tensor(ssr_chain_ids.data(), torch.int32, device),
+                    b_starts=vector2tensor(
+                        ssr_chain_ids.indexBeginData(), torch.int32, device
                     ),
                 )
             else:
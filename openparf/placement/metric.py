@@ -99,6 +99,9 @@ class EvalMetric(object):
         self.current_grad = None
         self.at_avg_grad_norms = None
         self.backtrack_cnt = None
+        # iteration at which hpwl/overflow were evaluated,
+        # which lags behind opt_iter when the evaluation is strided
+        self.eval_iteration = None
 
     def __str__(self):
         """
@@ -197,15 +200,28 @@ class EvalMetric(object):
                 self.objective = obj.data
             if "density" in ops:
                 self.density = ops["density"](var).data
-            if self.current_grad is not None:
-                self.at_avg_grad_norms = []
-                for at_type in range(data_cls.num_area_types):
-                    at_grad = self.current_grad[data_cls.area_type_inst_groups[at_type]]
-                    if at_grad.size()[0] > 0:
-                        avg_at_grad_norm = at_grad.norm(dim=1).mean().item()
-                    else:
-                        avg_at_grad_norm = 0
-                    self.at_avg_grad_norms.append(avg_at_grad_norm)
+            if self.current_grad is not None and "area_type_grad_norm" in ops:
+                # average L2 norm of the instance gradients per area type, 0 for empty ones
+                self.at_avg_grad_norms = ops["area_type_grad_norm"](
+                    self.current_grad, p=2, average=True
+                ).tolist()
             # if "fence_region" in ops:
             #     self.fence_region = ops["fence_region"](var).sum()
         self.eval_time = time.time() - tt
+        self.eval_iteration = self.opt_iter.iteration
+
+    def inherit_evaluation(self, other):
+        """
+        @brief reuse the evaluated metrics of an earlier step, so that
+            steps skipped by strided evaluation still carry the latest available metrics
+        @param other an evaluated metric
+        """
+        self.overflow = other.overflow
+        self.hpwl = other.hpwl
+        self.wirelength = other.wirelength
+        self.density = other.density
+        self.at_avg_grad_norms = other.at_avg_grad_norms
+        self.ck_illegal_insts_num = other.ck_illegal_insts_num
+        self.movable_insts_num = other.movable_insts_num
+        self.cr_max_displacement = other.cr_max_displacement
+        self.eval_iteration = other.eval_iteration
@@ -24,7 +24,6 @@ import logging
 import math
 import numpy as np
 import torch
-# from hummingbird.ml import convert, load
 
 from ..ops.direct_lg import direct_lg
 from ..ops.electric_potential import electric_potential
@@ -60,6 +59,8 @@ from ..ops.static_timing_analysis import static_timing_analysis
 # from ..ops.congestion_prediction import congestion_prediction
 from ..ops.masked_direct_lg import masked_direct_lg
 from ..ops.ssr_abacus_lg import ssr_abacus_lg
+from ..py_utils.tracer import TracedOp
+from ..py_utils.workspace import Workspace
 
 logger = logging.getLogger(__name__)
 
@@ -112,7 +113,17 @@ def build_stable_zero_div_op():
     return stable_div.StableZeroDiv()
 
 
-def build_electric_potential_op(params, placedb, data_cls):
+def gp_compute_dtype(params, data_cls):
+    """Dtype of the wirelength and density ops in global placement.
+    The mixed-precision mode computes them in float32,
+    while positions and the optimizer stay in params.dtype.
+    """
+    if params.gp_mixed_precision_flag:
+        return torch.float32
+    return data_cls.inst_sizes.dtype
+
+
+def build_electric_potential_op(params, placedb, data_cls, workspace=None):
     """Electric potential"""
     return electric_potential.ElectricPotential(
         inst_sizes=data_cls.inst_sizes,
@@ -135,6 +146,10 @@ def build_electric_potential_op(params, placedb, data_cls):
         movable_macro_mask=None,
         fast_mode=False,
         xy_ratio=params.wirelength_weights[0] / params.wirelength_weights[1],
+        compute_dtype=gp_compute_dtype(params, data_cls),
+        dct_backend=params.dct_backend or "fft",
+        spectral_energy_flag=bool(params.gp_spectral_energy_flag),
+        workspace=workspace,
     )
 
 
@@ -198,6 +213,34 @@ def build_precond_op(params, placedb, data_cls):
     return precond_op
 
 
+def build_area_type_grad_norm_op(params, placedb, data_cls):
+    """Per-area-type norms of a gradient in one segmented reduction.
+    Each instance contributes the p-norm of its gradient to every area type
+    it belongs to, so with p=1 the sum of area type `at` equals
+    grad[area_type_inst_groups[at]].norm(p=1).
+    """
+    inst_ids = data_cls.area_type_inst_group_ids
+    segments = data_cls.area_type_inst_group_segments
+    counts = data_cls.area_type_inst_group_counts
+
+    def area_type_grad_norm_op(grad, p=1, average=False):
+        """
+        :param grad: gradient of shape (#instances, 2)
+        :param p: order of the per-instance norm
+        :param average: average over the instances of each area type instead of sum;
+            empty area types get 0
+        :return: tensor of shape (#area types,)
+        """
+        with torch.no_grad():
+            norms = grad.view([-1, 2]).index_select(0, inst_ids).norm(p=p, dim=1)
+            res = grad.new_zeros(data_cls.num_area_types).index_add_(0, segments, norms)
+            if average:
+                res.div_(counts.clamp(min=1).to(res.dtype))
+            return res
+
+    return area_type_grad_norm_op
+
+
 def build_direct_lg_op(params, placedb, data_cls):
     """Legalize LUTs and FFs"""
     return direct_lg.DirectLegalize(placedb=placedb, params=params)
@@ -220,7 +263,7 @@ def build_ism_dp_op(params, placedb, data_cls):
     )
 
 
-def build_rudy_op(params, data_cls):
+def build_rudy_op(params, data_cls, workspace=None):
     return rudy.Rudy(
         netpin_start=data_cls.net_pin_map.b_starts,
         flat_netpin=data_cls.net_pin_map.bs,
@@ -240,6 +283,10 @@ def build_rudy_op(params, data_cls):
         deterministic_flag=params.deterministic_flag,
         initial_horizontal_utilization_map=None,
         initial_vertical_utilization_map=None,
+        incremental_flag=params.rudy_incremental_flag,
+        bbox_tolerance=params.rudy_bbox_tolerance,
+        rebuild_interval=params.rudy_rebuild_interval,
+        workspace=workspace,
     )
 
 def build_net_density_op(params, data_cls):
@@ -262,7 +309,7 @@ def build_net_density_op(params, data_cls):
         initial_vertical_net_density_map=None,
     )
 
-def build_pin_utilization_op(params, data_cls):
+def build_pin_utilization_op(params, data_cls, workspace=None):
     instpin_start = data_cls.inst_pin_map.b_starts
     # Derived from elfplace implementation in elfplace. Since control set pins(e.g., CK/CR/CE) in
     # FFs can be largely shared, it is almost always an overestimation of using FF's pin count
@@ -290,6 +337,7 @@ def build_pin_utilization_op(params, data_cls):
         unit_pin_capacity=params.unit_pin_capacity,
         pin_stretch_ratio=params.pin_stretch_ratio,
         deterministic_flag=params.deterministic_flag,
+        workspace=workspace,
     )
 
 
@@ -519,7 +567,18 @@ def build_align_region_op(params, placedb, data_cls):
 
 def build_estimate_delay_op(params, data_cls, placedb):
     delay_model_path = params.delay_model_path
-    delay_model = load(delay_model_path)
+    if delay_model_path.endswith((".pt", ".pth")):
+        delay_model = torch.load(delay_model_path, map_location="cpu")
+    else:
+        from hummingbird.ml import load
+
+        delay_model = load(delay_model_path)
+        if params.delay_model_tabulate_flag:
+            delay_model = delay_estimation.TabulatedDelayModel.from_model(
+                delay_model,
+                site_map_width=placedb.siteMapDim().x(),
+                num_dy=placedb.siteMapDim().y() + 1,
+            )
     return delay_estimation.DelayEstimation(
         placedb=placedb, data_cls=data_cls, delay_model=delay_model
     )
@@ -531,6 +590,18 @@ def build_static_timing_op(params, data_cls, placedb):
         placedb=placedb, data_cls=data_cls, timing_period=timing_period
     )
 
+def build_timing_op(params, placedb, estimate_delay_op, static_timing_op):
+    """delay estimation and static timing analysis, re-timing only the cones of moved instances"""
+    return static_timing_analysis.IncrementalTimingAnalysis(
+        estimate_delay_op=estimate_delay_op,
+        static_timing_op=static_timing_op,
+        num_insts=placedb.numInsts(),
+        incremental_flag=params.timing_incremental_flag,
+        move_threshold=params.timing_incremental_move_threshold,
+        max_moved_ratio=params.timing_incremental_max_moved_ratio,
+    )
+
+
 def build_graph_builder_op(params, data_cls):
     return graph_builder.GraphBuilder(
         # todo: check num_inst is correct or not
@@ -591,7 +662,11 @@ def build_mixed_abacus_lg_op(params, data_cls, placedb):
             )
         ]
         legalizer = mixed_abacus_lg.MixedAbacusLegalizer(
-            placedb, data_cls, movable_inst_ids, at_id
+            placedb,
+            data_cls,
+            movable_inst_ids,
+            at_id,
+            num_window_cols=params.mixed_lg_window_cols or 0,
         )
         legalizers.append(legalizer)
         logger.info(
@@ -615,6 +690,8 @@ class OpCollections(object):
     """Collection of all operators for placement"""
 
     def __init__(self, params, placedb, data_cls):
+        # buffers of the density, potential, field and utilization maps reused across calls
+        self.workspace = Workspace(enabled=bool(params.workspace_flag))
         self.stable_div_op = build_stable_div_op()
         self.stable_zero_div_op = build_stable_zero_div_op()
         self.move_boundary_op = build_move_boundary_op(params, placedb, data_cls)
@@ -622,12 +699,17 @@ class OpCollections(object):
         self.pin_pos_op = build_pin_pos_op(params, placedb, data_cls)
         self.hpwl_op = self.build_hpwl_op(params, placedb, data_cls)
         self.wirelength_op = self.build_wawl_op(params, placedb, data_cls)
-        self.density_op = build_electric_potential_op(params, placedb, data_cls)
+        self.density_op = build_electric_potential_op(
+            params, placedb, data_cls, self.workspace
+        )
         self.overflow_op = self.build_electric_overflow_op(params, placedb, data_cls)
         self.normalized_overflow_op = self.build_normalized_overflow_op(
             params, placedb, data_cls
         )
         self.precond_op = build_precond_op(params, placedb, data_cls)
+        self.area_type_grad_norm_op = build_area_type_grad_norm_op(
+            params, placedb, data_cls
+        )
         # single-site resource
         # i.e., a resource occupies exactly one site
         self.ssr_legalize_op = mcf_lg.MinCostFlowLegalizer(params, placedb, data_cls)
@@ -663,7 +745,7 @@ class OpCollections(object):
         )
         # routing utilization map
         self.net_density_op = build_net_density_op(params, data_cls)
-        self.rudy_op = build_rudy_op(params, data_cls)
+        self.rudy_op = build_rudy_op(params, data_cls, self.workspace)
         # routability congestion prediction
         # if params.congestion_prediction_flag:
         #     self.congestion_prediction_op = build_congestion_prediction_op(
@@ -675,7 +757,9 @@ class OpCollections(object):
         # self.graph_builder_op = build_graph_builder_op(params, data_cls)
 
         # pin utilization map
-        self.pin_utilization_op = build_pin_utilization_op(params, data_cls)
+        self.pin_utilization_op = build_pin_utilization_op(
+            params, data_cls, self.workspace
+        )
         # resource area map
         self.resource_area_op = build_resource_area_op(params, data_cls)
         # energy well
@@ -726,9 +810,21 @@ class OpCollections(object):
         if params.timing_optimization_flag or params.report_timing_flag:
             self.estimate_delay_op = build_estimate_delay_op(params, data_cls, placedb)
             self.static_timing_op = build_static_timing_op(params, data_cls, placedb)
+            self.timing_op = build_timing_op(
+                params, placedb, self.estimate_delay_op, self.static_timing_op
+            )
         else:
             self.estimate_delay_op = None
             self.static_timing_op = None
+            self.timing_op = None
+
+    def trace(self, tracer):
+        """Trace every call of the operators with `tracer`.
+        The wrappers forward attribute accesses to the operators.
+        """
+        for name, op in list(vars(self).items()):
+            if name.endswith("_op") and callable(op) and not isinstance(op, TracedOp):
+                setattr(self, name, TracedOp(op, name, tracer))
 
     def build_random_pos_op(self, params, placedb, data_cls):
         def random_pos(pos):
@@ -863,12 +959,31 @@ class OpCollections(object):
             pin_mask=data_cls.pin_mask,
             gamma=data_cls.gamma.gamma,
         )
+        compute_dtype = gp_compute_dtype(params, data_cls)
+        if compute_dtype == data_cls.inst_sizes.dtype:
 
-        def wawl_op(pos):
-            pin_pos = self.pin_pos_op(pos)
-            return op(pin_pos)
+            def wawl_op(pos):
+                pin_pos = self.pin_pos_op(pos)
+                return op(pin_pos)
+
+            return wawl_op
+
+        # cast the instance positions instead of the pin positions,
+        # as there are more pins than instances
+        pin_pos_op = pin_pos.PinPos(
+            pin_offsets=data_cls.pin_offsets.new_zeros(
+                data_cls.pin_offsets.shape, dtype=compute_dtype
+            ),
+            inst_pins=data_cls.inst_pin_map.bs,
+            inst_pins_start=data_cls.inst_pin_map.b_starts,
+            pin2inst_map=data_cls.inst_pin_map.b2as,
+        )
+
+        def mixed_precision_wawl_op(pos):
+            pin_pos = pin_pos_op(pos.to(compute_dtype))
+            return op(pin_pos).to(pos.dtype)
 
-        return wawl_op
+        return mixed_precision_wawl_op
 
     def build_electric_overflow_op(self, params, placedb, data_cls):
         """Electric overflow
@@ -893,6 +1008,8 @@ class OpCollections(object):
             smooth_flag=False,
             deterministic_flag=params.deterministic_flag,
             movable_macro_mask=None,
+            compute_dtype=gp_compute_dtype(params, data_cls),
+            workspace=self.workspace,
         )
 
     def build_normalized_overflow_op(self, params, placedb, data_cls):
@@ -26,6 +26,8 @@ class PlaceModel(nn.Module):
         self.placedb = placedb
         self.data_cls = data_cls
         self.op_cls = op_cls
+        # scratch buffer for the wirelength gradient, see _grad_buffers
+        self.wirelength_grad = None
     
     def obj_fn(self, pos):
         """
@@ -173,47 +175,77 @@ class PlaceModel(nn.Module):
         #        print("a!! at %d, |wl grad| = %g, |D grad| = %g, |D/wl| = %g" % (at, wirelength_grad_norm, density_grad_norm, ratios[at]))
         
         obj, _ = self.obj_fn(pos)
-        
-        if pos.grad is not None:
-            pos.grad.zero_()
-        
-        self.wirelength.backward()
-        wirelength_grad = pos.grad.data.clone()
-        
-        if pos.grad is not None:
-            pos.grad.zero_()
-        
-        self.density.backward()
-        density_grad = pos.grad.data.clone()
-        
-        # overall gradient
-        pos.grad.data.copy_(wirelength_grad + density_grad)
-        # in case some instances are locked
-        pos.grad.data.masked_fill_(self.data_cls.inst_lock_mask.view([-1, 1]), 0)
-        
-        if self.params.gp_dynamic_precondition: 
-            # compute normalization factor alphas for preconditioning
-            gd_gw_norm_ratios = pos.new_ones(self.data_cls.num_area_types)
-            for area_type in range(self.data_cls.num_area_types - 1):
-                inst_ids = self.data_cls.area_type_inst_groups[area_type]
-                if len(inst_ids):
-                    wirelength_grad_norm = wirelength_grad[inst_ids].norm(p=1)
-                    density_grad_norm = density_grad[inst_ids].norm(p=1)
-                    gd_gw_norm_ratios[area_type] = density_grad_norm / wirelength_grad_norm
-            self.data_cls.multiplier.gd_gw_norm_ratio = self.op_cls.stable_zero_div_op(gd_gw_norm_ratios.clamp_(min=1.0),
-                                                                                    self.data_cls.multiplier.lambdas)
-            precond_alphas = self.data_cls.multiplier.gd_gw_norm_ratio
-        else:
-            precond_alphas = pos.new_ones(self.data_cls.num_area_types)
-        
-        self.op_cls.precond_op(pos.grad, precond_alphas)
-        
+
+        wirelength_grad, grad = self._grad_buffers(pos)
+        self._backward_into(self.wirelength, pos, wirelength_grad)
+        # the density gradient lands in pos.grad directly; the wirelength
+        # gradient is folded in once the per-term norms have been taken
+        density_grad = self._backward_into(self.density, pos, grad)
+
         grad_dicts = {
             'wirelength_grad_norm': wirelength_grad.norm(p=1),
             'density_grad_norm'   : density_grad.norm(p=1)
         }
-        return obj, pos.grad, grad_dicts
-    
+        precond_alphas = self._compute_precond_alphas(pos, wirelength_grad, density_grad)
+
+        # overall gradient
+        grad.add_(wirelength_grad)
+        # in case some instances are locked
+        grad.masked_fill_(self.data_cls.inst_lock_mask.view([-1, 1]), 0)
+
+        self.op_cls.precond_op(grad, precond_alphas)
+
+        return obj, grad, grad_dicts
+
+    def _grad_buffers(self, pos):
+        """Get the preallocated gradient buffers for `pos`.
+        The wirelength gradient is a scratch buffer shared by all evaluations,
+        as it never leaves obj_and_grad_fn. The overall gradient lives in
+        pos.grad, since the optimizer keeps references to it.
+        @return (wirelength gradient buffer, overall gradient buffer)
+        """
+        if pos.grad is None:
+            pos.grad = torch.zeros_like(pos.data)
+        if self.wirelength_grad is None or self.wirelength_grad.shape != pos.shape \
+                or self.wirelength_grad.dtype != pos.dtype or self.wirelength_grad.device != pos.device:
+            self.wirelength_grad = torch.zeros_like(pos.data)
+        return self.wirelength_grad, pos.grad
+
+    @staticmethod
+    def _backward_into(term, pos, grad_buf):
+        """
+        @brief back-propagate one objective term and write its gradient
+            w.r.t. pos into grad_buf without allocating a new full-size tensor.
+            pos.grad is temporarily redirected to grad_buf, into which autograd
+            accumulates in place, and restored even if backward raises.
+        @return grad_buf
+        """
+        grad_bk = pos.grad
+        grad_buf.zero_()
+        pos.grad = grad_buf
+        try:
+            term.backward()
+        finally:
+            pos.grad = grad_bk
+        return grad_buf
+
+    def _compute_precond_alphas(self, pos, wirelength_grad, density_grad):
+        """
+        @brief compute normalization factor alphas for preconditioning
+        """
+        if not self.params.gp_dynamic_precondition:
+            return pos.new_ones(self.data_cls.num_area_types)
+        wirelength_grad_norms = self.op_cls.area_type_grad_norm_op(wirelength_grad, p=1)
+        density_grad_norms = self.op_cls.area_type_grad_norm_op(density_grad, p=1)
+        # empty area types and the last area type keep a ratio of 1
+        gd_gw_norm_ratios = torch.where(self.data_cls.area_type_inst_group_counts > 0,
+                                        density_grad_norms / wirelength_grad_norms,
+                                        torch.ones_like(density_grad_norms))
+        gd_gw_norm_ratios[-1] = 1
+        self.data_cls.multiplier.gd_gw_norm_ratio = self.op_cls.stable_zero_div_op(gd_gw_norm_ratios.clamp_(min=1.0),
+                                                                                self.data_cls.multiplier.lambdas)
+        return self.data_cls.multiplier.gd_gw_norm_ratio
+
     def forward(self):
         """
         @brief Compute objective with current locations of cells.
@@ -225,6 +257,8 @@ class FenceRegionPlaceModel(PlaceModel):
     def __init__(self, params, placedb, data_cls, op_cls):
         super(FenceRegionPlaceModel, self).__init__(params, placedb, data_cls, op_cls)
         self.fence_region_cost_term = None
+        # scratch buffer for the fence region gradient, see _grad_buffers
+        self.fence_region_cost_grad = None
     
     def obj_fn(self, pos):
         wirelength_and_density_obj, obj_terms_dict = super(FenceRegionPlaceModel, self).obj_fn(pos)
@@ -246,83 +280,34 @@ class FenceRegionPlaceModel(PlaceModel):
     
     def obj_and_grad_fn(self, pos):
         obj, _ = self.obj_fn(pos)
-        
-        if pos.grad is not None:
-            pos.grad.zero_()
-        self.wirelength.backward()
-        wirelength_grad = pos.grad.data.clone()
-        
-        if pos.grad is not None:
-            pos.grad.zero_()
-        self.density.backward()
-        density_grad = pos.grad.data.clone()
-        
-        # Note that fence region cost only makes senses to movable instances.
-        if pos.grad is not None:
-            pos.grad.zero_()
-        self.fence_region_cost_term.backward()
-        fence_region_cost_term_grad = pos.grad.data.clone()[self.data_cls.movable_range[0]
-                                                            :self.data_cls.movable_range[1]]
-        
-        # overall gradient
-        pos.grad.data.copy_(wirelength_grad + density_grad)
-       
-        if self.params.gp_dynamic_precondition: 
-            # compute normalization factor alphas for preconditioning
-            gd_gw_norm_ratios = pos.new_ones(self.data_cls.num_area_types)
-            for area_type in range(self.data_cls.num_area_types - 1):
-                inst_ids = self.data_cls.area_type_inst_groups[area_type]
-                if len(inst_ids):
-                    wirelength_grad_norm = wirelength_grad[inst_ids].norm(p=1)
-                    density_grad_norm = density_grad[inst_ids].norm(p=1)
-                    gd_gw_norm_ratios[area_type] = density_grad_norm / wirelength_grad_norm
-            self.data_cls.multiplier.gd_gw_norm_ratio = self.op_cls.stable_zero_div_op(gd_gw_norm_ratios.clamp_(min=1.0),
-                                                                                    self.data_cls.multiplier.lambdas)
-            precond_alphas = self.data_cls.multiplier.gd_gw_norm_ratio
-        else:
-            precond_alphas = pos.new_ones(self.data_cls.num_area_types)
-            
-        self.op_cls.precond_op(pos.grad, precond_alphas)
-        
-        temp_grad = pos.grad.data.clone()
-        temp_grad[self.data_cls.movable_range[0]:self.data_cls.movable_range[1]] += fence_region_cost_term_grad
-        pos.grad.data.copy_(temp_grad)
 
-        # in case some instances are locked
-        pos.grad.data.masked_fill_(self.data_cls.inst_lock_mask.view([-1, 1]), 0)
+        wirelength_grad, grad = self._grad_buffers(pos)
+        if self.fence_region_cost_grad is None or self.fence_region_cost_grad.shape != grad.shape \
+                or self.fence_region_cost_grad.dtype != grad.dtype or self.fence_region_cost_grad.device != grad.device:
+            self.fence_region_cost_grad = torch.zeros_like(grad)
+        self._backward_into(self.wirelength, pos, wirelength_grad)
+        # Note that fence region cost only makes senses to movable instances,
+        # so its gradient is zero outside the movable range.
+        fence_region_cost_term_grad = self._backward_into(self.fence_region_cost_term, pos,
+                                                          self.fence_region_cost_grad)
+        density_grad = self._backward_into(self.density, pos, grad)
 
-        # area_type_mover_density_grad_norm = pos.new_ones(self.data_cls.num_area_types)
-        # area_type_filler_density_grad_norm = pos.new_ones(self.data_cls.num_area_types)
-        # area_type_density_grad_norm = pos.new_ones(self.data_cls.num_area_types)
-        # for area_type in range(self.data_cls.num_area_types - 1):
-        #     inst_ids = self.data_cls.area_type_inst_groups[area_type]
-        #     if len(inst_ids):
-        #         area_type_density_grad_norm[area_type] = density_grad[inst_ids].norm(p=1)
-        #     movable_inst_ids = inst_ids[
-        #         (self.data_cls.movable_range[0] <= inst_ids) * (inst_ids < self.data_cls.movable_range[1])]
-        #     filler_inst_ids = inst_ids[
-        #         (self.data_cls.filler_range[0] <= inst_ids) * (inst_ids < self.data_cls.filler_range[1])]
-        #     if len(movable_inst_ids):
-        #         area_type_mover_density_grad_norm[area_type] = density_grad[movable_inst_ids].norm(p=1) / len(movable_inst_ids)
-        #     if len(filler_inst_ids):
-        #         area_type_filler_density_grad_norm[area_type] = density_grad[filler_inst_ids].norm(p=1) / len(filler_inst_ids)
-        # area_type_density_grad_norm /= wirelength_grad.norm(p=1)
-        # logger.info("area_type_density_grad_norm: ")
-        # logger.info(area_type_density_grad_norm.numpy())
-        # logger.info("area_type_mover_density_grad_norm(avg per instance): ")
-        # logger.info(area_type_mover_density_grad_norm.numpy())
-        # logger.info("area_type_filler_density_grad_norm(avg per instance): ")
-        # logger.info(area_type_filler_density_grad_norm.numpy())
-        # logger.info("gd_gw_norm_ratio:")
-        # logger.info(self.data_cls.multiplier.gd_gw_norm_ratio.numpy())
-        
         grad_dicts = {
             'wirelength_grad_norm'  : wirelength_grad.norm(p=1),
             'density_grad_norm'     : density_grad.norm(p=1),
             'fence_region_grad_norm': fence_region_cost_term_grad.norm(p=1)
         }
-        
-        return obj, pos.grad, grad_dicts
+        precond_alphas = self._compute_precond_alphas(pos, wirelength_grad, density_grad)
+
+        # overall gradient
+        grad.add_(wirelength_grad)
+        self.op_cls.precond_op(grad, precond_alphas)
+        grad.add_(fence_region_cost_term_grad)
+
+        # in case some instances are locked
+        grad.masked_fill_(self.data_cls.inst_lock_mask.view([-1, 1]), 0)
+
+        return obj, grad, grad_dicts
     
     def forward(self):
         return self.obj_fn(self.data_cls.pos[0])[0]
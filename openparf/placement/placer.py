@@ -16,6 +16,8 @@ import numpy as np
 import random
 import pathlib
 import os.path as osp
+import gzip
+from collections import OrderedDict
 
 try:
     from loguru import logger
@@ -25,6 +27,8 @@ except ModuleNotFoundError:
     logger = logging.getLogger(__name__)
 from openparf.py_utils.base import DeferredAction, log_dict
 import openparf.py_utils.stopwatch as stopwatch
+import openparf.py_utils.checkpoint as checkpoint
+from openparf.py_utils.tracer import Tracer, traced
 
 # from openparf.placement.statistics_viewer import PlacerStatisticsViewer
 
@@ -53,10 +57,160 @@ datatypes = {"float32": torch.float32, "float64": torch.float64}
 
 debug_timing_flag = False
 
+_missing = object()
+
+
+def _get_attr_path(obj, path):
+    """getattr with a dotted path, e.g., 'multiplier.lambdas'; _missing if absent"""
+    for name in path.split("."):
+        obj = getattr(obj, name, _missing)
+        if obj is _missing:
+            return _missing
+    return obj
+
+
+def _set_attr_path(obj, path, value):
+    """setattr with a dotted path"""
+    names = path.split(".")
+    for name in names[:-1]:
+        obj = getattr(obj, name)
+    setattr(obj, names[-1], value)
+
+
+def _is_json_value(value):
+    if isinstance(value, (list, tuple)):
+        return all(_is_json_value(x) for x in value)
+    return value is None or isinstance(value, (bool, int, float, str))
+
+
+def _param_group_state(prefix, group, param, tensors):
+    """Split an optimizer parameter group into named tensors and JSON metadata.
+
+    :param prefix: name prefix of the tensors
+    :param group: parameter group of the optimizer, or of its state_dict
+    :param param: the optimized tensor; list items aliasing it are recorded by reference
+    :param tensors: dict to add the tensors to
+    :return: JSON metadata to rebuild the group with _restore_param_group
+    """
+    state = OrderedDict()
+    for key, value in group.items():
+        if key == "params":
+            continue
+        if isinstance(value, list):
+            items = []
+            for i, x in enumerate(value):
+                if x is None:
+                    items.append(None)
+                elif x is param:
+                    items.append("params")
+                else:
+                    tensors["%s.%s.%d" % (prefix, key, i)] = x
+                    items.append("variable" if x.requires_grad else "tensor")
+            state[key] = {"kind": "list", "items": items}
+        elif isinstance(value, torch.Tensor):
+            tensors["%s.%s" % (prefix, key)] = value
+            state[key] = {"kind": "tensor"}
+        else:
+            state[key] = {"kind": "value", "value": value}
+    return state
+
+
+def _restore_param_group(prefix, state, tensors, group, param, device):
+    """Inverse of _param_group_state; updates group in place"""
+    for key, entry in state.items():
+        if entry["kind"] == "list":
+            items = []
+            for i, kind in enumerate(entry["items"]):
+                if kind is None:
+                    items.append(None)
+                elif kind == "params":
+                    items.append(param)
+                else:
+                    x = tensors["%s.%s.%d" % (prefix, key, i)].to(device, copy=True)
+                    items.append(x.requires_grad_() if kind == "variable" else x)
+            group[key] = items
+        elif entry["kind"] == "tensor":
+            group[key] = tensors["%s.%s" % (prefix, key)].to(device, copy=True)
+        else:
+            group[key] = entry["value"]
+
 
 class Placer(nn.Module):
     """Top placement engine"""
 
+    # members of data collections that global placement updates,
+    # i.e., the ones saved to checkpoints besides the instance positions
+    checkpoint_data_attrs = (
+        "inst_locs_xyz",
+        "inst_sizes",
+        "inst_sizes_max",
+        "inst_areas",
+        "total_movable_areas",
+        "net_weights",
+        "inst_lock_mask",
+        "area_type_lock_mask",
+        "area_type_mask",
+        "gamma.gamma",
+        "multiplier.lambdas",
+        "multiplier.t",
+        "multiplier.cs",
+        "multiplier.gd_gw_norm_ratio",
+        "wl_0",
+        "phi_0",
+        "density_0",
+        "io_pos_xyz",
+        "fence_region_cost_parameters.eta",
+        "fence_region_cost_parameters.energy_function_exponent",
+        "movable_inst_to_clock_region",
+        "movable_inst_cr_avail_map",
+        "clock_available_clock_region",
+        "half_column_available_clock_region",
+        "wirelength",
+        "density",
+        "phi",
+    )
+    # bookkeeping of the global placement loop saved to rolling checkpoints,
+    # so that a resumed run takes the same stage transitions
+    checkpoint_loop_attrs = (
+        "last_ssr_legalize_iter",
+        "last_area_inflation_iter",
+        "last_clock_assignment_iter",
+        "last_timing_adjustment_iter",
+        "last_timing_adjustment_threshold",
+        "eta_update_counter",
+        "num_gp_adjust_area",
+        "num_io_legalization",
+        "num_gp_timing_adjustment",
+        "num_confine_fence_region",
+        "gp_adjust_area",
+        "gp_adjust_route_area",
+        "gp_adjust_pin_area",
+        "gp_adjust_resource_area",
+        "gp_timing_adjustment",
+        "confine_fence_region",
+        "restore_best_solution_flag",
+        "timing_optimization_counter",
+        "latest_timing_analysis_result",
+        "best_pos_before_ck_ssir_lg",
+        "movable_inst_avail_crs",
+    )
+    # scalar members of the metrics saved to rolling checkpoints
+    checkpoint_metric_attrs = (
+        "eval_iteration",
+        "step_size",
+        "ck_illegal_insts_num",
+        "movable_insts_num",
+        "cr_max_displacement",
+    )
+    # members of the solution saved after global placement and legalization
+    checkpoint_solution_attrs = (
+        "inst_locs_xyz",
+        "io_pos_xyz",
+        "movable_inst_to_clock_region",
+        "clock_available_clock_region",
+        "half_column_available_clock_region",
+    )
+
     def __init__(self, params, placedb):
         self.restore_best_solution_flag = False
 
@@ -70,6 +224,11 @@ class Placer(nn.Module):
 
         self.dtype = datatypes[params.dtype]
         self.device = torch.device("cuda" if params.gpu else "cpu")
+        if params.gp_mixed_precision_flag and self.dtype != torch.float32:
+            logger.info(
+                "mixed-precision global placement: wirelength and density in float32, positions in %s"
+                % params.dtype
+            )
 
         self.params = params
         self.placedb = placedb
@@ -96,6 +255,17 @@ class Placer(nn.Module):
         # initialize operator collections
         self.op_cls = OpCollections(params, placedb, self.data_cls)
 
+        # tracer of placement stages and operators
+        self.tracer = Tracer(
+            enabled=bool(params.trace_flag),
+            max_events=params.trace_max_events,
+            synchronize=torch.cuda.synchronize
+            if params.gpu and params.trace_sync_flag
+            else None,
+        )
+        if self.tracer.enabled:
+            self.op_cls.trace(self.tracer)
+
         # initialize functor collections.
         self.functor_cls = functor_collections.FunctorCollections(
             params=self.params, data_cls=self.data_cls, placedb=self.placedb
@@ -135,17 +305,25 @@ class Placer(nn.Module):
         self.best_pos_before_ck_ssir_lg = None
         self.best_sol_metric = None
 
+        # rolling checkpoints of global placement
+        self.checkpoint_writer = None
+        self.last_gp_checkpoint_iter = None
+        self.last_gp_checkpoint_time = None
+
         # Placer model and optimizer
         self.model = None
         self.optimizer = None
         self.optimizer_initial_state = None
 
         self.visualization_writer = None
+        # latest metric evaluated by one_step, see gp_metric_eval_stride
+        self.latest_eval_metric = None
 
         self.eta_update_counter = None
         self.timing_optimization_counter = 0
 
     def reset_optimizer(self, opt_iter):
+        self.invalidate_metrics()
         # reset density and overflow operator to update stretched sizes
         self.op_cls.density_op.reset()
         self.op_cls.overflow_op.reset()
@@ -212,6 +390,7 @@ class Placer(nn.Module):
             return False
         return True
 
+    @traced("area_inflation")
     def _gp_adjust_area(self, current_metric, opt_iter):
         """adjust cell(instance) area
 
@@ -624,6 +803,7 @@ class Placer(nn.Module):
         # self.reset_optimizer(opt_iter)
         return
 
+    @traced("timing_analysis")
     def timing_analysis(self, pos, opt_iter):
         target_clk_period_ps = self.params.target_clock_period_ns * 1000
         (
@@ -690,6 +870,66 @@ class Placer(nn.Module):
         else:
             return True
 
+    def _reset_clock_region_ops(self):
+        """Reset the ops honoring the clock region assignment in data collections"""
+        # Fence region cost only make senses to movable instances.
+        movable_inst_sizes_max = self.data_cls.inst_sizes_max[
+            self.data_cls.movable_range[0] : self.data_cls.movable_range[1]
+        ]
+        movable_inst_areas = (
+            movable_inst_sizes_max[..., 0] * movable_inst_sizes_max[..., 1]
+        )
+
+        # Reset the fence region cost function
+        self.op_cls.fence_region_op.reset_instance(
+            inst_areas=movable_inst_areas,
+            inst_sizes=movable_inst_sizes_max,
+            inst_cr_avail_map=self.data_cls.movable_inst_cr_avail_map.to(
+                self.device
+            ),
+            energy_function_exponents=self.data_cls.fence_region_cost_parameters.energy_function_exponent.to(
+                self.device
+            ),
+        )
+
+        # Reset the fence region checker operator
+        self.op_cls.fence_region_checker_op.reset(
+            fence_region_boxes=self.data_cls.fence_region_boxes,
+            inst_sizes=movable_inst_sizes_max,
+            inst_avail_crs=self.movable_inst_avail_crs,
+        )
+
+        # Reset the SSSR(single-site-single-resource) legalization operator
+        self.op_cls.ssr_legalize_op.reset_honor_fence_region_constraints(True)
+        self.op_cls.ssr_legalize_op.reset_clock_available_clock_region(
+            self.data_cls.clock_available_clock_region
+        )
+
+        # Reset the direct legalization operator
+        self.op_cls.direct_lg_op.reset_honor_fence_region_constraints(True)
+        self.op_cls.direct_lg_op.reset_clock_available_clock_region(
+            self.data_cls.clock_available_clock_region
+        )
+
+        self.op_cls.ism_dp_op.reset_honor_clock_constraints(True)
+        self.op_cls.ism_dp_op.reset_clock_available_clock_region(
+            self.data_cls.clock_available_clock_region
+        )
+
+    def _build_fence_region_model(self):
+        """Create a new fence region placement model and optimizer"""
+        self.model = FenceRegionPlaceModel(
+            self.params, self.placedb, self.data_cls, self.op_cls
+        ).to(self.device)
+
+        self.optimizer = NesterovAcceleratedGradientOptimizer(
+            self.parameters(),
+            lr=0,
+            obj_and_grad_fn=self.model.obj_and_grad_fn,
+            constraint_fn=self.op_cls.move_boundary_op,
+        )
+
+    @traced("clock_region_confinement")
     def _confine_clock_region(self, opt_iter, metrics):
         with DeferredAction() as defer:
             self.confine_fence_region_stopwatch.start()
@@ -710,7 +950,7 @@ class Placer(nn.Module):
             if self.params.dump_before_clock_refinement_flag:
                 logger.info("Dumping before clock region assignment...")
                 self.dump(
-                    "{}/{}.{:02d}.before_cnp.pklz".format(
+                    "{}/{}.{:02d}.before_cnp.ckpt".format(
                         self.params.result_dir,
                         self.params.design_name(),
                         current_stage_idx,
@@ -825,41 +1065,7 @@ class Placer(nn.Module):
             )
             # TODO: only reset energy cost
 
-            # Reset the fence region cost function
-            self.op_cls.fence_region_op.reset_instance(
-                inst_areas=movable_inst_areas,
-                inst_sizes=movable_inst_sizes_max,
-                inst_cr_avail_map=self.data_cls.movable_inst_cr_avail_map.to(
-                    self.device
-                ),
-                energy_function_exponents=self.data_cls.fence_region_cost_parameters.energy_function_exponent.to(
-                    self.device
-                ),
-            )
-
-            # Reset the fence region checker operator
-            self.op_cls.fence_region_checker_op.reset(
-                fence_region_boxes=self.data_cls.fence_region_boxes,
-                inst_sizes=movable_inst_sizes_max,
-                inst_avail_crs=self.movable_inst_avail_crs,
-            )
-
-            # Reset the SSSR(single-site-single-resource) legalization operator
-            self.op_cls.ssr_legalize_op.reset_honor_fence_region_constraints(True)
-            self.op_cls.ssr_legalize_op.reset_clock_available_clock_region(
-                self.data_cls.clock_available_clock_region
-            )
-
-            # Reset the direct legalization operator
-            self.op_cls.direct_lg_op.reset_honor_fence_region_constraints(True)
-            self.op_cls.direct_lg_op.reset_clock_available_clock_region(
-                self.data_cls.clock_available_clock_region
-            )
-
-            self.op_cls.ism_dp_op.reset_honor_clock_constraints(True)
-            self.op_cls.ism_dp_op.reset_clock_available_clock_region(
-                self.data_cls.clock_available_clock_region
-            )
+            self._reset_clock_region_ops()
 
             movable_pos = pos[
                 self.data_cls.movable_range[0] : self.data_cls.movable_range[1]
@@ -916,17 +1122,7 @@ class Placer(nn.Module):
                 logger.info(
                     "Do not move the movable instances to the center of target clock regions..."
                 )
-            # Create a new fence region placement model and optimizer
-            self.model = FenceRegionPlaceModel(
-                self.params, self.placedb, self.data_cls, self.op_cls
-            ).to(self.device)
-
-            self.optimizer = NesterovAcceleratedGradientOptimizer(
-                self.parameters(),
-                lr=0,
-                obj_and_grad_fn=self.model.obj_and_grad_fn,
-                constraint_fn=self.op_cls.move_boundary_op,
-            )
+            self._build_fence_region_model()
             self.reset_fence_region_cost_parameters()
             # self.update_gamma(opt_iter, metrics[-1].overflow)
             # self.reset_lambdas(self.params.reset_lambda_param)
@@ -1009,9 +1205,10 @@ class Placer(nn.Module):
                 or self.num_io_legalization >= 1
             ):
                 return False
-            latest_metrics = metrics[-1]
-            assert latest_metrics.at_avg_grad_norms is not None
-            at_avg_grad_norms = latest_metrics.at_avg_grad_norms
+            at_avg_grad_norms = metrics[-1].at_avg_grad_norms
+            # not evaluated yet, e.g., no gradient at the latest evaluation or a resumed run
+            if at_avg_grad_norms is None:
+                return False
             io_at_ids = [
                 self.placedb.getAreaTypeIndexFromName(x)
                 for x in self.params.io_at_names
@@ -1034,6 +1231,7 @@ class Placer(nn.Module):
             logger.warning("Value EError: {0}".format(e))
             return False
 
+    @traced("io_legalization")
     def io_legalization(self, opt_iter):
         logger.info("Start IO Legalization...")
         # self.plot(os.path.join(self.params.plot_dir, "iter%s_before_io_rough_legalizaion.bmp" % ('{:04}'.format(opt_iter.iteration))),
@@ -1049,12 +1247,21 @@ class Placer(nn.Module):
             ] = 1
             self.data_cls.area_type_lock_mask[io_at_id] = 1
             self.data_cls.area_type_mask[io_at_id] = 0
+        self._lock_density_maps()
         # reset optimizer
         self.reset_optimizer(opt_iter)
         # self.plot(os.path.join(self.params.plot_dir, "iter%s_after_io_rough_legalizaion.bmp" % ('{:04}'.format(opt_iter.iteration))),
         #             opt_iter, plot_target_at_names=self.params.plot_target_at_names, filler_flag=True)
         self.num_io_legalization += 1
 
+    def _lock_density_maps(self):
+        """Fold the locked instances into the static density maps of the density ops,
+        so that they are not scattered at every iteration anymore.
+        Call it whenever inst_lock_mask or the positions of locked instances change.
+        """
+        for op in (self.op_cls.density_op, self.op_cls.overflow_op):
+            op.lock(self.data_cls.inst_lock_mask)
+
     def _check_divergence(self, metrics):
         """
         Only work for clock-aware placement.
@@ -1232,13 +1439,12 @@ class Placer(nn.Module):
         if pin_slacks is None:
             pos = self.data_cls.pos[0]
             with torch.no_grad():
-                pin_delays, ignore_pin_masks = self.op_cls.estimate_delay_op(pos)
                 (
                     pin_arrivals,
                     pin_requires,
                     pin_slacks,
                     ignore_net_masks,
-                ) = self.op_cls.static_timing_op(pin_delays)
+                ) = self.op_cls.timing_op(pos)
         worest_negative_slacks = torch.min(pin_slacks)
         total_negative_slacks = torch.sum(pin_slacks[pin_slacks < 0])
         logger.info(
@@ -1258,13 +1464,12 @@ class Placer(nn.Module):
         pos = self.data_cls.pos[0]
         num_nets = self.placedb.numNets()
         with torch.no_grad():
-            pin_delays, ignore_pin_masks = self.op_cls.estimate_delay_op(pos)
             (
                 pin_arrivals,
                 pin_requires,
                 pin_slacks,
                 ignore_net_masks,
-            ) = self.op_cls.static_timing_op(pin_delays)
+            ) = self.op_cls.timing_op(pos)
             pin_criticalitys = torch.pow(
                 self.params.timing_criticality_alpha,
                 (pin_slacks.max() - pin_slacks) / (pin_slacks.max() - pin_slacks.min()),
@@ -1337,6 +1542,7 @@ class Placer(nn.Module):
             # "objective": self.model.obj_fn,
             "hpwl": self.op_cls.hpwl_op,
             "overflow": self.op_cls.normalized_overflow_op,
+            "area_type_grad_norm": self.op_cls.area_type_grad_norm_op,
         }
 
         # initial iteration
@@ -1385,369 +1591,391 @@ class Placer(nn.Module):
                 self.params.gp_timing_adjustment_overflow_threshold
             )
             self.eta_update_counter = 0
+            self.restore_best_solution_flag = False
 
-            tt = time.time()
-            if self.params.load_global_place_init_file:
-                logger.info(
-                    "load global placement initial file from {}".format(
-                        self.params.load_global_place_init_file
+            with self.tracer.span("global_place", "stage"):
+                tt = time.time()
+                resume_file = self.gp_resume_file()
+                if resume_file:
+                    opt_iter, metrics = self.resume_gp(resume_file, eval_ops)
+                elif self.params.load_global_place_init_file:
+                    logger.info(
+                        "load global placement initial file from {}".format(
+                            self.params.load_global_place_init_file
+                        )
                     )
-                )
-                self.load_gp(self.params.load_global_place_init_file)
-                # self.metric_before_clk_assignment = self.initialize_params(eval_ops, opt_iter, set_random_pos=False)
-                # self._confine_clock_region(opt_iter, metrics)
-                # cur_metric = self.initialize_params(eval_ops, opt_iter, set_random_pos=False)
-                # eval_ops['fence_region'] = self.op_cls.fence_region_op
-            else:
-                cur_metric = self.initialize_params(eval_ops, opt_iter)
-
-            self.plot(
-                os.path.join(
-                    self.params.plot_dir,
-                    "iter%s_initial.bmp" % ("{:04}".format(opt_iter.iteration)),
-                ),
-                opt_iter,
-                plot_target_at_names=self.params.plot_target_at_names,
-                filler_flag=False,
-            )
+                    self.load_gp(self.params.load_global_place_init_file)
+                    # self.metric_before_clk_assignment = self.initialize_params(eval_ops, opt_iter, set_random_pos=False)
+                    # self._confine_clock_region(opt_iter, metrics)
+                    # cur_metric = self.initialize_params(eval_ops, opt_iter, set_random_pos=False)
+                    # eval_ops['fence_region'] = self.op_cls.fence_region_op
+                else:
+                    cur_metric = self.initialize_params(eval_ops, opt_iter)
 
-            if self.params.plot_fgrain_flag:
-                self.plot_fgrain(
-                            osp.join(
-                                self.params.plot_dir,
-                                "fgrain_iter%s_initial.bmp"
-                                % ("{:04}".format(opt_iter.iteration)),
-                            ),
-                            opt_iter,
-                            self.data_cls.plot_group_types,
-                            self.data_cls.plot_ginst_list,
-                        )
+                self.plot(
+                    os.path.join(
+                        self.params.plot_dir,
+                        "iter%s_initial.bmp" % ("{:04}".format(opt_iter.iteration)),
+                    ),
+                    opt_iter,
+                    plot_target_at_names=self.params.plot_target_at_names,
+                    filler_flag=False,
+                )
 
-            # logger.info("<initial metric>: " + str(cur_metric))
-            # metrics.append(cur_metric)
-            # the state must be saved before setting learning rate
-            self.optimizer_initial_state = copy.deepcopy(self.optimizer.state_dict())
-            self.initialize_learning_rate(self.model, self.optimizer, 0.1)
-
-            # if self.params.load_global_place_init_file:
-            #     # set this flag to trigger SSIR legalization routine.
-            #     self.last_clock_assignment_iter = cur_metric.opt_iter.iteration
-            #     self.gp_adjust_area = False
-            #     self.num_gp_adjust_area = 1
-            self.restore_best_solution_flag = False
+                if self.params.plot_fgrain_flag:
+                    self.plot_fgrain(
+                                osp.join(
+                                    self.params.plot_dir,
+                                    "fgrain_iter%s_initial.bmp"
+                                    % ("{:04}".format(opt_iter.iteration)),
+                                ),
+                                opt_iter,
+                                self.data_cls.plot_group_types,
+                                self.data_cls.plot_ginst_list,
+                            )
 
-            while opt_iter.iteration < 20 or not self.stop_condition(metrics):
-                if self.last_clock_assignment_iter is None:
-                    for opt_iter.iter_gamma in range(self.params.gamma_iters):
-                        for opt_iter.iter_lambda in range(self.params.lambda_iters):
-                            for opt_iter.iter_sub in range(self.params.sub_iters):
-                                cur_metric = self.one_step(
-                                    self.optimizer, eval_ops, opt_iter
-                                )
-                                if (
-                                    self.params.plot_flag
-                                    and opt_iter.iteration
-                                    % self.params.plot_iteration_frequency
-                                    == 0
-                                ):
+                # logger.info("<initial metric>: " + str(cur_metric))
+                # metrics.append(cur_metric)
+                if not resume_file:
+                    # the state must be saved before setting learning rate
+                    self.optimizer_initial_state = copy.deepcopy(
+                        self.optimizer.state_dict()
+                    )
+                    self.initialize_learning_rate(self.model, self.optimizer, 0.1)
+
+                # if self.params.load_global_place_init_file:
+                #     # set this flag to trigger SSIR legalization routine.
+                #     self.last_clock_assignment_iter = cur_metric.opt_iter.iteration
+                #     self.gp_adjust_area = False
+                #     self.num_gp_adjust_area = 1
+
+                self._open_gp_checkpoints(opt_iter)
+                try:
+                    while opt_iter.iteration < 20 or not self.stop_condition(metrics):
+                        if self._gp_checkpoint_condition(opt_iter):
+                            self.save_gp_checkpoint(opt_iter, metrics)
+                        if self.last_clock_assignment_iter is None:
+                            for opt_iter.iter_gamma in range(self.params.gamma_iters):
+                                for opt_iter.iter_lambda in range(self.params.lambda_iters):
+                                    for opt_iter.iter_sub in range(self.params.sub_iters):
+                                        cur_metric = self.one_step(
+                                            self.optimizer, eval_ops, opt_iter
+                                        )
+                                        if (
+                                            self.params.plot_flag
+                                            and opt_iter.iteration
+                                            % self.params.plot_iteration_frequency
+                                            == 0
+                                        ):
+                                            self.plot(
+                                                os.path.join(
+                                                    self.params.plot_dir,
+                                                    "iter%s.bmp"
+                                                    % ("{:04}".format(opt_iter.iteration)),
+                                                ),
+                                                opt_iter,
+                                                plot_target_at_names=self.params.plot_target_at_names,
+                                                filler_flag=False,
+                                            )
+                                        if (
+                                            self.params.plot_fgrain_flag
+                                            and opt_iter.iteration
+                                            % self.params.plot_iteration_frequency
+                                            == 0
+                                        ):
+                                            assert self.data_cls.plot_group_types is not None
+                                            assert self.data_cls.plot_ginst_list is not None
+                                            self.plot_fgrain(
+                                                osp.join(
+                                                    self.params.plot_dir,
+                                                    "fgrain_iter%s.bmp"
+                                                    % ("{:04}".format(opt_iter.iteration)),
+                                                ),
+                                                opt_iter,
+                                                self.data_cls.plot_group_types,
+                                                self.data_cls.plot_ginst_list,
+                                            )
+
+                                        if (
+                                            self.params.gp_timing_analysis_flag
+                                            and opt_iter.iteration
+                                            % self.params.gp_timing_analysis_iters
+                                            == 0
+                                        ):
+                                            max_dly, wns, tns = self.timing_analysis(
+                                                self.data_cls.pos[0], opt_iter
+                                            )
+                                            self.latest_timing_analysis_result = (
+                                                max_dly,
+                                                wns,
+                                                tns,
+                                            )
+                                            logger.info(
+                                                "[Timing Analysis] at Iter {}: max_dly={:.03f} ns, wns={:.03f} ns, tns={:.03f} ns".format(
+                                                    opt_iter.iteration,
+                                                    max_dly / 1e3,
+                                                    wns / 1e3,
+                                                    tns / 1e3,
+                                                )
+                                            )
+
+                                        opt_iter.iteration += 1
+                                        metrics.append(cur_metric)
+                                self.update_lambdas(opt_iter)
+                            # adjust instance areas
+                            if self._gp_adjust_area_condition(metrics[-1]) is True:
+                                if self.params.plot_flag:
                                     self.plot(
                                         os.path.join(
                                             self.params.plot_dir,
-                                            "iter%s.bmp"
-                                            % ("{:04}".format(opt_iter.iteration)),
+                                            "iter%s_before_area_adjustment_%d.bmp"
+                                            % (
+                                                "{:04}".format(opt_iter.iteration),
+                                                self.num_gp_adjust_area,
+                                            ),
                                         ),
                                         opt_iter,
                                         plot_target_at_names=self.params.plot_target_at_names,
-                                        filler_flag=False,
-                                    )
-                                if (
-                                    self.params.plot_fgrain_flag
-                                    and opt_iter.iteration
-                                    % self.params.plot_iteration_frequency
-                                    == 0
-                                ):
-                                    assert self.data_cls.plot_group_types is not None
-                                    assert self.data_cls.plot_ginst_list is not None
-                                    self.plot_fgrain(
-                                        osp.join(
-                                            self.params.plot_dir,
-                                            "fgrain_iter%s.bmp"
-                                            % ("{:04}".format(opt_iter.iteration)),
-                                        ),
-                                        opt_iter,
-                                        self.data_cls.plot_group_types,
-                                        self.data_cls.plot_ginst_list,
-                                    )
-
-                                if (
-                                    self.params.gp_timing_analysis_flag
-                                    and opt_iter.iteration
-                                    % self.params.gp_timing_analysis_iters
-                                    == 0
-                                ):
-                                    max_dly, wns, tns = self.timing_analysis(
-                                        self.data_cls.pos[0], opt_iter
+                                        filler_flag=True,
                                     )
-                                    self.latest_timing_analysis_result = (
-                                        max_dly,
-                                        wns,
-                                        tns,
+                                self._gp_adjust_area(metrics[-1], opt_iter)
+                                self.last_area_inflation_iter = cur_metric.opt_iter.iteration
+                                self.invalidate_metrics()
+                                continue
+
+                            if self.timing_adjustment_condition(metrics[-1], opt_iter) is True:
+                                self.timing_adjustment(metrics[-1], opt_iter)
+                                self.last_timing_adjustment_iter = cur_metric.opt_iter.iteration
+                                self.invalidate_metrics()
+
+                            # clock region constraints
+                            if self._confine_clock_region_condition(metrics[-1]) is True:
+                                self.metric_before_clk_assignment = metrics[-1]
+                                self.reset_optimizer(opt_iter)
+                                self._confine_clock_region(opt_iter, metrics)
+                                self.last_clock_assignment_iter = cur_metric.opt_iter.iteration
+                                eval_ops["fence_region"] = self.op_cls.fence_region_op
+                                # new_metric = self.initialize_params(
+                                #     eval_ops, opt_iter, set_random_pos=False
+                                # )
+                                # logger.info("<metric after clock assignment>" + str(new_metric))
+                                # metrics.append(new_metric)
+                                self.optimizer_initial_state = copy.deepcopy(
+                                    self.optimizer.state_dict()
+                                )
+                                self.initialize_learning_rate(self.model, self.optimizer, 0.1)
+                                self.plot(
+                                    os.path.join(
+                                        self.params.plot_dir,
+                                        "iter%s_after_ck_assignment.bmp"
+                                        % ("{:04}".format(opt_iter.iteration)),
+                                    ),
+                                    opt_iter,
+                                    plot_target_at_names=self.params.plot_target_at_names,
+                                    filler_flag=True,
+                                )
+                                self.best_pos_before_ck_ssir_lg = None
+                                self.best_sol_metric = None
+                                continue
+                            self.update_gamma(opt_iter, metrics[-1].overflow)
+                        else:
+                            for opt_iter.iter_eta in range(self.params.eta_iters):
+                                for opt_iter.iter_gamma in range(self.params.gamma_ck_iters):
+                                    for opt_iter.iter_lambda in range(self.params.lambda_iters):
+                                        for opt_iter.iter_sub in range(self.params.sub_iters):
+                                            cur_metric = self.one_step(
+                                                self.optimizer, eval_ops, opt_iter
+                                            )
+                                            if (
+                                                self.params.plot_flag
+                                                and opt_iter.iteration
+                                                % self.params.plot_iteration_frequency
+                                                == 0
+                                            ):
+                                                self.plot(
+                                                    os.path.join(
+                                                        self.params.plot_dir,
+                                                        "iter%s.bmp"
+                                                        % ("{:04}".format(opt_iter.iteration)),
+                                                    ),
+                                                    opt_iter,
+                                                    filler_flag=True,
+                                                    plot_target_at_names=self.params.plot_target_at_names,
+                                                )
+                                            opt_iter.iteration += 1
+                                            metrics.append(cur_metric)
+                                            if (
+                                                self.restore_best_solution_flag is False
+                                                and cur_metric.eval_iteration
+                                                == cur_metric.opt_iter.iteration
+                                            ):
+                                                self._save_best_solution(metrics, cur_metric)
+                                    self.update_lambdas(opt_iter)
+                                self.update_gamma(opt_iter, metrics[-1].overflow)
+                            # self._update_eta()
+                            # if self._check_divergence(metrics) is True:
+                            #     assert self.best_pos_before_ck_ssir_lg is not None, "Can not find good enough solution"
+                            #     logger.info("Roll back to the best solution")
+                            #     with torch.no_grad():
+                            #         self.data_cls.pos[0].data.copy_(self.best_pos_before_ck_ssir_lg)
+                            #     self.restore_best_solution_flag = True
+
+                        # lookahead legalization for IOs
+                        if self.io_legalization_condition(opt_iter, metrics):
+                            self.io_legalization(opt_iter)
+                            self.invalidate_metrics()
+
+                            # with open("io_net.txt", "r") as f:
+                            #     lines = f.readlines()
+                            #     for line in lines:
+                            #         a, b = line.strip().split()
+                            #         a_id = self.placedb.nameToInst(a)
+                            #         b_id = self.placedb.nameToInst(b)
+                            #         print(f"{a}: {self.data_cls.io_pos_xyz[a_id][:2]}       {b}:{self.data_cls.pos[0][b_id]}")
+
+                            continue
+                        # if self.timing_weighting_condition(opt_iter, metrics):
+                        #     self.timing_weighting(opt_iter)
+                        #     continue
+
+                        # lookahead legalization for single-site resources like DSP and RAM
+                        if self._ssir_legalization_condition(metrics):
+                            if (
+                                self.params.io_legalization_flag
+                                and self.num_io_legalization == 0
+                            ):
+                                self.io_legalization(opt_iter)
+                            if self.params.dump_before_ssir_legalization_flag:
+                                logger.info("Dumping before SSIR legalization...")
+                                self.dump(
+                                    "{}/{}.before_ssir.ckpt".format(
+                                        self.params.result_dir, self.params.design_name()
                                     )
-                                    logger.info(
-                                        "[Timing Analysis] at Iter {}: max_dly={:.03f} ns, wns={:.03f} ns, tns={:.03f} ns".format(
-                                            opt_iter.iteration,
-                                            max_dly / 1e3,
-                                            wns / 1e3,
-                                            tns / 1e3,
-                                        )
+                                )
+                            logger.info("Legalize single-site resources")
+                            with self.tracer.span("ssir_legalization", "stage"):
+                                if self.params.confine_clock_region_flag:
+                                    self.op_cls.ssr_legalize_op.reset_honor_fence_region_constraints(
+                                        self.params.confine_clock_region_flag
                                     )
 
-                                opt_iter.iteration += 1
-                                metrics.append(cur_metric)
-                        self.update_lambdas(opt_iter)
-                    # adjust instance areas
-                    if self._gp_adjust_area_condition(metrics[-1]) is True:
-                        if self.params.plot_flag:
-                            self.plot(
-                                os.path.join(
-                                    self.params.plot_dir,
-                                    "iter%s_before_area_adjustment_%d.bmp"
-                                    % (
-                                        "{:04}".format(opt_iter.iteration),
-                                        self.num_gp_adjust_area,
+                                if self.op_cls.ssr_abacus_legalize_op:
+                                    self.op_cls.ssr_abacus_legalize_op(self.data_cls.pos[0])
+
+                                if self.params.macro_place_flag:
+                                    # legalize the macro first
+                                    self.op_cls.ssr_mixed_size_legalize_op(self.data_cls.pos[0])
+                                    # then legalize the single instance
+                                    self.op_cls.region_mcf_lg_op(self.data_cls.pos[0])
+                                else:
+                                    self.op_cls.ssr_legalize_op(self.data_cls.pos[0])
+                                # the legalizers lock the SSR instances, fold them into the static density maps
+                                self._lock_density_maps()
+
+                                # lock the legalized instances for ssr_legalize_lock_iters
+                                self.last_ssr_legalize_iter = opt_iter.iteration
+
+                            if self.params.macro_place_flag:
+                                inst_check_ids = (
+                                    self.op_cls.legality_macro_check_op.inst_check_ids
+                                )
+                                with torch.no_grad():
+                                    self.data_cls.inst_locs_xyz[
+                                        inst_check_ids, :2
+                                    ] = self.data_cls.pos[0][inst_check_ids]
+                                    self.data_cls.inst_locs_xyz[inst_check_ids, 2] = 0
+                                legal = self.op_cls.legality_macro_check_op(
+                                    self.data_cls.inst_locs_xyz
+                                )
+                                if not legal:
+                                    logger.warning("Macro Placement is not LEGAL")
+                                else:
+                                    logger.info("Macro placement is legal.")
+                                return
+
+                            self.reset_optimizer(opt_iter)
+
+                            # need to apply the change of gradient to the optimizer
+                            # with torch.no_grad():
+                            #    for group in optimizer.param_groups:
+                            #        for i in range(len(group['g_k'])):
+                            #            group['g_k'][i].masked_fill_(self.data_cls.inst_lock_mask.view([-1, 1]), 0)
+                            #            group['g_k_1'][i].masked_fill_(self.data_cls.inst_lock_mask.view([-1, 1]), 0)
+                            #            for area_type, lock in enumerate(self.data_cls.area_type_lock_mask):
+                            #                inst_ids = self.data_cls.area_type_inst_groups[area_type]
+                            #                if lock and len(inst_ids):
+                            #                    group['u_k'][i][inst_ids] = self.pos[0][inst_ids]
+                            #                    group['v_k_1'][i][inst_ids] = self.pos[0][inst_ids]
+                            #                    group['v_kp1'][i][inst_ids] = self.pos[0][inst_ids]
+                            #            # I found masked_scatter cannot assign the data correctly
+                            #            # group['u_k'][i].data.masked_scatter_(self.data_cls.inst_lock_mask.view([-1, 1]), self.pos[0])
+                            #            ##group['v_k'][i].data.masked_scatter_(self.data_cls.inst_lock_mask.view([-1, 1]), self.pos[0])
+                            #            # group['v_k_1'][i].data.masked_scatter_(self.data_cls.inst_lock_mask.view([-1, 1]), self.pos[0])
+                            #            # group['v_kp1'][i].data.masked_scatter_(self.data_cls.inst_lock_mask.view([-1, 1]), self.pos[0])
+                            if self.params.plot_flag:
+                                self.plot(
+                                    os.path.join(
+                                        self.params.plot_dir,
+                                        "iter%s_ssir_lg.bmp"
+                                        % ("{:04}".format(opt_iter.iteration)),
                                     ),
-                                ),
-                                opt_iter,
-                                plot_target_at_names=self.params.plot_target_at_names,
-                                filler_flag=True,
-                            )
-                        self._gp_adjust_area(metrics[-1], opt_iter)
-                        self.last_area_inflation_iter = cur_metric.opt_iter.iteration
-                        continue
-
-                    if self.timing_adjustment_condition(metrics[-1], opt_iter) is True:
-                        self.timing_adjustment(metrics[-1], opt_iter)
-                        self.last_timing_adjustment_iter = cur_metric.opt_iter.iteration
-
-                    # clock region constraints
-                    if self._confine_clock_region_condition(metrics[-1]) is True:
-                        self.metric_before_clk_assignment = metrics[-1]
-                        self.reset_optimizer(opt_iter)
-                        self._confine_clock_region(opt_iter, metrics)
-                        self.last_clock_assignment_iter = cur_metric.opt_iter.iteration
-                        eval_ops["fence_region"] = self.op_cls.fence_region_op
-                        # new_metric = self.initialize_params(
-                        #     eval_ops, opt_iter, set_random_pos=False
-                        # )
-                        # logger.info("<metric after clock assignment>" + str(new_metric))
-                        # metrics.append(new_metric)
-                        self.optimizer_initial_state = copy.deepcopy(
-                            self.optimizer.state_dict()
-                        )
-                        self.initialize_learning_rate(self.model, self.optimizer, 0.1)
-                        self.plot(
-                            os.path.join(
-                                self.params.plot_dir,
-                                "iter%s_after_ck_assignment.bmp"
-                                % ("{:04}".format(opt_iter.iteration)),
-                            ),
-                            opt_iter,
-                            plot_target_at_names=self.params.plot_target_at_names,
-                            filler_flag=True,
-                        )
-                        self.best_pos_before_ck_ssir_lg = None
-                        self.best_sol_metric = None
-                        continue
-                    self.update_gamma(opt_iter, metrics[-1].overflow)
-                else:
-                    for opt_iter.iter_eta in range(self.params.eta_iters):
-                        for opt_iter.iter_gamma in range(self.params.gamma_ck_iters):
-                            for opt_iter.iter_lambda in range(self.params.lambda_iters):
-                                for opt_iter.iter_sub in range(self.params.sub_iters):
-                                    cur_metric = self.one_step(
-                                        self.optimizer, eval_ops, opt_iter
-                                    )
-                                    if (
-                                        self.params.plot_flag
-                                        and opt_iter.iteration
-                                        % self.params.plot_iteration_frequency
-                                        == 0
-                                    ):
-                                        self.plot(
-                                            os.path.join(
-                                                self.params.plot_dir,
-                                                "iter%s.bmp"
-                                                % ("{:04}".format(opt_iter.iteration)),
-                                            ),
-                                            opt_iter,
-                                            filler_flag=True,
-                                            plot_target_at_names=self.params.plot_target_at_names,
-                                        )
-                                    opt_iter.iteration += 1
-                                    metrics.append(cur_metric)
-                                    if self.restore_best_solution_flag is False:
-                                        self._save_best_solution(metrics, cur_metric)
-                            self.update_lambdas(opt_iter)
-                        self.update_gamma(opt_iter, metrics[-1].overflow)
-                    # self._update_eta()
-                    # if self._check_divergence(metrics) is True:
-                    #     assert self.best_pos_before_ck_ssir_lg is not None, "Can not find good enough solution"
-                    #     logger.info("Roll back to the best solution")
-                    #     with torch.no_grad():
-                    #         self.data_cls.pos[0].data.copy_(self.best_pos_before_ck_ssir_lg)
-                    #     self.restore_best_solution_flag = True
-
-                # lookahead legalization for IOs
-                if self.io_legalization_condition(opt_iter, metrics):
-                    self.io_legalization(opt_iter)
-
-                    # with open("io_net.txt", "r") as f:
-                    #     lines = f.readlines()
-                    #     for line in lines:
-                    #         a, b = line.strip().split()
-                    #         a_id = self.placedb.nameToInst(a)
-                    #         b_id = self.placedb.nameToInst(b)
-                    #         print(f"{a}: {self.data_cls.io_pos_xyz[a_id][:2]}       {b}:{self.data_cls.pos[0][b_id]}")
-
-                    continue
-                # if self.timing_weighting_condition(opt_iter, metrics):
-                #     self.timing_weighting(opt_iter)
-                #     continue
-
-                # lookahead legalization for single-site resources like DSP and RAM
-                if self._ssir_legalization_condition(metrics):
-                    if (
-                        self.params.io_legalization_flag
-                        and self.num_io_legalization == 0
-                    ):
-                        self.io_legalization(opt_iter)
-                    if self.params.dump_before_ssir_legalization_flag:
-                        logger.info("Dumping before SSIR legalization...")
-                        self.dump(
-                            "{}/{}.before_ssir.pklz".format(
-                                self.params.result_dir, self.params.design_name()
-                            )
-                        )
-                    logger.info("Legalize single-site resources")
-
-                    if self.params.confine_clock_region_flag:
-                        self.op_cls.ssr_legalize_op.reset_honor_fence_region_constraints(
-                            self.params.confine_clock_region_flag
-                        )
-
-                    if self.op_cls.ssr_abacus_legalize_op:
-                        self.op_cls.ssr_abacus_legalize_op(self.data_cls.pos[0])
-
-                    if self.params.macro_place_flag:
-                        # legalize the macro first
-                        self.op_cls.ssr_mixed_size_legalize_op(self.data_cls.pos[0])
-                        # then legalize the single instance
-                        self.op_cls.region_mcf_lg_op(self.data_cls.pos[0])
-                    else:
-                        self.op_cls.ssr_legalize_op(self.data_cls.pos[0])
-
-                    # lock the legalized instances for ssr_legalize_lock_iters
-                    self.last_ssr_legalize_iter = opt_iter.iteration
+                                    opt_iter,
+                                    filler_flag=False,
+                                    plot_target_at_names=self.params.plot_target_at_names,
+                                )
+                finally:
+                    self._close_gp_checkpoints()
 
-                    if self.params.macro_place_flag:
-                        inst_check_ids = (
-                            self.op_cls.legality_macro_check_op.inst_check_ids
-                        )
-                        with torch.no_grad():
-                            self.data_cls.inst_locs_xyz[
-                                inst_check_ids, :2
-                            ] = self.data_cls.pos[0][inst_check_ids]
-                            self.data_cls.inst_locs_xyz[inst_check_ids, 2] = 0
-                        legal = self.op_cls.legality_macro_check_op(
-                            self.data_cls.inst_locs_xyz
-                        )
-                        if not legal:
-                            logger.warning("Macro Placement is not LEGAL")
-                        else:
-                            logger.info("Macro placement is legal.")
-                        return
-
-                    self.reset_optimizer(opt_iter)
-
-                    # need to apply the change of gradient to the optimizer
-                    # with torch.no_grad():
-                    #    for group in optimizer.param_groups:
-                    #        for i in range(len(group['g_k'])):
-                    #            group['g_k'][i].masked_fill_(self.data_cls.inst_lock_mask.view([-1, 1]), 0)
-                    #            group['g_k_1'][i].masked_fill_(self.data_cls.inst_lock_mask.view([-1, 1]), 0)
-                    #            for area_type, lock in enumerate(self.data_cls.area_type_lock_mask):
-                    #                inst_ids = self.data_cls.area_type_inst_groups[area_type]
-                    #                if lock and len(inst_ids):
-                    #                    group['u_k'][i][inst_ids] = self.pos[0][inst_ids]
-                    #                    group['v_k_1'][i][inst_ids] = self.pos[0][inst_ids]
-                    #                    group['v_kp1'][i][inst_ids] = self.pos[0][inst_ids]
-                    #            # I found masked_scatter cannot assign the data correctly
-                    #            # group['u_k'][i].data.masked_scatter_(self.data_cls.inst_lock_mask.view([-1, 1]), self.pos[0])
-                    #            ##group['v_k'][i].data.masked_scatter_(self.data_cls.inst_lock_mask.view([-1, 1]), self.pos[0])
-                    #            # group['v_k_1'][i].data.masked_scatter_(self.data_cls.inst_lock_mask.view([-1, 1]), self.pos[0])
-                    #            # group['v_kp1'][i].data.masked_scatter_(self.data_cls.inst_lock_mask.view([-1, 1]), self.pos[0])
-                    if self.params.plot_flag:
-                        self.plot(
-                            os.path.join(
-                                self.params.plot_dir,
-                                "iter%s_ssir_lg.bmp"
-                                % ("{:04}".format(opt_iter.iteration)),
-                            ),
-                            opt_iter,
-                            filler_flag=False,
-                            plot_target_at_names=self.params.plot_target_at_names,
+                if self.params.gp_timing_analysis_flag:
+                    max_dly, wns, tns = self.timing_analysis(self.data_cls.pos[0], opt_iter)
+                    logger.info(
+                        "[Timing Analysis] at Iter {}: max_dly={:.03f} ns, wns={:.03f} ns, tns={:.03f} ns".format(
+                            opt_iter.iteration, max_dly / 1e3, wns / 1e3, tns / 1e3
                         )
-
-            if self.params.gp_timing_analysis_flag:
-                max_dly, wns, tns = self.timing_analysis(self.data_cls.pos[0], opt_iter)
-                logger.info(
-                    "[Timing Analysis] at Iter {}: max_dly={:.03f} ns, wns={:.03f} ns, tns={:.03f} ns".format(
-                        opt_iter.iteration, max_dly / 1e3, wns / 1e3, tns / 1e3
                     )
-                )
 
-            if self.params.report_timing_flag:
-                logger.info("Timing After Global Placement...")
-                self.report_timing(opt_iter=opt_iter)
+                if self.params.report_timing_flag:
+                    logger.info("Timing After Global Placement...")
+                    self.report_timing(opt_iter=opt_iter)
 
-            # restore primordial instances size for legalization
-            self.data_cls.inst_sizes.data.copy_(self.primordial_inst_sizes)
-            # update data collections
-            self.data_cls.inst_sizes_max.data.copy_(
-                self.data_cls.inst_sizes.max(dim=1)[0]
-            )
-            self.data_cls.inst_areas.data.copy_(
-                self.data_cls.inst_sizes[..., 0] * self.data_cls.inst_sizes[..., 1]
-            )
-            self.data_cls.total_movable_areas.data.copy_(
-                self.data_cls.inst_areas[
-                    self.data_cls.movable_range[0] : self.data_cls.movable_range[1]
-                ].sum(dim=0)
-            )
-            # reset density and overflow operator to update stretched sizes
-            self.op_cls.density_op.reset()
-            self.op_cls.overflow_op.reset()
+                # restore primordial instances size for legalization
+                self.data_cls.inst_sizes.data.copy_(self.primordial_inst_sizes)
+                # update data collections
+                self.data_cls.inst_sizes_max.data.copy_(
+                    self.data_cls.inst_sizes.max(dim=1)[0]
+                )
+                self.data_cls.inst_areas.data.copy_(
+                    self.data_cls.inst_sizes[..., 0] * self.data_cls.inst_sizes[..., 1]
+                )
+                self.data_cls.total_movable_areas.data.copy_(
+                    self.data_cls.inst_areas[
+                        self.data_cls.movable_range[0] : self.data_cls.movable_range[1]
+                    ].sum(dim=0)
+                )
+                # reset density and overflow operator to update stretched sizes
+                self.op_cls.density_op.reset()
+                self.op_cls.overflow_op.reset()
 
-            physical_pos = self.data_cls.pos[0][
-                self.data_cls.movable_range[0] : self.data_cls.fixed_range[1]
-            ]
-            # self.dump("%s/%s.after_gp.pklz" % (self.params.result_dir, self.params.design_name()))
-            if self.params.confine_clock_region_flag and self.params.count_ck_cr:
-                cr_ck_counts = self.op_cls.cr_ck_counter_op(physical_pos)
-                logger.info(
-                    "CR-CK count after global placement: {}".format(
-                        iarray2str(cr_ck_counts)
+                physical_pos = self.data_cls.pos[0][
+                    self.data_cls.movable_range[0] : self.data_cls.fixed_range[1]
+                ]
+                # self.dump("%s/%s.after_gp.pklz" % (self.params.result_dir, self.params.design_name()))
+                if self.params.confine_clock_region_flag and self.params.count_ck_cr:
+                    cr_ck_counts = self.op_cls.cr_ck_counter_op(physical_pos)
+                    logger.info(
+                        "CR-CK count after global placement: {}".format(
+                            iarray2str(cr_ck_counts)
+                        )
                     )
-                )
 
-            logger.info("global placement takes %.3f seconds" % (time.time() - tt))
+                logger.info("global placement takes %.3f seconds" % (time.time() - tt))
 
         if (
             self.params.global_place_flag
             and self.params.dump_global_place_solution_flag
         ):
             self.dump(
-                "%s/%s.gp.pklz" % (self.params.result_dir, self.params.design_name())
+                "%s/%s.gp.ckpt" % (self.params.result_dir, self.params.design_name())
             )
 
         if (
@@ -1838,79 +2066,87 @@ class Placer(nn.Module):
                 )
             )
         if self.params.legalize_flag:
-            tt = time.time()
-            if self.params.carry_chain_legalization_flag:
-                assert self.data_cls.io_pos_xyz is not None
-                pos_xyz = self.data_cls.io_pos_xyz.to(self.device).to(self.dtype)
-                with torch.no_grad():
-                    pos_xyz[:, :2].data.copy_(pos[: self.data_cls.movable_range[1]])
-                logger.info("Start Carry Chain Legalization...")
-                self.op_cls.chain_legalization_op(pos_xyz)
-                self.op_cls.masked_direct_lg_op(pos_xyz)
-            else:
-                if self.params.confine_clock_region_flag:
-                    self.op_cls.direct_lg_op.reset_honor_fence_region_constraints(
-                        self.params.confine_clock_region_flag
-                    )
-                    self.op_cls.direct_lg_op.reset_clock_available_clock_region(
-                        self.data_cls.clock_available_clock_region
-                    )
-                # legalize LUTs and FFs
-                if self.params.confine_clock_region_flag:
-                    (
-                        pos_xyz,
-                        self.data_cls.half_column_available_clock_region,
-                    ) = self.op_cls.direct_lg_op(pos)
+            with self.tracer.span("legalization", "stage"):
+                tt = time.time()
+                if self.params.carry_chain_legalization_flag:
+                    assert self.data_cls.io_pos_xyz is not None
+                    pos_xyz = self.data_cls.io_pos_xyz.to(self.device).to(self.dtype)
+                    with torch.no_grad():
+                        pos_xyz[:, :2].data.copy_(pos[: self.data_cls.movable_range[1]])
+                    logger.info("Start Carry Chain Legalization...")
+                    self.op_cls.chain_legalization_op(pos_xyz)
+                    self.op_cls.masked_direct_lg_op(pos_xyz)
                 else:
-                    pos_xyz = self.op_cls.direct_lg_op(pos)
+                    if self.params.confine_clock_region_flag:
+                        self.op_cls.direct_lg_op.reset_honor_fence_region_constraints(
+                            self.params.confine_clock_region_flag
+                        )
+                        self.op_cls.direct_lg_op.reset_clock_available_clock_region(
+                            self.data_cls.clock_available_clock_region
+                        )
+                    # legalize LUTs and FFs
+                    if self.params.confine_clock_region_flag:
+                        (
+                            pos_xyz,
+                            self.data_cls.half_column_available_clock_region,
+                        ) = self.op_cls.direct_lg_op(pos)
+                    else:
+                        pos_xyz = self.op_cls.direct_lg_op(pos)
+                    logger.info(
+                        "direct legalization phases: %s"
+                        % ", ".join(
+                            "%s %.3f ms" % item
+                            for item in self.op_cls.direct_lg_op.phase_times().items()
+                        )
+                    )
 
-            # apply solution
-            loc_xyz = pos_xyz[
-                self.data_cls.movable_range[0] : self.data_cls.movable_range[1]
-            ]
-            self.data_cls.pos[0][
-                self.data_cls.movable_range[0] : self.data_cls.movable_range[1]
-            ].data.copy_(loc_xyz[:, :2])
-            self.data_cls.inst_locs_xyz[
-                self.data_cls.movable_range[0] : self.data_cls.movable_range[1]
-            ].data.copy_(loc_xyz)
-
-            # evaluate
-            opt_iter.iteration += 1
-            cur_metric = EvalMetric(self.params, copy.deepcopy(opt_iter))
-            cur_metric.evaluate(self.data_cls, eval_ops, self.data_cls.pos[0])
-            metrics.append(cur_metric)
-            logger.info(cur_metric)
-            if self.visualization_writer is not None:
-                self.visualization_writer.recordMetric(cur_metric)
-            if self.params.count_ck_cr:
-                physical_pos = pos[
-                    self.data_cls.movable_range[0] : self.data_cls.fixed_range[1]
+                # apply solution
+                loc_xyz = pos_xyz[
+                    self.data_cls.movable_range[0] : self.data_cls.movable_range[1]
                 ]
-                cr_ck_count = self.op_cls.cr_ck_counter_op(physical_pos)
-                logger.info(
-                    "CR-CK Count after direct legalization: {}".format(
-                        iarray2str(cr_ck_count)
-                    )
-                )
-            if not legality_check_done:
-                if self.params.architecture_name == "xarch":
-                    legal = self.op_cls.legality_check_op(
-                        self.data_cls.inst_locs_xyz, arch="xarch"
+                self.data_cls.pos[0][
+                    self.data_cls.movable_range[0] : self.data_cls.movable_range[1]
+                ].data.copy_(loc_xyz[:, :2])
+                self.data_cls.inst_locs_xyz[
+                    self.data_cls.movable_range[0] : self.data_cls.movable_range[1]
+                ].data.copy_(loc_xyz)
+
+                # evaluate
+                opt_iter.iteration += 1
+                cur_metric = EvalMetric(self.params, copy.deepcopy(opt_iter))
+                cur_metric.evaluate(self.data_cls, eval_ops, self.data_cls.pos[0])
+                metrics.append(cur_metric)
+                logger.info(cur_metric)
+                if self.visualization_writer is not None:
+                    self.visualization_writer.recordMetric(cur_metric)
+                if self.params.count_ck_cr:
+                    physical_pos = pos[
+                        self.data_cls.movable_range[0] : self.data_cls.fixed_range[1]
+                    ]
+                    cr_ck_count = self.op_cls.cr_ck_counter_op(physical_pos)
+                    logger.info(
+                        "CR-CK Count after direct legalization: {}".format(
+                            iarray2str(cr_ck_count)
+                        )
                     )
-                else:
-                    legal = self.op_cls.legality_check_op(self.data_cls.inst_locs_xyz)
-                if not legal:
-                    logger.warning("Placement is not LEGAL")
-                legality_check_done = True
-            if self.params.gp_timing_analysis_flag or debug_timing_flag:
-                max_dly, wns, tns = self.timing_analysis(self.data_cls.pos[0], opt_iter)
-                logger.info(
-                    "[Timing Analysis] after legalization: max_dly={:.03f} ns, wns={:.03f} ns, tns={:.03f} ns".format(
-                        max_dly / 1e3, wns / 1e3, tns / 1e3
+                if not legality_check_done:
+                    if self.params.architecture_name == "xarch":
+                        legal = self.op_cls.legality_check_op(
+                            self.data_cls.inst_locs_xyz, arch="xarch"
+                        )
+                    else:
+                        legal = self.op_cls.legality_check_op(self.data_cls.inst_locs_xyz)
+                    if not legal:
+                        logger.warning("Placement is not LEGAL")
+                    legality_check_done = True
+                if self.params.gp_timing_analysis_flag or debug_timing_flag:
+                    max_dly, wns, tns = self.timing_analysis(self.data_cls.pos[0], opt_iter)
+                    logger.info(
+                        "[Timing Analysis] after legalization: max_dly={:.03f} ns, wns={:.03f} ns, tns={:.03f} ns".format(
+                            max_dly / 1e3, wns / 1e3, tns / 1e3
+                        )
                     )
-                )
-            logger.info("legalization takes %.3f seconds" % (time.time() - tt))
+                logger.info("legalization takes %.3f seconds" % (time.time() - tt))
 
         # plot legalization iteration
         if self.params.plot_flag:
@@ -1926,7 +2162,7 @@ class Placer(nn.Module):
 
         if self.params.legalize_flag and self.params.dump_legalize_solution_flag:
             self.dump(
-                "%s/%s.lg.pklz" % (self.params.result_dir, self.params.design_name())
+                "%s/%s.lg.ckpt" % (self.params.result_dir, self.params.design_name())
             )
 
         if not self.params.legalize_flag and self.params.load_legalize_solution_file:
@@ -1935,71 +2171,79 @@ class Placer(nn.Module):
 
         # detailed placement
         if self.params.detailed_place_flag:
-            tt = time.time()
-            if not legality_check_done:
-                legal = self.op_cls.legality_check_op(self.data_cls.inst_locs_xyz)
-                if not legal:
-                    logger.warning("Placement is not LEGAL")
-                legality_check_done = True
-            if self.params.confine_clock_region_flag:
-                self.op_cls.ism_dp_op.reset_honor_clock_constraints(
-                    self.params.confine_clock_region_flag
-                )
-                self.op_cls.ism_dp_op.reset_clock_available_clock_region(
-                    self.data_cls.clock_available_clock_region
-                )
-                self.op_cls.ism_dp_op.reset_half_column_available_clock_region(
-                    self.data_cls.half_column_available_clock_region
-                )
-            if self.params.io_legalization_flag:
-                chain_at_name = self.params.carry_chain_at_name
-                chain_at_id = self.placedb.getAreaTypeIndexFromName(chain_at_name)
-                inst_ids = self.data_cls.area_type_inst_groups[chain_at_id]
-                inst_ids = inst_ids[
-                    torch.logical_and(
-                        self.data_cls.movable_range[0] <= inst_ids,
-                        inst_ids < self.data_cls.movable_range[1],
+            with self.tracer.span("detailed_place", "stage"):
+                tt = time.time()
+                if not legality_check_done:
+                    legal = self.op_cls.legality_check_op(self.data_cls.inst_locs_xyz)
+                    if not legal:
+                        logger.warning("Placement is not LEGAL")
+                    legality_check_done = True
+                if self.params.confine_clock_region_flag:
+                    self.op_cls.ism_dp_op.reset_honor_clock_constraints(
+                        self.params.confine_clock_region_flag
                     )
-                ]
-                fixed_mask = torch.zeros(
-                    self.data_cls.inst_locs_xyz.shape[0],
-                    dtype=torch.uint8,
-                    device="cpu",
-                    requires_grad=False,
-                )
-                fixed_mask[inst_ids] = 1
-                self.op_cls.ism_dp_op.fixed_mask = fixed_mask
-            loc_xyz = self.op_cls.ism_dp_op(self.data_cls.inst_locs_xyz)
-            # apply solution
-            pos_xyz = loc_xyz[
-                self.data_cls.movable_range[0] : self.data_cls.movable_range[1]
-            ]
-            self.data_cls.pos[0][
-                self.data_cls.movable_range[0] : self.data_cls.movable_range[1]
-            ].data.copy_(pos_xyz[:, :2])
-            # convert to lower left
-            self.data_cls.inst_locs_xyz[
-                self.data_cls.movable_range[0] : self.data_cls.movable_range[1]
-            ].data.copy_(pos_xyz)
-            # evaluate
-            opt_iter.iteration += 1
-            cur_metric = EvalMetric(self.params, copy.deepcopy(opt_iter))
-            cur_metric.evaluate(self.data_cls, eval_ops, self.data_cls.pos[0])
-            metrics.append(cur_metric)
-            legality_check_done = False
-            if not legality_check_done:
-                legal = self.op_cls.legality_check_op(self.data_cls.inst_locs_xyz)
-                if not legal:
-                    logger.warning("Placement is not LEGAL")
-                legality_check_done = True
-            if self.params.gp_timing_analysis_flag:
-                max_dly, wns, tns = self.timing_analysis(self.data_cls.pos[0], opt_iter)
+                    self.op_cls.ism_dp_op.reset_clock_available_clock_region(
+                        self.data_cls.clock_available_clock_region
+                    )
+                    self.op_cls.ism_dp_op.reset_half_column_available_clock_region(
+                        self.data_cls.half_column_available_clock_region
+                    )
+                if self.params.io_legalization_flag:
+                    chain_at_name = self.params.carry_chain_at_name
+                    chain_at_id = self.placedb.getAreaTypeIndexFromName(chain_at_name)
+                    inst_ids = self.data_cls.area_type_inst_groups[chain_at_id]
+                    inst_ids = inst_ids[
+                        torch.logical_and(
+                            self.data_cls.movable_range[0] <= inst_ids,
+                            inst_ids < self.data_cls.movable_range[1],
+                        )
+                    ]
+                    fixed_mask = torch.zeros(
+                        self.data_cls.inst_locs_xyz.shape[0],
+                        dtype=torch.uint8,
+                        device="cpu",
+                        requires_grad=False,
+                    )
+                    fixed_mask[inst_ids] = 1
+                    self.op_cls.ism_dp_op.fixed_mask = fixed_mask
+                loc_xyz = self.op_cls.ism_dp_op(self.data_cls.inst_locs_xyz)
                 logger.info(
-                    "[Timing Analysis] after detailed placement: max_dly={:.03f} ns, wns={:.03f} ns, tns={:.03f} ns".format(
-                        max_dly / 1e3, wns / 1e3, tns / 1e3
+                    "ISM detailed placement phases: %s"
+                    % ", ".join(
+                        "%s %.3f ms" % item
+                        for item in self.op_cls.ism_dp_op.phase_times().items()
                     )
                 )
-            logger.info("detailed placement takes %.3f seconds" % ((time.time() - tt)))
+                # apply solution
+                pos_xyz = loc_xyz[
+                    self.data_cls.movable_range[0] : self.data_cls.movable_range[1]
+                ]
+                self.data_cls.pos[0][
+                    self.data_cls.movable_range[0] : self.data_cls.movable_range[1]
+                ].data.copy_(pos_xyz[:, :2])
+                # convert to lower left
+                self.data_cls.inst_locs_xyz[
+                    self.data_cls.movable_range[0] : self.data_cls.movable_range[1]
+                ].data.copy_(pos_xyz)
+                # evaluate
+                opt_iter.iteration += 1
+                cur_metric = EvalMetric(self.params, copy.deepcopy(opt_iter))
+                cur_metric.evaluate(self.data_cls, eval_ops, self.data_cls.pos[0])
+                metrics.append(cur_metric)
+                legality_check_done = False
+                if not legality_check_done:
+                    legal = self.op_cls.legality_check_op(self.data_cls.inst_locs_xyz)
+                    if not legal:
+                        logger.warning("Placement is not LEGAL")
+                    legality_check_done = True
+                if self.params.gp_timing_analysis_flag:
+                    max_dly, wns, tns = self.timing_analysis(self.data_cls.pos[0], opt_iter)
+                    logger.info(
+                        "[Timing Analysis] after detailed placement: max_dly={:.03f} ns, wns={:.03f} ns, tns={:.03f} ns".format(
+                            max_dly / 1e3, wns / 1e3, tns / 1e3
+                        )
+                    )
+                logger.info("detailed placement takes %.3f seconds" % ((time.time() - tt)))
             if self.params.report_timing_flag:
                 logger.info("Timing After Detailed Placement...")
                 self.report_timing(opt_iter=opt_iter)
@@ -2041,13 +2285,17 @@ class Placer(nn.Module):
                 avg_at_grad_norm = at_grad.norm(dim=1).mean()
                 logger.info("at_type: %d, avg-norm: %g", at_type, avg_at_grad_norm)
 
+    @traced("gp_iteration")
     def one_step(self, optimizer, eval_ops, opt_iter):
-        """@brief forward one step"""
+        """@brief forward one step.
+        HPWL and overflow are evaluated every `gp_metric_eval_stride` iterations;
+        the steps in between inherit the latest evaluated metrics without any host sync.
+        """
         pos = self.data_cls.pos[0]
         cur_metric = EvalMetric(self.params, copy.deepcopy(opt_iter))
         cur_metric.gamma = self.data_cls.gamma.gamma.data
         cur_metric.lambdas = self.data_cls.multiplier.lambdas.data
-        cur_metric.step_size = self.data_cls.multiplier.t.item()
+        step_size = self.data_cls.multiplier.t.data.clone()
         if (
             self.num_confine_fence_region is not None
             and self.num_confine_fence_region > 0
@@ -2063,10 +2311,16 @@ class Placer(nn.Module):
         optimizer.step(cur_metric=cur_metric)
         logger.debug("optimizer step %.3f ms" % ((time.time() - tt) * 1000))
 
-        cur_metric.evaluate(self.data_cls, eval_ops, pos)
         # nesterov has already computed the objective of the next step
         cur_metric.objective = optimizer.param_groups[0]["obj_k_1"][0].data.clone()
 
+        if not self._metric_eval_due(opt_iter):
+            cur_metric.inherit_evaluation(self.latest_eval_metric)
+            return cur_metric
+
+        cur_metric.step_size = step_size.item()
+        cur_metric.evaluate(self.data_cls, eval_ops, pos)
+
         if (
             self.params.count_ck_cr
             and self.num_confine_fence_region is not None
@@ -2089,12 +2343,27 @@ class Placer(nn.Module):
             # cur_metric.cr_ck_count = self.op_cls.cr_ck_counter_op(physical_pos)
 
             # cur_metric.cr_ck_count = None
+        self.latest_eval_metric = cur_metric
         # actually reports the metric before step
         logger.info(cur_metric)
         if self.visualization_writer is not None:
             self.visualization_writer.recordMetric(cur_metric)
         return cur_metric
 
+    def _metric_eval_due(self, opt_iter):
+        """Whether one_step should evaluate the metrics at this iteration"""
+        return (
+            self.latest_eval_metric is None
+            or opt_iter.iteration - self.latest_eval_metric.eval_iteration
+            >= self.params.gp_metric_eval_stride
+        )
+
+    def invalidate_metrics(self):
+        """Force the next step to evaluate the metrics,
+        e.g., after legalization or area adjustment changes the placement.
+        """
+        self.latest_eval_metric = None
+
     def update_gamma(self, opt_iter, overflow):
         """
         @brief update gamma in wirelength model
@@ -2476,6 +2745,17 @@ class Placer(nn.Module):
         for param_group in optimizer.param_groups:
             param_group["lr"] = learning_rate.data
 
+    def _previous_evaluated_metric(self, metrics):
+        """The latest metric evaluated before the one metrics[-1] carries.
+        Consecutive metrics share the same evaluation under gp_metric_eval_stride,
+        so comparing metrics[-1] with metrics[-2] is not enough.
+        """
+        eval_iteration = metrics[-1].eval_iteration if len(metrics) else None
+        for metric in reversed(metrics[:-1]):
+            if metric.eval_iteration != eval_iteration:
+                return metric
+        return None
+
     def stop_condition(self, metrics):
         """Stop condition"""
         # maximum iteration reached
@@ -2486,7 +2766,8 @@ class Placer(nn.Module):
             return True
 
             # do not stop if HPWL is still improving
-        if len(metrics) > 1 and metrics[-1].hpwl.sum() < metrics[-2].hpwl.sum():
+        prev_metric = self._previous_evaluated_metric(metrics)
+        if prev_metric is not None and metrics[-1].hpwl.sum() < prev_metric.hpwl.sum():
             return False
 
         # do not stop if some area types have not reached stop overflow
@@ -2605,46 +2886,406 @@ class Placer(nn.Module):
             iteration=opt_iter.iteration,
         )
 
-    def dump(self, filename):
-        """@brief Dump placement data"""
+    def checkpoint_state(self, opt_iter=None):
+        """Collect the global placement state as named tensors and JSON metadata,
+        see openparf/py_utils/checkpoint.py for the file format.
+
+        :param opt_iter: current optimization iteration, if any
+        :return: (dict from names to tensors, metadata)
+        """
+        tensors = OrderedDict()
+        meta = OrderedDict()
+        tensors["data_cls.pos"] = self.data_cls.pos[0]
+        values = OrderedDict()
+        for path in self.checkpoint_data_attrs:
+            value = _get_attr_path(self.data_cls, path)
+            if isinstance(value, torch.Tensor):
+                tensors["data_cls." + path] = value
+            elif _is_json_value(value):
+                values[path] = value
+            elif value is not _missing:
+                logger.warning(
+                    "skip data_cls.%s of type %s in checkpoint" % (path, type(value))
+                )
+        meta["data_cls"] = values
+        # stretched sizes are derived from the instance sizes at the latest reset
+        for op_name in ("density_op", "overflow_op"):
+            op = getattr(self.op_cls, op_name)
+            for attr in ("inst_sizes_stretched", "inst_weights"):
+                tensors["op_cls.%s.%s" % (op_name, attr)] = getattr(op, attr)
+        if self.optimizer is not None:
+            meta["optimizer"] = _param_group_state(
+                "optimizer",
+                self.optimizer.param_groups[0],
+                self.data_cls.pos[0],
+                tensors,
+            )
+        if self.optimizer_initial_state is not None:
+            meta["optimizer_initial_state"] = _param_group_state(
+                "optimizer_initial_state",
+                self.optimizer_initial_state["param_groups"][0],
+                self.data_cls.pos[0],
+                tensors,
+            )
+        if opt_iter is not None:
+            meta["opt_iter"] = dict(vars(opt_iter))
+        tensors["rng.torch"] = torch.get_rng_state()
+        if self.device.type == "cuda":
+            tensors["rng.torch_cuda"] = torch.cuda.get_rng_state(self.device)
+        np_state = np.random.get_state()
+        tensors["rng.numpy"] = torch.from_numpy(np_state[1].astype(np.int64))
+        meta["rng"] = {"numpy": [np_state[0], int(np_state[2]), int(np_state[3]), float(np_state[4])]}
+        meta["devices"] = {name: str(t.device) for name, t in tensors.items()}
+        return tensors, meta
+
+    def _restore_data_attr(self, path, tensors, meta):
+        name = "data_cls." + path
+        if name in tensors:
+            saved = tensors[name]
+            current = _get_attr_path(self.data_cls, path)
+            if (
+                isinstance(current, torch.Tensor)
+                and current.shape == saved.shape
+                and current.dtype == saved.dtype
+            ):
+                # in place, as ops may hold references to data collections
+                current.data.copy_(saved)
+            else:
+                device = self.device if meta["devices"][name].startswith("cuda") else "cpu"
+                _set_attr_path(self.data_cls, path, saved.to(device, copy=True))
+        elif path in meta["data_cls"]:
+            _set_attr_path(self.data_cls, path, meta["data_cls"][path])
+
+    def restore_checkpoint_state(self, tensors, meta, restore_optimizer=True):
+        """Restore the state collected by checkpoint_state.
+
+        :param tensors: named tensors of the checkpoint
+        :param meta: metadata of the checkpoint
+        :param restore_optimizer: whether restore the optimizer state into self.optimizer
+        :return: the saved optimization iteration, or None
+        """
+        pos = self.data_cls.pos[0]
+        pos.data.copy_(tensors["data_cls.pos"])
+        for path in self.checkpoint_data_attrs:
+            self._restore_data_attr(path, tensors, meta)
+        for op_name in ("density_op", "overflow_op"):
+            op = getattr(self.op_cls, op_name)
+            op.reset()
+            for attr in ("inst_sizes_stretched", "inst_weights"):
+                getattr(op, attr).data.copy_(tensors["op_cls.%s.%s" % (op_name, attr)])
+        self._lock_density_maps()
+        if restore_optimizer and "optimizer" in meta:
+            assert self.optimizer is not None
+            _restore_param_group(
+                "optimizer",
+                meta["optimizer"],
+                tensors,
+                self.optimizer.param_groups[0],
+                pos,
+                self.device,
+            )
+        if restore_optimizer and "optimizer_initial_state" in meta:
+            group = {"params": [0]}
+            _restore_param_group(
+                "optimizer_initial_state",
+                meta["optimizer_initial_state"],
+                tensors,
+                group,
+                pos,
+                self.device,
+            )
+            self.optimizer_initial_state = {"state": {}, "param_groups": [group]}
+        torch.set_rng_state(tensors["rng.torch"].clone())
+        if self.device.type == "cuda" and "rng.torch_cuda" in tensors:
+            torch.cuda.set_rng_state(tensors["rng.torch_cuda"].clone(), self.device)
+        np_state = meta["rng"]["numpy"]
+        np.random.set_state(
+            (
+                np_state[0],
+                tensors["rng.numpy"].numpy().astype(np.uint32),
+                np_state[1],
+                np_state[2],
+                np_state[3],
+            )
+        )
+        if "opt_iter" in meta:
+            return OptIter(**meta["opt_iter"])
+        return None
+
+    def gp_loop_state(self, metrics, tensors, meta):
+        """Add the bookkeeping of the global placement loop and the metric history
+        to a checkpoint collected by checkpoint_state.
+
+        :param metrics: metrics of the global placement so far
+        :param tensors: named tensors of the checkpoint, updated in place
+        :param meta: metadata of the checkpoint, updated in place
+        """
+        values = OrderedDict()
+        tuples = OrderedDict()
+        for attr in self.checkpoint_loop_attrs:
+            value = getattr(self, attr, None)
+            name = "placer." + attr
+            if isinstance(value, torch.Tensor):
+                tensors[name] = value
+            elif isinstance(value, tuple):
+                # e.g., the (max delay, WNS, TNS) of the latest timing analysis
+                items = []
+                for i, x in enumerate(value):
+                    if isinstance(x, torch.Tensor):
+                        tensors["%s.%d" % (name, i)] = x
+                        items.append({"kind": "tensor"})
+                    elif _is_json_value(x):
+                        items.append({"kind": "value", "value": x})
+                    else:
+                        raise TypeError(
+                            "cannot save item %d of type %s of %s to checkpoint"
+                            % (i, type(x), name)
+                        )
+                tuples[attr] = items
+            elif _is_json_value(value):
+                values[attr] = value
+            else:
+                raise TypeError(
+                    "cannot save %s of type %s to checkpoint" % (name, type(value))
+                )
+        meta["placer"] = values
+        meta["placer_tuples"] = tuples
+
+        def index_of(metric):
+            for i, m in enumerate(metrics):
+                if m is metric:
+                    return i
+            if metric is not None:
+                logger.warning("metric not in the history is not saved to checkpoint")
+            return None
+
+        history = OrderedDict()
+        history["opt_iters"] = [dict(vars(m.opt_iter)) for m in metrics]
+        for attr in self.checkpoint_metric_attrs:
+            history[attr] = [getattr(m, attr) for m in metrics]
+        history["at_avg_grad_norms"] = (
+            metrics[-1].at_avg_grad_norms if metrics else None
+        )
+        history["metric_before_clk_assignment"] = index_of(
+            self.metric_before_clk_assignment
+        )
+        history["best_sol_metric"] = index_of(self.best_sol_metric)
+        history["latest_eval_metric"] = index_of(self.latest_eval_metric)
+        meta["metrics"] = history
+        if metrics:
+            tensors["metrics.hpwl"] = torch.stack([m.hpwl for m in metrics])
+            tensors["metrics.overflow"] = torch.stack([m.overflow for m in metrics])
+
+    def restore_gp_loop_state(self, tensors, meta):
+        """Restore the state added by gp_loop_state.
+
+        :param tensors: named tensors of the checkpoint
+        :param meta: metadata of the checkpoint
+        :return: the metric history
+        """
+        def restore_tensor(name):
+            device = self.device if meta["devices"][name].startswith("cuda") else "cpu"
+            return tensors[name].to(device, copy=True)
+
+        for attr in self.checkpoint_loop_attrs:
+            name = "placer." + attr
+            if name in tensors:
+                setattr(self, attr, restore_tensor(name))
+            elif attr in meta.get("placer_tuples", {}):
+                value = tuple(
+                    restore_tensor("%s.%d" % (name, i))
+                    if item["kind"] == "tensor"
+                    else item["value"]
+                    for i, item in enumerate(meta["placer_tuples"][attr])
+                )
+                setattr(self, attr, value)
+            elif attr in meta["placer"]:
+                setattr(self, attr, meta["placer"][attr])
+
+        history = meta["metrics"]
+        metrics = []
+        for i, opt_iter in enumerate(history["opt_iters"]):
+            metric = EvalMetric(self.params, OptIter(**opt_iter))
+            metric.hpwl = tensors["metrics.hpwl"][i].to(self.device, copy=True)
+            metric.overflow = tensors["metrics.overflow"][i].to(self.device, copy=True)
+            for attr in self.checkpoint_metric_attrs:
+                setattr(metric, attr, history[attr][i])
+            metrics.append(metric)
+        if metrics:
+            metrics[-1].at_avg_grad_norms = history["at_avg_grad_norms"]
+
+        def metric_at(index):
+            return metrics[index] if index is not None else None
+
+        self.metric_before_clk_assignment = metric_at(
+            history["metric_before_clk_assignment"]
+        )
+        self.best_sol_metric = metric_at(history["best_sol_metric"])
+        self.latest_eval_metric = metric_at(history["latest_eval_metric"])
+        return metrics
+
+    def _gp_checkpoint_condition(self, opt_iter):
+        if self.checkpoint_writer is None or (
+            opt_iter.iteration == self.last_gp_checkpoint_iter
+        ):
+            return False
+        if (
+            self.params.gp_checkpoint_iters > 0
+            and opt_iter.iteration - self.last_gp_checkpoint_iter
+            >= self.params.gp_checkpoint_iters
+        ):
+            return True
+        return (
+            self.params.gp_checkpoint_minutes > 0
+            and time.time() - self.last_gp_checkpoint_time
+            >= self.params.gp_checkpoint_minutes * 60
+        )
+
+    def _gp_checkpoint_prefix(self):
+        return "%s.gp.iter" % self.params.design_name()
+
+    def _gp_checkpoint_dir(self):
+        if self.params.gp_checkpoint_dir:
+            return self.params.gp_checkpoint_dir
+        return os.path.join(self.params.result_dir, "checkpoints")
+
+    def _open_gp_checkpoints(self, opt_iter):
+        """Start the background writer of rolling checkpoints if they are enabled"""
+        self.last_gp_checkpoint_iter = opt_iter.iteration
+        self.last_gp_checkpoint_time = time.time()
+        if (
+            self.params.gp_checkpoint_iters > 0
+            or self.params.gp_checkpoint_minutes > 0
+        ):
+            self.checkpoint_writer = checkpoint.CheckpointWriter(
+                self._gp_checkpoint_dir(),
+                self._gp_checkpoint_prefix(),
+                self.params.gp_checkpoint_keep,
+                self.params.checkpoint_compression or "none",
+            )
+
+    def write_trace(self):
+        """@brief write the timeline of the traced stages and log their summary"""
+        if not self.tracer.enabled:
+            return
+        # spans still open, if any, e.g., when writing the trace in the middle of a stage
+        self.tracer.end_all()
+        filename = self.params.trace_file or "%s/%s.trace.json" % (
+            self.params.result_dir,
+            self.params.design_name(),
+        )
+        self.tracer.write_chrome_trace(filename)
+        logger.info("write trace to %s" % filename)
+        if self.tracer.num_dropped_events:
+            logger.warning(
+                "%d events are not in the trace, increase trace_max_events to keep them"
+                % self.tracer.num_dropped_events
+            )
+        logger.info("Stage summary\n%s" % self.tracer.summary())
+
+    def _close_gp_checkpoints(self):
+        if self.checkpoint_writer is not None:
+            self.checkpoint_writer.close()
+            self.checkpoint_writer = None
+
+    def save_gp_checkpoint(self, opt_iter, metrics):
+        """Submit a rolling checkpoint of global placement to the background writer.
+        Only the device-to-host copy happens on the placement thread.
+        """
+        tensors, meta = self.checkpoint_state(opt_iter)
+        self.gp_loop_state(metrics, tensors, meta)
+        meta["devices"] = {name: str(t.device) for name, t in tensors.items()}
+        self.checkpoint_writer.submit(opt_iter.iteration, tensors, meta)
+        self.last_gp_checkpoint_iter = opt_iter.iteration
+        self.last_gp_checkpoint_time = time.time()
+
+    def gp_resume_file(self):
+        """The checkpoint to resume global placement from, None if not resuming.
+        A directory means the latest rolling checkpoint in it.
+        """
+        filename = self.params.gp_resume_file
+        if not filename:
+            return None
+        if os.path.isdir(filename):
+            candidates = checkpoint.list_checkpoints(
+                filename, self._gp_checkpoint_prefix()
+            )
+            assert candidates, "no checkpoint of %s found in %s" % (
+                self.params.design_name(),
+                filename,
+            )
+            filename = candidates[-1]
+        return filename
+
+    def resume_gp(self, filename, eval_ops):
+        """Resume global placement from a rolling checkpoint written by save_gp_checkpoint.
+        Rebuild the clock region model and optimizer if the checkpoint is taken after
+        clock region assignment.
+
+        :param filename: path of the checkpoint
+        :param eval_ops: evaluation ops of the global placement loop, updated in place
+        :return: (optimization iteration, metric history)
+        """
+        logger.info("resume global placement from %s" % filename)
+        tensors, meta = checkpoint.load_checkpoint(filename)
+        assert "placer" in meta, "%s is not a global placement checkpoint" % filename
+        metrics = self.restore_gp_loop_state(tensors, meta)
+        clock_stage = self.last_clock_assignment_iter is not None
+        if clock_stage:
+            self._build_fence_region_model()
+        opt_iter = self.restore_checkpoint_state(tensors, meta, restore_optimizer=True)
+        if clock_stage:
+            self._reset_clock_region_ops()
+            eval_ops["fence_region"] = self.op_cls.fence_region_op
+        return opt_iter, metrics
+
+    def dump(self, filename, opt_iter=None):
+        """@brief Dump placement data as a checkpoint
+        @param filename path of the checkpoint
+        @param opt_iter current optimization iteration, if any
+        """
         logger.debug("write to %s" % filename)
-        # TODO: fix
-        inst_to_clock_indexes_bk, cr_map_bk = None, None
         try:
-            if not os.path.exists(os.path.dirname(filename)):
-                os.makedirs(os.path.dirname(filename))
-            if self.data_cls.cr_map:
-                inst_to_clock_indexes_bk = self.data_cls.inst_to_clock_indexes
-                cr_map_bk = self.data_cls.cr_map
-            self.data_cls.inst_to_clock_indexes = None
-            self.data_cls.cr_map = None
-            self.data_cls.site_bboxes = None
-            self.data_cls.chain_info_vec = None
-            self.data_cls.ssr_chain_info_vec = None
-            with gzip.open(filename, "wb") as f:
-                pickle.dump(
-                    {
-                        "data_cls": self.data_cls,
-                        "density_op": self.op_cls.density_op,
-                        "overflow_op": self.op_cls.overflow_op,
-                    },
-                    f,
-                )
+            tensors, meta = self.checkpoint_state(opt_iter)
+            checkpoint.save_checkpoint(
+                filename, tensors, meta, self.params.checkpoint_compression or "none"
+            )
         except Exception as e:
             logger.warning("Error occurs when dump data collection: {}".format(e))
-        finally:
-            if inst_to_clock_indexes_bk is not None:
-                self.data_cls.inst_to_clock_indexes = inst_to_clock_indexes_bk
-                self.data_cls.cr_map = cr_map_bk
-            self.data_cls.site_bboxes = self.placedb.collectSiteBoxes()
 
-    def load_gp(self, filename):
+    def load_gp(self, filename, restore_optimizer=False):
         """Load the intermediate state of global placement, including the instance positions
 
-        :param filename:
-        :return:
+        :param filename: checkpoint written by dump, or a legacy pickle dump
+        :param restore_optimizer: whether restore the optimizer state as well
+        :return: the saved optimization iteration, or None
         """
         logger.debug("read from %s" % filename)
+        if not checkpoint.is_checkpoint(filename):
+            logger.warning("%s is a legacy pickle dump" % filename)
+            self._load_gp_pickle(filename)
+            return None
+        tensors, meta = checkpoint.load_checkpoint(filename)
+        return self.restore_checkpoint_state(tensors, meta, restore_optimizer)
+
+    def load(self, filename):
+        """@brief Load the placement solution, i.e., positions and clock region assignment"""
+        logger.debug("read from %s" % filename)
+        if not checkpoint.is_checkpoint(filename):
+            logger.warning("%s is a legacy pickle dump" % filename)
+            self._load_pickle(filename)
+            return
+        try:
+            tensors, meta = checkpoint.load_checkpoint(filename)
+            self.data_cls.pos[0].data.copy_(tensors["data_cls.pos"])
+            for path in self.checkpoint_solution_attrs:
+                self._restore_data_attr(path, tensors, meta)
+            self._lock_density_maps()
+        except Exception as e:
+            logger.warning("Error occurs when reading initial solution: {}".format(e))
+
+    def _load_gp_pickle(self, filename):
+        """Load the intermediate state of global placement from a legacy pickle dump"""
         try:
             with gzip.open(filename, "rb") as f:
                 data = pickle.load(f)
@@ -2683,9 +3324,8 @@ class Placer(nn.Module):
         except Exception as e:
             logger.warning("Error occurs when reading initial solution: {}".format(e))
 
-    def load(self, filename):
-        """@brief Load placement data"""
-        logger.debug("read from %s" % filename)
+    def _load_pickle(self, filename):
+        """Load placement data from a legacy pickle dump"""
         try:
             with gzip.open(filename, "rb") as f:
                 data = pickle.load(f)
@@ -2713,25 +3353,18 @@ class Placer(nn.Module):
         When left_corner is set to true, the bottom left corner of each instance is dumped.
         Otherwise,  the center is dumped.
         """
-        logger.debug("Reading placement results from %s" % filename)
+        logger.debug("Dumping placement results to %s" % filename)
 
-        with open(filename, "w") as fp:
-            for i in range(
-                self.data_cls.movable_range[0], self.data_cls.movable_range[1]
-            ):
-                xy = self.data_cls.pos[0][i]
-                if left_corner:
-                    r = xy - self.data_cls.inst_sizes_max[i] / 2
-                else:
-                    r = xy
-                fp.write(
-                    self.placedb.instName(i)
-                    + " "
-                    + str(r[0].item())
-                    + " "
-                    + str(r[1].item())
-                    + "\n"
-                )
+        bgn, end = self.data_cls.movable_range
+        with torch.no_grad():
+            xy = self.data_cls.pos[0][bgn:end]
+            if left_corner:
+                xy = xy - self.data_cls.inst_sizes_max[bgn:end] / 2
+            xy = xy.to(device="cpu", dtype=torch.float64).numpy()
+        if not self.placedb.writeInstLocs(filename, xy, bgn, end):
+            raise RuntimeError(
+                "Error occurs when writing placement results to %s" % filename
+            )
 
     def load_pl(self, filename, left_corner=False):
         """
@@ -2740,19 +3373,20 @@ class Placer(nn.Module):
         Otherwise, the file stores the center of each instance.
         """
 
-        logger.debug("Dumping placement results to %s" % filename)
+        logger.debug("Reading placement results from %s" % filename)
+        num_insts = self.placedb.numInsts()
         pos = self.data_cls.pos[0]
-        with open(filename, "r") as fp:
-            for l in fp:
-                d = l.split()
-                name = d[0]
-                id_ = self.placedb.nameToInst(name)
-                x = float(d[1])
-                y = float(d[2])
-                pos[id_][0] = x
-                pos[id_][1] = y
-        if left_corner:
-            pos += self.data_cls.inst_sizes_max / 2
+        with torch.no_grad():
+            # instances missing in the file keep their locations
+            xy = pos[:num_insts].to(device="cpu", dtype=torch.float64, copy=True)
+            xy = xy.numpy()
+            if not self.placedb.readInstLocs(filename, xy):
+                raise RuntimeError(
+                    "Error occurs when reading placement results from %s" % filename
+                )
+            pos[:num_insts] = torch.from_numpy(xy)
+            if left_corner:
+                pos += self.data_cls.inst_sizes_max / 2
 
     def load_clock_available_clock_region(self, filename):
         logger.debug("Loading clock available clock region from %s" % filename)
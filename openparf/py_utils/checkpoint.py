@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tensor-only checkpoint container.
+
+A checkpoint file holds a set of named tensors and a JSON manifest:
+
+    | header | tensor 0 | tensor 1 | ... | manifest |
+
+The header stores the magic string, the format version and the location of
+the manifest, which is written last so that tensors can be streamed to disk
+one by one. Every tensor starts at a multiple of ALIGNMENT bytes, so an
+uncompressed checkpoint can be memory-mapped and viewed as tensors without
+copying. Tensors may optionally be compressed with zstd or lz4 if the
+corresponding python package is installed.
+"""
+
+import os
+import glob
+import json
+import queue
+import struct
+import logging
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import torch
+
+try:
+    import zstandard
+except ModuleNotFoundError:
+    zstandard = None
+try:
+    import lz4.frame as lz4_frame
+except ModuleNotFoundError:
+    lz4_frame = None
+
+MAGIC = b"OPFCKPT\x00"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+# magic, format version, manifest offset, manifest size
+HEADER = struct.Struct("<8sIQQ")
+
+COMPRESSIONS = ("none", "zstd", "lz4")
+
+logger = logging.getLogger(__name__)
+
+_torch2numpy_dtypes = {
+    torch.bool: np.bool_,
+    torch.uint8: np.uint8,
+    torch.int8: np.int8,
+    torch.int16: np.int16,
+    torch.int32: np.int32,
+    torch.int64: np.int64,
+    torch.float16: np.float16,
+    torch.float32: np.float32,
+    torch.float64: np.float64,
+}
+_name2torch_dtypes = {str(k).split(".")[-1]: k for k in _torch2numpy_dtypes}
+
+
+def _compressor(compression):
+    if compression == "none":
+        return lambda data: data
+    if compression == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd compression requires the zstandard package")
+        return zstandard.ZstdCompressor(level=3, threads=-1).compress
+    if compression == "lz4":
+        if lz4_frame is None:
+            raise RuntimeError("lz4 compression requires the lz4 package")
+        return lz4_frame.compress
+    raise ValueError(
+        "unknown checkpoint compression %s, options: %s" % (compression, COMPRESSIONS)
+    )
+
+
+def _decompressor(compression):
+    if compression == "none":
+        return lambda data: data
+    if compression == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd compression requires the zstandard package")
+        return zstandard.ZstdDecompressor().decompress
+    if compression == "lz4":
+        if lz4_frame is None:
+            raise RuntimeError("lz4 compression requires the lz4 package")
+        return lz4_frame.decompress
+    raise ValueError(
+        "unknown checkpoint compression %s, options: %s" % (compression, COMPRESSIONS)
+    )
+
+
+def _pad(f):
+    pos = f.tell()
+    if pos % ALIGNMENT:
+        f.write(b"\x00" * (ALIGNMENT - pos % ALIGNMENT))
+
+
+def is_checkpoint(filename):
+    """Whether the file is written by save_checkpoint"""
+    with open(filename, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def save_checkpoint(filename, tensors, meta=None, compression="none"):
+    """Write named tensors and JSON-serializable metadata.
+    The file is written to a temporary path and then renamed,
+    so an interrupted write never leaves a truncated checkpoint behind.
+
+    :param filename: path of the checkpoint
+    :param tensors: dict from names to tensors on any device
+    :param meta: JSON-serializable metadata
+    :param compression: one of COMPRESSIONS
+    """
+    compress = _compressor(compression)
+    dirname = os.path.dirname(filename)
+    if dirname:
+        os.makedirs(dirname, exist_ok=True)
+    entries = OrderedDict()
+    tmp_filename = filename + ".tmp"
+    with open(tmp_filename, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, 0))
+        for name, t in tensors.items():
+            if t.dtype not in _torch2numpy_dtypes:
+                raise TypeError("unsupported dtype %s of tensor %s" % (t.dtype, name))
+            data = compress(t.detach().cpu().contiguous().numpy().tobytes())
+            _pad(f)
+            entries[name] = {
+                "dtype": str(t.dtype).split(".")[-1],
+                "shape": list(t.shape),
+                "device": str(t.device),
+                "requires_grad": t.requires_grad,
+                "offset": f.tell(),
+                "nbytes": len(data),
+            }
+            f.write(data)
+        manifest = json.dumps(
+            {
+                "version": FORMAT_VERSION,
+                "compression": compression,
+                "tensors": entries,
+                "meta": meta if meta is not None else {},
+            }
+        ).encode("utf-8")
+        manifest_offset = f.tell()
+        f.write(manifest)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, manifest_offset, len(manifest)))
+    os.replace(tmp_filename, filename)
+
+
+def read_manifest(filename):
+    """Read the manifest only, without touching the tensor data"""
+    with open(filename, "rb") as f:
+        magic, version, manifest_offset, manifest_size = HEADER.unpack(
+            f.read(HEADER.size)
+        )
+        if magic != MAGIC:
+            raise ValueError("%s is not a checkpoint" % filename)
+        if version > FORMAT_VERSION:
+            raise ValueError(
+                "%s has checkpoint format version %d, newer than the supported version %d"
+                % (filename, version, FORMAT_VERSION)
+            )
+        f.seek(manifest_offset)
+        return json.loads(f.read(manifest_size).decode("utf-8"))
+
+
+def load_checkpoint(filename, mmap=True):
+    """Read a checkpoint written by save_checkpoint.
+
+    :param filename: path of the checkpoint
+    :param mmap: view uncompressed tensors on a copy-on-write memory map instead of reading them;
+        compressed tensors are always decompressed into memory
+    :return: (ordered dict from names to CPU tensors, metadata)
+    """
+    manifest = read_manifest(filename)
+    tensors = OrderedDict()
+    if mmap and manifest["compression"] == "none":
+        buf = np.asarray(np.memmap(filename, dtype=np.uint8, mode="c"))
+        for name, entry in manifest["tensors"].items():
+            array = buf[entry["offset"] : entry["offset"] + entry["nbytes"]]
+            tensors[name] = _as_tensor(array, entry)
+    else:
+        decompress = _decompressor(manifest["compression"])
+        with open(filename, "rb") as f:
+            for name, entry in manifest["tensors"].items():
+                f.seek(entry["offset"])
+                data = bytearray(decompress(f.read(entry["nbytes"])))
+                tensors[name] = _as_tensor(np.frombuffer(data, dtype=np.uint8), entry)
+    return tensors, manifest["meta"]
+
+
+def _as_tensor(array, entry):
+    """View raw bytes as the tensor described by a manifest entry"""
+    dtype = _torch2numpy_dtypes[_name2torch_dtypes[entry["dtype"]]]
+    return torch.from_numpy(array.view(dtype).reshape(entry["shape"]))
+
+
+def list_checkpoints(dirname, prefix):
+    """Checkpoints named <prefix><zero-padded number>.ckpt in a directory, oldest first"""
+    return sorted(glob.glob(os.path.join(dirname, glob.escape(prefix) + "*.ckpt")))
+
+
+class CheckpointWriter(object):
+    """Write checkpoints in a background thread and keep only the latest ones.
+    Tensors are copied to host memory on the caller's thread, so the caller may
+    keep updating them in place once submit returns.
+    """
+
+    def __init__(self, dirname, prefix, keep, compression="none"):
+        """
+        :param dirname: directory of the checkpoints
+        :param prefix: file name prefix of the checkpoints, used to find the ones to remove
+        :param keep: number of checkpoints to keep, 0 to keep all of them
+        :param compression: one of COMPRESSIONS
+        """
+        self.dirname = dirname
+        self.prefix = prefix
+        self.keep = keep
+        self.compression = compression
+        # at most one pending checkpoint besides the one being written
+        self._queue = queue.Queue(maxsize=1)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def filename(self, index):
+        return os.path.join(self.dirname, "%s%06d.ckpt" % (self.prefix, index))
+
+    def submit(self, index, tensors, meta):
+        """Schedule a checkpoint; blocks only if the previous one is still pending.
+
+        :param index: checkpoint index, e.g., the iteration, that orders the checkpoints
+        :param tensors: dict from names to tensors on any device
+        :param meta: JSON-serializable metadata, must not be modified afterwards
+        """
+        snapshot = OrderedDict(
+            (name, t.detach().to("cpu", copy=True)) for name, t in tensors.items()
+        )
+        self._queue.put((self.filename(index), snapshot, meta))
+
+    def close(self):
+        """Wait for the pending checkpoints and stop the writer thread"""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def _run(self):
+        while True:
+            task = self._queue.get()
+            if task is None:
+                break
+            filename, tensors, meta = task
+            try:
+                save_checkpoint(filename, tensors, meta, self.compression)
+                if self.keep > 0:
+                    for stale in list_checkpoints(self.dirname, self.prefix)[: -self.keep]:
+                        os.remove(stale)
+                logger.info("write checkpoint %s" % filename)
+            except Exception as e:
+                logger.warning("Error occurs when writing checkpoint {}: {}".format(filename, e))
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""On-disk cache of parsed benchmark databases.
+
+A cache entry is a binary snapshot of the Database written by
+Database.writeSnapshot, named by a content hash of all benchmark input
+files, including the architecture files. Editing any input file changes
+the key, so stale entries are never read; they can be removed at any time.
+"""
+
+import os
+import hashlib
+import logging
+import os.path as osp
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+_CHUNK_SIZE = 1 << 22
+
+
+def _bookshelf_files(aux_file):
+    """The aux file and the files it lists, e.g., 'design : a.nodes a.nets a.pl a.scl a.lib'"""
+    dirname = osp.dirname(aux_file)
+    files = [aux_file]
+    with open(aux_file, "r") as f:
+        for line in f:
+            if ":" not in line:
+                continue
+            for name in line.split(":", 1)[1].split():
+                path = osp.join(dirname, name)
+                if osp.isfile(path):
+                    files.append(path)
+    return files
+
+
+def benchmark_files(params):
+    """All input files read by flow.build_placedb for the benchmark format"""
+    if params.benchmark_format == "bookshelf":
+        return _bookshelf_files(params.aux_input)
+    if params.benchmark_format == "xarch":
+        return [params.xml_input, params.verilog_input]
+    if params.benchmark_format == "flexshelf":
+        with open(params.design_input, "r") as f:
+            data = yaml.safe_load(f)
+        dirname = osp.dirname(params.design_input)
+        return [
+            params.layout_input,
+            params.design_input,
+            osp.join(dirname, data["netlist"]),
+            osp.join(dirname, data["place"]),
+        ]
+    if params.benchmark_format == "ehbookshelf":
+        return sorted(
+            osp.join(params.input_dir, name)
+            for name in os.listdir(params.input_dir)
+            if osp.isfile(osp.join(params.input_dir, name))
+        )
+    raise RuntimeError("Unknown benchmark format: {}".format(params.benchmark_format))
+
+
+def content_hash(params):
+    """Hash of the benchmark format and the contents of all input files"""
+    h = hashlib.blake2b(digest_size=20)
+    h.update(params.benchmark_format.encode("utf-8"))
+    for path in benchmark_files(params):
+        # the base name only, so that a copied benchmark hits the same entry
+        h.update(b"\0" + osp.basename(path).encode("utf-8") + b"\0")
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+                h.update(chunk)
+    return h.hexdigest()
+
+
+def cache_filename(params):
+    """Path of the cache entry for the benchmark in params.db_cache_dir"""
+    return osp.join(
+        params.db_cache_dir,
+        "%s.%s.dbsnap" % (params.design_name(), content_hash(params)),
+    )
+
+
+def write(db, filename):
+    """Write a cache entry; a failure only costs the next run the parsing time"""
+    os.makedirs(osp.dirname(filename) or ".", exist_ok=True)
+    # rename after writing, so that concurrent jobs never read a partial entry
+    tmp_filename = "%s.%d.tmp" % (filename, os.getpid())
+    try:
+        if db.writeSnapshot(tmp_filename):
+            os.replace(tmp_filename, filename)
+            return True
+    except OSError as e:
+        logger.warning("Error occurs when writing database cache {}: {}".format(filename, e))
+    if osp.exists(tmp_filename):
+        os.remove(tmp_filename)
+    return False
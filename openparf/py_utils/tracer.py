@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Hierarchical tracer of placement stages and operators.
+
+Spans nest like a call stack. Each span records the wall time, the CPU time of
+the process and the peak resident set size at its end. Aggregates per span
+path, e.g., 'global_place/gp_iteration/density_op', are always kept, so the
+summary table stays exact on long runs, while individual events are kept up to
+`max_events` for the timeline. The timeline is written in the Chrome trace
+event format, which chrome://tracing and https://ui.perfetto.dev open.
+
+A span costs a few microseconds, small compared to any operator, so the tracer
+can stay enabled in production runs. A disabled tracer costs one attribute
+lookup per span.
+"""
+
+import os
+import json
+import time
+import resource
+import functools
+import threading
+from collections import OrderedDict
+
+# ru_maxrss is in kilobytes on Linux and in bytes on macOS
+_MAXRSS_TO_MB = 1.0 / (1 << 20) if os.uname().sysname == "Darwin" else 1.0 / (1 << 10)
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _MAXRSS_TO_MB
+
+
+class _Stat(object):
+    __slots__ = ("count", "wall_ns", "cpu_ns", "max_wall_ns", "peak_rss_mb")
+
+    def __init__(self):
+        self.count = 0
+        self.wall_ns = 0
+        self.cpu_ns = 0
+        self.max_wall_ns = 0
+        self.peak_rss_mb = 0.0
+
+
+class Tracer(object):
+    """Record nested spans of a single thread.
+
+    :param enabled: a disabled tracer records nothing
+    :param max_events: maximum number of events kept for the timeline
+    :param synchronize: function called before taking a time stamp, e.g.,
+        torch.cuda.synchronize, so that asynchronous kernels are charged to
+        the span launching them
+    """
+
+    def __init__(self, enabled=True, max_events=1000000, synchronize=None):
+        self.enabled = enabled
+        self.max_events = max_events
+        self.synchronize = synchronize
+        self.reset()
+
+    def reset(self):
+        self._stack = []
+        self._events = []
+        self._stats = OrderedDict()
+        self.num_dropped_events = 0
+        self._origin_ns = time.perf_counter_ns()
+        self._tid = threading.get_ident()
+
+    def begin(self, name, cat="op"):
+        """Open a span nested in the current one"""
+        if not self.enabled:
+            return
+        if self.synchronize is not None:
+            self.synchronize()
+        path = self._stack[-1][0] + "/" + name if self._stack else name
+        self._stack.append(
+            (path, name, cat, time.perf_counter_ns(), time.process_time_ns())
+        )
+
+    def end(self):
+        """Close the current span"""
+        if not self.enabled or not self._stack:
+            return
+        if self.synchronize is not None:
+            self.synchronize()
+        wall_end = time.perf_counter_ns()
+        cpu_end = time.process_time_ns()
+        rss = peak_rss_mb()
+        path, name, cat, wall_bgn, cpu_bgn = self._stack.pop()
+        wall_ns = wall_end - wall_bgn
+        cpu_ns = cpu_end - cpu_bgn
+
+        stat = self._stats.get(path)
+        if stat is None:
+            stat = self._stats[path] = _Stat()
+        stat.count += 1
+        stat.wall_ns += wall_ns
+        stat.cpu_ns += cpu_ns
+        stat.max_wall_ns = max(stat.max_wall_ns, wall_ns)
+        stat.peak_rss_mb = max(stat.peak_rss_mb, rss)
+
+        if len(self._events) < self.max_events:
+            self._events.append((name, cat, wall_bgn, wall_ns, cpu_ns, rss))
+        else:
+            self.num_dropped_events += 1
+
+    def end_all(self):
+        """Close all open spans, e.g., after an early return"""
+        while self.enabled and self._stack:
+            self.end()
+
+    def span(self, name, cat="op"):
+        """Context manager of a span"""
+        return _Span(self, name, cat)
+
+    def stats(self):
+        """Aggregates per span path in the order the paths first end"""
+        return self._stats
+
+    def write_chrome_trace(self, filename):
+        """Write complete ('X') events in the Chrome trace event format"""
+        pid = os.getpid()
+        events = [
+            {
+                "name": name,
+                "cat": cat,
+                "ph": "X",
+                "ts": (wall_bgn - self._origin_ns) / 1e3,
+                "dur": wall_ns / 1e3,
+                "pid": pid,
+                "tid": self._tid,
+                "args": {"cpu_ms": cpu_ns / 1e6, "peak_rss_mb": rss},
+            }
+            for name, cat, wall_bgn, wall_ns, cpu_ns, rss in self._events
+        ]
+        # chrome://tracing expects the parents before their children
+        events.sort(key=lambda e: (e["ts"], -e["dur"]))
+        os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+        with open(filename, "w") as f:
+            json.dump(
+                {
+                    "traceEvents": events,
+                    "displayTimeUnit": "ms",
+                    "otherData": {"num_dropped_events": self.num_dropped_events},
+                },
+                f,
+            )
+
+    def summary(self, min_percent=0.0):
+        """Table of the aggregates per span path.
+
+        :param min_percent: hide paths taking less wall time than this
+            percentage of the root spans
+        """
+        total_ns = sum(s.wall_ns for p, s in self._stats.items() if "/" not in p)
+        header = ["stage", "calls", "wall(s)", "cpu(s)", "max(ms)", "wall%", "rss(MB)"]
+        paths = list(self._stats.keys())
+        rows = []
+        for path, s in self._stats.items():
+            percent = 100.0 * s.wall_ns / total_ns if total_ns else 0.0
+            if percent < min_percent:
+                continue
+            row = [
+                "  " * path.count("/") + path.rsplit("/", 1)[-1],
+                "%d" % s.count,
+                "%.3f" % (s.wall_ns / 1e9),
+                "%.3f" % (s.cpu_ns / 1e9),
+                "%.3f" % (s.max_wall_ns / 1e6),
+                "%.1f" % percent,
+                "%.1f" % s.peak_rss_mb,
+            ]
+            rows.append((path, row))
+        # list children right after their parents, in the order the paths first end
+        rank = {p: i for i, p in enumerate(paths)}
+
+        def path_key(path):
+            parts = path.split("/")
+            return [rank.get("/".join(parts[: i + 1]), -1) for i in range(len(parts))]
+
+        rows = [row for path, row in sorted(rows, key=lambda x: path_key(x[0]))]
+        widths = [
+            max(len(header[j]), *(len(r[j]) for r in rows)) if rows else len(header[j])
+            for j in range(len(header))
+        ]
+        lines = [
+            " | ".join(h.ljust(w) for h, w in zip(header, widths)),
+            "-+-".join("-" * w for w in widths),
+        ]
+        for r in rows:
+            lines.append(" | ".join(c.ljust(w) for c, w in zip(r, widths)))
+        return "\n".join(lines)
+
+
+class _Span(object):
+    __slots__ = ("tracer", "name", "cat")
+
+    def __init__(self, tracer, name, cat):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+
+    def __enter__(self):
+        self.tracer.begin(self.name, self.cat)
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.tracer.end()
+        return False
+
+
+class TracedOp(object):
+    """Callable wrapper of an operator that traces each call.
+    Other attributes are forwarded to the operator.
+    """
+
+    __slots__ = ("_op", "_name", "_tracer")
+
+    def __init__(self, op, name, tracer):
+        object.__setattr__(self, "_op", op)
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_tracer", tracer)
+
+    def __call__(self, *args, **kwargs):
+        tracer = self._tracer
+        if not tracer.enabled:
+            return self._op(*args, **kwargs)
+        tracer.begin(self._name, "op")
+        try:
+            return self._op(*args, **kwargs)
+        finally:
+            tracer.end()
+
+    def __getattr__(self, name):
+        return getattr(self._op, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._op, name, value)
+
+
+def traced(name, cat="stage"):
+    """Decorator tracing a method of an object with a `tracer` attribute"""
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            tracer = self.tracer
+            if not tracer.enabled:
+                return fn(self, *args, **kwargs)
+            tracer.begin(name, cat)
+            try:
+                return fn(self, *args, **kwargs)
+            finally:
+                tracer.end()
+
+        return wrapper
+
+    return decorator
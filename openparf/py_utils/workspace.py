@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Persistent workspace of the grids used by the placement operators.
+
+Density, potential, field and utilization maps have the same few shapes for
+the whole run, so allocating them at every call only churns the allocator and,
+on CPU, faults in fresh pages. Operators instead request their buffers from a
+workspace by name. A buffer is allocated at the first request of its name,
+shape, dtype and device, and returned as is afterwards, so the content of a
+buffer is only valid until the next request of the same name.
+
+Operators owning a result that must survive the next call, e.g., field maps
+kept for the backward, use a distinct name for it.
+"""
+
+import logging
+from collections import OrderedDict
+
+import torch
+
+logger = logging.getLogger(__name__)
+
+
+class Workspace(object):
+    """Named buffers allocated once and reused across calls.
+
+    :param enabled: a disabled workspace allocates a new buffer at every
+        request, which is the behavior of the operators without workspace
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.buffers = OrderedDict()
+        self.num_bytes = 0
+        self.peak_num_bytes = 0
+
+    def get(self, name, size, dtype, device, zero_flag=False):
+        """Buffer of `name` with the given size, dtype and device.
+
+        :param zero_flag: fill the buffer with zeros, otherwise its content is
+            whatever the previous user left
+        """
+        size = tuple(size)
+        device = torch.device(device)
+        if not self.enabled:
+            if zero_flag:
+                return torch.zeros(size, dtype=dtype, device=device)
+            return torch.empty(size, dtype=dtype, device=device)
+        key = (name, size, dtype, device)
+        buf = self.buffers.get(key)
+        if buf is None:
+            buf = torch.empty(size, dtype=dtype, device=device)
+            self.buffers[key] = buf
+            self.num_bytes += buf.numel() * buf.element_size()
+            self.peak_num_bytes = max(self.peak_num_bytes, self.num_bytes)
+        if zero_flag:
+            buf.zero_()
+        return buf
+
+    def like(self, name, x, zero_flag=False):
+        """Buffer of `name` with the size, dtype and device of x"""
+        return self.get(name, x.size(), x.dtype, x.device, zero_flag)
+
+    def release(self, prefix=""):
+        """Free the buffers whose names start with prefix, all of them by default"""
+        for key in [key for key in self.buffers if key[0].startswith(prefix)]:
+            buf = self.buffers.pop(key)
+            self.num_bytes -= buf.numel() * buf.element_size()
+
+    def summary(self):
+        """Table of the memory held per buffer name"""
+        usage = OrderedDict()
+        for (name, size, dtype, device), buf in self.buffers.items():
+            count, num_bytes = usage.get((name, str(device)), (0, 0))
+            usage[(name, str(device))] = (
+                count + 1,
+                num_bytes + buf.numel() * buf.element_size(),
+            )
+        header = ["buffer", "device", "count", "MB"]
+        rows = [
+            [name, device, "%d" % count, "%.3f" % (num_bytes / 2 ** 20)]
+            for (name, device), (count, num_bytes) in usage.items()
+        ]
+        rows.append(["total", "", "%d" % len(self.buffers), "%.3f" % (self.num_bytes / 2 ** 20)])
+        rows.append(["peak", "", "", "%.3f" % (self.peak_num_bytes / 2 ** 20)])
+        widths = [max(len(header[j]), *(len(r[j]) for r in rows)) for j in range(len(header))]
+        lines = [
+            " | ".join(h.ljust(w) for h, w in zip(header, widths)),
+            "-+-".join("-" * w for w in widths),
+        ]
+        for r in rows:
+            lines.append(" | ".join(c.ljust(w) for c, w in zip(r, widths)))
+        return "\n".join(lines)
@@ -725,6 +725,8 @@ void bind_database(py::module &m) {
           .def("readFlexshelfLayout", (void(Database::*)(std::string const &)) & Database::readFlexshelfLayout)
           .def("readFlexshelfDesign",
                   (void(Database::*)(std::string const &, std::string const &)) & Database::readFlexshelfDesign)
+          .def("writeSnapshot", &Database::writeSnapshot)
+          .def("readSnapshot", &Database::readSnapshot)
           .def("memory", &Database::memory)
           .def("__repr__",
                   [](Database const &rhs) {
@@ -924,6 +926,30 @@ void bind_database(py::module &m) {
                     rhs.apply(locs);
                   })
           .def("writeBookshelfPl", (bool(PlaceDB::*)(std::string const &)) & PlaceDB::writeBookshelfPl)
+          .def(
+                  "writeInstLocs",
+                  [](PlaceDB const &rhs, std::string const &pl_file,
+                          py::array_t<double, py::array::c_style | py::array::forcecast> xy, IndexType bgn,
+                          IndexType end) {
+                    if (bgn > end || xy.size() != 2 * static_cast<py::ssize_t>(end - bgn)) {
+                      throw py::value_error("writeInstLocs expects 2 values per instance");
+                    }
+                    py::gil_scoped_release release;
+                    return rhs.writeInstLocs(pl_file, xy.data(), bgn, end);
+                  },
+                  "Write (x, y) of instances [bgn, end) as \"name x y\" lines")
+          .def(
+                  "readInstLocs",
+                  [](PlaceDB const &rhs, std::string const &pl_file, py::array_t<double, py::array::c_style> xy) {
+                    if (xy.size() != 2 * static_cast<py::ssize_t>(rhs.numInsts())) {
+                      throw py::value_error("readInstLocs expects 2 values per instance");
+                    }
+                    auto data = xy.mutable_data();
+                    py::gil_scoped_release release;
+                    return rhs.readInstLocs(pl_file, data);
+                  },
+                  py::arg("pl_file"), py::arg("xy").noconvert(),
+                  "Read \"name x y\" lines into (x, y) of instances in place")
           .def("writeMacroBookshelfPl", (bool(PlaceDB::*)(std::string const &)) & PlaceDB::writeMacroBookshelfPl)
           .def("writeBookshelfNodes", (bool(PlaceDB::*)(std::string const &)) & PlaceDB::writeBookshelfNodes)
           .def("writeBookshelfNets", (bool(PlaceDB::*)(std::string const &)) & PlaceDB::writeBookshelfNets)
@@ -596,65 +596,88 @@ void bind_geometry(py::module &m) {
     return ret;                                                                \
   }
 
+#define BIND_VECTOR_NUMPY(T, Width) &vector2Array<T, Width, T::value_type::value_type>
+
   py::bind_vector<VectorPoint2DInt>(m, "VectorPoint2DInt")
-      .def("tolist", BIND_VECTOR_POINTSIZE_2D_TOLIST(VectorPoint2DInt));
+      .def("tolist", BIND_VECTOR_POINTSIZE_2D_TOLIST(VectorPoint2DInt))
+      .def("numpy", BIND_VECTOR_NUMPY(VectorPoint2DInt, 2));
   py::bind_vector<VectorPoint2DUint>(m, "VectorPoint2DUint")
-      .def("tolist", BIND_VECTOR_POINTSIZE_2D_TOLIST(VectorPoint2DUint));
+      .def("tolist", BIND_VECTOR_POINTSIZE_2D_TOLIST(VectorPoint2DUint))
+      .def("numpy", BIND_VECTOR_NUMPY(VectorPoint2DUint, 2));
 
   py::bind_vector<VectorPoint2DFloat>(m, "VectorPoint2DFloat")
-      .def("tolist", BIND_VECTOR_POINTSIZE_2D_TOLIST(VectorPoint2DFloat));
+      .def("tolist", BIND_VECTOR_POINTSIZE_2D_TOLIST(VectorPoint2DFloat))
+      .def("numpy", BIND_VECTOR_NUMPY(VectorPoint2DFloat, 2));
 
   py::bind_vector<VectorPoint2DDouble>(m, "VectorPoint2DDouble")
-      .def("tolist", BIND_VECTOR_POINTSIZE_2D_TOLIST(VectorPoint2DDouble));
+      .def("tolist", BIND_VECTOR_POINTSIZE_2D_TOLIST(VectorPoint2DDouble))
+      .def("numpy", BIND_VECTOR_NUMPY(VectorPoint2DDouble, 2));
 
   py::bind_vector<VectorPoint3DInt>(m, "VectorPoint3DInt")
-      .def("tolist", BIND_VECTOR_POINTSIZE_3D_TOLIST(VectorPoint3DInt));
+      .def("tolist", BIND_VECTOR_POINTSIZE_3D_TOLIST(VectorPoint3DInt))
+      .def("numpy", BIND_VECTOR_NUMPY(VectorPoint3DInt, 3));
 
   py::bind_vector<VectorPoint3DUint>(m, "VectorPoint3DUint")
-      .def("tolist", BIND_VECTOR_POINTSIZE_3D_TOLIST(VectorPoint3DUint));
+      .def("tolist", BIND_VECTOR_POINTSIZE_3D_TOLIST(VectorPoint3DUint))
+      .def("numpy", BIND_VECTOR_NUMPY(VectorPoint3DUint, 3));
 
   py::bind_vector<VectorPoint3DFloat>(m, "VectorPoint3DFloat")
-      .def("tolist", BIND_VECTOR_POINTSIZE_3D_TOLIST(VectorPoint3DFloat));
+      .def("tolist", BIND_VECTOR_POINTSIZE_3D_TOLIST(VectorPoint3DFloat))
+      .def("numpy", BIND_VECTOR_NUMPY(VectorPoint3DFloat, 3));
 
   py::bind_vector<VectorPoint3DDouble>(m, "VectorPoint3DDouble")
-      .def("tolist", BIND_VECTOR_POINTSIZE_3D_TOLIST(VectorPoint3DDouble));
+      .def("tolist", BIND_VECTOR_POINTSIZE_3D_TOLIST(VectorPoint3DDouble))
+      .def("numpy", BIND_VECTOR_NUMPY(VectorPoint3DDouble, 3));
 
   py::bind_vector<VectorBoxInt>(m, "VectorBoxInt")
-      .def("tolist", BIND_VECTOR_BOX_TOLIST(VectorBoxInt));
+      .def("tolist", BIND_VECTOR_BOX_TOLIST(VectorBoxInt))
+      .def("numpy", BIND_VECTOR_NUMPY(VectorBoxInt, 4));
   py::bind_vector<VectorBoxUint>(m, "VectorBoxUint")
-      .def("tolist", BIND_VECTOR_BOX_TOLIST(VectorBoxUint));
+      .def("tolist", BIND_VECTOR_BOX_TOLIST(VectorBoxUint))
+      .def("numpy", BIND_VECTOR_NUMPY(VectorBoxUint, 4));
   py::bind_vector<VectorBoxFloat>(m, "VectorBoxFloat")
-      .def("tolist", BIND_VECTOR_BOX_TOLIST(VectorBoxFloat));
+      .def("tolist", BIND_VECTOR_BOX_TOLIST(VectorBoxFloat))
+      .def("numpy", BIND_VECTOR_NUMPY(VectorBoxFloat, 4));
   py::bind_vector<VectorBoxDouble>(m, "VectorBoxDouble")
-      .def("tolist", BIND_VECTOR_BOX_TOLIST(VectorBoxDouble));
+      .def("tolist", BIND_VECTOR_BOX_TOLIST(VectorBoxDouble))
+      .def("numpy", BIND_VECTOR_NUMPY(VectorBoxDouble, 4));
 
   py::bind_vector<VectorSize2DInt>(m, "VectorSize2DInt")
-      .def("tolist", BIND_VECTOR_POINTSIZE_2D_TOLIST(VectorSize2DInt));
+      .def("tolist", BIND_VECTOR_POINTSIZE_2D_TOLIST(VectorSize2DInt))
+      .def("numpy", BIND_VECTOR_NUMPY(VectorSize2DInt, 2));
 
   py::bind_vector<VectorSize2DUint>(m, "VectorSize2DUint")
-      .def("tolist", BIND_VECTOR_POINTSIZE_2D_TOLIST(VectorSize2DUint));
+      .def("tolist", BIND_VECTOR_POINTSIZE_2D_TOLIST(VectorSize2DUint))
+      .def("numpy", BIND_VECTOR_NUMPY(VectorSize2DUint, 2));
 
   py::bind_vector<VectorSize2DFloat>(m, "VectorSize2DFloat")
-      .def("tolist", BIND_VECTOR_POINTSIZE_2D_TOLIST(VectorSize2DFloat));
+      .def("tolist", BIND_VECTOR_POINTSIZE_2D_TOLIST(VectorSize2DFloat))
+      .def("numpy", BIND_VECTOR_NUMPY(VectorSize2DFloat, 2));
 
   py::bind_vector<VectorSize2DDouble>(m, "VectorSize2DDouble")
-      .def("tolist", BIND_VECTOR_POINTSIZE_2D_TOLIST(VectorSize2DDouble));
+      .def("tolist", BIND_VECTOR_POINTSIZE_2D_TOLIST(VectorSize2DDouble))
+      .def("numpy", BIND_VECTOR_NUMPY(VectorSize2DDouble, 2));
 
   py::bind_vector<VectorSize3DInt>(m, "VectorSize3DInt")
-      .def("tolist", BIND_VECTOR_POINTSIZE_3D_TOLIST(VectorSize3DInt));
+      .def("tolist", BIND_VECTOR_POINTSIZE_3D_TOLIST(VectorSize3DInt))
+      .def("numpy", BIND_VECTOR_NUMPY(VectorSize3DInt, 3));
 
   py::bind_vector<VectorSize3DUint>(m, "VectorSize3DUint")
-      .def("tolist", BIND_VECTOR_POINTSIZE_3D_TOLIST(VectorSize3DUint));
+      .def("tolist", BIND_VECTOR_POINTSIZE_3D_TOLIST(VectorSize3DUint))
+      .def("numpy", BIND_VECTOR_NUMPY(VectorSize3DUint, 3));
 
   py::bind_vector<VectorSize3DFloat>(m, "VectorSize3DFloat")
-      .def("tolist", BIND_VECTOR_POINTSIZE_3D_TOLIST(VectorSize3DFloat));
+      .def("tolist", BIND_VECTOR_POINTSIZE_3D_TOLIST(VectorSize3DFloat))
+      .def("numpy", BIND_VECTOR_NUMPY(VectorSize3DFloat, 3));
 
   py::bind_vector<VectorSize3DDouble>(m, "VectorSize3DDouble")
-      .def("tolist", BIND_VECTOR_POINTSIZE_3D_TOLIST(VectorSize3DDouble));
+      .def("tolist", BIND_VECTOR_POINTSIZE_3D_TOLIST(VectorSize3DDouble))
+      .def("numpy", BIND_VECTOR_NUMPY(VectorSize3DDouble, 3));
 
 #undef BIND_VECTOR_POINTSIZE_2D_TOLIST
 #undef BIND_VECTOR_POINTSIZE_3D_TOLIST
 #undef BIND_VECTOR_BOX_TOLIST
+#undef BIND_VECTOR_NUMPY
 
 #ifdef VERSION_INFO
   m.attr("__version__") = VERSION_INFO;
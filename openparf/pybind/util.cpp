@@ -172,21 +172,21 @@ void bind_util(py::module& m) {
         },
         "Print message");
 
-  BIND_VECTOR_TOLIST(VectorModelType);
-  BIND_VECTOR_TOLIST(VectorSignalDirection);
-  BIND_VECTOR_TOLIST(VectorSignalType);
-  BIND_VECTOR_TOLIST(VectorShapeModelType);
-  BIND_VECTOR_TOLIST(VectorPlaceStatus);
-  BIND_VECTOR_TOLIST(VectorResourceCategory);
-
-  BIND_VECTOR_TOLIST(VectorChar);
-  BIND_VECTOR_TOLIST(VectorUchar);
-  BIND_VECTOR_TOLIST(VectorInt);
-  BIND_VECTOR_TOLIST(VectorUint);
-  BIND_VECTOR_TOLIST(VectorLong);
-  BIND_VECTOR_TOLIST(VectorUlong);
-  BIND_VECTOR_TOLIST(VectorFloat);
-  BIND_VECTOR_TOLIST(VectorDouble);
+  BIND_VECTOR_TOLIST_NUMPY(VectorModelType);
+  BIND_VECTOR_TOLIST_NUMPY(VectorSignalDirection);
+  BIND_VECTOR_TOLIST_NUMPY(VectorSignalType);
+  BIND_VECTOR_TOLIST_NUMPY(VectorShapeModelType);
+  BIND_VECTOR_TOLIST_NUMPY(VectorPlaceStatus);
+  BIND_VECTOR_TOLIST_NUMPY(VectorResourceCategory);
+
+  BIND_VECTOR_TOLIST_NUMPY(VectorChar);
+  BIND_VECTOR_TOLIST_NUMPY(VectorUchar);
+  BIND_VECTOR_TOLIST_NUMPY(VectorInt);
+  BIND_VECTOR_TOLIST_NUMPY(VectorUint);
+  BIND_VECTOR_TOLIST_NUMPY(VectorLong);
+  BIND_VECTOR_TOLIST_NUMPY(VectorUlong);
+  BIND_VECTOR_TOLIST_NUMPY(VectorFloat);
+  BIND_VECTOR_TOLIST_NUMPY(VectorDouble);
   BIND_VECTOR_TOLIST(VectorString);
 
   BIND_VECTOR_TOLIST_LEVELS(VectorCharL2, 2);
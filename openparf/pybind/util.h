@@ -8,8 +8,10 @@
 #define OPENPARF_PYBIND_UTIL_H_
 
 #include <string>
+#include <type_traits>
 #include <vector>
 
+#include "pybind11/numpy.h"
 #include "pybind11/pybind11.h"
 // It looks like stl.h and stl_bind.h cannot be included at the same time.
 // I need to bind vectors, but use type conversion for others.
@@ -74,6 +76,33 @@ struct NestedVector2List<T, 0> {
   type const& operator()(type const& rhs) const { return rhs; }
 };
 
+/// @brief Element type of the array view of a vector; enums are viewed as their underlying integers.
+template<typename T, typename Enable = void>
+struct ArrayViewElement {
+  using type = T;
+};
+template<typename T>
+struct ArrayViewElement<T, typename std::enable_if<std::is_enum<T>::value>::type> {
+  using type = typename std::underlying_type<T>::type;
+};
+
+/// @brief View a vector as a numpy array without copying.
+/// Vectors of fixed-size arrays, e.g., points and boxes, are viewed as 2D arrays.
+/// The numpy array holds a reference to the python object of the vector,
+/// which keeps the owner of the vector alive if it is returned by reference.
+template<typename T, std::size_t Width = 1, typename E = typename ArrayViewElement<typename T::value_type>::type>
+pybind11::array vector2Array(pybind11::object self) {
+  static_assert(sizeof(typename T::value_type) == Width * sizeof(E), "vector elements must be packed arrays");
+  auto                          &rhs     = self.cast<T&>();
+  std::vector<pybind11::ssize_t> shape   = {static_cast<pybind11::ssize_t>(rhs.size())};
+  std::vector<pybind11::ssize_t> strides = {static_cast<pybind11::ssize_t>(sizeof(typename T::value_type))};
+  if (Width > 1) {
+    shape.push_back(Width);
+    strides.push_back(sizeof(E));
+  }
+  return pybind11::array(pybind11::dtype::of<E>(), shape, strides, rhs.data(), self);
+}
+
 #define BIND_VECTOR_TOLIST(T)                                                                                          \
   py::bind_vector<T>(m, #T)                                                                                            \
           .def("tolist",                                                                                               \
@@ -88,6 +117,9 @@ struct NestedVector2List<T, 0> {
           .def("resize", [](T& rhs, std::size_t n) { rhs.resize(n); })                                                 \
           .def("assign", [](T& rhs, std::size_t n, T::value_type const& v) { rhs.assign(n, v); })
 
+#define BIND_VECTOR_TOLIST_NUMPY(T)                                                                                    \
+  BIND_VECTOR_TOLIST(T).def("numpy", &vector2Array<T>, "Return a numpy array sharing the memory of the vector")
+
 #define BIND_VECTOR_TOLIST_LEVELS(T, Level)                                                                            \
   py::bind_vector<T>(m, #T)                                                                                            \
           .def("tolist",                                                                                               \
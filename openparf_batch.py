@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import logging
+import argparse
+
+from openparf.batch import available_threads, collect_designs, place_designs
+
+if __name__ == "__main__":
+    """
+    @brief place multiple designs with a pool of warm worker processes.
+    Parameters not listed below are passed as '--key value' pairs to all designs.
+    """
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        description="OpenPARF: place multiple designs in a process pool.",
+    )
+    parser.add_argument(
+        "--config", type=str, required=True, help="path the parameter json file"
+    )
+    parser.add_argument(
+        "--designs",
+        type=str,
+        nargs="+",
+        required=True,
+        help="design directories, or directories of design directories",
+    )
+    parser.add_argument(
+        "--result_dir", type=str, required=True, help="directory of the results"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=2, help="number of designs placed concurrently"
+    )
+    parser.add_argument(
+        "--num_threads",
+        type=int,
+        default=available_threads(),
+        help="total number of threads, partitioned among the workers",
+    )
+    parser.add_argument(
+        "--csv",
+        type=str,
+        default=None,
+        help="path to the summary CSV file; <result_dir>/summary.csv by default",
+    )
+
+    args, unknown_args = parser.parse_known_args()
+    overrides = dict(
+        [unknown_args[i].lstrip("-"), unknown_args[i + 1]]
+        for i in range(0, len(unknown_args), 2)
+    )
+
+    logging.basicConfig(level=logging.INFO)
+
+    rows = place_designs(
+        args.config,
+        collect_designs(args.designs),
+        args.result_dir,
+        args.workers,
+        args.num_threads,
+        csv_file=args.csv,
+        overrides=overrides,
+    )
+    sys.exit(0 if all(row["status"] == "ok" for row in rows) else 1)
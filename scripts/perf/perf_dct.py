@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Benchmark the spectral transforms on the bin maps of a design, e.g.,
+    python scripts/perf/perf_dct.py \
+        --config unittest/regression/mlcad2023/Design_2.json
+
+Area types are grouped by the dimensions of placedb.binMapDims() as in the
+electrostatic system. For each group, times dct2, idxst_idct, idct_idxst and
+idct2 over the batch of maps of the group with the FFT and the matmul backends,
+reports the backend chosen by auto and the maximum difference of the results.
+"""
+
+from perf_utils import (
+    parse_args,
+    load_params,
+    time_fn,
+    print_table,
+)
+
+
+def main():
+    args, overrides = parse_args(__doc__)
+    params = load_params(args.config, overrides)
+
+    import torch
+    from openparf.flow import build_placedb
+    from openparf.ops.dct import dct
+
+    torch.set_num_threads(params.num_threads)
+    db, placedb = build_placedb(params)
+    dtype = torch.float64 if params.dtype == "float64" else torch.float32
+    device = torch.device("cuda" if params.gpu else "cpu")
+
+    groups = {}
+    for dims in placedb.binMapDims().tolist():
+        key = tuple(dims)
+        groups[key] = groups.get(key, 0) + 1
+
+    generator = torch.Generator().manual_seed(params.random_seed)
+    rows = []
+    for (M, N), batch in sorted(groups.items()):
+        x = torch.rand(batch, M, N, generator=generator, dtype=dtype).to(device)
+        results = {}
+        times = {}
+        for backend in ["fft", "matmul"]:
+            ops = [
+                op(backend=backend)
+                for op in [dct.Dct2, dct.IdxstIdct, dct.IdctIdxst, dct.Idct2]
+            ]
+            results[backend] = [op.forward(x).clone() for op in ops]
+            times[backend] = time_fn(
+                lambda: [op.forward(x) for op in ops],
+                device,
+                args.warmup,
+                args.repeat,
+            )
+        max_diff = max(
+            float((a - b).abs().max())
+            for a, b in zip(results["fft"], results["matmul"])
+        )
+        rows.append(
+            [
+                "%dx%d" % (M, N),
+                batch,
+                "%.3f" % times["fft"],
+                "%.3f" % times["matmul"],
+                "%.2fx" % (times["fft"] / times["matmul"]),
+                dct.selectBackend("auto", M, N),
+                "%g" % max_diff,
+            ]
+        )
+
+    print(
+        "design %s, device %s, dtype %s, %d threads"
+        % (args.config, device, dtype, params.num_threads)
+    )
+    print_table(
+        [
+            "bin map",
+            "#maps",
+            "fft (ms)",
+            "matmul (ms)",
+            "speedup",
+            "auto",
+            "max |diff|",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
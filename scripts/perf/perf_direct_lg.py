@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Benchmark the direct legalization of LUTs and FFs, e.g.,
+    python scripts/perf/perf_direct_lg.py \
+        --config unittest/regression/mlcad2023/Design_2.json --repeat 3
+
+Compares the per-call forward, which rebuilds the DL problem from the
+placement database, against the persistent legalizer, which builds it once,
+and checks that they give the same positions, also on a second call with
+the positions moved by up to one site. Positions are loaded from
+--pos, e.g., a tensor saved after global placement, otherwise they are drawn
+uniformly over the die. Clock constraints are not honored.
+
+Then reports the runtime of the phases of the persistent legalizer.
+"""
+
+from perf_utils import (
+    parse_args,
+    load_params,
+    build_placer,
+    time_fn,
+    print_table,
+)
+
+
+def add_arguments(parser):
+    parser.add_argument(
+        "--pos",
+        type=str,
+        default=None,
+        help="torch file of the instance positions, shape (#insts, 2)",
+    )
+
+
+def main():
+    args, overrides = parse_args(__doc__, add_arguments)
+    params = load_params(args.config, overrides)
+
+    import torch
+    from openparf.ops.direct_lg import direct_lg, direct_lg_cpp
+
+    db, placedb, placer = build_placer(params)
+    pos = placer.data_cls.pos[0].data.cpu().clone()
+    generator = torch.Generator().manual_seed(params.random_seed)
+    dims = placedb.siteMapDim()
+    if args.pos is not None:
+        pos.copy_(torch.load(args.pos).view_as(pos))
+    else:
+        xy = pos.view(-1, 2)
+        xy[:, 0] = torch.rand(xy.size(0), generator=generator, dtype=pos.dtype) * dims.x()
+        xy[:, 1] = torch.rand(xy.size(0), generator=generator, dtype=pos.dtype) * dims.y()
+
+    legalizer = direct_lg.DirectLegalize(placedb, params)
+    device = torch.device("cpu")
+    golden = direct_lg_cpp.forward(placedb, legalizer.param, pos)
+    result = legalizer(pos)
+    max_diff = float((golden - result).abs().max())
+
+    # the second call runs on other positions, it must not depend on the first one
+    next_pos = pos.clone()
+    next_xy = next_pos.view(-1, 2)
+    next_xy.add_(torch.rand(next_xy.size(), generator=generator, dtype=pos.dtype) * 2 - 1)
+    next_xy[:, 0].clamp_(0, dims.x())
+    next_xy[:, 1].clamp_(0, dims.y())
+    next_golden = direct_lg_cpp.forward(placedb, legalizer.param, next_pos)
+    max_diff = max(max_diff, float((next_golden - legalizer(next_pos)).abs().max()))
+
+    per_call_ms = time_fn(
+        lambda: direct_lg_cpp.forward(placedb, legalizer.param, pos),
+        device,
+        args.warmup,
+        args.repeat,
+    )
+    persistent_ms = time_fn(lambda: legalizer(pos), device, args.warmup, args.repeat)
+    phase_times = legalizer.phase_times()
+
+    print(
+        "design %s, %d threads, %s positions, max |diff| %g"
+        % (args.config, params.num_threads, args.pos or "random", max_diff)
+    )
+    print_table(
+        ["direct legalization", "time (ms)", "speedup"],
+        [
+            ["per-call problem", "%.3f" % per_call_ms, "1.00x"],
+            [
+                "persistent problem",
+                "%.3f" % persistent_ms,
+                "%.2fx" % (per_call_ms / persistent_ms),
+            ],
+        ],
+    )
+    print_table(
+        ["phase", "time (ms)"],
+        [[name, "%.3f" % ms] for name, ms in phase_times.items()],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Benchmark one solve of ElectrostaticSystem over all area types.
+
+Compares the batched solver, which stacks the area types with the same bin
+map dimensions and runs each spectral transform once per batch, against
+the previous loop with one set of transforms per area type
+(batch_flag=False). Density maps are random maps of the bin map dimensions
+of the design.
+
+Modes are fast (no energy), full (energy from the potential maps of idct2)
+and spectral (energy from the dct coefficients, spectral_energy_flag).
+"""
+
+from perf_utils import (
+    parse_args,
+    load_params,
+    build_placer,
+    time_fn,
+    print_table,
+)
+
+
+def main():
+    args, overrides = parse_args(__doc__)
+    params = load_params(args.config, overrides)
+
+    import torch
+    from openparf.ops.electric_potential.electric_potential import (
+        ElectrostaticSystem,
+    )
+
+    db, placedb, placer = build_placer(params)
+    density_op = placer.op_cls.density_op
+    bin_map_dims = density_op.bin_map_dims
+    dtype = placer.data_cls.pos[0].dtype
+    device = placer.data_cls.pos[0].device
+
+    generator = torch.Generator().manual_seed(0)
+    density_maps = [
+        torch.rand(int(M), int(N), generator=generator, dtype=dtype).to(device)
+        for M, N in bin_map_dims.tolist()
+    ]
+
+    rows = []
+    max_diff = 0
+    energies = {}
+    modes = [("fast", True, False), ("full", False, False), ("spectral", False, True)]
+    for mode, fast_mode, spectral_energy_flag in modes:
+        results = []
+        for name, batch_flag in [("loop", False), ("batched", True)]:
+            es = ElectrostaticSystem(
+                bin_map_dims=bin_map_dims,
+                bin_sizes=density_op.bin_sizes,
+                dtype=dtype,
+                device=device,
+                fast_mode=fast_mode,
+                xy_ratio=density_op.xy_ratio,
+                batch_flag=batch_flag,
+                spectral_energy_flag=spectral_energy_flag,
+            )
+            ms = time_fn(
+                lambda: es.forward(density_maps), device, args.warmup, args.repeat
+            )
+            _, field_map_xs, field_map_ys, energy = es.forward(density_maps)
+            energies[mode] = energy.clone()
+            results.append(
+                [x.clone() for x in field_map_xs] + [y.clone() for y in field_map_ys]
+            )
+            rows.append(
+                [
+                    name,
+                    mode,
+                    "%d" % len(es.groups),
+                    "%.3f" % ms,
+                ]
+            )
+        for ref, x in zip(*results):
+            max_diff = max(max_diff, (ref - x).abs().max().item())
+    energy_diff = (energies["spectral"] - energies["full"]).abs() / energies[
+        "full"
+    ].abs().clamp(min=1e-30)
+    print(
+        "design %s, #area types %d, device %s, max |field diff| %g, "
+        "max relative |energy diff| spectral vs full %g"
+        % (args.config, len(density_maps), device, max_diff, energy_diff.max().item())
+    )
+    print_table(["impl", "mode", "#transform batches", "ms/solve"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Benchmark the global placement throughput (iterations/second).
+
+Runs the Nesterov loop of Placer.one_step from the same initial placement
+for every metric evaluation stride in --strides, and reports the iteration
+rate and the final HPWL/overflow of each run.
+"""
+
+import copy
+import time
+
+from perf_utils import parse_args, load_params, build_placer, synchronize, print_table
+
+
+def add_arguments(parser):
+    parser.add_argument(
+        "--strides",
+        type=int,
+        nargs="+",
+        default=[1, 5, 10],
+        help="values of gp_metric_eval_stride to compare",
+    )
+
+
+def run(placer, stride, init_pos, warmup, repeat):
+    import torch
+    from openparf.placement.metric import OptIter
+    from openparf.placement.nesterov import NesterovAcceleratedGradientOptimizer
+    from openparf.placement.place_model import PlaceModel
+
+    params = placer.params
+    params.gp_metric_eval_stride = stride
+    with torch.no_grad():
+        placer.data_cls.pos[0].data.copy_(init_pos)
+    placer.model = PlaceModel(
+        params, placer.placedb, placer.data_cls, placer.op_cls
+    ).to(placer.device)
+    placer.optimizer = NesterovAcceleratedGradientOptimizer(
+        placer.parameters(),
+        lr=0,
+        obj_and_grad_fn=placer.model.obj_and_grad_fn,
+        constraint_fn=placer.op_cls.move_boundary_op,
+    )
+    eval_ops = {
+        "hpwl": placer.op_cls.hpwl_op,
+        "overflow": placer.op_cls.normalized_overflow_op,
+        "area_type_grad_norm": placer.op_cls.area_type_grad_norm_op,
+    }
+    opt_iter = OptIter(0, 0, 0, 0, 0)
+    placer.num_confine_fence_region = 0
+    placer.invalidate_metrics()
+    # same random initial placement for every run
+    params.random_center_init_flag = False
+    placer.initialize_params(eval_ops, opt_iter)
+    placer.initialize_learning_rate(placer.model, placer.optimizer, 0.1)
+
+    device = placer.data_cls.pos[0].device
+    metrics = []
+    tt = None
+    for i in range(warmup + repeat):
+        if i == warmup:
+            synchronize(device)
+            tt = time.time()
+        metrics.append(placer.one_step(placer.optimizer, eval_ops, opt_iter))
+        placer.update_gamma(opt_iter, metrics[-1].overflow)
+        opt_iter.iteration += 1
+    synchronize(device)
+    elapsed = time.time() - tt
+    last = metrics[-1]
+    return (
+        repeat / elapsed,
+        float(last.hpwl.sum()),
+        float(last.overflow.max()),
+        last.eval_iteration,
+    )
+
+
+def main():
+    args, overrides = parse_args(__doc__, add_arguments)
+    params = load_params(args.config, overrides)
+
+    db, placedb, placer = build_placer(params)
+    pos = placer.data_cls.pos[0]
+    if params.random_center_init_flag:
+        placer.op_cls.random_pos_op(pos)
+    init_pos = pos.data.clone()
+
+    rows = []
+    for stride in args.strides:
+        its, hpwl, overflow, eval_iteration = run(
+            placer, stride, init_pos, args.warmup, args.repeat
+        )
+        rows.append(
+            [stride, "%.2f" % its, "%.6E" % hpwl, "%.4f" % overflow, eval_iteration]
+        )
+    print("design %s, #insts %d, device %s" % (args.config, pos.size(0), pos.device))
+    print_table(
+        ["stride", "iters/s", "last HPWL", "last max overflow", "evaluated at"], rows
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Benchmark the independent set matching detailed placement, e.g.,
+    python scripts/perf/perf_ism_dp.py \
+        --config unittest/regression/mlcad2023/Design_2.json \
+        --pos results/Design_2.lg.pt --windows 4 4 --time_budget 5
+
+Compares the per-call forward, which builds a new detailed placer, against
+the persistent placer, which keeps the ISM solvers across calls, and checks
+that they give the same locations. Then runs the persistent placer with
+--windows parallel windowed passes and with a runtime budget of
+--time_budget seconds. The locations are loaded from --pos, a tensor of the
+legal instance locations (x, y, z), e.g., inst_locs_xyz saved after
+legalization. Clock constraints are not honored.
+
+Reports the runtime of every run and the phases of the persistent placer.
+"""
+
+from perf_utils import (
+    parse_args,
+    load_params,
+    build_placer,
+    time_fn,
+    print_table,
+)
+
+
+def add_arguments(parser):
+    parser.add_argument(
+        "--pos",
+        type=str,
+        required=True,
+        help="torch file of the legal instance locations, shape (#insts, 3)",
+    )
+    parser.add_argument(
+        "--windows",
+        type=int,
+        nargs=2,
+        default=[4, 4],
+        help="number of windows in x and y of the windowed passes",
+    )
+    parser.add_argument(
+        "--time_budget",
+        type=float,
+        default=1.0,
+        help="runtime budget in seconds of the budgeted run",
+    )
+
+
+def main():
+    args, overrides = parse_args(__doc__, add_arguments)
+    params = load_params(args.config, overrides)
+
+    import torch
+    from openparf.ops.ism_dp import ism_dp, ism_dp_cpp
+
+    db, placedb, placer = build_placer(params)
+    locs = torch.load(args.pos).cpu()
+    assert locs.shape[1] == 3
+
+    dp = ism_dp.ISMDetailedPlace(placedb, params)
+    dp.param.verbose = 0
+    dp.param.numWindowsX = dp.param.numWindowsY = 0
+    dp.param.timeBudget = 0.0
+    dp.fixed_mask = torch.zeros(locs.shape[0], dtype=torch.uint8)
+    dummy = torch.zeros((1))
+    device = torch.device("cpu")
+
+    def per_call():
+        return ism_dp_cpp.forward(placedb, dp.param, dummy, dummy, dp.fixed_mask, locs)
+
+    golden = per_call()
+    result = dp(locs)
+    max_diff = float((golden - result).abs().max())
+
+    per_call_ms = time_fn(per_call, device, args.warmup, args.repeat)
+    rows = [["per-call placer", "%.3f" % per_call_ms, "1.00x"]]
+    phase_rows = []
+
+    def run(name, num_windows, time_budget):
+        dp.param.numWindowsX, dp.param.numWindowsY = num_windows
+        dp.param.timeBudget = time_budget
+        ms = time_fn(lambda: dp(locs), device, args.warmup, args.repeat)
+        rows.append([name, "%.3f" % ms, "%.2fx" % (per_call_ms / ms)])
+        phase_rows.extend([name, k, "%.3f" % v] for k, v in dp.phase_times().items())
+
+    run("persistent placer", [0, 0], 0.0)
+    run("windowed %dx%d" % tuple(args.windows), args.windows, 0.0)
+    run("budget %g s" % args.time_budget, [0, 0], args.time_budget)
+
+    print(
+        "design %s, %d threads, locations %s, max |diff| %g"
+        % (args.config, params.num_threads, args.pos, max_diff)
+    )
+    print_table(["ISM detailed placement", "time (ms)", "speedup"], rows)
+    print_table(["run", "phase", "time (ms)"], phase_rows)
+
+
+if __name__ == "__main__":
+    main()
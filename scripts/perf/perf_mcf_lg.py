@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Benchmark the min-cost flow legalization of single-site resources, e.g.,
+    python scripts/perf/perf_mcf_lg.py \
+        --config unittest/regression/mlcad2023/Design_2.json
+
+Legalizes the DSP/RAM-like instances with the monolithic flow problem and
+with the partitioned one, on ssr_legalize_partition_dims of the configuration
+or the clock region grid, and reports runtime, total and
+maximum displacement, and the number of instances re-assigned by the global
+pass. Positions are loaded from --pos, e.g., a tensor saved after global
+placement, otherwise they are drawn uniformly over the die.
+
+Then moves --move_ratio of the instances by up to --move_dist, and all the
+others by up to --jitter as between two calls during global placement, and
+compares a warm-started incremental legalization, with the legalizer kept from the
+original positions, against the cold one of a new legalizer, and reports how
+many instances were solved again and how many arcs were rebuilt.
+
+A legalizer accumulates arcs over its calls, so every run uses a new one and
+only the legalization itself is timed.
+"""
+
+from perf_utils import (
+    parse_args,
+    load_params,
+    build_placer,
+    print_table,
+)
+
+
+def add_arguments(parser):
+    parser.add_argument(
+        "--pos",
+        type=str,
+        default=None,
+        help="torch file of the instance positions, shape (#insts, 2)",
+    )
+    parser.add_argument(
+        "--move_ratio",
+        type=float,
+        default=0.1,
+        help="ratio of instances moved before the incremental legalization",
+    )
+    parser.add_argument(
+        "--move_dist",
+        type=float,
+        default=2.0,
+        help="maximum x and y distance of a move",
+    )
+    parser.add_argument(
+        "--jitter",
+        type=float,
+        default=0.1,
+        help="maximum x and y distance of the other instances",
+    )
+
+
+def main():
+    args, overrides = parse_args(__doc__, add_arguments)
+    params = load_params(args.config, overrides)
+
+    import time
+    import torch
+    from openparf.ops.mcf_lg import mcf_lg
+
+    db, placedb, placer = build_placer(params)
+    data_cls = placer.data_cls
+    pos = data_cls.pos[0].data.cpu().clone()
+    if args.pos is not None:
+        pos.copy_(torch.load(args.pos).view_as(pos))
+    else:
+        generator = torch.Generator().manual_seed(params.random_seed)
+        xy = pos.view(-1, 2)
+        dims = placedb.siteMapDim()
+        xy[:, 0] = torch.rand(xy.size(0), generator=generator, dtype=pos.dtype) * dims.x()
+        xy[:, 1] = torch.rand(xy.size(0), generator=generator, dtype=pos.dtype) * dims.y()
+
+    def run(partition_flag, incremental_flag, positions, warm_positions=None):
+        params.ssr_legalize_partition_flag = partition_flag
+        params.ssr_legalize_incremental_flag = incremental_flag
+        times = []
+        for _ in range(args.warmup + args.repeat):
+            legalizer = mcf_lg.MinCostFlowLegalizer(params, placedb, data_cls).legalizer
+            if warm_positions is not None:
+                legalizer.forward(warm_positions)
+            tt = time.time()
+            res = legalizer.forward(positions)
+            times.append((time.time() - tt) * 1000)
+        return legalizer, res, sum(times[args.warmup :]) / max(args.repeat, 1)
+
+    rows = []
+    monolithic_ms = None
+    for name, partition_flag in [("monolithic", 0), ("partitioned", 1)]:
+        legalizer, res, ms = run(partition_flag, 0, pos)
+        num_reconciled = legalizer.get_num_reconciled_insts() if partition_flag else 0
+        disp = (res.view(-1, 2) - pos.view(-1, 2)).abs().sum(dim=1)
+        monolithic_ms = monolithic_ms or ms
+        rows.append(
+            [
+                name,
+                "%.3f" % ms,
+                "%.2fx" % (monolithic_ms / ms),
+                "%g" % float(disp.sum()),
+                "%g" % float(disp.max()),
+                num_reconciled,
+            ]
+        )
+
+    print(
+        "design %s, %d threads, %s positions"
+        % (args.config, params.num_threads, args.pos or "random")
+    )
+    print_table(
+        [
+            "legalization",
+            "time (ms)",
+            "speedup",
+            "displacement",
+            "max displacement",
+            "#reconciled",
+        ],
+        rows,
+    )
+
+    # incremental legalization after moving some instances
+    generator = torch.Generator().manual_seed(params.random_seed + 1)
+    moved_pos = pos.clone()
+    xy = moved_pos.view(-1, 2)
+    moved = torch.rand(xy.size(0), generator=generator) < args.move_ratio
+    shift = torch.rand(xy.size(), generator=generator, dtype=pos.dtype) * 2 - 1
+    xy[moved] += shift[moved] * args.move_dist
+    xy[~moved] += shift[~moved] * args.jitter
+    rows = []
+    cold_ms = None
+    for name, warm_positions in [("cold", None), ("warm", pos)]:
+        legalizer, res, ms = run(0, 1, moved_pos, warm_positions)
+        disp = (res.view(-1, 2) - xy).abs().sum(dim=1)
+        cold_ms = cold_ms or ms
+        rows.append(
+            [name, "%.3f" % ms, "%.2fx" % (cold_ms / ms), "%g" % float(disp.sum())]
+            + ["%d" % x for x in legalizer.get_incremental_stats()]
+        )
+    print(
+        "incremental legalization, %.1f%% of the instances moved by up to %g, the others by up to %g"
+        % (args.move_ratio * 100, args.move_dist, args.jitter)
+    )
+    print_table(
+        [
+            "legalization",
+            "time (ms)",
+            "speedup",
+            "displacement",
+            "#solved again",
+            "#arcs rebuilt",
+            "#moved sites",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
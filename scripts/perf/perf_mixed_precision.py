@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Regression benchmark of mixed-precision global placement.
+
+Runs global placement of the design twice with float64 positions, once with
+float64 wirelength and density ops and once with gp_mixed_precision_flag,
+which computes them in float32. Reports the runtime, the final HPWL and the
+maximum overflow of each run, and the deltas of the mixed-precision run, e.g.,
+    python scripts/perf/perf_mixed_precision.py \
+        --config unittest/regression/ehbookshelf/sample1.json
+Legalization and detailed placement are skipped unless overridden.
+"""
+
+import time
+
+from perf_utils import (
+    parse_args,
+    load_params,
+    build_placer,
+    synchronize,
+    print_table,
+)
+
+
+def run(config, overrides, mixed_precision_flag):
+    import torch
+
+    params = load_params(config, overrides)
+    params.dtype = "float64"
+    params.gp_mixed_precision_flag = mixed_precision_flag
+    db, placedb, placer = build_placer(params)
+    device = placer.data_cls.pos[0].device
+
+    synchronize(device)
+    tt = time.time()
+    placer()
+    synchronize(device)
+    elapsed = time.time() - tt
+
+    with torch.no_grad():
+        pos = placer.data_cls.pos[0]
+        hpwl = placer.op_cls.hpwl_op(pos)
+        overflow = placer.op_cls.normalized_overflow_op(pos)
+    weights = params.wirelength_weights
+    return (
+        elapsed,
+        float(hpwl[0] * weights[0] + hpwl[1] * weights[1]),
+        float(overflow.max()),
+        device,
+    )
+
+
+def main():
+    args, overrides = parse_args(__doc__)
+    overrides.setdefault("legalize_flag", 0)
+    overrides.setdefault("detailed_place_flag", 0)
+
+    results = [run(args.config, overrides, flag) for flag in [0, 1]]
+    ref_time, ref_hpwl, ref_overflow, device = results[0]
+    rows = []
+    for name, (elapsed, hpwl, overflow, _) in zip(["float64", "mixed"], results):
+        rows.append(
+            [
+                name,
+                "%.3f" % elapsed,
+                "%.2fx" % (ref_time / elapsed),
+                "%.6E" % hpwl,
+                "%+.3f%%" % (100.0 * (hpwl - ref_hpwl) / ref_hpwl),
+                "%.4f" % overflow,
+                "%+.4f" % (overflow - ref_overflow),
+            ]
+        )
+    print("design %s, device %s" % (args.config, device))
+    print_table(
+        [
+            "mode",
+            "GP time (s)",
+            "speedup",
+            "HPWL",
+            "HPWL delta",
+            "max overflow",
+            "overflow delta",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
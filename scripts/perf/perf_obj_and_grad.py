@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Benchmark one evaluation of PlaceModel.obj_and_grad_fn.
+
+Compares the current implementation, which back-propagates each term into
+preallocated buffers, against the previous clone-based implementation kept
+below for reference. Reports time and memory allocated per evaluation.
+"""
+
+from perf_utils import (
+    parse_args,
+    load_params,
+    build_placer,
+    reset_peak_memory,
+    peak_memory_mb,
+    time_fn,
+    print_table,
+)
+
+
+def legacy_obj_and_grad_fn(model, pos):
+    """The clone-based implementation before the buffers were preallocated"""
+    data_cls = model.data_cls
+    obj, _ = model.obj_fn(pos)
+    if pos.grad is not None:
+        pos.grad.zero_()
+    model.wirelength.backward()
+    wirelength_grad = pos.grad.data.clone()
+    if pos.grad is not None:
+        pos.grad.zero_()
+    model.density.backward()
+    density_grad = pos.grad.data.clone()
+    pos.grad.data.copy_(wirelength_grad + density_grad)
+    pos.grad.data.masked_fill_(data_cls.inst_lock_mask.view([-1, 1]), 0)
+    if model.params.gp_dynamic_precondition:
+        ratios = pos.new_ones(data_cls.num_area_types)
+        for area_type in range(data_cls.num_area_types - 1):
+            inst_ids = data_cls.area_type_inst_groups[area_type]
+            if len(inst_ids):
+                ratios[area_type] = density_grad[inst_ids].norm(p=1) / wirelength_grad[inst_ids].norm(p=1)
+        precond_alphas = model.op_cls.stable_zero_div_op(ratios.clamp_(min=1.0), data_cls.multiplier.lambdas)
+    else:
+        precond_alphas = pos.new_ones(data_cls.num_area_types)
+    model.op_cls.precond_op(pos.grad, precond_alphas)
+    grad_dicts = {
+        "wirelength_grad_norm": wirelength_grad.norm(p=1),
+        "density_grad_norm": density_grad.norm(p=1),
+    }
+    return obj, pos.grad, grad_dicts
+
+
+def allocated_mb(fn, device):
+    """Memory allocated by one call of fn(), as seen by the autograd profiler"""
+    import torch
+
+    with torch.autograd.profiler.profile(
+        use_cuda=(device.type == "cuda"), profile_memory=True
+    ) as prof:
+        fn()
+    if device.type == "cuda":
+        total = sum(max(e.self_cuda_memory_usage, 0) for e in prof.function_events)
+    else:
+        total = sum(max(e.self_cpu_memory_usage, 0) for e in prof.function_events)
+    return total / 2 ** 20
+
+
+def main():
+    args, overrides = parse_args(__doc__)
+    params = load_params(args.config, overrides)
+
+    import torch
+    from openparf.placement.place_model import PlaceModel
+    from openparf.placement.metric import OptIter
+
+    db, placedb, placer = build_placer(params)
+    placer.model = PlaceModel(
+        params, placedb, placer.data_cls, placer.op_cls
+    ).to(placer.device)
+    eval_ops = {
+        "hpwl": placer.op_cls.hpwl_op,
+        "overflow": placer.op_cls.normalized_overflow_op,
+    }
+    placer.initialize_params(eval_ops, OptIter(0, 0, 0, 0, 0))
+    pos = placer.data_cls.pos[0]
+    device = pos.device
+
+    candidates = [
+        ("legacy", lambda: legacy_obj_and_grad_fn(placer.model, pos)),
+        ("fused", lambda: placer.model.obj_and_grad_fn(pos)),
+    ]
+
+    # sanity check: both implementations give the same gradient
+    ref_grad = candidates[0][1]()[1].clone()
+    grad = candidates[1][1]()[1]
+    max_diff = (ref_grad - grad).abs().max().item()
+
+    rows = []
+    for name, fn in candidates:
+        reset_peak_memory(device)
+        ms = time_fn(fn, device, args.warmup, args.repeat)
+        rows.append(
+            [
+                name,
+                "%.3f" % ms,
+                "%.2f" % allocated_mb(fn, device),
+                "%.2f" % peak_memory_mb(device),
+            ]
+        )
+    print(
+        "design %s, #insts %d, device %s, max |grad diff| %g"
+        % (args.config, pos.size(0), device, max_diff)
+    )
+    print_table(["impl", "ms/eval", "allocated MB/eval", "peak MB"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Benchmark static timing analysis on a design, e.g.,
+    python scripts/perf/perf_static_timing_analysis.py \
+        --config unittest/regression/mlcad2023/Design_2.json
+
+Compares the per-call forward, which rebuilds the timing graph and
+propagates sequentially, against the persistent levelized timing graph
+with one thread and with num_threads threads. Pin delays come from the
+delay estimation op if timing is enabled in the configuration, otherwise
+random delays are used. Results must be identical.
+
+Then times incremental updates of the delays of --update_ratio of the pins
+against a full analysis, and checks that they give the same timing.
+"""
+
+from perf_utils import (
+    parse_args,
+    load_params,
+    build_placer,
+    time_fn,
+    print_table,
+)
+
+
+def add_arguments(parser):
+    parser.add_argument(
+        "--timing_period",
+        type=float,
+        default=None,
+        help="timing period in ps, defaults to params.timing_period or 5000",
+    )
+    parser.add_argument(
+        "--update_ratio",
+        type=float,
+        default=0.01,
+        help="ratio of pins whose delays change in each incremental update",
+    )
+
+
+def main():
+    args, overrides = parse_args(__doc__, add_arguments)
+    params = load_params(args.config, overrides)
+
+    import time
+    import torch
+    from openparf.ops.static_timing_analysis import static_timing_analysis_cpp
+
+    db, placedb, placer = build_placer(params)
+    data_cls = placer.data_cls
+    timing_period = args.timing_period or params.timing_period or 5000.0
+    if placer.op_cls.estimate_delay_op is not None:
+        with torch.no_grad():
+            pin_delays, _ = placer.op_cls.estimate_delay_op(data_cls.pos[0])
+        pin_delays = pin_delays.cpu().contiguous()
+    else:
+        generator = torch.Generator().manual_seed(params.random_seed)
+        pin_delays = torch.rand(
+            placedb.numPins(), generator=generator, dtype=data_cls.pos[0].dtype
+        ).mul_(1000)
+    net_mask = data_cls.net_mask_ignore_large.cpu().contiguous()
+    device = torch.device("cpu")
+
+    tt = time.time()
+    graph = static_timing_analysis_cpp.TimingGraph(placedb, net_mask)
+    build_time = (time.time() - tt) * 1000
+
+    legacy = static_timing_analysis_cpp.forward(
+        placedb, pin_delays, net_mask, timing_period
+    )
+    result = graph.forward(pin_delays, timing_period)
+    max_diffs = [
+        float((a.double() - b.double()).abs().max()) if a.numel() else 0.0
+        for a, b in zip(legacy, result)
+    ]
+
+    rows = []
+    torch.set_num_threads(params.num_threads)
+    legacy_ms = time_fn(
+        lambda: static_timing_analysis_cpp.forward(
+            placedb, pin_delays, net_mask, timing_period
+        ),
+        device,
+        args.warmup,
+        args.repeat,
+    )
+    rows.append(["per-call graph", 1, "%.3f" % legacy_ms, "1.00x"])
+    for num_threads in sorted(set([1, params.num_threads])):
+        torch.set_num_threads(num_threads)
+        ms = time_fn(
+            lambda: graph.forward(pin_delays, timing_period),
+            device,
+            args.warmup,
+            args.repeat,
+        )
+        rows.append(
+            ["levelized graph", num_threads, "%.3f" % ms, "%.2fx" % (legacy_ms / ms)]
+        )
+    torch.set_num_threads(params.num_threads)
+
+    print(
+        "design %s: %d pins, %d arcs, %d levels, graph built once in %.3f ms"
+        % (
+            args.config,
+            placedb.numPins(),
+            graph.num_arcs(),
+            graph.num_levels(),
+            build_time,
+        )
+    )
+    print(
+        "max |diff| arrivals %g, requires %g, ignored nets %g"
+        % tuple(max_diffs)
+    )
+    print_table(["STA", "threads", "time (ms)", "speedup"], rows)
+
+    # incremental updates, each perturbing a random subset of the pin delays
+    num_changed = max(int(placedb.numPins() * args.update_ratio), 1)
+    generator = torch.Generator().manual_seed(params.random_seed)
+    updates = []
+    for _ in range(args.warmup + args.repeat):
+        pin_ids = torch.randperm(placedb.numPins(), generator=generator)[:num_changed]
+        scales = 0.5 + torch.rand(num_changed, generator=generator, dtype=pin_delays.dtype)
+        updates.append((pin_ids.int(), pin_delays[pin_ids] * scales))
+    graph.analyze(pin_delays, timing_period)
+    current = pin_delays.clone()
+    for pin_ids, delays in updates[: args.warmup]:
+        graph.update(pin_ids, delays)
+        current[pin_ids.long()] = delays
+    tt = time.time()
+    num_updated_insts = 0
+    for pin_ids, delays in updates[args.warmup :]:
+        result = graph.update(pin_ids, delays)
+        num_updated_insts += graph.num_updated_insts()
+    update_ms = (time.time() - tt) * 1000 / max(args.repeat, 1)
+    for pin_ids, delays in updates[args.warmup :]:
+        current[pin_ids.long()] = delays
+    golden = graph.forward(current, timing_period)
+    analyze_ms = time_fn(
+        lambda: graph.analyze(current, timing_period), device, args.warmup, args.repeat
+    )
+    max_diffs = [float((a - b).abs().max()) for a, b in zip(result[:2], golden[:2])]
+    print(
+        "incremental update of %d pins re-timed %.1f instances on average, "
+        "max |diff| arrivals %g, requires %g"
+        % (num_changed, num_updated_insts / max(args.repeat, 1), *max_diffs)
+    )
+    print_table(
+        ["STA", "time (ms)", "speedup"],
+        [
+            ["full analysis", "%.3f" % analyze_ms, "1.00x"],
+            ["incremental update", "%.3f" % update_ms, "%.2fx" % (analyze_ms / update_ms)],
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
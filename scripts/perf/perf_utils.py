@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Shared helpers of the performance scripts in this directory.
+
+The scripts are meant to be run against an installed tree, e.g.,
+    python scripts/perf/perf_obj_and_grad.py --project_dir <install_dir> \
+        --config unittest/regression/mlcad2023/Design_2.json
+Extra `--key value` pairs override the corresponding JSON parameters.
+"""
+
+import os
+import sys
+import time
+import logging
+import resource
+import argparse
+
+
+def parse_args(description, add_arguments=None):
+    """Parse the common command line arguments.
+
+    :param description: description of the script
+    :param add_arguments: optional callback to register script-specific arguments
+    :return: (parsed arguments, dict of parameter overrides)
+    """
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        description=description,
+    )
+    parser.add_argument(
+        "--project_dir",
+        type=str,
+        default=os.path.dirname(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        ),
+        help="directory containing the openparf python package",
+    )
+    parser.add_argument(
+        "--config", type=str, required=True, help="path the parameter json file"
+    )
+    parser.add_argument(
+        "--warmup", type=int, default=3, help="number of untimed warm-up runs"
+    )
+    parser.add_argument("--repeat", type=int, default=20, help="number of timed runs")
+    if add_arguments is not None:
+        add_arguments(parser)
+    args, unknown_args = parser.parse_known_args()
+    overrides = dict(
+        [unknown_args[i].lstrip("-"), unknown_args[i + 1]]
+        for i in range(0, len(unknown_args), 2)
+    )
+    if args.project_dir not in sys.path:
+        sys.path.append(args.project_dir)
+    logging.basicConfig(level=logging.WARNING)
+    return args, overrides
+
+
+def load_params(config, overrides=None):
+    """Load placement parameters the same way as openparf.py does."""
+    from openparf.params import Params
+
+    params = Params()
+    params.load(config)
+    for k, v in (overrides or {}).items():
+        params.update(k, v)
+    os.environ["OMP_NUM_THREADS"] = "%d" % params.num_threads
+    return params
+
+
+def build_placer(params):
+    """Build the placement database and a placer on top of it.
+
+    :return: (database, placement database, placer); the database must be kept
+        alive as long as the placement database is in use.
+    """
+    import torch
+    from openparf.flow import build_placedb
+    from openparf.placement.placer import Placer
+
+    torch.set_num_threads(params.num_threads)
+    db, placedb = build_placedb(params)
+    placer = Placer(params, placedb)
+    return db, placedb, placer
+
+
+def synchronize(device):
+    import torch
+
+    if device.type == "cuda":
+        torch.cuda.synchronize()
+
+
+def reset_peak_memory(device):
+    import torch
+
+    if device.type == "cuda":
+        torch.cuda.reset_peak_memory_stats(device)
+
+
+def peak_memory_mb(device):
+    """Peak memory since the last reset on GPU, peak RSS of the process on CPU"""
+    import torch
+
+    if device.type == "cuda":
+        return torch.cuda.max_memory_allocated(device) / 2 ** 20
+    # ru_maxrss is in KB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2 ** 10
+
+
+def time_fn(fn, device, warmup, repeat):
+    """Average wall time of fn() in milliseconds"""
+    for _ in range(warmup):
+        fn()
+    synchronize(device)
+    tt = time.time()
+    for _ in range(repeat):
+        fn()
+    synchronize(device)
+    return (time.time() - tt) * 1000 / max(repeat, 1)
+
+
+def print_table(header, rows):
+    """Print rows as a markdown table"""
+    rows = [[str(x) for x in row] for row in rows]
+    widths = [len(x) for x in header]
+    for row in rows:
+        widths = [max(w, len(x)) for w, x in zip(widths, row)]
+    content = "| " + " | ".join(x.ljust(w) for x, w in zip(header, widths)) + " |\n"
+    content += "| " + " | ".join("-" * w for w in widths) + " |\n"
+    for row in rows:
+        content += "| " + " | ".join(x.ljust(w) for x, w in zip(row, widths)) + " |\n"
+    print(content)
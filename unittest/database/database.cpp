@@ -22,6 +22,7 @@
 
 #include <gtest/gtest.h>
 
+#include <cstdio>
 #include <fstream>
 #include <iostream>
 #include <sstream>
@@ -205,6 +206,60 @@ class EHBookshelfTest : public ::testing::Test {
   }
 };
 
+class SnapshotTest : public ::testing::Test {
+ public:
+  void testSample1() {
+    openparf::database::Database db(0);
+    db.readEHBookshelf(test_dir + "/" + "../../benchmarks/ehbookshelf/sample1");
+    std::string filename = ::testing::TempDir() + "database_snapshot.bin";
+    ASSERT_TRUE(db.writeSnapshot(filename));
+
+    openparf::database::Database snapshot(0);
+    ASSERT_TRUE(snapshot.readSnapshot(filename));
+    std::remove(filename.c_str());
+
+    auto const &design = db.design();
+    auto const &other  = snapshot.design();
+    ASSERT_EQ(design.numModels(), other.numModels());
+    for (auto const &model : design.models()) {
+      ASSERT_EQ(other.modelId(model.name()), model.id());
+    }
+    auto const &netlist       = *design.netlist();
+    auto const &other_netlist = *other.netlist();
+    ASSERT_EQ(netlist.numInsts(), other_netlist.numInsts());
+    ASSERT_EQ(netlist.numNets(), other_netlist.numNets());
+    ASSERT_EQ(netlist.numPins(), other_netlist.numPins());
+    for (auto const &inst : netlist.insts()) {
+      auto const &other_inst = other_netlist.inst(inst.id());
+      ASSERT_EQ(inst.attr().name(), other_inst.attr().name());
+      ASSERT_EQ(inst.attr().modelId(), other_inst.attr().modelId());
+      ASSERT_EQ(inst.attr().loc(), other_inst.attr().loc());
+      ASSERT_EQ(inst.pinIds(), other_inst.pinIds());
+    }
+    for (auto const &net : netlist.nets()) {
+      ASSERT_EQ(net.attr().name(), other_netlist.net(net.id()).attr().name());
+      ASSERT_EQ(net.pinIds(), other_netlist.net(net.id()).pinIds());
+    }
+    ASSERT_EQ(design.topModuleInst()->netlist().instIds(), other.topModuleInst()->netlist().instIds());
+
+    auto const &site_map       = db.layout().siteMap();
+    auto const &other_site_map = snapshot.layout().siteMap();
+    ASSERT_EQ(site_map.size(), other_site_map.size());
+    for (auto const &site : site_map) {
+      auto other_site = other_site_map.at(site.siteMapId().x(), site.siteMapId().y());
+      ASSERT_EQ(site.bbox(), other_site->bbox());
+      ASSERT_EQ(site.siteTypeId(), other_site->siteTypeId());
+    }
+    auto const &resource_map = snapshot.layout().resourceMap();
+    ASSERT_EQ(resource_map.resourceId("URAM288"), resource_map.modelResourceIds(other.modelId("URAM288"))[0]);
+
+    auto &shape_constraint = snapshot.shapeConstraint();
+    ASSERT_EQ(shape_constraint.shapeModels().size(), 11);
+    ASSERT_EQ(shape_constraint.shapeModel(10).name(), "URAM_CASCADE_8x2");
+    ASSERT_EQ(shape_constraint.shapes().size(), 10);
+    ASSERT_EQ(shape_constraint.shapes()[0].instIds().size(), 2);
+  }
+};
 
 TEST_F(DatabaseTest, Sample1) {
   testSample1();
@@ -214,6 +269,10 @@ TEST_F(EHBookshelfTest, Sample1) {
   testSample1();
 }
 
+TEST_F(SnapshotTest, Sample1) {
+  testSample1();
+}
+
 }   // namespace unitest
 
 OPENPARF_END_NAMESPACE
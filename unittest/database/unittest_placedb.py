@@ -7,8 +7,11 @@
 import pdb
 import os
 import sys
+import tempfile
 import unittest
 
+import numpy as np
+
 if len(sys.argv) < 2:
     print("usage: python script.py [project_dir] test_dir")
     project_dir = os.path.dirname(
@@ -280,6 +283,78 @@ class PlaceDBTest(unittest.TestCase):
             elif model.name() in ["LRAM", "SHIFT"]:
                 self.assertEqual(inst_area_type, placedb.resourceAreaTypes("LUTM"))
 
+    def testNumpyViews(self):
+        db = of.database.Database(0)
+        db.readBookshelf(test_dir + "/sample1/design.aux")
+        placedb = of.database.PlaceDB(db)
+
+        inst_locs = placedb.instLocs().numpy()
+        self.assertEqual(inst_locs.shape, (placedb.numInsts(), 3))
+        self.assertEqual(inst_locs.tolist(), placedb.instLocs().tolist())
+        # views of the same vector share its memory
+        self.assertTrue(
+            np.shares_memory(inst_locs, placedb.instLocs().numpy()))
+
+        inst_sizes = placedb.instSizes().numpy()
+        self.assertEqual(inst_sizes.shape, (placedb.numInsts() *
+                                            placedb.numAreaTypes(), 2))
+        self.assertEqual(inst_sizes.tolist(), placedb.instSizes().tolist())
+        self.assertEqual(placedb.binMapDims().numpy().tolist(),
+                         placedb.binMapDims().tolist())
+        self.assertEqual(placedb.pinOffsets().numpy().tolist(),
+                         placedb.pinOffsets().tolist())
+        for area_type in range(placedb.numAreaTypes()):
+            self.assertEqual(
+                placedb.binCapacityMap(area_type).numpy().tolist(),
+                placedb.binCapacityMap(area_type).tolist())
+        self.assertEqual(placedb.instPins().data().numpy().tolist(),
+                         placedb.instPins().data().tolist())
+        self.assertEqual(placedb.pin2Net().numpy().tolist(),
+                         placedb.pin2Net().tolist())
+        # vectors returned by value are kept alive by their views
+        self.assertEqual(placedb.getInstModelIds().numpy().tolist(),
+                         placedb.getInstModelIds().tolist())
+        # enums are viewed as their underlying integers
+        self.assertEqual(placedb.pinSignalDirects().numpy().dtype, np.uint8)
+        self.assertEqual(placedb.pinSignalDirects().numpy().tolist(), [
+            int(x) for x in placedb.pinSignalDirects().tolist()
+        ])
+
+        # the views remain valid after the python objects of the database are released
+        del placedb
+        del db
+        self.assertEqual(inst_locs.shape[1], 3)
+        inst_locs.sum()
+
+    def testInstLocsIO(self):
+        db = of.database.Database(0)
+        db.readBookshelf(test_dir + "/sample1/design.aux")
+        placedb = of.database.PlaceDB(db)
+        num_insts = placedb.numInsts()
+
+        np.random.seed(0)
+        xy = np.random.uniform(0, 100, [num_insts, 2])
+        xy[0] = [1.5, 0.1]
+        bgn, end = 1, num_insts
+        with tempfile.TemporaryDirectory() as dirname:
+            filename = os.path.join(dirname, "test.pl")
+            self.assertTrue(
+                placedb.writeInstLocs(filename, xy[bgn:end], bgn, end))
+            with open(filename, "r") as f:
+                lines = f.read().splitlines()
+            self.assertEqual(len(lines), end - bgn)
+            self.assertEqual(lines[0].split()[0], placedb.instName(bgn))
+
+            # instances missing in the file keep their locations
+            xy_read = np.full([num_insts, 2], -1.0)
+            self.assertTrue(placedb.readInstLocs(filename, xy_read))
+            np.testing.assert_array_equal(xy_read[bgn:end], xy[bgn:end])
+            np.testing.assert_array_equal(xy_read[:bgn], -1.0)
+
+            with open(filename, "a") as f:
+                f.write("unknown_inst 1 2\n")
+            self.assertFalse(placedb.readInstLocs(filename, xy_read))
+
 
 if __name__ == '__main__':
     if len(sys.argv) < 2:
@@ -388,6 +388,135 @@ class ElectricPotentialOpTest(unittest.TestCase):
                     rtol=1e-3,
                     atol=1e-5)
 
+    def testBatchedElectrostaticSystem(self):
+        """Area types with the same dimensions solved in a batch give the same
+        results as solving them one by one
+        """
+        dtype = torch.float64
+        torch.manual_seed(10)
+        MNs = [[16, 8], [16, 8], [32, 16], [16, 8]]
+        bin_sizes = [[1.0, 2.0], [2.0, 1.0], [1.0, 1.0], [1.0, 0.5]]
+        devices = [torch.device('cpu')]
+        if configure.compile_configurations[
+                "CUDA_FOUND"] == "TRUE" and torch.cuda.device_count():
+            devices.append(torch.device('cuda'))
+        for device in devices:
+            density_maps = [
+                torch.rand(M, N, dtype=dtype, device=device) for M, N in MNs
+            ]
+            results = []
+            for batch_flag in [False, True]:
+                es = electric_potential.ElectrostaticSystem(
+                    bin_map_dims=torch.tensor(MNs, dtype=torch.int32),
+                    bin_sizes=bin_sizes,
+                    dtype=dtype,
+                    device=device,
+                    fast_mode=False,
+                    xy_ratio=1,
+                    batch_flag=batch_flag)
+                self.assertEqual(len(es.groups), 2 if batch_flag else 4)
+                potential_maps, field_map_xs, field_map_ys, energy = es.forward(
+                    density_maps)
+                results.append([
+                    [x.cpu().numpy().copy() for x in potential_maps],
+                    [x.cpu().numpy().copy() for x in field_map_xs],
+                    [x.cpu().numpy().copy() for x in field_map_ys],
+                    energy.cpu().numpy().copy()
+                ])
+            for i in range(3):
+                for ref, x in zip(results[0][i], results[1][i]):
+                    np.testing.assert_allclose(ref, x, rtol=1e-9, atol=1e-12)
+            np.testing.assert_allclose(results[0][3],
+                                       results[1][3],
+                                       rtol=1e-9)
+
+
+    def testSpectralEnergy(self):
+        """Energy from the dct coefficients equals the energy from the potential maps
+        """
+        dtype = torch.float64
+        torch.manual_seed(10)
+        MNs = [[16, 8], [16, 8], [32, 16], [12, 20]]
+        bin_sizes = [[1.0, 2.0], [2.0, 1.0], [1.0, 1.0], [1.0, 0.5]]
+        devices = [torch.device('cpu')]
+        if configure.compile_configurations[
+                "CUDA_FOUND"] == "TRUE" and torch.cuda.device_count():
+            devices.append(torch.device('cuda'))
+        for device in devices:
+            density_maps = [
+                torch.rand(M, N, dtype=dtype, device=device) for M, N in MNs
+            ]
+            energies = []
+            for spectral_energy_flag in [False, True]:
+                es = electric_potential.ElectrostaticSystem(
+                    bin_map_dims=torch.tensor(MNs, dtype=torch.int32),
+                    bin_sizes=bin_sizes,
+                    dtype=dtype,
+                    device=device,
+                    fast_mode=False,
+                    xy_ratio=0.5,
+                    spectral_energy_flag=spectral_energy_flag)
+                potential_maps, field_map_xs, field_map_ys, energy = es.forward(
+                    density_maps)
+                energies.append(energy.cpu().numpy().copy())
+            np.testing.assert_allclose(energies[0], energies[1], rtol=1e-9)
+
+    def testLockedAreaTypes(self):
+        """Instances locked by SSR legalization leave the movable density,
+        and their area type leaves the electrostatic solve once all its instances are locked
+        """
+        dtype = torch.float64
+        # area type 0: movable 0-2 and fixed 5, area type 1: movable 3-4, e.g., DSPs
+        inst_sizes = torch.zeros(6, 2, 2, dtype=dtype)
+        inst_sizes[[0, 1, 2, 5], 0] = 1.0
+        inst_sizes[[3, 4], 1] = 2.0
+        pos = torch.tensor([[1.5, 2.5], [4.0, 4.5], [6.5, 1.5], [2.0, 6.0], [5.0, 5.0], [7.5, 7.5]],
+                           dtype=dtype)
+        bin_map_dims = torch.tensor([[8, 8], [4, 4]], dtype=torch.int32)
+
+        def build():
+            return electric_potential.ElectricPotential(
+                inst_sizes=inst_sizes,
+                initial_density_maps=[None, None],
+                bin_map_dims=bin_map_dims,
+                area_type_mask=torch.ones(2, dtype=torch.bool),
+                xl=0.0,
+                yl=0.0,
+                xh=8.0,
+                yh=8.0,
+                movable_range=(0, 5),
+                filler_range=(6, 6),
+                fixed_range=(5, 6),
+                target_density=torch.ones(2, dtype=dtype),
+                smooth_flag=False,
+                deterministic_flag=True,
+                fast_mode=False)
+
+        def run(op, pos):
+            pos_var = pos.clone().requires_grad_(True)
+            energy = op.forward(pos_var)
+            energy.sum().backward()
+            return energy.detach(), pos_var.grad
+
+        golden_energy, golden_grad = run(build(), pos)
+
+        op = build()
+        op.lock(torch.tensor([0, 0, 0, 1, 1, 0], dtype=torch.uint8))
+        energy, grad = run(op, pos)
+        np.testing.assert_allclose(energy.numpy(), golden_energy.numpy(), rtol=1e-9)
+        # locked instances get no density gradient, the others are unaffected
+        self.assertTrue(torch.equal(op.inst_sizes_unlocked[3:5], torch.zeros(2, 2, 2, dtype=dtype)))
+        np.testing.assert_allclose(grad[3:5].numpy(), 0)
+        np.testing.assert_allclose(grad[:3].numpy(), golden_grad[:3].numpy(), rtol=1e-9)
+        self.assertEqual(op.lockedAreaTypes(), [1])
+        self.assertEqual(op.electrostatic_system.frozen_area_types, [1])
+
+        # the locked instances stay where they were locked in the static map
+        moved = pos.clone()
+        moved[3:5] += 1.0
+        energy, grad = run(op, moved)
+        np.testing.assert_allclose(energy.numpy(), golden_energy.numpy(), rtol=1e-9)
+
 
 if __name__ == '__main__':
     if len(sys.argv) < 2:
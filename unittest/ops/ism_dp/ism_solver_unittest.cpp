@@ -0,0 +1,177 @@
+/**
+ * @file   ism_solver_unittest.cpp
+ * @brief  ISMSolver kept across runs matches a new solver per run, windowed passes do not degrade the wirelength
+ */
+#include "ops/ism_dp/src/ism_solver.h"
+#include <algorithm>
+#include <gtest/gtest.h>
+#include <random>
+#include <set>
+#include <vector>
+
+OPENPARF_BEGIN_NAMESPACE
+
+namespace unittest {
+
+using ism_dp::Box;
+using ism_dp::IndexType;
+using ism_dp::ISMParam;
+using ism_dp::ISMProblem;
+using ism_dp::ISMSolver;
+using ism_dp::kIndexTypeMax;
+using ism_dp::kRealTypeMax;
+using ism_dp::kRealTypeMin;
+using ism_dp::RealType;
+using ism_dp::XY;
+
+class ISMSolverTest : public ::testing::Test {
+public:
+  static constexpr IndexType kNumSitesX    = 16;
+  static constexpr IndexType kNumSitesY    = 16;
+  static constexpr IndexType kNumFixed     = 4;
+  static constexpr IndexType kNumThreads   = 2;
+  static constexpr IndexType kMaxNetDegree = 16;
+
+  /// A random legal placement of a tiny design, with 70% of the sites occupied by instances with nets, fillers on the
+  /// other sites and a few fixed instances
+  ISMProblem makeProblem(unsigned seed) const {
+    std::mt19937 rng(seed);
+    ISMProblem   prob;
+    prob.siteXYs.resize(kNumSitesX, kNumSitesY);
+    for (IndexType x = 0; x < kNumSitesX; ++x) {
+      for (IndexType y = 0; y < kNumSitesY; ++y) {
+        prob.siteXYs(x, y) = XY<RealType>(x + 0.5, y + 0.5);
+      }
+    }
+    prob.siteToCtrlSet.resize(kNumSitesX, kNumSitesY, kIndexTypeMax);
+    prob.siteToMate.resize(kNumSitesX, kNumSitesY, kIndexTypeMax);
+
+    IndexType              num_sites = kNumSitesX * kNumSitesY;
+    IndexType              num_insts = num_sites * 7 / 10;
+    std::vector<IndexType> sites(num_sites);
+    for (IndexType s = 0; s < num_sites; ++s) {
+      sites[s] = s;
+    }
+    std::shuffle(sites.begin(), sites.end(), rng);
+    prob.instTypes.assign(num_sites, 0);
+    prob.instToSite = sites;
+    prob.instXYs.resize(num_sites);
+    prob.instCKSR.assign(num_sites, kIndexTypeMax);
+    prob.instCE.assign(num_sites, ISMProblem::CESet{kIndexTypeMax, kIndexTypeMax});
+    prob.instToMates.assign(num_sites, {});
+    for (IndexType i = 0; i < kNumFixed; ++i) {
+      prob.instToSite[i] = kIndexTypeMax;
+      prob.instTypes[i]  = kIndexTypeMax;
+      prob.instXYs[i]    = XY<RealType>(rng() % kNumSitesX, rng() % kNumSitesY);
+    }
+
+    // local nets of 2 to 5 pins, some of them on a fixed instance
+    std::uniform_int_distribution<IndexType> inst_dist(kNumFixed, num_insts - 1);
+    for (IndexType n = 0; n < num_insts; ++n) {
+      std::set<IndexType> pins{inst_dist(rng)};
+      if (n % 10 == 0) {
+        pins.insert(rng() % kNumFixed);
+      }
+      IndexType degree = 2 + rng() % 4;
+      while ((IndexType) pins.size() < degree) {
+        pins.insert(inst_dist(rng));
+      }
+      for (IndexType i : pins) {
+        prob.pinToInst.push_back(i);
+        prob.pinToNet.push_back(n);
+        prob.pinOffsets.emplace_back(0, 0);
+      }
+      prob.netWts.push_back(1.0);
+    }
+    prob.honorClockConstraints = false;
+    return prob;
+  }
+
+  ISMParam makeParam() const {
+    ISMParam param;
+    param.verbose           = 0;
+    param.maxNetDegree      = kMaxNetDegree;
+    param.maxRadius         = 5;
+    param.numSitePerCtrlSet = kIndexTypeMax;
+    return param;
+  }
+
+  /// Sites of the instances after a run
+  std::vector<IndexType> run(ISMSolver &solver, const ISMProblem &prob) const {
+    solver.buildISMProblem(prob);
+    solver.run();
+    std::vector<IndexType> sites;
+    for (IndexType i = 0; i < (IndexType) prob.instTypes.size(); ++i) {
+      sites.push_back(solver.instSol(i).siteId);
+    }
+    return sites;
+  }
+
+  /// HPWL of the nets optimized by ISM with the instances on the given sites
+  RealType hpwl(const ISMProblem &prob, const std::vector<IndexType> &sites) const {
+    std::vector<Box<RealType>> bboxes(prob.netWts.size(),
+            Box<RealType>(kRealTypeMax, kRealTypeMax, kRealTypeMin, kRealTypeMin));
+    std::vector<IndexType>     degrees(prob.netWts.size(), 0);
+    for (IndexType p = 0; p < (IndexType) prob.pinToInst.size(); ++p) {
+      IndexType i = prob.pinToInst[p];
+      bboxes[prob.pinToNet[p]].encompass(sites[i] == kIndexTypeMax ? prob.instXYs[i] : prob.siteXYs[sites[i]]);
+      ++degrees[prob.pinToNet[p]];
+    }
+    RealType total = 0;
+    for (IndexType n = 0; n < (IndexType) bboxes.size(); ++n) {
+      if (degrees[n] <= kMaxNetDegree) {
+        total += prob.netWts[n] * (bboxes[n].width() + bboxes[n].height());
+      }
+    }
+    return total;
+  }
+
+  void testPersistent() const {
+    ISMProblem prob  = makeProblem(1);
+    ISMProblem prob2 = makeProblem(2);
+    ISMParam   param = makeParam();
+
+    // a solver kept across runs, as the persistent detailed placer does
+    ISMSolver persistent(prob, param, kNumThreads);
+    auto      sites       = run(persistent, prob);
+    auto      sites2      = run(persistent, prob2);
+    auto      sites_again = run(persistent, prob);
+
+    // a new solver per run, as the per-call detailed placer does
+    ISMSolver solver(prob, param, kNumThreads);
+    ISMSolver solver2(prob2, param, kNumThreads);
+    ASSERT_EQ(sites, run(solver, prob));
+    ASSERT_EQ(sites2, run(solver2, prob2));
+    ASSERT_EQ(sites_again, sites);
+    ASSERT_LT(hpwl(prob, sites), hpwl(prob, prob.instToSite));
+  }
+
+  void testWindowed() const {
+    ISMProblem prob  = makeProblem(3);
+    ISMParam   param = makeParam();
+    param.numWindowsX     = 2;
+    param.numWindowsY     = 2;
+    param.numWindowPasses = 2;
+    ISMSolver solver(prob, param, kNumThreads);
+    auto      sites = run(solver, prob);
+
+    // every site holds at most one instance
+    std::set<IndexType> used;
+    for (IndexType i = 0; i < (IndexType) sites.size(); ++i) {
+      if (sites[i] == kIndexTypeMax) {
+        ASSERT_EQ(prob.instToSite[i], kIndexTypeMax);
+        continue;
+      }
+      ASSERT_TRUE(used.insert(sites[i]).second);
+    }
+    ASSERT_LE(hpwl(prob, sites), hpwl(prob, prob.instToSite));
+  }
+};
+
+TEST_F(ISMSolverTest, Persistent) { testPersistent(); }
+
+TEST_F(ISMSolverTest, Windowed) { testWindowed(); }
+
+} // namespace unittest
+
+OPENPARF_END_NAMESPACE
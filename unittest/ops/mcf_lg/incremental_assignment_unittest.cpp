@@ -0,0 +1,202 @@
+/**
+ * @file   incremental_assignment_unittest.cpp
+ * @brief  Incremental solves of IncrementalAssignment match the solve from scratch
+ */
+#include "ops/mcf_lg/src/incremental_assignment.h"
+#include <algorithm>
+#include <array>
+#include <cmath>
+#include <cstdint>
+#include <gtest/gtest.h>
+#include <random>
+#include <vector>
+
+OPENPARF_BEGIN_NAMESPACE
+
+namespace unittest {
+
+class IncrementalAssignmentTest : public ::testing::Test {
+public:
+  using Assignment = IncrementalAssignment<double>;
+  using CostType   = Assignment::CostType;
+
+  struct Inst {
+    double x      = 0;
+    double y      = 0;
+    double weight = 1;
+    bool   active = true;
+  };
+
+  static constexpr int32_t kNumSitesX   = 8;
+  static constexpr int32_t kNumSitesY   = 8;
+  static constexpr int32_t kNumInsts    = 40;
+  static constexpr int32_t kScaleFactor = 100;
+
+  IncrementalAssignmentTest() : rng_(1000), insts_(kNumInsts) {
+    for (int32_t x = 0; x < kNumSitesX; ++x) {
+      for (int32_t y = 0; y < kNumSitesY; ++y) {
+        sites_.push_back({x + 0.5, y + 0.5});
+      }
+    }
+    site_available_.assign(sites_.size(), true);
+    for (auto &inst : insts_) {
+      randomize(inst);
+    }
+  }
+
+  /// an assignment of the current instances and sites
+  Assignment build(double dist_incr) const {
+    Assignment assignment(sites_, kNumInsts, dist_incr, kScaleFactor);
+    for (int32_t s = 0; s < (int32_t) sites_.size(); ++s) {
+      assignment.updateSite(s, site_available_[s]);
+    }
+    for (int32_t i = 0; i < kNumInsts; ++i) {
+      auto const &inst = insts_[i];
+      assignment.updateInst(i, inst.x, inst.y, inst.weight, inst.active);
+    }
+    return assignment;
+  }
+
+  /// check that the assignment is legal and return its cost
+  CostType cost(Assignment const &assignment) const {
+    std::vector<int32_t> site_inst(sites_.size(), -1);
+    CostType             total = 0;
+    for (int32_t i = 0; i < kNumInsts; ++i) {
+      auto const &inst = insts_[i];
+      int32_t     s    = assignment.instSite(i);
+      if (!inst.active) {
+        EXPECT_EQ(s, -1);
+        continue;
+      }
+      EXPECT_NE(s, -1);
+      if (s == -1) continue;
+      EXPECT_TRUE(site_available_[s]);
+      EXPECT_EQ(site_inst[s], -1);
+      site_inst[s]  = i;
+      double dist   = std::abs(sites_[s][0] - inst.x) + std::abs(sites_[s][1] - inst.y);
+      total        += (CostType) (dist * inst.weight * kScaleFactor);
+    }
+    return total;
+  }
+
+  /// move, re-weight, deactivate and activate random instances, and block and release random sites, solving after
+  /// every few updates
+  void testUpdates(double dist_incr) {
+    Assignment assignment = build(dist_incr);
+    ASSERT_TRUE(assignment.solve());
+    ASSERT_EQ(cost(assignment), cost(fromScratch(dist_incr)));
+
+    std::uniform_int_distribution<int32_t> inst_dist(0, kNumInsts - 1);
+    std::uniform_int_distribution<int32_t> site_dist(0, sites_.size() - 1);
+    std::uniform_int_distribution<int32_t> op_dist(0, 3);
+    for (int32_t step = 0; step < 50; ++step) {
+      for (int32_t k = 0; k < 3; ++k) {
+        int32_t i    = inst_dist(rng_);
+        auto   &inst = insts_[i];
+        switch (op_dist(rng_)) {
+          case 0:
+            randomize(inst);
+            break;
+          case 1:
+            inst.weight = std::uniform_int_distribution<int32_t>(1, 3)(rng_);
+            break;
+          case 2:
+            inst.active = !inst.active;
+            break;
+          default: {
+            int32_t s = site_dist(rng_);
+            // keep enough sites for all the instances
+            if (site_available_[s] && numAvailableSites() == kNumInsts) break;
+            site_available_[s] = !site_available_[s];
+            assignment.updateSite(s, site_available_[s]);
+            break;
+          }
+        }
+        assignment.updateInst(i, inst.x, inst.y, inst.weight, inst.active);
+      }
+      ASSERT_TRUE(assignment.solve());
+      ASSERT_EQ(cost(assignment), cost(fromScratch(dist_incr)));
+    }
+  }
+
+  /// move every instance a little, as between two calls of global placement, most instances keep their sites as a
+  /// warm start
+  void testJitter(double dist_incr) {
+    Assignment assignment = build(dist_incr);
+    ASSERT_TRUE(assignment.solve());
+    std::uniform_real_distribution<double> shift_dist(-0.05, 0.05);
+    int32_t                                num_steps         = 10;
+    int32_t                                num_updated_insts = 0;
+    for (int32_t step = 0; step < num_steps; ++step) {
+      for (int32_t i = 0; i < kNumInsts; ++i) {
+        auto &inst = insts_[i];
+        inst.x     = std::min(std::max(inst.x + shift_dist(rng_), 0.0), (double) kNumSitesX);
+        inst.y     = std::min(std::max(inst.y + shift_dist(rng_), 0.0), (double) kNumSitesY);
+        assignment.updateInst(i, inst.x, inst.y, inst.weight, inst.active);
+      }
+      ASSERT_TRUE(assignment.solve());
+      ASSERT_EQ(cost(assignment), cost(fromScratch(dist_incr)));
+      num_updated_insts += assignment.stats().num_updated_insts;
+    }
+    // a cold solve would augment from every instance
+    ASSERT_LT(num_updated_insts, num_steps * kNumInsts / 2);
+  }
+
+  /// the update of an instance to its current state leaves the assignment as is
+  void testNoop() {
+    Assignment assignment = build(2);
+    ASSERT_TRUE(assignment.solve());
+    std::vector<int32_t> inst_sites;
+    for (int32_t i = 0; i < kNumInsts; ++i) {
+      inst_sites.push_back(assignment.instSite(i));
+      auto const &inst = insts_[i];
+      assignment.updateInst(i, inst.x, inst.y, inst.weight, inst.active);
+      assignment.updateSite(i, site_available_[i]);
+    }
+    ASSERT_TRUE(assignment.solve());
+    ASSERT_EQ(assignment.stats().num_updated_insts, 0);
+    ASSERT_EQ(assignment.stats().num_changed_arcs, 0);
+    ASSERT_EQ(assignment.stats().num_reassigned_insts, 0);
+    for (int32_t i = 0; i < kNumInsts; ++i) {
+      ASSERT_EQ(assignment.instSite(i), inst_sites[i]);
+    }
+  }
+
+private:
+  Assignment fromScratch(double dist_incr) const {
+    Assignment assignment = build(dist_incr);
+    EXPECT_TRUE(assignment.solve());
+    return assignment;
+  }
+
+  void randomize(Inst &inst) {
+    std::uniform_real_distribution<double> x_dist(0, kNumSitesX);
+    std::uniform_real_distribution<double> y_dist(0, kNumSitesY);
+    inst.x = x_dist(rng_);
+    inst.y = y_dist(rng_);
+  }
+
+  int32_t numAvailableSites() const {
+    int32_t count = 0;
+    for (bool available : site_available_) {
+      count += available;
+    }
+    return count;
+  }
+
+  std::mt19937                       rng_;
+  std::vector<std::array<double, 2>> sites_;
+  std::vector<bool>                  site_available_;
+  std::vector<Inst>                  insts_;
+};
+
+/// arcs to all the sites, both solves are optimal over the complete graph
+TEST_F(IncrementalAssignmentTest, Updates) { testUpdates(kNumSitesX + kNumSitesY); }
+
+TEST_F(IncrementalAssignmentTest, Jitter) { testJitter(kNumSitesX + kNumSitesY); }
+
+TEST_F(IncrementalAssignmentTest, Noop) { testNoop(); }
+
+} // namespace unittest
+
+OPENPARF_END_NAMESPACE
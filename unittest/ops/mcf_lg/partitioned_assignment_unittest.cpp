@@ -0,0 +1,125 @@
+/**
+ * @file   partitioned_assignment_unittest.cpp
+ * @brief  Partitioned solves of PartitionedAssignment are legal and close to the monolithic solve
+ */
+#include "ops/mcf_lg/src/partitioned_assignment.h"
+#include <array>
+#include <cmath>
+#include <cstdint>
+#include <gtest/gtest.h>
+#include <random>
+#include <vector>
+
+OPENPARF_BEGIN_NAMESPACE
+
+namespace unittest {
+
+class PartitionedAssignmentTest : public ::testing::Test {
+public:
+  using Assignment = PartitionedAssignment<double>;
+  using Insts      = std::vector<std::array<double, 3>>;
+  using Sites      = std::vector<std::array<double, 2>>;
+
+  static constexpr int32_t kNumSitesX        = 16;
+  static constexpr int32_t kNumSitesY        = 16;
+  static constexpr int32_t kSitePerIteration = 100;
+  static constexpr int32_t kScaleFactor      = 1000;
+  static constexpr int32_t kNumThreads       = 2;
+
+  /// two models, one on every site of the grid and one on the even columns only
+  PartitionedAssignmentTest() : model_sites_(2) {
+    for (int32_t x = 0; x < kNumSitesX; ++x) {
+      for (int32_t y = 0; y < kNumSitesY; ++y) {
+        model_sites_[0].push_back({x + 0.5, y + 0.5});
+        if (x % 2 == 0) {
+          model_sites_[1].push_back({x + 0.5, y + 0.5});
+        }
+      }
+    }
+  }
+
+  /// instances with weights of 1 to 3, uniform over [0, w) x [0, h)
+  Insts makeInsts(unsigned seed, int32_t num_insts, double w, double h) const {
+    std::mt19937                           rng(seed);
+    std::uniform_real_distribution<double> x_dist(0, w);
+    std::uniform_real_distribution<double> y_dist(0, h);
+    std::uniform_int_distribution<int>     weight_dist(1, 3);
+    Insts                                  insts;
+    for (int32_t i = 0; i < num_insts; ++i) {
+      double x = x_dist(rng);
+      double y = y_dist(rng);
+      insts.push_back({x, y, (double) weight_dist(rng)});
+    }
+    return insts;
+  }
+
+  /// check that every instance has its own site and return the weighted displacement
+  double cost(Insts const &insts, Sites const &sites, std::vector<int32_t> const &inst_sites) const {
+    EXPECT_EQ(inst_sites.size(), insts.size());
+    std::vector<int32_t> site_insts(sites.size(), -1);
+    double               total = 0;
+    for (int32_t i = 0; i < (int32_t) inst_sites.size(); ++i) {
+      int32_t s = inst_sites[i];
+      EXPECT_GE(s, 0);
+      EXPECT_LT(s, (int32_t) sites.size());
+      if (s < 0 || s >= (int32_t) sites.size()) continue;
+      EXPECT_EQ(site_insts[s], -1);
+      site_insts[s]  = i;
+      total         += (std::abs(sites[s][0] - insts[i][0]) + std::abs(sites[s][1] - insts[i][1])) * insts[i][2];
+    }
+    return total;
+  }
+
+  /// partitioned solve of both models, legal and within the tolerance of the monolithic solve of each model
+  int32_t testPartitioned(std::vector<Insts> const &model_insts,
+          int32_t                                   num_windows_x,
+          int32_t                                   num_windows_y,
+          double                                    margin,
+          double                                    tolerance) const {
+    Assignment                        assignment(kSitePerIteration, kScaleFactor);
+    std::vector<std::vector<int32_t>> model_inst_sites;
+    int32_t num_reconciled_insts = assignment.solvePartitioned(model_insts, model_sites_, kNumSitesX, kNumSitesY,
+            num_windows_x, num_windows_y, margin, kNumThreads, model_inst_sites);
+    EXPECT_EQ(model_inst_sites.size(), model_insts.size());
+    for (int32_t idx = 0; idx < (int32_t) model_insts.size(); ++idx) {
+      auto const          &insts = model_insts[idx];
+      auto const          &sites = model_sites_[idx];
+      std::vector<int32_t> inst_sites;
+      EXPECT_TRUE(assignment.solve(insts, sites, inst_sites));
+      double monolithic = cost(insts, sites, inst_sites);
+      EXPECT_LE(cost(insts, sites, model_inst_sites[idx]), monolithic * (1 + tolerance));
+    }
+    return num_reconciled_insts;
+  }
+
+  std::vector<Sites> model_sites_;
+};
+
+/// a single window is the monolithic problem
+TEST_F(PartitionedAssignmentTest, SingleWindow) {
+  std::vector<Insts> model_insts = {makeInsts(1, 150, kNumSitesX, kNumSitesY),
+          makeInsts(2, 60, kNumSitesX, kNumSitesY)};
+  ASSERT_EQ(testPartitioned(model_insts, 1, 1, 0.5, 0), 0);
+}
+
+/// instances spread over the die, from a few large windows to many small ones without margin
+TEST_F(PartitionedAssignmentTest, Uniform) {
+  for (unsigned seed = 0; seed < 5; ++seed) {
+    std::vector<Insts> model_insts = {makeInsts(seed, 150, kNumSitesX, kNumSitesY),
+            makeInsts(seed + 100, 60, kNumSitesX, kNumSitesY)};
+    testPartitioned(model_insts, 2, 2, 0.5, 0.05);
+    testPartitioned(model_insts, 4, 4, 0.5, 0.05);
+    testPartitioned(model_insts, 4, 4, 0, 0.15);
+  }
+}
+
+/// instances crowding a corner, windows widen their sites and claim the same ones, the global pass assigns the rest
+TEST_F(PartitionedAssignmentTest, Crowded) {
+  std::vector<Insts> model_insts = {makeInsts(3, 150, kNumSitesX / 2, kNumSitesY / 2),
+          makeInsts(4, 60, kNumSitesX / 2, kNumSitesY / 2)};
+  ASSERT_GT(testPartitioned(model_insts, 4, 4, 0.5, 0.2), 0);
+}
+
+}   // namespace unittest
+
+OPENPARF_END_NAMESPACE
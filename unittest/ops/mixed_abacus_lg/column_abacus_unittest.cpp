@@ -0,0 +1,190 @@
+/**
+ * @file   column_abacus_unittest.cpp
+ * @brief  The column search of the column-wise Abacus matches the spiral over all the columns, windowed placements
+ * are legal
+ */
+#include "ops/mixed_abacus_lg/src/column_abacus.h"
+#include <algorithm>
+#include <gtest/gtest.h>
+#include <limits>
+#include <map>
+#include <memory>
+#include <random>
+#include <utility>
+#include <vector>
+
+OPENPARF_BEGIN_NAMESPACE
+
+namespace unittest {
+
+using mixed_abacus_legalizer::Columns;
+using mixed_abacus_legalizer::placeCells;
+using mixed_abacus_legalizer::Range;
+using mixed_abacus_legalizer::XY;
+using mixed_abacus_legalizer::detail::Cell;
+using mixed_abacus_legalizer::detail::CellList;
+using mixed_abacus_legalizer::detail::Cluster;
+using mixed_abacus_legalizer::detail::ColumnPlacement;
+
+class ColumnAbacusTest : public ::testing::Test {
+public:
+  /// column and bottom y of each cell
+  using Placement = std::map<int32_t, std::pair<int32_t, float>>;
+
+  static constexpr int32_t kNumSiteX    = 24;
+  static constexpr int32_t kNumSiteY    = 40;
+  static constexpr int32_t kSiteHeight  = 2;
+  static constexpr int32_t kNumColSites = 16;
+  static constexpr int32_t kRegionXl    = 8;
+  static constexpr int32_t kRegionXh    = 16;
+
+  /// every fourth column has no resource site, the others are shifted up by a site every other column
+  ColumnAbacusTest() {
+    columns_.site_height = kSiteHeight;
+    for (int32_t x = 0; x < kNumSiteX; x++) {
+      bool feasible = x % 4 != 3;
+      columns_.col_yl.push_back(feasible ? (x % 2) * kSiteHeight : kNumSiteY);
+      columns_.col_yh.push_back(feasible ? columns_.col_yl.back() + kNumColSites * kSiteHeight : 0);
+      columns_.col_heights.push_back(feasible ? kNumColSites * kSiteHeight : 0);
+      if (feasible) {
+        columns_.feasible_cols.push_back(x);
+      }
+    }
+  }
+
+  /// cascades of 1 to 3 sites around the center of [xl, xh), one in five constrained to the columns of a region
+  CellList makeCells(unsigned seed, int32_t num_cells, float xl, float xh) {
+    std::mt19937                          rng(seed);
+    std::uniform_real_distribution<float> x_dist(xl, xh);
+    std::uniform_real_distribution<float> y_dist(0, kNumSiteY);
+    std::uniform_int_distribution<int>    len_dist(1, 3);
+    CellList                              cell_list;
+    pos_.clear();
+    for (int32_t i = 0; i < num_cells; i++) {
+      float height = kSiteHeight * len_dist(rng);
+      float x      = x_dist(rng);
+      float y      = y_dist(rng);
+      pos_.push_back(x);
+      pos_.push_back(y);
+      Range x_range = i % 5 == 0 ? Range(kRegionXl, kRegionXh) : Range(0, kNumSiteX);
+      cell_list.emplace_back(XY<float>(x - 0.5, y - height * 0.5), height, x_range, Range(0, kNumSiteY), {i});
+    }
+    return cell_list;
+  }
+
+  /// the search over all the columns before the column index, spiraling out of the column of the cell
+  std::vector<ColumnPlacement> spiralPlaceCells(CellList &cell_list) {
+    std::vector<ColumnPlacement> heads(kNumSiteX);
+    std::vector<Cell>           &cells = cell_list.cells();
+    std::sort(cells.begin(), cells.end(), [](const Cell &a, const Cell &b) -> bool {
+      return a.pos().y() == b.pos().y() ? a.height() > b.height() : a.pos().y() < b.pos().y();
+    });
+    for (auto &cell : cells) {
+      float                    best_added_cost = std::numeric_limits<float>::max();
+      int                      best_col        = std::numeric_limits<int>::max();
+      std::shared_ptr<Cluster> best_col_first_cluster;
+      int                      ix = std::floor(cell.pos().x());
+      for (int dx = 0; dx < kNumSiteX; dx++) {
+        for (int sign : {1, -1}) {
+          int Xc = ix + dx * sign;
+          if (!(0 <= Xc && Xc < kNumSiteX)) {
+            continue;
+          }
+          if (!(cell.range_xmin() <= Xc && Xc < cell.range_xmax())) {
+            continue;
+          }
+          float x_cost = (cell.pos().x() - Xc) * (cell.pos().x() - Xc);
+          if (x_cost >= best_added_cost) {
+            continue;
+          }
+          ColumnPlacement &head = heads[Xc];
+          if (head.height_sum + cell.height() > columns_.col_heights[Xc]) {
+            continue;
+          }
+          float column_origin_cost = head.root != nullptr ? head.root->prefix_cost : 0;
+          auto  cluster            = std::make_shared<Cluster>(cell, head.root);
+          cluster->update(columns_.col_yl[Xc], columns_.col_yh[Xc], columns_.site_height, cell_list, pos_.data());
+          while (cluster->next != nullptr && cluster->overlap_with(*cluster->next)) {
+            *cluster = cluster->next->merge_with(*cluster);
+            cluster->update(columns_.col_yl[Xc], columns_.col_yh[Xc], columns_.site_height, cell_list, pos_.data());
+          }
+          float added_cost = x_cost + cluster->prefix_cost - column_origin_cost;
+          if (added_cost < best_added_cost) {
+            best_col               = Xc;
+            best_added_cost        = added_cost;
+            best_col_first_cluster = cluster;
+          }
+        }
+      }
+      EXPECT_NE(best_col, std::numeric_limits<int>::max());
+      heads[best_col].root = best_col_first_cluster;
+      heads[best_col].height_sum += cell.height();
+    }
+    return heads;
+  }
+
+  /// check that every cell is placed once, within its columns, on the sites of its column without overlap
+  Placement legalPlacement(CellList const &cell_list, std::vector<ColumnPlacement> const &heads) const {
+    Placement placement;
+    for (int32_t x = 0; x < kNumSiteX; x++) {
+      std::vector<std::pair<float, float>> spans;
+      float                                height_sum = 0;
+      for (auto cluster = heads[x].root; cluster; cluster = cluster->next) {
+        for (size_t j = 0; j < cluster->cells.size(); j++) {
+          auto       &cell = cluster->cells[j];
+          float       y    = cluster->Yc + cluster->cell_offsets[j];
+          EXPECT_TRUE(placement.emplace(cell_list.cell_inst_ids(cell.id())[0], std::make_pair(x, y)).second);
+          EXPECT_LE(cell.range_xmin(), x);
+          EXPECT_LT(x, cell.range_xmax());
+          EXPECT_GE(y, columns_.col_yl[x]);
+          EXPECT_LE(y + cell.height(), columns_.col_yh[x]);
+          EXPECT_EQ(std::fmod(y - columns_.col_yl[x], columns_.site_height), 0);
+          spans.emplace_back(y, y + cell.height());
+          height_sum += cell.height();
+        }
+      }
+      EXPECT_LE(height_sum, columns_.col_heights[x]);
+      std::sort(spans.begin(), spans.end());
+      for (size_t k = 1; k < spans.size(); k++) {
+        EXPECT_LE(spans[k - 1].second, spans[k].first);
+      }
+    }
+    EXPECT_EQ(placement.size(), cell_list.size());
+    return placement;
+  }
+
+  void testSpiral(unsigned seed, int32_t num_cells) {
+    CellList cell_list = makeCells(seed, num_cells, 0, kNumSiteX);
+    CellList golden    = cell_list;
+    auto     heads     = placeCells(columns_, cell_list, pos_.data(), 0, 1);
+    auto     placement = legalPlacement(cell_list, heads);
+    ASSERT_EQ(placement, legalPlacement(golden, spiralPlaceCells(golden)));
+  }
+
+  void testWindowed(unsigned seed, int32_t num_cells, float xl, float xh) {
+    CellList cell_list = makeCells(seed, num_cells, xl, xh);
+    auto     heads     = placeCells(columns_, cell_list, pos_.data(), 5, 2);
+    legalPlacement(cell_list, heads);
+  }
+
+private:
+  Columns            columns_;
+  std::vector<float> pos_;
+};
+
+/// from sparse to nearly full columns
+TEST_F(ColumnAbacusTest, Spiral) {
+  for (unsigned seed = 0; seed < 20; seed++) {
+    testSpiral(seed, 10 + seed * 4);
+  }
+}
+
+/// cells spread over all the windows
+TEST_F(ColumnAbacusTest, Windowed) { testWindowed(1, 60, 0, kNumSiteX); }
+
+/// cells crowding the first window, most of them go to the other windows afterwards
+TEST_F(ColumnAbacusTest, WindowedCrowded) { testWindowed(2, 60, 0, 5); }
+
+}   // namespace unittest
+
+OPENPARF_END_NAMESPACE
@@ -0,0 +1,11 @@
+/**
+ * @file   main.cpp
+ * @author Yibo Lin
+ * @date   Mar 2020
+ */
+#include <gtest/gtest.h>
+
+int main(int argc, char **argv) {
+  testing::InitGoogleTest(&argc, argv);
+  return RUN_ALL_TESTS();
+}
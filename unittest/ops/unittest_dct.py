@@ -212,6 +212,106 @@ class DXTOpTest(unittest.TestCase):
                                        atol=1e-14)
 
 
+class BatchedDXTOpTest(unittest.TestCase):
+    def testBatchedRandom(self):
+        """A batch of maps is transformed as if each map was transformed alone"""
+        torch.manual_seed(10)
+        B = 3
+        M = 4
+        N = 8
+        x = torch.empty(B, M, N, dtype=torch.float64).uniform_(0, 10.0)
+        expkM = discrete_spectral_transform.getExactExpk(M,
+                                                         dtype=x.dtype,
+                                                         device=x.device)
+        expkN = discrete_spectral_transform.getExactExpk(N,
+                                                         dtype=x.dtype,
+                                                         device=x.device)
+
+        devices = [torch.device("cpu")]
+        if torch.cuda.device_count():
+            devices.append(torch.device("cuda"))
+        for device in devices:
+            for op in [dct.Dct2, dct.Idct2, dct.IdctIdxst, dct.IdxstIdct]:
+                custom = op(expkM.to(device), expkN.to(device))
+                # the output buffer of an op is reused, so copy each map
+                golden_value = np.stack([
+                    custom.forward(x[b].to(device)).cpu().numpy().copy()
+                    for b in range(B)
+                ])
+                custom = op(expkM.to(device), expkN.to(device))
+                batch_value = custom.forward(x.to(device)).cpu().numpy()
+                np.testing.assert_allclose(batch_value,
+                                           golden_value,
+                                           rtol=1e-9,
+                                           atol=1e-12)
+
+
+class MatmulDXTOpTest(unittest.TestCase):
+    def testMatmulRandom(self):
+        """The matmul backend matches the FFT backend on non-power-of-two maps"""
+        torch.manual_seed(10)
+        B = 2
+        M = 6
+        N = 10
+        x = torch.empty(B, M, N, dtype=torch.float64).uniform_(0, 10.0)
+
+        devices = [torch.device("cpu")]
+        if torch.cuda.device_count():
+            devices.append(torch.device("cuda"))
+        for device in devices:
+            for op in [dct.Dct2, dct.Idct2, dct.IdctIdxst, dct.IdxstIdct]:
+                golden_value = op(backend="fft").forward(
+                    x.to(device)).cpu().numpy()
+                matmul_value = op(backend="matmul").forward(
+                    x.to(device)).cpu().numpy()
+                np.testing.assert_allclose(matmul_value,
+                                           golden_value,
+                                           rtol=1e-9,
+                                           atol=1e-10)
+                auto_value = op(backend="auto").forward(
+                    x.to(device)).cpu().numpy()
+                np.testing.assert_allclose(auto_value,
+                                           golden_value,
+                                           rtol=1e-9,
+                                           atol=1e-10)
+
+    def testCache(self):
+        """Twiddle factors and bases are computed once per size, dtype and device"""
+        expk = dct.getCachedExpk(12, dtype=torch.float64, device="cpu")
+        self.assertIs(
+            dct.getCachedExpk(12, dtype=torch.float64, device="cpu"), expk)
+        self.assertIsNot(
+            dct.getCachedExpk(12, dtype=torch.float32, device="cpu"), expk)
+        np.testing.assert_allclose(
+            expk.numpy(),
+            discrete_spectral_transform.getExactExpk(
+                12, dtype=torch.float64, device="cpu").numpy())
+        basis = dct.getCachedBasis("idct", 12, torch.float64, "cpu")
+        self.assertIs(dct.getCachedBasis("idct", 12, torch.float64, "cpu"),
+                      basis)
+        self.assertEqual(dct.selectBackend("auto", 8, 16), "fft")
+        self.assertEqual(dct.selectBackend("auto", 168, 480), "matmul")
+        self.assertEqual(dct.selectBackend("fft", 168, 480), "fft")
+        dct.clearCache()
+        self.assertIsNot(
+            dct.getCachedExpk(12, dtype=torch.float64, device="cpu"), expk)
+
+    def testCacheBound(self):
+        """The cache keeps at most CACHE_MAX_ENTRIES, evicting the least recently used"""
+        dct.clearCache()
+        expk = dct.getCachedExpk(2, dtype=torch.float64, device="cpu")
+        for N in range(3, dct.CACHE_MAX_ENTRIES + 8):
+            # keep the first entry in use
+            self.assertIs(
+                dct.getCachedExpk(2, dtype=torch.float64, device="cpu"), expk)
+            dct.getCachedExpk(N, dtype=torch.float64, device="cpu")
+        self.assertEqual(len(dct._cache), dct.CACHE_MAX_ENTRIES)
+        self.assertIs(
+            dct.getCachedExpk(2, dtype=torch.float64, device="cpu"), expk)
+        self.assertNotIn(("expk", 3, torch.float64, "cpu"), dct._cache)
+        dct.clearCache()
+
+
 if __name__ == '__main__':
     torch.manual_seed(10)
     np.random.seed(10)
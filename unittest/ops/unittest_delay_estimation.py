@@ -0,0 +1,84 @@
+import math
+import os
+import sys
+import unittest
+import torch
+import numpy as np
+
+if len(sys.argv) < 2:
+    print("usage: python script.py [project_dir]")
+    project_dir = os.path.dirname(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+else:
+    project_dir = os.path.abspath(sys.argv[1])
+print("use project_dir = %s" % project_dir)
+
+sys.path.append(project_dir)
+if True:
+    from openparf.ops.delay_estimation import delay_estimation
+
+
+def denseFeatures(min_x, max_x, dy, is_ram, is_dsp, site_map_width):
+    """Golden dense features, following the loop of ExtractDelayFeatures
+    """
+    feature = np.zeros(site_map_width + 3)
+    lb = int(math.ceil(min_x))
+    rb = int(math.floor(max_x))
+    if lb > 0:
+        feature[lb - 1] = lb - min_x
+    if rb < site_map_width:
+        feature[rb] = max_x - rb
+    for i in range(lb, rb):
+        feature[i] = 1
+    feature[site_map_width] = dy
+    feature[site_map_width + 1] = is_ram
+    feature[site_map_width + 2] = is_dsp
+    return feature
+
+
+class LinearDelayModel(object):
+    """delay = 2 * covered columns + 3 * dy + 5 * RAM + 7 * DSP
+    """
+
+    def predict(self, features):
+        return features[:, :-3].sum(dim=1) * 2 + features[:, -3] * 3 + features[:, -2] * 5 + features[:, -1] * 7
+
+
+class DelayEstimationOpTest(unittest.TestCase):
+    def testExpandDelayFeatures(self):
+        site_map_width = 10
+        # spans inside one column, across columns, on column boundaries and at the layout boundaries
+        spans = [(2.3, 2.7), (1.5, 6.25), (3.0, 5.0), (0.0, 9.5), (4.0, 4.0), (0.0, 0.0), (7.2, 10.0)]
+        compact = []
+        golden = []
+        for i, (min_x, max_x) in enumerate(spans):
+            compact.append([min_x, max_x - min_x, 0.5 * i, i % 2, i // 4, 3])
+            golden.append(denseFeatures(min_x, max_x, 0.5 * i, i % 2, i // 4, site_map_width))
+        dense = delay_estimation.expand_delay_features(
+            torch.tensor(compact, dtype=torch.float64), site_map_width)
+        np.testing.assert_allclose(dense.numpy(), np.array(golden), atol=1e-12)
+
+    def testTabulatedDelayModel(self):
+        site_map_width = 10
+        model = delay_estimation.TabulatedDelayModel.from_model(
+            LinearDelayModel(), site_map_width=site_map_width, num_dy=6)
+        self.assertEqual(tuple(model.table.shape), (4, site_map_width + 1, 6))
+        # the table interpolates a model linear in dx and dy exactly, away from the boundaries
+        features = torch.tensor([[1.0, 2.5, 1.25, 0, 0, 1],
+                                 [0.0, 7.0, 4.5, 1, 0, 5],
+                                 [3.0, 0.0, 0.0, 0, 1, 2],
+                                 [2.0, 6.75, 3.0, 1, 1, 9]])
+        golden = features[:, 1] * 2 + features[:, 2] * 3 + features[:, 3] * 5 + features[:, 4] * 7
+        np.testing.assert_allclose(model(features).numpy(), golden.numpy(), rtol=1e-5)
+        # dy beyond the table is clamped to its last row
+        features[:, 2] = 100
+        golden = features[:, 1] * 2 + 5 * 3 + features[:, 3] * 5 + features[:, 4] * 7
+        np.testing.assert_allclose(model(features).numpy(), golden.numpy(), rtol=1e-5)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        pass
+    else:
+        sys.argv.pop()
+    unittest.main()
@@ -523,6 +523,86 @@ class DensityMapOpTest(unittest.TestCase):
                                        atol=1e-6)
 
 
+    @parameterized.expand([
+        [True],
+        [False],
+    ])
+    def testDensityMapLock(self, deterministic_flag):
+        """
+        @brief locked cells are folded into the static map,
+        which gives the same map as scattering all cells
+        """
+        dtype = np.float32
+        pos = np.array([[1, 1], [2, 2], [3, 2], [2, 2.5]], dtype=dtype)
+        node_sizes = np.array([[1, 1.5], [1, 1], [1.5, 0.5], [1.5, 0.5]],
+                              dtype=dtype)
+        node_sizes_2d = node_sizes.reshape([-1, 1, 2])
+        bin_map_dims = np.array([[3, 3]], dtype=np.int32)
+        centers = torch.from_numpy(pos + node_sizes / 2)
+
+        custom = density_map.DensityMap(torch.from_numpy(node_sizes_2d),
+                                        [torch.zeros(3, 3, dtype=torch.float32)],
+                                        torch.from_numpy(bin_map_dims),
+                                        torch.ones((1,), dtype=torch.int32),
+                                        xl=1.0,
+                                        yl=1.0,
+                                        xh=4.0,
+                                        yh=4.0,
+                                        movable_range=(0, 2),
+                                        filler_range=(3, 4),
+                                        fixed_range=(2, 3),
+                                        stretch_flag=1,
+                                        smooth_flag=False,
+                                        deterministic_flag=deterministic_flag)
+        golden = custom.forward(centers)[0].clone()
+
+        custom.lock(torch.tensor([1, 0, 0, 1], dtype=torch.uint8))
+        result = custom.forward(centers)[0].clone()
+        np.testing.assert_allclose(golden, result, rtol=1e-6, atol=1e-6)
+        # the static map keeps the locked cells where they were locked
+        moved = centers.clone()
+        moved[0] += 0.5
+        result = custom.forward(moved)[0]
+        np.testing.assert_allclose(golden, result, rtol=1e-6, atol=1e-6)
+
+        custom.lock(None)
+        result = custom.forward(moved)[0]
+        self.assertFalse(np.allclose(golden, result))
+
+    def testDensityMapComputeDtype(self):
+        """
+        @brief float32 density maps with float64 positions
+        """
+        pos = np.array([[1, 1], [2, 2], [3, 2], [2, 2.5]], dtype=np.float64)
+        node_sizes = np.array([[1, 1.5], [1, 1], [1.5, 0.5], [1.5, 0.5]],
+                              dtype=np.float64)
+        centers = torch.from_numpy(pos + node_sizes / 2)
+        results = []
+        for compute_dtype in [None, torch.float32]:
+            custom = density_map.DensityOverflow(
+                torch.from_numpy(node_sizes.reshape([-1, 1, 2])),
+                [torch.zeros(3, 3, dtype=torch.float64)],
+                torch.tensor([[3, 3]], dtype=torch.int32),
+                torch.ones((1,), dtype=torch.int32),
+                xl=1.0,
+                yl=1.0,
+                xh=4.0,
+                yh=4.0,
+                movable_range=(0, 2),
+                filler_range=(3, 4),
+                fixed_range=(2, 3),
+                stretch_flag=1,
+                smooth_flag=False,
+                deterministic_flag=True,
+                target_density=[0.5],
+                compute_dtype=compute_dtype)
+            overflows = custom.forward(centers)
+            self.assertEqual(overflows.dtype, torch.float64)
+            self.assertEqual(custom.density_map_buffers[0].dtype,
+                             compute_dtype or torch.float64)
+            results.append(overflows.numpy())
+        np.testing.assert_allclose(results[0], results[1], rtol=1e-6, atol=1e-6)
+
 if __name__ == '__main__':
     if len(sys.argv) < 2:
         pass
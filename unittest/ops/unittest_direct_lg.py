@@ -0,0 +1,89 @@
+import os
+import sys
+import unittest
+import torch
+
+if len(sys.argv) < 2:
+    print("usage: python script.py [project_dir] [project_source_dir]")
+    project_dir = os.path.dirname(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+else:
+    project_dir = os.path.abspath(sys.argv[1])
+project_source_dir = os.path.abspath(sys.argv[2]) if len(sys.argv) > 2 else project_dir
+print("use project_dir = %s, project_source_dir = %s" % (project_dir, project_source_dir))
+
+sys.path.append(project_dir)
+if True:
+    from openparf.params import Params
+    from openparf.flow import build_placedb
+    from openparf.placement.placer import Placer
+    from openparf.ops.direct_lg import direct_lg, direct_lg_cpp
+sys.path.pop()
+
+
+class DirectLegalizeOpTest(unittest.TestCase):
+    """The persistent legalizer, run again on new positions, matches the per-call legalization
+    """
+
+    def setUp(self):
+        params = Params()
+        params.load(os.path.join(project_source_dir, "unittest/regression/ehbookshelf/sample1.json"))
+        params.input_dir = os.path.join(project_source_dir, params.input_dir)
+        params.gpu = 0
+        params.num_threads = 1
+        torch.set_num_threads(params.num_threads)
+        self.params = params
+        db, self.placedb = build_placedb(params)
+        self.data_cls = Placer(params, self.placedb).data_cls
+
+    def random_pos(self, seed):
+        """Instance positions drawn uniformly over the die"""
+        generator = torch.Generator().manual_seed(seed)
+        pos = self.data_cls.pos[0].data.cpu().clone()
+        xy = pos.view(-1, 2)
+        dims = self.placedb.siteMapDim()
+        xy[:, 0] = torch.rand(xy.size(0), generator=generator, dtype=pos.dtype) * dims.x()
+        xy[:, 1] = torch.rand(xy.size(0), generator=generator, dtype=pos.dtype) * dims.y()
+        return pos
+
+    def testForward(self):
+        op = direct_lg.DirectLegalize(self.placedb, self.params)
+        op.param.verbose = 0
+        pos1 = self.random_pos(self.params.random_seed)
+        pos2 = self.random_pos(self.params.random_seed + 1)
+        result1 = op(pos1)
+        result2 = op(pos2)
+        self.assertTrue(torch.equal(result1, direct_lg_cpp.forward(self.placedb, op.param, pos1)))
+        self.assertTrue(torch.equal(result2, direct_lg_cpp.forward(self.placedb, op.param, pos2)))
+
+    def testClockAwareForward(self):
+        op = direct_lg.ClockAwareDirectLegalize(self.placedb,
+                                                self.params,
+                                                self.data_cls.inst_to_clock_indexes,
+                                                max_clock_net_per_half_column=self.params.maximum_clock_per_half_column,
+                                                honor_fence_region_constraints=True)
+        op.param.verbose = 0
+        # every clock is available in every clock region
+        clock_available_clock_region = torch.ones(
+            (self.data_cls.num_clocks, self.data_cls.num_clock_regions), dtype=torch.uint8)
+        op.reset_clock_available_clock_region(clock_available_clock_region)
+        pos1 = self.random_pos(self.params.random_seed)
+        pos2 = self.random_pos(self.params.random_seed + 1)
+        op(pos1)
+        result, hc_avail_map = op(pos2)
+        golden, golden_hc_avail_map = direct_lg_cpp.clock_aware_forward(self.placedb, op.param, pos2,
+                                                                         self.data_cls.inst_to_clock_indexes,
+                                                                         clock_available_clock_region)
+        self.assertTrue(torch.equal(result, golden))
+        self.assertTrue(torch.equal(hc_avail_map, golden_hc_avail_map))
+
+        # the placer switches the same legalizer between both modes
+        op.reset_honor_fence_region_constraints(False)
+        result = op(pos1)
+        self.assertTrue(torch.equal(result, direct_lg_cpp.forward(self.placedb, op.param, pos1)))
+
+
+if __name__ == '__main__':
+    # unittest uses sys.argv to find the main function
+    sys.argv = sys.argv[0:1]
+    unittest.main()
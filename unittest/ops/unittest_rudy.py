@@ -117,6 +117,55 @@ class RudyUnittest(unittest.TestCase):
             np.testing.assert_allclose(result_cpu, result_cuda.cpu())
 
 
+    @parameterized.expand([
+        [False],
+        [True],
+    ])
+    def test_incremental_rudy(self, deterministic_flag):
+        dtype = torch.float64
+        torch.manual_seed(0)
+        num_pins = 40
+        num_nets = 12
+        pin_pos = torch.rand(num_pins, 2, dtype=dtype) * torch.tensor([2.0, 4.0], dtype=dtype)
+        flat_netpin = torch.randperm(num_pins).int()
+        netpin_start = torch.tensor([0, 2, 5, 7, 10, 12, 15, 20, 22, 26, 30, 35, 40], dtype=torch.int32)
+        net_weights = torch.rand(num_nets, dtype=dtype) + 1
+
+        def build(incremental_flag, bbox_tolerance=0.0):
+            return rudy.Rudy(netpin_start=netpin_start,
+                             flat_netpin=flat_netpin,
+                             net_weights=net_weights,
+                             xl=0.0,
+                             xh=2.0,
+                             yl=0.0,
+                             yh=4.0,
+                             num_bins_x=8,
+                             num_bins_y=8,
+                             unit_horizontal_capacity=0.1,
+                             unit_vertical_capacity=0.2,
+                             deterministic_flag=deterministic_flag,
+                             incremental_flag=incremental_flag,
+                             bbox_tolerance=bbox_tolerance)
+
+        full_op = build(False)
+        incremental_op = build(True)
+        tolerant_op = build(True, bbox_tolerance=0.5)
+        for step in range(4):
+            if step:
+                # move some pins, and change the weight of one net
+                moved = torch.randperm(num_pins)[:5]
+                pin_pos[moved] += (torch.rand(5, 2, dtype=dtype) - 0.5) * 0.3
+                net_weights[step] *= 2
+            golden = [x.clone() for x in full_op(pin_pos.view(-1))]
+            result = incremental_op(pin_pos.view(-1))
+            for x, y in zip(golden, result):
+                np.testing.assert_allclose(x, y, rtol=1e-6, atol=1e-6)
+            tolerant_op(pin_pos.view(-1))
+        # a forced rebuild removes the drift of the tolerance
+        result = tolerant_op(pin_pos.view(-1), rebuild_flag=True)
+        for x, y in zip(golden, result):
+            np.testing.assert_allclose(x, y, rtol=1e-6, atol=1e-6)
+
 # ground truth:
 #
 # flat_net2pin_map =  [0 4 1 2 3]
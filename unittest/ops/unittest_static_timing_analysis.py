@@ -0,0 +1,99 @@
+import os
+import sys
+import unittest
+import torch
+import numpy as np
+
+if len(sys.argv) < 2:
+    print("usage: python script.py [project_dir] [project_source_dir]")
+    project_dir = os.path.dirname(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+else:
+    project_dir = os.path.abspath(sys.argv[1])
+project_source_dir = os.path.abspath(sys.argv[2]) if len(sys.argv) > 2 else project_dir
+print("use project_dir = %s, project_source_dir = %s" % (project_dir, project_source_dir))
+
+sys.path.append(project_dir)
+if True:
+    from openparf.params import Params
+    from openparf.flow import build_placedb
+    from openparf.placement.placer import Placer
+    from openparf.ops.delay_estimation import delay_estimation
+    from openparf.ops.static_timing_analysis import static_timing_analysis
+sys.path.pop()
+
+
+class LinearDelayModel(object):
+    """delay = 2 * covered columns + 3 * dy + 5 * RAM + 7 * DSP
+    """
+
+    def predict(self, features):
+        return features[:, :-3].sum(dim=1) * 2 + features[:, -3] * 3 + features[:, -2] * 5 + features[:, -1] * 7
+
+
+class StaticTimingAnalysisOpTest(unittest.TestCase):
+    def testIncrementalTimingAnalysis(self):
+        params = Params()
+        params.load(os.path.join(project_source_dir, "unittest/regression/ehbookshelf/sample1.json"))
+        params.input_dir = os.path.join(project_source_dir, params.input_dir)
+        params.gpu = 0
+        params.num_threads = 1
+        db, placedb = build_placedb(params)
+        placer = Placer(params, placedb)
+        data_cls = placer.data_cls
+        num_insts = placedb.numInsts()
+        movable_range = data_cls.movable_range
+        filler_range = data_cls.filler_range
+        self.assertGreater(filler_range[1], filler_range[0])
+
+        def build():
+            estimate_delay_op = delay_estimation.DelayEstimation(placedb, data_cls, LinearDelayModel())
+            static_timing_op = static_timing_analysis.StaticTimingAnalysis(placedb, data_cls, 5000.0)
+            return estimate_delay_op, static_timing_op
+
+        generator = torch.Generator().manual_seed(params.random_seed)
+        pos = data_cls.pos[0].data.clone()
+        xy = pos.view(-1, 2)
+        xy[movable_range[0]:movable_range[1], 0].uniform_(0, placedb.siteMapDim().x(), generator=generator)
+        xy[movable_range[0]:movable_range[1], 1].uniform_(0, placedb.siteMapDim().y(), generator=generator)
+
+        estimate_delay_op, static_timing_op = build()
+        timing_op = static_timing_analysis.IncrementalTimingAnalysis(estimate_delay_op,
+                                                                     static_timing_op,
+                                                                     num_insts,
+                                                                     move_threshold=0.5,
+                                                                     max_moved_ratio=0.2)
+        timing_op(pos)
+        self.assertEqual(timing_op.anchor_pos.shape[0], num_insts)
+
+        # count the instances re-estimated incrementally
+        num_updated = []
+        update = estimate_delay_op.update
+
+        def counted_update(pos, inst_mask):
+            num_updated.append(int(inst_mask.sum()))
+            return update(pos, inst_mask)
+
+        estimate_delay_op.update = counted_update
+
+        # move a few instances, and all the fillers, which must not trigger a full analysis
+        moved_pos = pos.clone()
+        moved_xy = moved_pos.view(-1, 2)
+        num_moved = min(10, movable_range[1] - movable_range[0])
+        moved_xy[movable_range[0]:movable_range[0] + num_moved, 0] += 3.0
+        moved_xy[filler_range[0]:filler_range[1]] += 2.0
+        results = timing_op(moved_pos)
+        self.assertEqual(num_updated, [num_moved])
+
+        # a full analysis from scratch gives the same timing
+        estimate_delay_op, static_timing_op = build()
+        pin_delays, _ = estimate_delay_op(moved_pos)
+        golden = static_timing_op.forward(pin_delays)
+        for result, golden_result in zip(results, golden):
+            np.testing.assert_allclose(result.cpu().numpy(), golden_result.cpu().numpy(), rtol=1e-6, atol=1e-6)
+
+
+if __name__ == '__main__':
+    # unittest uses sys.argv to find the main function
+    sys.argv = sys.argv[0:1]
+    unittest.main()
@@ -0,0 +1,101 @@
+##
+# @file   unittest_gp_resume.py
+# @brief  Resuming global placement from a rolling checkpoint reproduces the uninterrupted run
+#
+
+import os
+import sys
+import tempfile
+import types
+import unittest
+
+import torch
+
+if len(sys.argv) < 2:
+    print("usage: python script.py [project_dir]")
+    project_dir = os.path.dirname(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+else:
+    project_dir = os.path.abspath(sys.argv[1])
+print("use project_dir = %s" % (project_dir))
+
+sys.path.append(project_dir)
+if True:
+    from openparf.params import Params
+    from openparf.flow import build_placedb
+    from openparf.placement.placer import Placer
+    import openparf.py_utils.checkpoint as checkpoint
+sys.path.pop()
+
+
+class GlobalPlaceResumeTest(unittest.TestCase):
+    def place(self, result_dir, **overrides):
+        """Run global placement of sample1 on CPU with a single thread for reproducibility"""
+        params = Params()
+        params.load(os.path.join(project_dir, "unittest/regression/ehbookshelf/sample1.json"))
+        params.input_dir = os.path.join(project_dir, params.input_dir)
+        params.result_dir = result_dir
+        params.gpu = 0
+        params.num_threads = 1
+        params.max_global_place_iters = 60
+        params.macro_place_flag = 0
+        params.legalize_flag = 0
+        params.detailed_place_flag = 0
+        params.route_flag = 0
+        params.plot_flag = 0
+        params.gp_checkpoint_iters = 20
+        params.gp_checkpoint_keep = 10
+        params.gp_checkpoint_dir = os.path.join(result_dir, "checkpoints")
+        for k, v in overrides.items():
+            params.update(k, v)
+        torch.set_num_threads(params.num_threads)
+        db, placedb = build_placedb(params)
+        placer = Placer(params, placedb)
+        placer()
+        return placer.data_cls.pos[0].data.clone(), params
+
+    def testResume(self):
+        with tempfile.TemporaryDirectory() as dirname:
+            golden, params = self.place(dirname)
+            filenames = checkpoint.list_checkpoints(params.gp_checkpoint_dir, "%s.gp.iter" % params.design_name())
+            self.assertGreaterEqual(len(filenames), 2)
+            # resume from the first checkpoint, with the checkpoints of the resumed run written elsewhere
+            pos, _ = self.place(dirname,
+                                gp_resume_file=filenames[0],
+                                gp_checkpoint_dir=os.path.join(dirname, "resumed"))
+            self.assertTrue(torch.equal(pos, golden))
+
+    def testTupleLoopState(self):
+        def state(value):
+            return types.SimpleNamespace(checkpoint_loop_attrs=("latest_timing_analysis_result",),
+                                         checkpoint_metric_attrs=Placer.checkpoint_metric_attrs,
+                                         latest_timing_analysis_result=value,
+                                         metric_before_clk_assignment=None,
+                                         best_sol_metric=None,
+                                         latest_eval_metric=None,
+                                         device=torch.device("cpu"))
+
+        # (max delay, WNS, TNS) of the latest timing analysis, as tensors or numbers
+        value = (torch.tensor(1.5), -2.0, torch.tensor(-3.5))
+        tensors, meta = {}, {}
+        Placer.gp_loop_state(state(value), [], tensors, meta)
+        meta["devices"] = {name: str(t.device) for name, t in tensors.items()}
+        restored = state(None)
+        Placer.restore_gp_loop_state(restored, tensors, meta)
+        self.assertIsInstance(restored.latest_timing_analysis_result, tuple)
+        self.assertEqual(len(restored.latest_timing_analysis_result), 3)
+        self.assertTrue(torch.equal(restored.latest_timing_analysis_result[0], value[0]))
+        self.assertEqual(restored.latest_timing_analysis_result[1], value[1])
+        self.assertTrue(torch.equal(restored.latest_timing_analysis_result[2], value[2]))
+
+        # values that cannot be saved are rejected instead of being dropped
+        with self.assertRaises(TypeError):
+            Placer.gp_loop_state(state((object(), )), [], {}, {})
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        pass
+    else:
+        sys.argv.pop()
+    unittest.main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import unittest
+
+import torch
+
+import openparf.py_utils.checkpoint as checkpoint
+
+
+class CheckpointTest(unittest.TestCase):
+    def setUp(self):
+        torch.manual_seed(0)
+        self.tensors = {
+            "pos": torch.rand(1001, 2, dtype=torch.float64),
+            "lambdas": torch.rand(7, dtype=torch.float32),
+            "mask": torch.rand(13) > 0.5,
+            "ids": torch.arange(17, dtype=torch.int64),
+            "empty": torch.zeros(0, 2, dtype=torch.int32),
+            "scalar": torch.tensor(3.5, dtype=torch.float64),
+        }
+        self.meta = {"opt_iter": {"iteration": 42}, "values": {"eta": None}}
+
+    def check(self, compression, mmap):
+        with tempfile.TemporaryDirectory() as dirname:
+            filename = os.path.join(dirname, "test.ckpt")
+            checkpoint.save_checkpoint(filename, self.tensors, self.meta, compression)
+            self.assertTrue(checkpoint.is_checkpoint(filename))
+            tensors, meta = checkpoint.load_checkpoint(filename, mmap=mmap)
+            self.assertEqual(meta, self.meta)
+            self.assertEqual(list(tensors.keys()), list(self.tensors.keys()))
+            for name, t in self.tensors.items():
+                self.assertEqual(tensors[name].dtype, t.dtype)
+                self.assertEqual(tensors[name].shape, t.shape)
+                # bit-identical
+                self.assertTrue(torch.equal(tensors[name], t))
+
+    def test_none(self):
+        self.check("none", mmap=True)
+        self.check("none", mmap=False)
+
+    @unittest.skipIf(checkpoint.zstandard is None, "zstandard is not installed")
+    def test_zstd(self):
+        self.check("zstd", mmap=True)
+
+    @unittest.skipIf(checkpoint.lz4_frame is None, "lz4 is not installed")
+    def test_lz4(self):
+        self.check("lz4", mmap=True)
+
+    def test_writer(self):
+        with tempfile.TemporaryDirectory() as dirname:
+            writer = checkpoint.CheckpointWriter(dirname, "test.iter", keep=2)
+            pos = self.tensors["pos"].clone()
+            for index in range(5):
+                pos.fill_(index)
+                writer.submit(index, {"pos": pos}, {"index": index})
+            writer.close()
+            filenames = checkpoint.list_checkpoints(dirname, "test.iter")
+            self.assertEqual(filenames, [writer.filename(3), writer.filename(4)])
+            # tensors are snapshotted at submission
+            tensors, meta = checkpoint.load_checkpoint(filenames[0])
+            self.assertEqual(meta, {"index": 3})
+            self.assertTrue(torch.all(tensors["pos"] == 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import os
+import json
+import tempfile
+import unittest
+
+from openparf.py_utils.tracer import Tracer, TracedOp, traced
+
+
+class Stage(object):
+    def __init__(self, tracer):
+        self.tracer = tracer
+        self.op = TracedOp(lambda x: x + 1, "inc_op", tracer)
+
+    @traced("stage")
+    def run(self, n):
+        return sum(self.op(i) for i in range(n))
+
+
+class TracerTest(unittest.TestCase):
+    def test_nesting(self):
+        tracer = Tracer()
+        stage = Stage(tracer)
+        with tracer.span("root", "stage"):
+            self.assertEqual(stage.run(3), 6)
+            self.assertEqual(stage.run(2), 3)
+        stats = tracer.stats()
+        self.assertEqual(list(stats.keys()), ["root/stage/inc_op", "root/stage", "root"])
+        self.assertEqual(stats["root"].count, 1)
+        self.assertEqual(stats["root/stage"].count, 2)
+        self.assertEqual(stats["root/stage/inc_op"].count, 5)
+        self.assertGreaterEqual(stats["root"].wall_ns, stats["root/stage"].wall_ns)
+        # parents are listed before their children
+        lines = tracer.summary().splitlines()
+        self.assertEqual([l.split("|")[0].strip() for l in lines[2:]], ["root", "stage", "inc_op"])
+
+    def test_chrome_trace(self):
+        tracer = Tracer(max_events=2)
+        stage = Stage(tracer)
+        stage.run(3)
+        self.assertEqual(tracer.num_dropped_events, 2)
+        self.assertEqual(tracer.stats()["stage/inc_op"].count, 3)
+        with tempfile.TemporaryDirectory() as dirname:
+            filename = os.path.join(dirname, "trace.json")
+            tracer.write_chrome_trace(filename)
+            with open(filename, "r") as f:
+                events = json.load(f)["traceEvents"]
+        self.assertEqual(len(events), 2)
+        for e in events:
+            self.assertEqual(e["ph"], "X")
+            self.assertEqual(e["name"], "inc_op")
+            self.assertIn("cpu_ms", e["args"])
+            self.assertIn("peak_rss_mb", e["args"])
+
+    def test_disabled(self):
+        tracer = Tracer(enabled=False)
+        stage = Stage(tracer)
+        self.assertEqual(stage.run(3), 6)
+        tracer.begin("open")
+        tracer.end_all()
+        self.assertEqual(len(tracer.stats()), 0)
+
+    def test_end_all(self):
+        tracer = Tracer()
+        tracer.begin("a")
+        tracer.begin("b")
+        tracer.end_all()
+        self.assertEqual(list(tracer.stats().keys()), ["a/b", "a"])
+
+    def test_exception(self):
+        # spans are closed when a stage raises, so later spans are not nested in them
+        tracer = Tracer()
+        with self.assertRaises(RuntimeError):
+            with tracer.span("stage_a", "stage"):
+                raise RuntimeError("failed stage")
+        with tracer.span("stage_b", "stage"):
+            pass
+        self.assertEqual(list(tracer.stats().keys()), ["stage_a", "stage_b"])
+
+    def test_forwarding(self):
+        class Op(object):
+            flag = False
+
+            def __call__(self):
+                return self.flag
+
+        tracer = Tracer()
+        op = TracedOp(Op(), "op", tracer)
+        op.flag = True
+        self.assertTrue(op())
+        self.assertTrue(op._op.flag)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import unittest
+
+import torch
+
+from openparf.py_utils.workspace import Workspace
+
+
+class WorkspaceTest(unittest.TestCase):
+    def test_reuse(self):
+        workspace = Workspace()
+        a = workspace.get("a", (4, 8), torch.float64, "cpu")
+        a.fill_(1)
+        self.assertIs(workspace.get("a", (4, 8), torch.float64, "cpu"), a)
+        self.assertEqual(float(workspace.get("a", (4, 8), torch.float64, "cpu", zero_flag=True).sum()), 0)
+        # names, shapes and dtypes are distinct buffers
+        self.assertIsNot(workspace.get("b", (4, 8), torch.float64, "cpu"), a)
+        self.assertIsNot(workspace.get("a", (8, 4), torch.float64, "cpu"), a)
+        self.assertIsNot(workspace.like("a", torch.zeros(4, 8, dtype=torch.float32)), a)
+        self.assertEqual(len(workspace.buffers), 4)
+        self.assertEqual(workspace.num_bytes, 3 * 32 * 8 + 32 * 4)
+
+    def test_release(self):
+        workspace = Workspace()
+        workspace.get("rudy.map", (16, 16), torch.float32, "cpu")
+        workspace.get("density.map", (8, 8), torch.float32, "cpu")
+        peak = workspace.peak_num_bytes
+        workspace.release("rudy.")
+        self.assertEqual(workspace.num_bytes, 8 * 8 * 4)
+        self.assertEqual(workspace.peak_num_bytes, peak)
+        lines = workspace.summary().splitlines()
+        self.assertEqual([l.split("|")[0].strip() for l in lines[2:]], ["density.map", "total", "peak"])
+        workspace.release()
+        self.assertEqual(workspace.num_bytes, 0)
+
+    def test_disabled(self):
+        workspace = Workspace(enabled=False)
+        a = workspace.get("a", (4, 8), torch.float64, "cpu", zero_flag=True)
+        self.assertEqual(float(a.sum()), 0)
+        self.assertIsNot(workspace.get("a", (4, 8), torch.float64, "cpu"), a)
+        self.assertEqual(workspace.num_bytes, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()